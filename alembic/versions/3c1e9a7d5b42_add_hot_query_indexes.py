@@ -0,0 +1,45 @@
+"""add hot query indexes
+
+Revision ID: 3c1e9a7d5b42
+Revises: fba69beeee19
+Create Date: 2026-10-16 09:12:31.418205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c1e9a7d5b42'
+down_revision: Union[str, None] = 'fba69beeee19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_messages_conversation_id_is_deleted_timestamp', 'messages', ['conversation_id', 'is_deleted', 'timestamp'], unique=False)
+    op.create_index('ix_conversations_user_id_is_deleted_last_activity', 'conversations', ['user_id', 'is_deleted', 'last_activity'], unique=False)
+    op.create_index('ix_files_user_id_is_deleted_upload_date', 'files', ['user_id', 'is_deleted', 'upload_date'], unique=False)
+    op.create_index('ix_files_conversation_id_is_deleted_upload_date', 'files', ['conversation_id', 'is_deleted', 'upload_date'], unique=False)
+    op.create_index('ix_files_checksum', 'files', ['checksum'], unique=False)
+    op.create_index('ix_question_answers_session_id_question_id', 'question_answers', ['session_id', 'question_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # InnoDB dropped its implicit foreign key indexes once the composite indexes covered
+    # those columns, so a plain index is recreated before each composite one is dropped
+    op.create_index('ix_question_answers_session_id', 'question_answers', ['session_id'], unique=False)
+    op.drop_index('ix_question_answers_session_id_question_id', table_name='question_answers')
+    op.drop_index('ix_files_checksum', table_name='files')
+    op.create_index('ix_files_conversation_id', 'files', ['conversation_id'], unique=False)
+    op.drop_index('ix_files_conversation_id_is_deleted_upload_date', table_name='files')
+    op.create_index('ix_files_user_id', 'files', ['user_id'], unique=False)
+    op.drop_index('ix_files_user_id_is_deleted_upload_date', table_name='files')
+    op.create_index('ix_conversations_user_id', 'conversations', ['user_id'], unique=False)
+    op.drop_index('ix_conversations_user_id_is_deleted_last_activity', table_name='conversations')
+    op.create_index('ix_messages_conversation_id', 'messages', ['conversation_id'], unique=False)
+    op.drop_index('ix_messages_conversation_id_is_deleted_timestamp', table_name='messages')
@@ -0,0 +1,41 @@
+"""add cv analyses
+
+Revision ID: 5e7a3c9d2b14
+Revises: 8d2f4b6a1c93
+Create Date: 2026-10-16 22:41:37.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e7a3c9d2b14'
+down_revision: Union[str, None] = '8d2f4b6a1c93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('cv_analyses',
+    sa.Column('checksum', sa.String(length=64), nullable=False),
+    sa.Column('analysis_version', sa.String(length=32), nullable=False),
+    sa.Column('result', sa.Text().with_variant(mysql.LONGTEXT(), 'mysql'), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=True),
+    sa.Column('size', sa.Integer(), nullable=True),
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('create_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('update_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('is_deleted', sa.Boolean(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('checksum', 'analysis_version', name='uq_cv_analyses_checksum_version')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('cv_analyses')
@@ -0,0 +1,63 @@
+"""add langgraph checkpoints
+
+Revision ID: 6a2d9f4c8e51
+Revises: b3f81d6e4a27
+Create Date: 2026-10-17 10:12:44.318206
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6a2d9f4c8e51'
+down_revision: Union[str, None] = 'b3f81d6e4a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Earlier versions of SQLCheckpointSaver created these tables at runtime: adopt them if present
+    existing_tables = sa.inspect(op.get_bind()).get_table_names()
+
+    if 'langgraph_checkpoints' not in existing_tables:
+        op.create_table('langgraph_checkpoints',
+        sa.Column('thread_id', sa.String(length=255), nullable=False),
+        sa.Column('checkpoint_ns', sa.String(length=255), nullable=False),
+        sa.Column('checkpoint_id', sa.String(length=64), nullable=False),
+        sa.Column('parent_checkpoint_id', sa.String(length=64), nullable=True),
+        sa.Column('checkpoint_type', sa.String(length=32), nullable=False),
+        sa.Column('checkpoint', sa.LargeBinary().with_variant(mysql.LONGBLOB(), 'mysql'), nullable=False),
+        sa.Column('metadata_type', sa.String(length=32), nullable=False),
+        sa.Column('checkpoint_metadata', sa.LargeBinary().with_variant(mysql.LONGBLOB(), 'mysql'), nullable=False),
+        sa.Column('message_count', sa.Integer(), nullable=False),
+        sa.Column('size_bytes', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('thread_id', 'checkpoint_ns')
+        )
+        op.create_index(op.f('ix_langgraph_checkpoints_updated_at'), 'langgraph_checkpoints', ['updated_at'], unique=False)
+
+    if 'langgraph_checkpoint_writes' not in existing_tables:
+        op.create_table('langgraph_checkpoint_writes',
+        sa.Column('thread_id', sa.String(length=255), nullable=False),
+        sa.Column('checkpoint_ns', sa.String(length=255), nullable=False),
+        sa.Column('checkpoint_id', sa.String(length=64), nullable=False),
+        sa.Column('task_id', sa.String(length=64), nullable=False),
+        sa.Column('idx', sa.Integer(), nullable=False),
+        sa.Column('channel', sa.String(length=255), nullable=False),
+        sa.Column('value_type', sa.String(length=32), nullable=False),
+        sa.Column('value', sa.LargeBinary().with_variant(mysql.LONGBLOB(), 'mysql'), nullable=False),
+        sa.Column('task_path', sa.String(length=255), nullable=False),
+        sa.PrimaryKeyConstraint('thread_id', 'checkpoint_ns', 'checkpoint_id', 'task_id', 'idx')
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('langgraph_checkpoint_writes')
+    op.drop_index(op.f('ix_langgraph_checkpoints_updated_at'), table_name='langgraph_checkpoints')
+    op.drop_table('langgraph_checkpoints')
@@ -0,0 +1,46 @@
+"""add file contents
+
+Revision ID: 8d2f4b6a1c93
+Revises: 3c1e9a7d5b42
+Create Date: 2026-10-16 14:05:12.731904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2f4b6a1c93'
+down_revision: Union[str, None] = '3c1e9a7d5b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('file_contents',
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('checksum', sa.String(length=64), nullable=False),
+    sa.Column('sha256', sa.String(length=64), nullable=True),
+    sa.Column('size', sa.Integer(), nullable=False),
+    sa.Column('content_type', sa.String(length=100), nullable=True),
+    sa.Column('object_path', sa.String(length=1000), nullable=True),
+    sa.Column('extracted_text', sa.Text().with_variant(mysql.LONGTEXT(), 'mysql'), nullable=True),
+    sa.Column('extracted_at', sa.DateTime(), nullable=True),
+    sa.Column('analyzed_at', sa.DateTime(), nullable=True),
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('create_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('update_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('is_deleted', sa.Boolean(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'checksum', name='uq_file_contents_user_id_checksum')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('file_contents')
@@ -0,0 +1,30 @@
+"""add conversation context summary
+
+Revision ID: b3f81d6e4a27
+Revises: 5e7a3c9d2b14
+Create Date: 2026-10-16 23:58:12.640193
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f81d6e4a27'
+down_revision: Union[str, None] = '5e7a3c9d2b14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('conversations', sa.Column('context_summary', sa.Text(), nullable=True))
+    op.add_column('conversations', sa.Column('context_summary_message_count', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('conversations', 'context_summary_message_count')
+    op.drop_column('conversations', 'context_summary')
@@ -8,12 +8,14 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
 from starlette.middleware.sessions import SessionMiddleware
 
-from app.core.config import SECRET_KEY
+from app.core.config import CHAT_PERSISTENCE_MODE, SECRET_KEY
 from app.exceptions.handlers import setup_exception_handlers
 from app.middleware.localization_middleware import LocalizationMiddleware
 from app.middleware.translation_manager import _
 from app.modules import route as api_routers
 from app.modules.agent.events import register_agent_event_handlers
+from app.modules.chat.services.turn_persistence_service import turn_write_behind
+from app.utils.n8n_api_client import n8n_client
 
 
 def custom_openapi(app: FastAPI):
@@ -98,4 +100,12 @@ def create_app():
 		logger = logging.getLogger(__name__)
 		logger.error(f'Failed to register event handlers: {e}')
 
+	# Release the pooled n8n connections
+	app.add_event_handler('shutdown', n8n_client.aclose)
+
+	# Write-behind chat persistence: replay turns journaled before a crash, flush queued turns on shutdown
+	if CHAT_PERSISTENCE_MODE == 'write_behind':
+		app.add_event_handler('startup', turn_write_behind.recover)
+		app.add_event_handler('shutdown', turn_write_behind.drain)
+
 	return app
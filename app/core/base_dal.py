@@ -1,14 +1,21 @@
 """Base DAL"""
 
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
 from typing import Generic, Type, TypeVar
 
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, asc, desc, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query, Session
 
-from app.exceptions.exception import CustomHTTPException
+from app.core.base_model import Pagination, decode_cursor, encode_cursor
+from app.exceptions.exception import CustomHTTPException, ValidationException
+from app.middleware.translation_manager import _
 
 T = TypeVar('T')  # Kiểu dữ liệu chung cho model
 
+# Session.info key counting the open AsyncBaseDAL.transaction() blocks of a session
+TRANSACTION_DEPTH_KEY = 'dal_transaction_depth'
+
 
 class BaseDAL(Generic[T]):
 	"""BaseDAL"""
@@ -60,6 +67,57 @@ class BaseDAL(Generic[T]):
 			return True
 		return False
 
+	def paginate_by_cursor(
+		self,
+		query: Query,
+		timestamp_column,
+		cursor: str | None = None,
+		page_size: int = 10,
+		descending: bool = True,
+		total_count: int | None = None,
+	) -> Pagination:
+		"""Keyset pagination on (timestamp_column, id) instead of COUNT + OFFSET
+
+		The cost of a page does not grow with its depth. total_count is passed through
+		as-is, so callers decide whether to pay for a count or supply an estimate.
+
+		Rows whose timestamp is NULL sort lowest (MySQL ordering): they come last on a
+		descending page and first on an ascending one, ordered by id.
+		"""
+		id_column = self.model.id
+
+		if cursor:
+			try:
+				cursor_timestamp, cursor_id = decode_cursor(cursor)
+			except ValueError:
+				raise ValidationException(_('invalid_pagination_cursor'))
+
+			if cursor_timestamp is None:
+				# Cursor on a NULL row: only NULL rows remain (descending), or NULL rows then all dated ones (ascending)
+				if descending:
+					keyset = and_(timestamp_column.is_(None), id_column < cursor_id)
+				else:
+					keyset = or_(timestamp_column.isnot(None), and_(timestamp_column.is_(None), id_column > cursor_id))
+			elif descending:
+				keyset = or_(timestamp_column < cursor_timestamp, and_(timestamp_column == cursor_timestamp, id_column < cursor_id))
+				if timestamp_column.expression.nullable:
+					keyset = or_(keyset, timestamp_column.is_(None))
+			else:
+				keyset = or_(timestamp_column > cursor_timestamp, and_(timestamp_column == cursor_timestamp, id_column > cursor_id))
+			query = query.filter(keyset)
+
+		direction = desc if descending else asc
+		rows = query.order_by(None).order_by(direction(timestamp_column), direction(id_column)).limit(page_size + 1).all()
+
+		# One extra row tells whether another page exists without counting
+		items = rows[:page_size]
+		next_cursor = None
+		if len(rows) > page_size:
+			last = items[-1]
+			next_cursor = encode_cursor(getattr(last, timestamp_column.key), last.id)
+
+		return Pagination(items=items, total_count=total_count, page=None, page_size=page_size, next_cursor=next_cursor)
+
 	def begin_transaction(self):
 		"""Bắt đầu transaction"""
 		self.db.begin()
@@ -94,3 +152,104 @@ class BaseDAL(Generic[T]):
 		except Exception as e:
 			self.rollback()
 			raise e
+
+
+class AsyncBaseDAL(Generic[T]):
+	"""Async counterpart of BaseDAL working on an AsyncSession
+
+	create/update/delete commit on their own, unless they run inside `transaction()`,
+	which commits once at the end. The session autobegins, so in_transaction() cannot
+	tell the two apart: the open transaction() blocks are counted in the session info.
+	"""
+
+	def __init__(self, db: AsyncSession, model: Type[T]):
+		self.db = db
+		self.model = model
+
+	async def get_by_id(self, item_id: str):
+		"""Lấy một bản ghi theo ID"""
+		result = await self.db.execute(select(self.model).where(self.model.id == item_id))
+		return result.scalars().first()
+
+	async def get_all(self):
+		"""Lấy tất cả bản ghi"""
+		result = await self.db.execute(select(self.model))
+		return result.scalars().all()
+
+	async def create(self, obj_data: dict):
+		"""Tạo một bản ghi mới"""
+		new_obj = self.model(**obj_data)
+		self.db.add(new_obj)
+		# Always flush to ensure the object gets an ID
+		await self.db.flush()
+		# Only commit if we're not in a transaction context
+		if not self._in_dal_transaction():
+			await self.db.commit()
+		# Always refresh to get the latest state
+		await self.db.refresh(new_obj)
+		return new_obj
+
+	async def update(self, item_id: str, update_data: dict):
+		"""Cập nhật một bản ghi"""
+		obj = await self.get_by_id(item_id)
+		if not obj:
+			return None
+		for key, value in update_data.items():
+			setattr(obj, key, value)
+		if not self._in_dal_transaction():
+			await self.db.commit()
+			await self.db.refresh(obj)
+		return obj
+
+	async def delete(self, item_id: str):
+		"""Xóa một bản ghi"""
+		obj = await self.get_by_id(item_id)
+		if obj:
+			await self.db.delete(obj)
+			if not self._in_dal_transaction():
+				await self.db.commit()
+			return True
+		return False
+
+	def _in_dal_transaction(self) -> bool:
+		return self.db.info.get(TRANSACTION_DEPTH_KEY, 0) > 0
+
+	async def begin_transaction(self):
+		"""Bắt đầu transaction"""
+		await self.db.begin()
+
+	async def commit(self):
+		"""Commit transaction"""
+		try:
+			await self.db.commit()
+		except Exception as e:
+			await self.rollback()
+			raise e
+
+	async def rollback(self):
+		"""Rollback transaction nếu có lỗi"""
+		await self.db.rollback()
+
+	@asynccontextmanager
+	async def transaction(self):
+		"""Async context manager để quản lý transaction (nested blocks commit with the outermost one)."""
+		depth = self.db.info.get(TRANSACTION_DEPTH_KEY, 0)
+		self.db.info[TRANSACTION_DEPTH_KEY] = depth + 1
+		try:
+			# Nếu chưa có transaction nào, thì bắt đầu
+			if not self.db.in_transaction():
+				await self.begin_transaction()
+
+			yield  # Chạy code trong `async with transaction()`
+
+			# Commit nếu không có lỗi
+			if depth == 0:
+				await self.commit()
+		except CustomHTTPException as ce:
+			await self.rollback()
+			raise ce
+		except Exception as e:
+			await self.rollback()
+			raise e
+		finally:
+			self.db.info[TRANSACTION_DEPTH_KEY] = depth
@@ -1,9 +1,11 @@
 """Base model"""
 
+import base64
+import json
 import uuid
 from datetime import datetime
 from enum import Enum
-from typing import Any, Generic, List, TypeVar
+from typing import Any, Generic, List, Literal, TypeVar
 
 from fastapi import Body
 from pydantic import BaseModel, ConfigDict, Field
@@ -66,6 +68,7 @@ class PagingInfo(BaseModel):
 	total_pages: int | None = Body(default=0, description='Tổng số trang', examples=[10])
 	page: int | None = Body(default=0, description='Trang hiện tại', examples=[1])
 	page_size: int | None = Body(default=0, description='Số lượng dữ liệu mỗi trang', examples=[10])
+	next_cursor: str | None = Body(default=None, description='Cursor của trang kế tiếp (chế độ cursor)', examples=[None])
 
 
 class PaginatedResponse(BaseModel, Generic[T]):
@@ -125,6 +128,14 @@ class FilterableRequestSchema(RequestSchema):
 	page: int | None = Field(default=1, ge=1, description='Page number')
 	page_size: int | None = Field(default=10, ge=1, description='Number of items per page')
 	filters: List[Filter] | None = Field(default=[], description='List of dynamic filters')
+	pagination_mode: Literal['offset', 'cursor'] | None = Field(default='offset', description='offset (page/page_size) or cursor (keyset) pagination')
+	cursor: str | None = Field(default=None, description='Opaque cursor from paging.next_cursor, implies cursor mode')
+	include_total: bool | None = Field(default=False, description='Also compute the total count in cursor mode')
+
+	@property
+	def use_cursor(self) -> bool:
+		"""Whether keyset pagination was requested"""
+		return self.pagination_mode == 'cursor' or bool(self.cursor)
 
 	def model_dump(self, **kwargs):
 		"""Override to include all dynamic fields in the output"""
@@ -137,21 +148,44 @@ class FilterableRequestSchema(RequestSchema):
 
 
 class Pagination(BaseModel, Generic[T]):
+	"""Page of results, either offset based (page) or keyset based (next_cursor)"""
+
 	model_config = ConfigDict(arbitrary_types_allowed=True)
 
 	items: List[T]
-	total_count: int
-	page: int
+	total_count: int | None
+	page: int | None
 	page_size: int
+	next_cursor: str | None = None
 
 	@property
-	def total_pages(self) -> int:
+	def total_pages(self) -> int | None:
+		if self.total_count is None:
+			return None
 		return (self.total_count + self.page_size - 1) // self.page_size
 
 	@property
 	def has_previous(self) -> bool:
-		return self.page > 1
+		return bool(self.page and self.page > 1)
 
 	@property
 	def has_next(self) -> bool:
+		if self.page is None:
+			return self.next_cursor is not None
 		return self.page < self.total_pages
+
+
+def encode_cursor(timestamp: datetime, item_id: str) -> str:
+	"""Encode a (timestamp, id) keyset position into an opaque cursor"""
+	raw = json.dumps([timestamp.isoformat() if timestamp else None, item_id])
+	return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple[datetime | None, str]:
+	"""Decode an opaque cursor, raising ValueError if it is malformed (the timestamp is None for a row without one)"""
+	try:
+		padded = cursor + '=' * (-len(cursor) % 4)
+		timestamp, item_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+		return (datetime.fromisoformat(timestamp) if timestamp is not None else None), str(item_id)
+	except Exception as e:
+		raise ValueError(f'Invalid cursor: {cursor}') from e
@@ -19,6 +19,14 @@ DB_HOST = os.getenv('DB_HOST', 'host.docker.internal')
 DB_PORT = os.getenv('DB_PORT', '3306')
 DB_NAME = os.getenv('DB_NAME', 'fproject_v2')
 DATABASE_URL = f'mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
+ASYNC_DATABASE_URL = f'mysql+aiomysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
+
+# Connection pool settings (applied to both the sync and the async engine)
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '10'))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '20'))
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))
+DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', '30'))
+DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true'
 SMTP_USERNAME = os.getenv('SMTP_USERNAME')
 SMTP_PASSWORD = os.getenv('SMTP_PASSWORD')
 
@@ -67,9 +75,80 @@ MINIO_ACCESS_KEY = os.getenv('MINIO_ACCESS_KEY', 'minioadmin')
 MINIO_SECRET_KEY = os.getenv('MINIO_SECRET_KEY', 'minioadmin')
 MINIO_BUCKET_NAME = os.getenv('MINIO_BUCKET_NAME', 'enterviu')
 MINIO_SECURE = False  # Using boolean instead of string
+# Streaming uploads: size of one multipart part (S3 minimum 5 MiB), the only part of an upload held in memory
+MINIO_UPLOAD_PART_SIZE = int(os.getenv('MINIO_UPLOAD_PART_SIZE', str(5 * 1024 * 1024)))
+FILE_UPLOAD_MAX_SIZE = int(os.getenv('FILE_UPLOAD_MAX_SIZE', str(50 * 1024 * 1024)))
+# Downloads are proxied from MinIO in chunks of this size, or redirected to a presigned URL when enabled
+FILE_DOWNLOAD_CHUNK_SIZE = int(os.getenv('FILE_DOWNLOAD_CHUNK_SIZE', str(256 * 1024)))
+FILE_DOWNLOAD_REDIRECT = os.getenv('FILE_DOWNLOAD_REDIRECT', 'False').lower() == 'true'
 
 CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', 'redis://redis:6379/0')
 CELERY_RESULT_BACKEND = os.getenv('CELERY_RESULT_BACKEND', 'redis://redis:6379/0')
+# Run tasks inline in the caller instead of a worker (tests, local development without a broker)
+CELERY_TASK_ALWAYS_EAGER = os.getenv('CELERY_TASK_ALWAYS_EAGER', 'False').lower() == 'true'
+
+# Background indexing of uploaded files (extract -> chunk -> embed -> upsert)
+FILE_INDEXING_MAX_RETRIES = int(os.getenv('FILE_INDEXING_MAX_RETRIES', '3'))
+FILE_INDEXING_RETRY_BACKOFF_SECONDS = int(os.getenv('FILE_INDEXING_RETRY_BACKOFF_SECONDS', '10'))
+FILE_INDEXING_CHUNK_SIZE = int(os.getenv('FILE_INDEXING_CHUNK_SIZE', '1000'))
+FILE_INDEXING_CHUNK_OVERLAP = int(os.getenv('FILE_INDEXING_CHUNK_OVERLAP', '150'))
+
+# Document text extraction runs in a process pool (0 workers: in a thread of the current process)
+EXTRACTION_MAX_WORKERS = int(os.getenv('EXTRACTION_MAX_WORKERS', '2'))
+EXTRACTION_TIMEOUT_SECONDS = float(os.getenv('EXTRACTION_TIMEOUT_SECONDS', '60'))
+EXTRACTION_MEMORY_LIMIT_MB = int(os.getenv('EXTRACTION_MEMORY_LIMIT_MB', '1024'))
+EXTRACTION_MAX_PDF_PAGES = int(os.getenv('EXTRACTION_MAX_PDF_PAGES', '500'))
+
+# Redis Settings
+REDIS_URL = os.getenv('REDIS_URL', CELERY_BROKER_URL.rsplit('/', 1)[0] + '/2')
+
+# WebSocket fan-out across uvicorn workers ('redis' or 'memory' for a single process)
+WEBSOCKET_PUBSUB_BACKEND = os.getenv('WEBSOCKET_PUBSUB_BACKEND', 'redis')
+WEBSOCKET_PUBSUB_CHANNEL = os.getenv('WEBSOCKET_PUBSUB_CHANNEL', 'enterviu:ws')
+
+# LangGraph conversation checkpoints (SQLAlchemy URL). Defaults to the app database, shared by every API replica:
+# a turn only sends the new message when the thread has a checkpoint, so a per-host store would miss turns served elsewhere
+CHECKPOINT_DATABASE_URL = os.getenv('CHECKPOINT_DATABASE_URL', DATABASE_URL)
+CHECKPOINT_MESSAGE_WINDOW = int(os.getenv('CHECKPOINT_MESSAGE_WINDOW', '40'))
+CHECKPOINT_TTL_SECONDS = int(os.getenv('CHECKPOINT_TTL_SECONDS', str(7 * 24 * 3600)))
+
+# Chat guardrails: latency budget per guardrail and what a timed out / failed check means ('open' allows, 'closed' blocks)
+GUARDRAIL_TIMEOUT_SECONDS = float(os.getenv('GUARDRAIL_TIMEOUT_SECONDS', '8'))
+GUARDRAIL_INPUT_FAIL_MODE = os.getenv('GUARDRAIL_INPUT_FAIL_MODE', 'closed')
+GUARDRAIL_OUTPUT_FAIL_MODE = os.getenv('GUARDRAIL_OUTPUT_FAIL_MODE', 'open')
+
+# n8n workflows: one pooled keep-alive client, per-endpoint circuit breakers open after N consecutive failures
+N8N_BASE_URL = os.getenv('N8N_BASE_URL', 'https://n8n.wc504.io.vn')
+N8N_MAX_CONNECTIONS = int(os.getenv('N8N_MAX_CONNECTIONS', '50'))
+N8N_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('N8N_CIRCUIT_FAILURE_THRESHOLD', '5'))
+N8N_CIRCUIT_RESET_SECONDS = float(os.getenv('N8N_CIRCUIT_RESET_SECONDS', '30'))
+# TLS certificate verification for every n8n call; set to false only for self-signed n8n deployments
+N8N_VERIFY_SSL = os.getenv('N8N_VERIFY_SSL', 'true').lower() == 'true'
+
+# Chat turn context (metadata, CV context, system prompt, recent history): conversations kept in memory and history length
+CONVERSATION_CONTEXT_CACHE_SIZE = int(os.getenv('CONVERSATION_CONTEXT_CACHE_SIZE', '1000'))
+CONVERSATION_CONTEXT_HISTORY_LIMIT = int(os.getenv('CONVERSATION_CONTEXT_HISTORY_LIMIT', '50'))
+
+# Chat turn persistence: 'transaction' writes each turn in one transaction before replying, 'write_behind' journals
+# the turn locally and writes it in the background (journaled turns are replayed on startup)
+CHAT_PERSISTENCE_MODE = os.getenv('CHAT_PERSISTENCE_MODE', 'transaction')
+CHAT_WRITE_BEHIND_JOURNAL_PATH = os.getenv('CHAT_WRITE_BEHIND_JOURNAL_PATH', './data/chat_write_behind.db')
+CHAT_WRITE_BEHIND_MAX_ATTEMPTS = int(os.getenv('CHAT_WRITE_BEHIND_MAX_ATTEMPTS', '5'))
+
+# Model input of a chat turn: token budget of system prompt + conversation summary + recent turns. Older messages are
+# folded into a rolling summary on the conversation, refreshed in the background once REFRESH_EVERY messages beyond the
+# KEEP_RECENT most recent ones are not summarized yet
+CHAT_CONTEXT_TOKEN_BUDGET = int(os.getenv('CHAT_CONTEXT_TOKEN_BUDGET', '12000'))
+CHAT_CONTEXT_SUMMARY_KEEP_RECENT = int(os.getenv('CHAT_CONTEXT_SUMMARY_KEEP_RECENT', '10'))
+CHAT_CONTEXT_SUMMARY_REFRESH_EVERY = int(os.getenv('CHAT_CONTEXT_SUMMARY_REFRESH_EVERY', '10'))
+CHAT_CONTEXT_SUMMARY_MAX_TOKENS = int(os.getenv('CHAT_CONTEXT_SUMMARY_MAX_TOKENS', '1024'))
+
+# CV analysis cache: results are keyed by content checksum + version; bump the version when the n8n CV workflow changes
+CV_ANALYSIS_VERSION = os.getenv('CV_ANALYSIS_VERSION', '1')
+
+# rag_search tool: latency budget of one call (collections not answered in time are skipped) and top-k cap
+RAG_SEARCH_TIMEOUT_SECONDS = float(os.getenv('RAG_SEARCH_TIMEOUT_SECONDS', '4'))
+RAG_SEARCH_MAX_TOP_K = int(os.getenv('RAG_SEARCH_MAX_TOP_K', '10'))
 
 
 CONTEXT_PRICE_PER_MILLION = 0.0004
@@ -83,6 +162,14 @@ class Settings(BaseModel):
 	API_V2_STR: str = API_V2_STR
 	DATABASE_URL: str = DATABASE_URL
 	SQLALCHEMY_DATABASE_URI: str = SQLALCHEMY_DATABASE_URI
+	ASYNC_DATABASE_URL: str = ASYNC_DATABASE_URL
+
+	# Database pool settings
+	DB_POOL_SIZE: int = DB_POOL_SIZE
+	DB_MAX_OVERFLOW: int = DB_MAX_OVERFLOW
+	DB_POOL_RECYCLE: int = DB_POOL_RECYCLE
+	DB_POOL_TIMEOUT: int = DB_POOL_TIMEOUT
+	DB_POOL_PRE_PING: bool = DB_POOL_PRE_PING
 
 	# JWT Settings
 	SECRET_KEY: str = SECRET_KEY
@@ -101,8 +188,59 @@ class Settings(BaseModel):
 	MINIO_SECRET_KEY: str = MINIO_SECRET_KEY
 	MINIO_BUCKET_NAME: str = MINIO_BUCKET_NAME
 	MINIO_SECURE: bool = MINIO_SECURE
+	MINIO_UPLOAD_PART_SIZE: int = MINIO_UPLOAD_PART_SIZE
+	FILE_UPLOAD_MAX_SIZE: int = FILE_UPLOAD_MAX_SIZE
+	FILE_DOWNLOAD_CHUNK_SIZE: int = FILE_DOWNLOAD_CHUNK_SIZE
+	FILE_DOWNLOAD_REDIRECT: bool = FILE_DOWNLOAD_REDIRECT
 	CELERY_BROKER_URL: str = CELERY_BROKER_URL
 	CELERY_RESULT_BACKEND: str = CELERY_RESULT_BACKEND
+	CELERY_TASK_ALWAYS_EAGER: bool = CELERY_TASK_ALWAYS_EAGER
+
+	# File Indexing Settings
+	FILE_INDEXING_MAX_RETRIES: int = FILE_INDEXING_MAX_RETRIES
+	FILE_INDEXING_RETRY_BACKOFF_SECONDS: int = FILE_INDEXING_RETRY_BACKOFF_SECONDS
+	FILE_INDEXING_CHUNK_SIZE: int = FILE_INDEXING_CHUNK_SIZE
+	FILE_INDEXING_CHUNK_OVERLAP: int = FILE_INDEXING_CHUNK_OVERLAP
+	EXTRACTION_MAX_WORKERS: int = EXTRACTION_MAX_WORKERS
+	EXTRACTION_TIMEOUT_SECONDS: float = EXTRACTION_TIMEOUT_SECONDS
+	EXTRACTION_MEMORY_LIMIT_MB: int = EXTRACTION_MEMORY_LIMIT_MB
+	EXTRACTION_MAX_PDF_PAGES: int = EXTRACTION_MAX_PDF_PAGES
+
+	# Redis Settings
+	REDIS_URL: str = REDIS_URL
+
+	# WebSocket Settings
+	WEBSOCKET_PUBSUB_BACKEND: str = WEBSOCKET_PUBSUB_BACKEND
+	WEBSOCKET_PUBSUB_CHANNEL: str = WEBSOCKET_PUBSUB_CHANNEL
+
+	# LangGraph Checkpoint Settings
+	CHECKPOINT_DATABASE_URL: str = CHECKPOINT_DATABASE_URL
+	CHECKPOINT_MESSAGE_WINDOW: int = CHECKPOINT_MESSAGE_WINDOW
+	CHECKPOINT_TTL_SECONDS: int = CHECKPOINT_TTL_SECONDS
+
+	# Guardrail Settings
+	GUARDRAIL_TIMEOUT_SECONDS: float = GUARDRAIL_TIMEOUT_SECONDS
+	GUARDRAIL_INPUT_FAIL_MODE: str = GUARDRAIL_INPUT_FAIL_MODE
+	GUARDRAIL_OUTPUT_FAIL_MODE: str = GUARDRAIL_OUTPUT_FAIL_MODE
+
+	# RAG Search Tool Settings
+	RAG_SEARCH_TIMEOUT_SECONDS: float = RAG_SEARCH_TIMEOUT_SECONDS
+	RAG_SEARCH_MAX_TOP_K: int = RAG_SEARCH_MAX_TOP_K
+	N8N_BASE_URL: str = N8N_BASE_URL
+	N8N_MAX_CONNECTIONS: int = N8N_MAX_CONNECTIONS
+	N8N_CIRCUIT_FAILURE_THRESHOLD: int = N8N_CIRCUIT_FAILURE_THRESHOLD
+	N8N_CIRCUIT_RESET_SECONDS: float = N8N_CIRCUIT_RESET_SECONDS
+	N8N_VERIFY_SSL: bool = N8N_VERIFY_SSL
+	CV_ANALYSIS_VERSION: str = CV_ANALYSIS_VERSION
+	CONVERSATION_CONTEXT_CACHE_SIZE: int = CONVERSATION_CONTEXT_CACHE_SIZE
+	CONVERSATION_CONTEXT_HISTORY_LIMIT: int = CONVERSATION_CONTEXT_HISTORY_LIMIT
+	CHAT_PERSISTENCE_MODE: str = CHAT_PERSISTENCE_MODE
+	CHAT_WRITE_BEHIND_JOURNAL_PATH: str = CHAT_WRITE_BEHIND_JOURNAL_PATH
+	CHAT_WRITE_BEHIND_MAX_ATTEMPTS: int = CHAT_WRITE_BEHIND_MAX_ATTEMPTS
+	CHAT_CONTEXT_TOKEN_BUDGET: int = CHAT_CONTEXT_TOKEN_BUDGET
+	CHAT_CONTEXT_SUMMARY_KEEP_RECENT: int = CHAT_CONTEXT_SUMMARY_KEEP_RECENT
+	CHAT_CONTEXT_SUMMARY_REFRESH_EVERY: int = CHAT_CONTEXT_SUMMARY_REFRESH_EVERY
+	CHAT_CONTEXT_SUMMARY_MAX_TOKENS: int = CHAT_CONTEXT_SUMMARY_MAX_TOKENS
 
 	# Facebook Graph API Settings
 	FACEBOOK_ACCESS_TOKEN: str = FACEBOOK_ACCESS_TOKEN
@@ -1,12 +1,33 @@
+import logging
+
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
-from app.core.config import DATABASE_URL
+from app.core.config import (
+	ASYNC_DATABASE_URL,
+	DATABASE_URL,
+	DB_MAX_OVERFLOW,
+	DB_POOL_PRE_PING,
+	DB_POOL_RECYCLE,
+	DB_POOL_SIZE,
+	DB_POOL_TIMEOUT,
+)
+
+logger = logging.getLogger(__name__)
 
 # SQL Database setup
 
-engine = create_engine(DATABASE_URL)
+POOL_OPTIONS = {
+	'pool_size': DB_POOL_SIZE,
+	'max_overflow': DB_MAX_OVERFLOW,
+	'pool_recycle': DB_POOL_RECYCLE,
+	'pool_timeout': DB_POOL_TIMEOUT,
+	'pool_pre_ping': DB_POOL_PRE_PING,
+}
+
+engine = create_engine(DATABASE_URL, **POOL_OPTIONS)
 
 SessionLocal = sessionmaker(
 	bind=engine,
@@ -14,6 +35,16 @@ SessionLocal = sessionmaker(
 	autoflush=False,
 )
 
+# Async engine for code running on the event loop (routes, websockets)
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **POOL_OPTIONS)
+
+AsyncSessionLocal = async_sessionmaker(
+	bind=async_engine,
+	class_=AsyncSession,
+	autoflush=False,
+	expire_on_commit=False,  # Objects stay readable after commit without a lazy reload
+)
+
 Base = declarative_base()
 
 
@@ -28,3 +59,14 @@ def get_db():
 		raise  # Quan trọng: Raise lại lỗi để FastAPI xử lý đúng
 	finally:
 		db.close()
+
+
+async def get_async_db():
+	"""get_async_db"""
+	async with AsyncSessionLocal() as db:
+		try:
+			yield db
+		except Exception as e:
+			await db.rollback()  # Rollback nếu có lỗi
+			logger.error(f'Async database session error: {e}')
+			raise
@@ -30,6 +30,9 @@ celery_app.conf.update(
 	# Task time limits to prevent hanging tasks
 	task_time_limit=24 * 60 * 60,  # 24 hours (comment corrected)
 	task_soft_time_limit=24 * 60 * 60,  # 24 hours (comment corrected)
+	# Eager mode: tasks run inline in the caller (tests, no broker)
+	task_always_eager=settings.CELERY_TASK_ALWAYS_EAGER,
+	task_eager_propagates=settings.CELERY_TASK_ALWAYS_EAGER,
 )
 
 if __name__ == '__main__':
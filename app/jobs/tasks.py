@@ -1,4 +1,3 @@
-import asyncio
 import json
 import logging
 import os
@@ -8,11 +7,13 @@ from celery import Task, schedules
 from celery.schedules import crontab
 from pytz import timezone
 
+from app.core.config import FILE_INDEXING_MAX_RETRIES, FILE_INDEXING_RETRY_BACKOFF_SECONDS
 from app.core.database import SessionLocal
 from app.enums.meeting_enums import TokenOperationTypeEnum
 from app.jobs.celery_worker import celery_app  # Import celery app directly
 from app.modules.users.dal.user_logs_dal import UserLogDAL
 from app.utils.agent_open_ai_api import AgentMicroService
+from app.utils.n8n_api_client import run_async
 from app.modules.subscription.jobs.check_orders import check_pending_orders
 
 logger = logging.getLogger(__name__)
@@ -61,3 +62,55 @@ def check_subscription_orders(self):
     except Exception as e:
         logger.error(f"Error in check_subscription_orders task: {str(e)}", exc_info=True)
         return f"Error checking pending orders: {str(e)}"
+
+
+@celery_app.task(bind=True, base=CallbackTask, max_retries=FILE_INDEXING_MAX_RETRIES, acks_late=True)
+def index_uploaded_file(self, file_id: str, conversation_id: str):
+	"""Index an uploaded file into its conversation collection (extract -> chunk -> embed -> upsert)
+
+	Transient failures are retried with exponential backoff; permanent ones and exhausted retries
+	are recorded on the file (is_indexed=False, indexing_error).
+	"""
+	from app.modules.agent.jobs.file_indexing import FileIndexingError, index_file, mark_indexing_failed
+
+	def on_progress(stage, meta):
+		# Eager mode has no task state to update
+		if not self.request.called_directly and not self.request.is_eager:
+			self.update_state(state='PROGRESS', meta={'stage': stage, **meta})
+
+	db = SessionLocal()
+	try:
+		return run_async(index_file(db, file_id, conversation_id, on_progress=on_progress))
+	except FileIndexingError as e:
+		logger.warning(f'[index_uploaded_file] File {file_id} cannot be indexed: {e}')
+		return {'file_id': file_id, 'status': 'failed', 'error': str(e)}
+	except Exception as e:
+		db.rollback()
+		if self.request.retries < self.max_retries:
+			countdown = FILE_INDEXING_RETRY_BACKOFF_SECONDS * 2**self.request.retries
+			logger.warning(f'[index_uploaded_file] File {file_id} failed (attempt {self.request.retries + 1}), retrying in {countdown}s: {e}')
+			raise self.retry(exc=e, countdown=countdown)
+		logger.error(f'[index_uploaded_file] File {file_id} failed after {self.request.retries + 1} attempts: {e}', exc_info=True)
+		mark_indexing_failed(db, file_id, str(e))
+		raise
+	finally:
+		db.close()
+
+
+@celery_app.task(bind=True, base=CallbackTask, acks_late=True)
+def refresh_conversation_summary(self, conversation_id: str):
+	"""Fold the messages added since the previous refresh into the conversation's rolling summary
+
+	Best effort: a failed refresh is requested again by the chat after CHAT_CONTEXT_SUMMARY_REFRESH_EVERY more messages.
+	"""
+	from app.modules.chat.services.conversation_summary_service import refresh_summary
+
+	db = SessionLocal()
+	try:
+		return run_async(refresh_summary(db, conversation_id))
+	except Exception as e:
+		db.rollback()
+		logger.error(f'[refresh_conversation_summary] Conversation {conversation_id} failed: {e}', exc_info=True)
+		return {'conversation_id': conversation_id, 'status': 'failed', 'error': str(e)}
+	finally:
+		db.close()
@@ -1,5 +1,5 @@
 """
-File indexing events - Handle real-time file indexing when files are uploaded
+File indexing events - Queue background indexing when files are uploaded
 """
 
 import logging
@@ -10,9 +10,6 @@ from sqlalchemy.orm import Session
 from app.modules.agent.services.file_indexing_service import (
 	ConversationFileIndexingService,
 )
-from app.modules.agentic_rag.repository.kb_repo import KBRepository
-from app.modules.chat.repository.file_repo import FileRepo
-from app.modules.chat.models.file import File
 
 logger = logging.getLogger(__name__)
 
@@ -23,7 +20,6 @@ class FileIndexingEventHandler:
 	def __init__(self, db: Session):
 		self.db = db
 		self.file_indexing_service = ConversationFileIndexingService(db)
-		self.file_repo = FileRepo(db)
 
 	def _get_conversation_collection_id(self, conversation_id: str) -> str:
 		"""Generate collection ID cho conversation"""
@@ -31,7 +27,7 @@ class FileIndexingEventHandler:
 
 	async def handle_file_uploaded(self, file_id: str, conversation_id: str, user_id: str) -> Dict[str, Any]:
 		"""
-		Handle event khi có file được upload - index vào Agentic RAG KBRepository
+		Handle event khi có file được upload - đưa file vào background indexing pipeline
 
 		Args:
 		    file_id: ID của file vừa upload
@@ -39,83 +35,14 @@ class FileIndexingEventHandler:
 		    user_id: ID của user
 
 		Returns:
-		    Dict chứa kết quả indexing
+		    Dict chứa task ID của indexing job
 		"""
-		try:
-			# Get file data cho indexing
-			try:
-				file_content = await self.file_repo.get_file_content(file_id, user_id)
-				file = self.file_repo.get_file_by_id(file_id, user_id)
-
-				files_data = [
-					{
-						'file_id': file.id,
-						'file_name': file.original_name,
-						'file_type': file.type,
-						'file_content': file_content,
-					}
-				]
-
-			except Exception as e:
-				logger.error(f'\033[91m[FileIndexingEventHandler] Error preparing file data: {str(e)}\033[0m')
-				return {
-					'success': False,
-					'error': f'Failed to prepare file data: {str(e)}',
-					'file_id': file_id,
-				}
-
-			# Index file vào Agentic RAG KBRepository
-			try:
-				# Get collection ID for conversation
-				collection_id = self._get_conversation_collection_id(conversation_id)
-
-				# Index vào Agentic RAG via file indexing service
-				result = await self.file_indexing_service.index_conversation_files(conversation_id, files_data)
-
-				# Mark file as indexed
-				if result['successful_file_ids']:
-					self.file_repo.bulk_mark_files_as_indexed(result['successful_file_ids'], success=True)
-
-				# Mark failed files
-				if result['failed_file_details']:
-					failed_file_ids = [f['file_id'] for f in result['failed_file_details']]
-					for failed_id in failed_file_ids:
-						error_msg = next(
-							(f['error'] for f in result['failed_file_details'] if f['file_id'] == failed_id),
-							'Unknown error',
-						)
-						self.file_repo.mark_file_as_indexed(failed_id, success=False, error_message=error_msg)
-
-				return {
-					'success': True,
-					'result': result,
-					'file_id': file_id,
-					'conversation_id': conversation_id,
-					'indexing_method': 'agentic_rag',
-				}
-
-			except Exception as e:
-				logger.error(f'\033[91m[FileIndexingEventHandler] Error indexing file via Agentic RAG: {str(e)}\033[0m')
-				# Mark file as failed indexing
-				self.file_repo.mark_file_as_indexed(file_id, success=False, error_message=str(e))
-
-				return {
-					'success': False,
-					'error': f'Agentic RAG indexing failed: {str(e)}',
-					'file_id': file_id,
-				}
-
-		except Exception as e:
-			logger.error(f'\033[91m[FileIndexingEventHandler] Error handling file upload event: {str(e)}\033[0m')
-			return {
-				'success': False,
-				'error': f'Event handling failed: {str(e)}',
-				'file_id': file_id,
-			}
+		return await self.handle_multiple_files_uploaded([file_id], conversation_id, user_id)
 
 	async def handle_multiple_files_uploaded(self, file_ids: List[str], conversation_id: str, user_id: str) -> Dict[str, Any]:
 		"""
-		Handle event khi có nhiều files được upload cùng lúc - index vào Agentic RAG
+		Handle event khi có nhiều files được upload cùng lúc - mỗi file là một Celery task
+		(extract -> chunk -> embed -> upsert) chạy song song trên worker, upload không chờ indexing
 
 		Args:
 		    file_ids: List IDs của files vừa upload
@@ -123,87 +50,34 @@ class FileIndexingEventHandler:
 		    user_id: ID của user
 
 		Returns:
-		    Dict chứa kết quả indexing tổng hợp
+		    Dict chứa task IDs theo file
 		"""
-		try:
-			# Prepare all files data
-			files_data = []
-			failed_files = []
-
-			for file_id in file_ids:
-				try:
-					file_content = await self.file_repo.get_file_content(file_id, user_id)
-					file = self.file_repo.get_file_by_id(file_id, user_id)
-
-					file_data = {
-						'file_id': file.id,
-						'file_name': file.original_name,
-						'file_type': file.type,
-						'file_content': file_content,
-					}
-					files_data.append(file_data)
-
-				except Exception as e:
-					logger.error(f'\033[91m[FileIndexingEventHandler] Error preparing file {file_id}: {str(e)}\033[0m')
-					failed_files.append({'file_id': file_id, 'error': str(e)})
-
-			if not files_data:
-				logger.warning(f'\033[93m[FileIndexingEventHandler] No files to index via Agentic RAG\033[0m')
-				return {
-					'success': False,
-					'error': 'No files could be prepared for Agentic RAG indexing',
-					'failed_files': failed_files,
-				}
-
-			# Index all files at once via Agentic RAG
-			try:
-				# Get collection ID for conversation
-				collection_id = self._get_conversation_collection_id(conversation_id)
-
-				# Index vào Agentic RAG service
-				result = await self.file_indexing_service.index_conversation_files(conversation_id, files_data)
-
-				# Mark files as indexed
-				if result['successful_file_ids']:
-					self.file_repo.bulk_mark_files_as_indexed(result['successful_file_ids'], success=True)
-
-				# Mark failed files
-				if result['failed_file_details']:
-					for failed_detail in result['failed_file_details']:
-						self.file_repo.mark_file_as_indexed(
-							failed_detail['file_id'],
-							success=False,
-							error_message=failed_detail['error'],
-						)
-
-				return {
-					'success': True,
-					'result': result,
-					'file_ids': file_ids,
-					'conversation_id': conversation_id,
-					'preparation_failed': failed_files,
-					'indexing_method': 'agentic_rag',
-				}
-
-			except Exception as e:
-				logger.error(f'\033[91m[FileIndexingEventHandler] Error in Agentic RAG batch indexing: {str(e)}\033[0m')
-				# Mark all files as failed
-				for file_id in file_ids:
-					self.file_repo.mark_file_as_indexed(file_id, success=False, error_message=str(e))
-
-				return {
-					'success': False,
-					'error': f'Agentic RAG batch indexing failed: {str(e)}',
-					'file_ids': file_ids,
-				}
-
-		except Exception as e:
-			logger.error(f'\033[91m[FileIndexingEventHandler] Error handling multiple files upload event: {str(e)}\033[0m')
-			return {
-				'success': False,
-				'error': f'Event handling failed: {str(e)}',
-				'file_ids': file_ids,
-			}
+		from app.jobs.tasks import index_uploaded_file
+
+		def enqueue(file_id: str):
+			# Publish tới broker là network I/O (eager mode: chạy luôn task), không chạy trên event loop
+			return index_uploaded_file.apply_async(args=[file_id, conversation_id])
+
+		results = await asyncio.gather(*(asyncio.to_thread(enqueue, file_id) for file_id in file_ids), return_exceptions=True)
+
+		task_ids = {}
+		failed_files = []
+		for file_id, result in zip(file_ids, results):
+			if isinstance(result, BaseException):
+				logger.error(f'\033[91m[FileIndexingEventHandler] Error enqueuing indexing of file {file_id}: {str(result)}\033[0m')
+				failed_files.append({'file_id': file_id, 'error': str(result)})
+			else:
+				task_ids[file_id] = result.id
+
+		return {
+			'success': not failed_files,
+			'task_ids': task_ids,
+			'file_ids': file_ids,
+			'conversation_id': conversation_id,
+			'failed_files': failed_files,
+			'error': '; '.join(f['error'] for f in failed_files) if failed_files else None,
+			'indexing_method': 'agentic_rag_background',
+		}
 
 	def get_conversation_collection_stats(self, conversation_id: str) -> Dict[str, Any]:
 		"""Get statistics của conversation collection từ Agentic RAG"""
@@ -0,0 +1,135 @@
+"""
+Background indexing pipeline for uploaded conversation files
+
+extract -> chunk -> embed + upsert, run by the `index_uploaded_file` Celery task. Re-running the
+pipeline for a file is safe: indexed files are skipped, a file whose content (checksum) is already
+indexed in the conversation is not embedded again, and point ids are derived from the file id so a
+retried upsert overwrites instead of duplicating.
+"""
+
+import logging
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+from pytz import timezone
+from sqlalchemy.orm import Session
+
+from app.core.config import FILE_INDEXING_CHUNK_OVERLAP, FILE_INDEXING_CHUNK_SIZE
+from app.modules.chat.dal.file_dal import FileDAL
+from app.modules.chat.services.file_content_service import FileContentService
+from app.modules.chat.services.file_extraction_service import file_extraction_service
+from app.modules.chat.services.file_service import file_service
+
+logger = logging.getLogger(__name__)
+
+# Namespace of the deterministic Qdrant point ids of file chunks
+FILE_CHUNK_NAMESPACE = uuid.UUID('7b0b6c3e-4f3a-4d59-9a43-0f1f8c7f2d11')
+
+ProgressCallback = Callable[[str, Dict[str, Any]], None]
+
+
+class FileIndexingError(Exception):
+	"""Permanent indexing failure (missing file, nothing extractable): retrying will not help"""
+
+
+def get_conversation_collection_id(conversation_id: str) -> str:
+	return f'conversation_{conversation_id}'
+
+
+def chunk_point_id(file_id: str, chunk_index: int) -> str:
+	return str(uuid.uuid5(FILE_CHUNK_NAMESPACE, f'{file_id}:{chunk_index}'))
+
+
+def split_into_chunks(text: str) -> List[str]:
+	splitter = RecursiveCharacterTextSplitter(chunk_size=FILE_INDEXING_CHUNK_SIZE, chunk_overlap=FILE_INDEXING_CHUNK_OVERLAP)
+	return [chunk for chunk in splitter.split_text(text) if chunk.strip()]
+
+
+async def index_file(db: Session, file_id: str, conversation_id: str, on_progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+	"""Index one uploaded file into the conversation collection and record the result on File.is_indexed
+
+	Raises:
+	    FileIndexingError: permanent failure, already recorded on the file
+	    Exception: transient failure (storage, embedding API, Qdrant), the caller retries
+	"""
+	from app.modules.agentic_rag.repository.kb_repo import KBRepository
+	from app.modules.agentic_rag.schemas.kb_schema import AddDocumentsRequest, DocumentModel
+
+	def progress(stage: str, **meta):
+		logger.info(f'[index_file] File {file_id}: {stage} {meta or ""}')
+		if on_progress:
+			on_progress(stage, {'file_id': file_id, **meta})
+
+	file_dal = FileDAL(db)
+	file = file_dal.get_by_id(file_id)
+	if not file or file.is_deleted:
+		raise FileIndexingError(f'File {file_id} not found')
+
+	if file.is_indexed:
+		progress('skipped', reason='already_indexed')
+		return {'file_id': file_id, 'status': 'skipped', 'reason': 'already_indexed'}
+
+	# Same content already indexed in this conversation: its chunks are already searchable
+	if file.checksum:
+		duplicate = file_dal.get_indexed_file_by_checksum(file.checksum, conversation_id, exclude_file_id=file_id)
+		if duplicate:
+			file_dal.mark_file_as_indexed(file_id, success=True)
+			progress('skipped', reason='duplicate', duplicate_of=duplicate.id)
+			return {'file_id': file_id, 'status': 'skipped', 'reason': 'duplicate', 'duplicate_of': duplicate.id}
+
+	content_service = FileContentService(db)
+	try:
+		# Extract (text of bytes the user already uploaded elsewhere is reused)
+		text = content_service.get_extracted_text(file.user_id, file.checksum)
+		if text:
+			progress('extracted', reused=True)
+		else:
+			progress('extracting')
+			file_content = await file_service.get_file_content(file.file_path)
+			extraction_result = await file_extraction_service.aextract_text_from_file(file_content=file_content, file_type=file.type, file_name=file.original_name)
+			if not extraction_result['extraction_success'] or not extraction_result['content'].strip():
+				raise FileIndexingError(extraction_result.get('extraction_error') or 'No content extracted')
+			text = extraction_result['content']
+			content_service.save_extracted_text(file.user_id, file.checksum, text)
+
+		# Chunk (same text -> same chunks, whose embeddings come from the embedding cache)
+		chunks = split_into_chunks(text)
+		progress('chunked', chunks=len(chunks))
+	except FileIndexingError as e:
+		file_dal.mark_file_as_indexed(file_id, success=False, error_message=str(e)[:1000])
+		raise
+
+	# Embed + upsert (batched by KBRepository, embeddings served from the cache when already seen)
+	indexed_at = datetime.now(timezone('Asia/Ho_Chi_Minh')).isoformat()
+	documents = [
+		DocumentModel(
+			id=chunk_point_id(file_id, index),
+			content=chunk,
+			metadata={
+				'file_id': file_id,
+				'file_name': file.original_name,
+				'file_type': file.type,
+				'conversation_id': conversation_id,
+				'checksum': file.checksum,
+				'chunk_index': index,
+				'chunk_count': len(chunks),
+				'indexed_at': indexed_at,
+				'char_count': len(chunk),
+				'original_file_id': file_id,
+			},
+		)
+		for index, chunk in enumerate(chunks)
+	]
+	progress('embedding', chunks=len(documents))
+	await KBRepository().add_documents(AddDocumentsRequest(documents=documents), collection_id=get_conversation_collection_id(conversation_id))
+
+	file_dal.mark_file_as_indexed(file_id, success=True)
+	progress('indexed', chunks=len(documents))
+	return {'file_id': file_id, 'status': 'indexed', 'chunks': len(documents), 'conversation_id': conversation_id}
+
+
+def mark_indexing_failed(db: Session, file_id: str, error: str):
+	"""Record a failure that exhausted its retries"""
+	FileDAL(db).mark_file_as_indexed(file_id, success=False, error_message=error[:1000])
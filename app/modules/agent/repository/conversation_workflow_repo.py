@@ -5,7 +5,7 @@ from app.modules.agent.repository.system_agent_repo import SystemAgentRepo
 from app.modules.agent.services.langgraph_service import LangGraphService
 from app.exceptions.exception import ValidationException
 from app.middleware.translation_manager import _
-from typing import Dict, Any, List
+from typing import Dict, Any, List, AsyncGenerator
 import logging
 
 logger = logging.getLogger(__name__)
@@ -34,6 +34,8 @@ class ConversationWorkflowRepo:
 		conversation_history: List[Dict[str, Any]] = None,
 		authorization_token: str = None,
 		user_id: str = None,
+		conversation_summary: str = None,
+		unsummarized_message_count: int = None,
 	) -> Dict[str, Any]:
 		"""Execute optimized chat workflow using cached services"""
 		logger.info(f'execute_chat_workflow - Starting for conversation: {conversation_id}')
@@ -57,6 +59,8 @@ class ConversationWorkflowRepo:
 				conversation_history=conversation_history or [],
 				authorization_token=authorization_token,
 				user_id=user_id,
+				conversation_summary=conversation_summary,
+				unsummarized_message_count=unsummarized_message_count,
 			)
 
 			logger.info('Chat workflow executed successfully')
@@ -66,6 +70,45 @@ class ConversationWorkflowRepo:
 			logger.error(f'ERROR execute_chat_workflow - Error: {str(e)}')
 			raise ValidationException(f'{_("chat_execution_failed")}: {str(e)}')
 
+	async def execute_streaming_chat_workflow(
+		self,
+		conversation_id: str,
+		user_message: str,
+		conversation_system_prompt: str = None,
+		conversation_history: List[Dict[str, Any]] = None,
+		authorization_token: str = None,
+		user_id: str = None,
+		conversation_summary: str = None,
+		unsummarized_message_count: int = None,
+	) -> AsyncGenerator[Dict[str, Any], None]:
+		"""Execute chat workflow yielding content deltas, an optional replace chunk and a final chunk"""
+		logger.info(f'execute_streaming_chat_workflow - Starting for conversation: {conversation_id}')
+
+		try:
+			agent = ConversationWorkflowRepo._system_agent_repo.get_system_agent()
+
+			combined_system_prompt = self._combine_system_prompts(
+				agent_prompt=agent.default_system_prompt,
+				conversation_prompt=conversation_system_prompt,
+			)
+
+			async for chunk in ConversationWorkflowRepo._langgraph_service.stream_conversation(
+				agent=agent,
+				conversation_id=conversation_id,
+				user_message=user_message,
+				conversation_system_prompt=combined_system_prompt,
+				conversation_history=conversation_history or [],
+				authorization_token=authorization_token,
+				user_id=user_id,
+				conversation_summary=conversation_summary,
+				unsummarized_message_count=unsummarized_message_count,
+			):
+				yield chunk
+
+		except Exception as e:
+			logger.error(f'ERROR execute_streaming_chat_workflow - Error: {str(e)}')
+			raise ValidationException(f'{_("chat_execution_failed")}: {str(e)}')
+
 	def _combine_system_prompts(self, agent_prompt: str = None, conversation_prompt: str = None) -> str:
 		"""Combine agent system prompt with conversation system prompt"""
 		prompts = []
@@ -64,7 +64,7 @@ class ConversationFileIndexingService:
 			for file_data in files_data:
 				try:
 					# Extract text từ file
-					extraction_result = file_extraction_service.extract_text_from_file(
+					extraction_result = await file_extraction_service.aextract_text_from_file(
 						file_content=file_data['file_content'],
 						file_type=file_data['file_type'],
 						file_name=file_data['file_name'],
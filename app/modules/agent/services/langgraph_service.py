@@ -25,6 +25,9 @@ from app.modules.agent.workflows.chat_workflow.config.workflow_config import (
 
 logger = logging.getLogger(__name__)
 
+# Graph nodes whose model output is forwarded to the client token by token
+STREAMED_NODES = ("agent_with_tools",)
+
 
 class LangGraphService(object):
     """Optimized LangGraph service with Agentic RAG integration via KBRepository"""
@@ -153,6 +156,53 @@ class LangGraphService(object):
 
         return messages
 
+    async def _prepare_turn_messages(
+        self,
+        config: Dict[str, Any],
+        user_message: str,
+        conversation_history: Optional[List[Dict[str, Any]]],
+    ) -> List:
+        """Build the workflow input for one turn
+
+        The thread checkpoint already holds the earlier turns, so normally only the new
+        user message is sent. The DB history seeds the thread when there is no checkpoint
+        yet (first turn, evicted by TTL, or a fresh checkpoint store). This relies on every
+        instance reading the same store (CHECKPOINT_DATABASE_URL defaults to the app database).
+        The system prompt travels in the run config and is never part of the input.
+        """
+        try:
+            snapshot = await LangGraphService._global_workflow.aget_state(config)
+            has_checkpoint = bool(snapshot.values.get("messages"))
+        except Exception as e:
+            logger.warning(
+                f"[_prepare_turn_messages] Could not read checkpoint, seeding from history: {e}"
+            )
+            has_checkpoint = False
+
+        if has_checkpoint:
+            return self._prepare_messages(None, user_message, [])
+
+        history = list(conversation_history or [])
+        # Routes store the user message before loading history, don't send it twice
+        if (
+            history
+            and history[-1].get("role") == "user"
+            and history[-1].get("content") == user_message
+        ):
+            history = history[:-1]
+
+        return self._prepare_messages(None, user_message, history)
+
+    def get_conversation_memory_stats(
+        self, conversation_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """Checkpoint size of a conversation (messages kept, bytes stored, last update)"""
+        from app.modules.agent.workflows.chat_workflow.workflow.checkpointer import (
+            get_checkpointer,
+        )
+
+        return get_checkpointer().get_thread_stats(conversation_id)
+
     async def execute_conversation(
         self,
         agent: Agent,
@@ -162,6 +212,8 @@ class LangGraphService(object):
         conversation_history: List[Dict[str, Any]] = None,
         authorization_token: str = None,
         user_id: str = None,
+        conversation_summary: Optional[str] = None,
+        unsummarized_message_count: Optional[int] = None,
     ) -> Dict[str, Any]:
         """Execute conversation using basic workflow with Agentic RAG"""
         start_time = time.time()
@@ -176,32 +228,20 @@ class LangGraphService(object):
             # Prepare system prompt
             system_prompt = conversation_system_prompt or agent.default_system_prompt
 
-            # Prepare messages
-            messages = self._prepare_messages(
-                system_prompt, user_message, conversation_history or []
-            )
-
             # Execute workflow - use ainvoke instead of astream to avoid __end__ issues
-            config = {
-                "configurable": {
-                    "thread_id": conversation_id,
-                    "conversation_id": conversation_id,
-                    "user_id": user_id,  # Add for WebSocket delivery
-                    "system_prompt": system_prompt,
-                }
-            }
+            config = self._build_run_config(
+                conversation_id,
+                user_id,
+                system_prompt,
+                authorization_token,
+                conversation_summary,
+                unsummarized_message_count,
+            )
 
-            # Add authorization token if provided
-            if authorization_token:
-                config["configurable"]["authorization_token"] = authorization_token
-                logger.info(
-                    f"[execute_conversation] Authorization token added to config: {authorization_token[:20] if authorization_token else None}..."
-                )
-                logger.info(
-                    f"[execute_conversation] conversation_id: {conversation_id}"
-                )
-            else:
-                logger.warning("[execute_conversation] No authorization token provided")
+            # Prepare messages (only the new one when the checkpoint has the history)
+            messages = await self._prepare_turn_messages(
+                config, user_message, conversation_history
+            )
 
             workflow_input = {"messages": messages}
 
@@ -238,6 +278,152 @@ class LangGraphService(object):
             print(f"[LangGraphService] Exception occurred: {str(e)}")
             raise ValidationException(f"Conversation execution failed: {str(e)}")
 
+    async def stream_conversation(
+        self,
+        agent: Agent,
+        conversation_id: str,
+        user_message: str,
+        conversation_system_prompt: str = None,
+        conversation_history: List[Dict[str, Any]] = None,
+        authorization_token: str = None,
+        user_id: str = None,
+        conversation_summary: Optional[str] = None,
+        unsummarized_message_count: Optional[int] = None,
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Stream conversation as content deltas followed by a single final chunk
+
+        Yields ``{"type": "content", "content": str}`` for every token produced by the
+        answering model and ends with ``{"type": "final", ...}`` carrying the full
+        response (taken from the final graph state), model and usage.
+
+        Deltas are sent before the output guardrails run. When the final response is not
+        the streamed text (tool result, rewritten or flagged output), a
+        ``{"type": "replace", "content": str, "response_safe": bool}`` chunk precedes the
+        final one so the client can retract what it already showed.
+        """
+        start_time = time.time()
+
+        try:
+            system_prompt = conversation_system_prompt or agent.default_system_prompt
+            config = self._build_run_config(
+                conversation_id,
+                user_id,
+                system_prompt,
+                authorization_token,
+                conversation_summary,
+                unsummarized_message_count,
+            )
+            messages = await self._prepare_turn_messages(
+                config, user_message, conversation_history
+            )
+
+            final_state = None
+            streamed_deltas: List[str] = []
+            usage = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+
+            async for event in LangGraphService._global_workflow.astream_events(
+                {"messages": messages}, config, version="v2"
+            ):
+                kind = event.get("event")
+                node = event.get("metadata", {}).get("langgraph_node")
+
+                # Only the answering model is streamed; guardrail LLM calls stay internal
+                if kind == "on_chat_model_stream" and node in STREAMED_NODES:
+                    delta = self._chunk_text(event["data"].get("chunk"))
+                    if delta:
+                        streamed_deltas.append(delta)
+                        yield {"type": "content", "content": delta}
+                elif kind == "on_chat_model_end" and node in STREAMED_NODES:
+                    usage_metadata = getattr(
+                        event["data"].get("output"), "usage_metadata", None
+                    ) or {}
+                    usage["prompt_tokens"] += usage_metadata.get("input_tokens", 0)
+                    usage["completion_tokens"] += usage_metadata.get("output_tokens", 0)
+                    usage["total_tokens"] += usage_metadata.get("total_tokens", 0)
+                elif kind == "on_chain_end" and not event.get("parent_ids"):
+                    final_state = event["data"].get("output")
+
+            content = (
+                self._extract_response_content(final_state)
+                if isinstance(final_state, dict)
+                else "No response generated"
+            )
+            response_time = int((time.time() - start_time) * 1000)
+
+            response_safe = (
+                final_state.get("response_safe", True)
+                if isinstance(final_state, dict)
+                else True
+            )
+            if content != "".join(streamed_deltas) or response_safe is False:
+                yield {
+                    "type": "replace",
+                    "content": content,
+                    "response_safe": response_safe is not False,
+                }
+
+            yield {
+                "type": "final",
+                "content": content,
+                "model_used": f"{agent.model_provider.value}:{agent.model_name}",
+                "usage": usage,
+                "response_time_ms": response_time,
+                "conversation_id": conversation_id,
+            }
+
+        except Exception as e:
+            logger.error(
+                f"\033[91m[stream_conversation] Error streaming conversation: {str(e)}\033[0m"
+            )
+            raise ValidationException(f"Conversation execution failed: {str(e)}")
+
+    def _build_run_config(
+        self,
+        conversation_id: str,
+        user_id: Optional[str],
+        system_prompt: str,
+        authorization_token: Optional[str] = None,
+        conversation_summary: Optional[str] = None,
+        unsummarized_message_count: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Build the LangGraph run config for a conversation turn"""
+        config = {
+            "configurable": {
+                "thread_id": conversation_id,
+                "conversation_id": conversation_id,
+                "user_id": user_id,  # Add for WebSocket delivery
+                "system_prompt": system_prompt,
+                # Rolling summary of the older messages, and how many stored messages it does not cover yet
+                "conversation_summary": conversation_summary,
+                "unsummarized_message_count": unsummarized_message_count,
+            }
+        }
+
+        # Add authorization token if provided
+        if authorization_token:
+            config["configurable"]["authorization_token"] = authorization_token
+            logger.info(
+                f"[_build_run_config] Authorization token added to config: {authorization_token[:20]}..."
+            )
+        else:
+            logger.warning("[_build_run_config] No authorization token provided")
+
+        return config
+
+    @staticmethod
+    def _chunk_text(chunk: Any) -> str:
+        """Extract plain text from a streamed message chunk"""
+        content = getattr(chunk, "content", None)
+        if isinstance(content, str):
+            return content
+        if isinstance(content, list):
+            # Gemini may stream content as a list of parts
+            return "".join(
+                part.get("text", "") if isinstance(part, dict) else str(part)
+                for part in content
+            )
+        return ""
+
     def _extract_response_content(self, final_state: Dict[str, Any]) -> str:
         """Extract the AI response content from workflow final state"""
         try:
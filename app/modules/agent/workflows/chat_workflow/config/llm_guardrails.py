@@ -163,7 +163,7 @@ def initialize_guardrails_with_llm(llm_instance):
 		async def validate_user_input(self, user_input: str, context: dict = None):
 			"""Validate user input through LLM guardrails"""
 			try:
-				result = self.manager.check_user_input(user_input, context)
+				result = await self.manager.acheck_user_input(user_input, context)
 				return {'is_safe': result.passed, 'summary': f'Input validation: {"passed" if result.passed else "failed"}', 'violations': [v.message for v in result.violations], 'overall_severity': result.violations[0].severity.value if result.violations else 'low'}
 			except Exception as e:
 				return {'is_safe': True, 'summary': f'Input validation error: {str(e)}', 'error': str(e)}
@@ -171,7 +171,7 @@ def initialize_guardrails_with_llm(llm_instance):
 		async def validate_ai_response(self, ai_response: str, context: dict = None):
 			"""Validate AI response through LLM guardrails"""
 			try:
-				result = self.manager.check_ai_output(ai_response, context)
+				result = await self.manager.acheck_ai_output(ai_response, context)
 				return {'is_safe': result.passed, 'summary': f'Output validation: {"passed" if result.passed else "flagged"}', 'violations': [v.message for v in result.violations], 'overall_severity': result.violations[0].severity.value if result.violations else 'low'}
 			except Exception as e:
 				return {
@@ -7,7 +7,7 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Any
 import os
 
-from ......core.config import GOOGLE_API_KEY
+from ......core.config import CHAT_CONTEXT_TOKEN_BUDGET, GOOGLE_API_KEY
 
 # Import persona types using relative import
 from .persona_prompts import PersonaType, PersonaPrompts
@@ -23,6 +23,9 @@ class WorkflowConfig:
 	max_tokens: int = 10000
 	api_key: Optional[str] = None
 
+	# Model input bound (system prompt + conversation summary + recent turns)
+	context_token_budget: int = CHAT_CONTEXT_TOKEN_BUDGET
+
 	# Authorization token for N8N API calls
 	authorization_token: Optional[str] = None
 
@@ -88,6 +91,7 @@ class WorkflowConfig:
 			'model_name': self.model_name,
 			'temperature': self.temperature,
 			'max_tokens': self.max_tokens,
+			'context_token_budget': self.context_token_budget,
 			'rag_enabled': self.rag_enabled,
 			'similarity_threshold': self.similarity_threshold,
 			'max_retrieved_docs': self.max_retrieved_docs,
@@ -115,6 +119,9 @@ class WorkflowConfig:
 		if self.max_tokens <= 0:
 			raise ValueError('Max tokens must be positive')
 
+		if self.context_token_budget <= 0:
+			raise ValueError('Context token budget must be positive')
+
 		if self.similarity_threshold < 0 or self.similarity_threshold > 1:
 			raise ValueError('Similarity threshold must be between 0 and 1')
 
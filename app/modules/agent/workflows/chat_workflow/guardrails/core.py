@@ -3,6 +3,7 @@ Guardrail Core System cho Chat Workflow
 Production-ready content safety và compliance system
 """
 
+import asyncio
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import Enum
@@ -30,6 +31,13 @@ class GuardrailAction(Enum):
 	ESCALATE = 'escalate'  # Báo cáo và chặn
 
 
+class GuardrailFailMode(Enum):
+	"""Cách xử lý guardrail bị timeout hoặc lỗi"""
+
+	OPEN = 'open'  # Cho phép với cảnh báo
+	CLOSED = 'closed'  # Chặn nội dung
+
+
 @dataclass
 class GuardrailViolation:
 	"""Chi tiết vi phạm guardrail"""
@@ -68,12 +76,22 @@ class BaseGuardrail(ABC):
 		self.severity = severity
 		self.violation_count = 0
 		self.last_violation = None
+		# Latency budget riêng (giây), None = dùng timeout của engine
+		self.timeout_seconds: Optional[float] = None
 
 	@abstractmethod
 	def check(self, content: str, context: Dict[str, Any] = None) -> GuardrailResult:
 		"""Kiểm tra nội dung theo rule cụ thể"""
 		pass
 
+	async def acheck(self, content: str, context: Dict[str, Any] = None) -> GuardrailResult:
+		"""Async variant của check
+
+		Rule-based checks chỉ là regex/string nên chạy thẳng trên event loop,
+		guardrail gọi I/O (LLM) override bằng native async call.
+		"""
+		return self.check(content, context)
+
 	def is_enabled(self) -> bool:
 		"""Kiểm tra rule có được enable không"""
 		return self.enabled
@@ -92,14 +110,24 @@ class BaseGuardrail(ABC):
 class GuardrailEngine:
 	"""Engine chính để xử lý tất cả guardrail rules"""
 
-	def __init__(self):
+	def __init__(
+		self,
+		timeout_seconds: Optional[float] = None,
+		input_fail_mode: GuardrailFailMode = GuardrailFailMode.CLOSED,
+		output_fail_mode: GuardrailFailMode = GuardrailFailMode.OPEN,
+	):
 		self.input_guardrails: List[BaseGuardrail] = []
 		self.output_guardrails: List[BaseGuardrail] = []
+		self.timeout_seconds = timeout_seconds
+		self.input_fail_mode = GuardrailFailMode(input_fail_mode)
+		self.output_fail_mode = GuardrailFailMode(output_fail_mode)
 		self.global_stats = {
 			'total_checks': 0,
 			'total_violations': 0,
 			'blocked_content': 0,
 			'modified_content': 0,
+			'timed_out_checks': 0,
+			'cancelled_checks': 0,
 		}
 
 	def add_input_guardrail(self, guardrail: BaseGuardrail):
@@ -118,6 +146,14 @@ class GuardrailEngine:
 		"""Kiểm tra đầu ra từ AI"""
 		return self._run_guardrails(ai_output, self.output_guardrails, context or {})
 
+	async def acheck_input(self, user_input: str, context: Dict[str, Any] = None) -> GuardrailResult:
+		"""Kiểm tra đầu vào từ user, các guardrail chạy đồng thời"""
+		return await self._arun_guardrails(user_input, self.input_guardrails, context or {}, self.input_fail_mode)
+
+	async def acheck_output(self, ai_output: str, context: Dict[str, Any] = None) -> GuardrailResult:
+		"""Kiểm tra đầu ra từ AI, các guardrail chạy đồng thời"""
+		return await self._arun_guardrails(ai_output, self.output_guardrails, context or {}, self.output_fail_mode)
+
 	def _run_guardrails(self, content: str, guardrails: List[BaseGuardrail], context: Dict[str, Any]) -> GuardrailResult:
 		"""Chạy tất cả guardrail rules"""
 		start_time = time.time()
@@ -179,6 +215,176 @@ class GuardrailEngine:
 			processing_time=processing_time,
 		)
 
+	async def _arun_guardrails(
+		self,
+		content: str,
+		guardrails: List[BaseGuardrail],
+		context: Dict[str, Any],
+		fail_mode: GuardrailFailMode,
+	) -> GuardrailResult:
+		"""Chạy đồng thời tất cả guardrail rules
+
+		Mỗi guardrail kiểm tra nội dung gốc trong latency budget của nó. Violation BLOCK/ESCALATE
+		đầu tiên hủy các check còn lại, nên thời gian xử lý xấp xỉ check chậm nhất thay vì tổng.
+		Modifications được nối tiếp như _run_guardrails: guardrail đã sửa nội dung gốc được chạy lại
+		tuần tự trên nội dung đã được các guardrail trước sửa.
+		"""
+		start_time = time.time()
+		active_guardrails = [g for g in guardrails if g.is_enabled()]
+
+		self.global_stats['total_checks'] += 1
+
+		tasks = {asyncio.create_task(self._acheck_with_budget(guardrail, content, context, fail_mode)): index for index, guardrail in enumerate(active_guardrails)}
+		results: Dict[int, GuardrailResult] = {}
+		pending = set(tasks)
+		short_circuited = False
+
+		try:
+			while pending:
+				done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+				for task in done:
+					results[tasks[task]] = task.result()
+
+				if any(self._is_blocking(results[tasks[task]]) for task in done) and pending:
+					short_circuited = True
+					break
+		finally:
+			# Short-circuit hoặc caller bị hủy: không để check nào chạy tiếp
+			for task in pending:
+				task.cancel()
+			if pending:
+				await asyncio.gather(*pending, return_exceptions=True)
+
+		all_violations = []
+		timed_out = []
+
+		for index, guardrail in enumerate(active_guardrails):
+			result = results.get(index)
+			if result is None:
+				continue
+
+			if (result.metadata or {}).get('timed_out'):
+				timed_out.append(guardrail.name)
+
+			if result.violations:
+				all_violations.extend(result.violations)
+				guardrail.violation_count += len(result.violations)
+				guardrail.last_violation = datetime.now()
+
+		has_blocking_violations = any(v.action in [GuardrailAction.BLOCK, GuardrailAction.ESCALATE] for v in all_violations)
+
+		# Pass đồng thời chỉ để phát hiện BLOCK/ESCALATE; modifications được áp dụng tuần tự trên nội dung tích lũy
+		modified_content = content
+		if not has_blocking_violations:
+			for index, guardrail in enumerate(active_guardrails):
+				result = results.get(index)
+				if result is None or not result.modified_content:
+					continue
+
+				if modified_content != content:
+					# Nội dung đã bị guardrail trước sửa: kiểm tra lại trên bản đã sửa
+					result = await self._acheck_with_budget(guardrail, modified_content, context, fail_mode)
+					if (result.metadata or {}).get('timed_out'):
+						timed_out.append(guardrail.name)
+					if self._is_blocking(result):
+						all_violations.extend(result.violations)
+						has_blocking_violations = True
+						break
+
+				if result.modified_content:
+					modified_content = result.modified_content
+					self.global_stats['modified_content'] += 1
+
+		cancelled = [g.name for index, g in enumerate(active_guardrails) if index not in results]
+		self.global_stats['timed_out_checks'] += len(timed_out)
+		self.global_stats['cancelled_checks'] += len(cancelled)
+
+		if has_blocking_violations:
+			self.global_stats['blocked_content'] += 1
+
+		if all_violations:
+			self.global_stats['total_violations'] += len(all_violations)
+
+		return GuardrailResult(
+			passed=not has_blocking_violations,
+			violations=all_violations,
+			modified_content=modified_content if modified_content != content else None,
+			metadata={
+				'original_content_length': len(content),
+				'modified_content_length': len(modified_content),
+				'guardrails_checked': len(results),
+				'violations_found': len(all_violations),
+				'short_circuited': short_circuited,
+				'timed_out_guardrails': timed_out,
+				'cancelled_guardrails': cancelled,
+				'fail_mode': fail_mode.value,
+			},
+			processing_time=time.time() - start_time,
+		)
+
+	async def _acheck_with_budget(
+		self,
+		guardrail: BaseGuardrail,
+		content: str,
+		context: Dict[str, Any],
+		fail_mode: GuardrailFailMode,
+	) -> GuardrailResult:
+		"""Chạy một guardrail trong latency budget, timeout/lỗi được xử lý theo fail mode"""
+		start_time = time.time()
+		timeout = guardrail.timeout_seconds if guardrail.timeout_seconds is not None else self.timeout_seconds
+
+		try:
+			return await asyncio.wait_for(guardrail.acheck(content, context), timeout=timeout)
+		except asyncio.TimeoutError:
+			return self._failure_result(
+				guardrail,
+				fail_mode,
+				f'Guardrail exceeded its {timeout}s latency budget',
+				{'guardrail': guardrail.name, 'timeout_seconds': timeout},
+				start_time,
+				timed_out=True,
+			)
+		except Exception as e:
+			return self._failure_result(
+				guardrail,
+				fail_mode,
+				f'Guardrail execution error: {str(e)}',
+				{'error': str(e), 'guardrail': guardrail.name},
+				start_time,
+			)
+
+	@staticmethod
+	def _failure_result(
+		guardrail: BaseGuardrail,
+		fail_mode: GuardrailFailMode,
+		message: str,
+		details: Dict[str, Any],
+		start_time: float,
+		timed_out: bool = False,
+	) -> GuardrailResult:
+		"""Kết quả thay thế cho guardrail không trả lời được: fail-open cảnh báo, fail-closed chặn"""
+		fail_closed = fail_mode == GuardrailFailMode.CLOSED
+		violation = GuardrailViolation(
+			rule_name=guardrail.name,
+			severity=GuardrailSeverity.HIGH if fail_closed else GuardrailSeverity.LOW,
+			action=GuardrailAction.BLOCK if fail_closed else GuardrailAction.ALLOW,
+			message=message,
+			details={**details, 'fail_mode': fail_mode.value},
+			timestamp=datetime.now(),
+			confidence=0.0,
+		)
+		return GuardrailResult(
+			passed=not fail_closed,
+			violations=[violation],
+			metadata={'timed_out': timed_out, 'fail_mode': fail_mode.value},
+			processing_time=time.time() - start_time,
+		)
+
+	@staticmethod
+	def _is_blocking(result: GuardrailResult) -> bool:
+		"""Result có violation chặn nội dung (BLOCK/ESCALATE)"""
+		return any(v.action in [GuardrailAction.BLOCK, GuardrailAction.ESCALATE] for v in result.violations)
+
 	def get_stats(self) -> Dict[str, Any]:
 		"""Lấy thống kê tổng quan"""
 		guardrail_stats = []
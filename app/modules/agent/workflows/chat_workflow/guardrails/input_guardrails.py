@@ -12,6 +12,7 @@ from .core import (
 	GuardrailSeverity,
 	GuardrailAction,
 )
+from .pattern_matcher import input_matcher, mask_hits
 from datetime import datetime
 
 
@@ -59,17 +60,17 @@ class ProfanityGuardrail(BaseGuardrail):
 			'bitch': '***',
 		}
 
+		input_matcher.register(self.name, {word: word for word in self.banned_words}, literal=True)
+
 	def check(self, content: str, context: Dict[str, Any] = None) -> GuardrailResult:
 		violations = []
-		modified_content = content.lower()
-		found_profanity = []
-
-		for word in self.banned_words:
-			if word in modified_content:
-				found_profanity.append(word)
-				modified_content = modified_content.replace(word, self.replacements.get(word, '***'))
+		hits = input_matcher.scan(content).get(self.name, [])
+		found_profanity = list(dict.fromkeys(hit.tag for hit in hits))
 
 		if found_profanity:
+			# Chỉ thay đoạn vi phạm, phần còn lại của message giữ nguyên
+			modified_content = mask_hits(content, hits, replacements=self.replacements)
+
 			violation = GuardrailViolation(
 				rule_name=self.name,
 				severity=self.severity,
@@ -97,12 +98,15 @@ class SpamGuardrail(BaseGuardrail):
 		self.max_repeated_chars = 5
 		self.max_repeated_words = 3
 
+		# Named group để pattern vẫn đúng khi được gộp vào regex chung (matcher không phân biệt hoa thường)
+		self.repeated_char_pattern = re.compile(r'(?P<repeated_char>.)(?P=repeated_char){' + str(self.max_repeated_chars) + ',}', re.IGNORECASE)
+		input_matcher.register(self.name, {'repeated_chars': self.repeated_char_pattern.pattern})
+
 	def check(self, content: str, context: Dict[str, Any] = None) -> GuardrailResult:
 		violations = []
 
 		# Kiểm tra ký tự lặp lại
-		repeated_char_pattern = r'(.)\1{' + str(self.max_repeated_chars) + ',}'
-		if re.search(repeated_char_pattern, content):
+		if input_matcher.scan(content).get(self.name):
 			violation = GuardrailViolation(
 				rule_name=self.name,
 				severity=self.severity,
@@ -114,7 +118,7 @@ class SpamGuardrail(BaseGuardrail):
 			violations.append(violation)
 
 			# Sửa đổi content
-			modified_content = re.sub(repeated_char_pattern, r'\1\1\1', content)
+			modified_content = self.repeated_char_pattern.sub(r'\g<repeated_char>' * 3, content)
 
 			return GuardrailResult(passed=True, violations=violations, modified_content=modified_content)
 
@@ -179,14 +183,14 @@ class PersonalInfoGuardrail(BaseGuardrail):
 			'credit_card': r'\b(?:\d{4}[-\s]?){3}\d{4}\b',
 		}
 
+		input_matcher.register(self.name, self.patterns)
+
 	def check(self, content: str, context: Dict[str, Any] = None) -> GuardrailResult:
 		violations = []
 		found_info = {}
 
-		for info_type, pattern in self.patterns.items():
-			matches = re.findall(pattern, content)
-			if matches:
-				found_info[info_type] = matches
+		for hit in input_matcher.scan(content).get(self.name, []):
+			found_info.setdefault(hit.tag, []).append(hit.text)
 
 		if found_info:
 			violation = GuardrailViolation(
@@ -222,23 +226,23 @@ class InjectionGuardrail(BaseGuardrail):
 			r'exec\s*\(',
 		]
 
+		input_matcher.register(self.name, {pattern: pattern for pattern in self.dangerous_patterns})
+
 	def check(self, content: str, context: Dict[str, Any] = None) -> GuardrailResult:
-		violations = []
-		content_lower = content.lower()
+		hits = input_matcher.scan(content).get(self.name)
 
-		for pattern in self.dangerous_patterns:
-			if re.search(pattern, content_lower, re.IGNORECASE):
-				violation = GuardrailViolation(
-					rule_name=self.name,
-					severity=self.severity,
-					action=GuardrailAction.BLOCK,
-					message=f'Phát hiện khả năng prompt injection: {pattern}',
-					details={'detected_pattern': pattern},
-					timestamp=datetime.now(),
-				)
-				violations.append(violation)
+		if hits:
+			pattern = hits[0].tag
+			violation = GuardrailViolation(
+				rule_name=self.name,
+				severity=self.severity,
+				action=GuardrailAction.BLOCK,
+				message=f'Phát hiện khả năng prompt injection: {pattern}',
+				details={'detected_pattern': pattern},
+				timestamp=datetime.now(),
+			)
 
-				return GuardrailResult(passed=False, violations=violations)
+			return GuardrailResult(passed=False, violations=[violation])
 
 		return GuardrailResult(passed=True, violations=[])
 
@@ -257,11 +261,12 @@ class EnterViuContextGuardrail(BaseGuardrail):
 			'discrimination',
 		]
 
+		input_matcher.register(self.name, {kw: kw for kw in self.off_topic_keywords}, literal=True)
+
 	def check(self, content: str, context: Dict[str, Any] = None) -> GuardrailResult:
 		violations = []
-		content_lower = content.lower()
 
-		found_keywords = [kw for kw in self.off_topic_keywords if kw in content_lower]
+		found_keywords = list(dict.fromkeys(hit.tag for hit in input_matcher.scan(content).get(self.name, [])))
 
 		if found_keywords:
 			violation = GuardrailViolation(
@@ -18,6 +18,7 @@ from .core import (
 	GuardrailSeverity,
 	GuardrailAction,
 	GuardrailEngine,
+	GuardrailFailMode,
 )
 from ..utils.color_logger import get_color_logger, Colors
 
@@ -102,26 +103,12 @@ class LLMInputGuardrail(BaseGuardrail):
 📊 OUTPUT: Structured JSON với quyết định chi tiết và confidence score.
 """
 
-	def check(self, content: str, context: Dict[str, Any] = None) -> GuardrailResult:
-		"""Phân tích content với LLM để xác định vi phạm."""
-		start_time = time.time()
-
-		color_logger.workflow_start(
-			'LLM Input Guardrail Analysis',
-			content_length=len(content),
-			model=self.model.model,
-		)
-
-		try:
-			# Prepare context information
-			context_info = self._prepare_context(context or {})
-
-			# Create analysis prompt
-			prompt = ChatPromptTemplate.from_messages([
-				('system', self.system_prompt),
-				(
-					'human',
-					"""
+		# Analysis prompt and structured model are built once and reused for every check
+		self.prompt = ChatPromptTemplate.from_messages([
+			('system', self.system_prompt),
+			(
+				'human',
+				"""
 🔍 PHÂN TÍCH CONTENT INPUT:
 
 **Nội dung cần kiểm tra:**
@@ -138,29 +125,18 @@ class LLMInputGuardrail(BaseGuardrail):
 5. Nội dung sửa đổi (nếu cần)
 6. Confidence score
 """,
-				),
-			])
-
-			# Bind structured output
-			structured_model = self.model.with_structured_output(LLMGuardrailDecision)
-
-			# Invoke LLM
-			decision = structured_model.invoke(prompt.format_messages(content=content, context_info=context_info))
-
-			processing_time = time.time() - start_time
+			),
+		])
+		self.structured_model = self.model.with_structured_output(LLMGuardrailDecision)
 
-			color_logger.info(
-				f'🤖 {Colors.BOLD}LLM GUARDRAIL DECISION:{Colors.RESET} {decision.action}',
-				Colors.BRIGHT_CYAN,
-				data=decision.model_dump(),
-				violation=decision.has_violation,
-				severity=decision.severity,
-				confidence=decision.confidence,
-				processing_time=processing_time,
-			)
+	def check(self, content: str, context: Dict[str, Any] = None) -> GuardrailResult:
+		"""Phân tích content với LLM để xác định vi phạm."""
+		start_time = time.time()
+		self._log_start(content)
 
-			# Convert to GuardrailResult
-			return self._convert_to_guardrail_result(decision, content, processing_time)
+		try:
+			decision = self.structured_model.invoke(self._build_messages(content, context))
+			return self._handle_decision(decision, content, start_time)
 
 		except Exception as e:
 			color_logger.error(f'LLM Guardrail Error: {str(e)}', Colors.BRIGHT_RED)
@@ -182,6 +158,44 @@ class LLMInputGuardrail(BaseGuardrail):
 				processing_time=time.time() - start_time,
 			)
 
+	async def acheck(self, content: str, context: Dict[str, Any] = None) -> GuardrailResult:
+		"""Native async variant của check, không block event loop trong lúc chờ Gemini.
+
+		Lỗi và timeout được raise lên để GuardrailEngine áp dụng fail-open/fail-closed policy.
+		"""
+		start_time = time.time()
+		self._log_start(content)
+
+		decision = await self.structured_model.ainvoke(self._build_messages(content, context))
+		return self._handle_decision(decision, content, start_time)
+
+	def _log_start(self, content: str):
+		color_logger.workflow_start(
+			'LLM Input Guardrail Analysis',
+			content_length=len(content),
+			model=self.model.model,
+		)
+
+	def _build_messages(self, content: str, context: Dict[str, Any] = None):
+		"""Format prompt với content và context."""
+		return self.prompt.format_messages(content=content, context_info=self._prepare_context(context or {}))
+
+	def _handle_decision(self, decision: LLMGuardrailDecision, content: str, start_time: float) -> GuardrailResult:
+		"""Log quyết định của LLM và convert sang GuardrailResult."""
+		processing_time = time.time() - start_time
+
+		color_logger.info(
+			f'🤖 {Colors.BOLD}LLM GUARDRAIL DECISION:{Colors.RESET} {decision.action}',
+			Colors.BRIGHT_CYAN,
+			data=decision.model_dump(),
+			violation=decision.has_violation,
+			severity=decision.severity,
+			confidence=decision.confidence,
+			processing_time=processing_time,
+		)
+
+		return self._convert_to_guardrail_result(decision, content, processing_time)
+
 	def _prepare_context(self, context: Dict[str, Any]) -> str:
 		"""Chuẩn bị context information cho LLM."""
 		context_parts = []
@@ -326,26 +340,12 @@ class LLMOutputGuardrail(BaseGuardrail):
 📊 OUTPUT: Structured JSON với assessment chi tiết.
 """
 
-	def check(self, content: str, context: Dict[str, Any] = None) -> GuardrailResult:
-		"""Phân tích AI response với LLM để đảm bảo chất lượng."""
-		start_time = time.time()
-
-		color_logger.workflow_start(
-			'LLM Output Guardrail Analysis',
-			content_length=len(content),
-			model=self.model.model,
-		)
-
-		try:
-			# Prepare context information
-			context_info = self._prepare_output_context(context or {})
-
-			# Create analysis prompt
-			prompt = ChatPromptTemplate.from_messages([
-				('system', self.system_prompt),
-				(
-					'human',
-					"""
+		# Analysis prompt and structured model are built once and reused for every check
+		self.prompt = ChatPromptTemplate.from_messages([
+			('system', self.system_prompt),
+			(
+				'human',
+				"""
 🔍 PHÂN TÍCH AI RESPONSE:
 
 **Response cần kiểm tra:**
@@ -362,28 +362,18 @@ class LLMOutputGuardrail(BaseGuardrail):
 5. Response cải thiện (nếu cần)
 6. Confidence score
 """,
-				),
-			])
-
-			# Bind structured output
-			structured_model = self.model.with_structured_output(LLMGuardrailDecision)
-
-			# Invoke LLM
-			decision = structured_model.invoke(prompt.format_messages(content=content, context_info=context_info))
+			),
+		])
+		self.structured_model = self.model.with_structured_output(LLMGuardrailDecision)
 
-			processing_time = time.time() - start_time
-
-			color_logger.info(
-				f'🤖 {Colors.BOLD}LLM OUTPUT GUARDRAIL:{Colors.RESET} {decision.action}',
-				Colors.BRIGHT_MAGENTA,
-				violation=decision.has_violation,
-				severity=decision.severity,
-				confidence=decision.confidence,
-				processing_time=processing_time,
-			)
+	def check(self, content: str, context: Dict[str, Any] = None) -> GuardrailResult:
+		"""Phân tích AI response với LLM để đảm bảo chất lượng."""
+		start_time = time.time()
+		self._log_start(content)
 
-			# Convert to GuardrailResult
-			return self._convert_to_guardrail_result(decision, content, processing_time)
+		try:
+			decision = self.structured_model.invoke(self._build_messages(content, context))
+			return self._handle_decision(decision, content, start_time)
 
 		except Exception as e:
 			color_logger.error(f'LLM Output Guardrail Error: {str(e)}', Colors.BRIGHT_RED)
@@ -405,6 +395,43 @@ class LLMOutputGuardrail(BaseGuardrail):
 				processing_time=time.time() - start_time,
 			)
 
+	async def acheck(self, content: str, context: Dict[str, Any] = None) -> GuardrailResult:
+		"""Native async variant của check, không block event loop trong lúc chờ Gemini.
+
+		Lỗi và timeout được raise lên để GuardrailEngine áp dụng fail-open/fail-closed policy.
+		"""
+		start_time = time.time()
+		self._log_start(content)
+
+		decision = await self.structured_model.ainvoke(self._build_messages(content, context))
+		return self._handle_decision(decision, content, start_time)
+
+	def _log_start(self, content: str):
+		color_logger.workflow_start(
+			'LLM Output Guardrail Analysis',
+			content_length=len(content),
+			model=self.model.model,
+		)
+
+	def _build_messages(self, content: str, context: Dict[str, Any] = None):
+		"""Format prompt với content và context."""
+		return self.prompt.format_messages(content=content, context_info=self._prepare_output_context(context or {}))
+
+	def _handle_decision(self, decision: LLMGuardrailDecision, content: str, start_time: float) -> GuardrailResult:
+		"""Log quyết định của LLM và convert sang GuardrailResult."""
+		processing_time = time.time() - start_time
+
+		color_logger.info(
+			f'🤖 {Colors.BOLD}LLM OUTPUT GUARDRAIL:{Colors.RESET} {decision.action}',
+			Colors.BRIGHT_MAGENTA,
+			violation=decision.has_violation,
+			severity=decision.severity,
+			confidence=decision.confidence,
+			processing_time=processing_time,
+		)
+
+		return self._convert_to_guardrail_result(decision, content, processing_time)
+
 	def _prepare_output_context(self, context: Dict[str, Any]) -> str:
 		"""Chuẩn bị context cho output analysis."""
 		context_parts = []
@@ -493,8 +520,11 @@ class LLMGuardrailEngine(GuardrailEngine):
 		self,
 		enable_llm_guardrails: bool = True,
 		model_name: str = 'gemini-2.0-flash-lite',
+		timeout_seconds: Optional[float] = None,
+		input_fail_mode: GuardrailFailMode = GuardrailFailMode.CLOSED,
+		output_fail_mode: GuardrailFailMode = GuardrailFailMode.OPEN,
 	):
-		super().__init__()
+		super().__init__(timeout_seconds=timeout_seconds, input_fail_mode=input_fail_mode, output_fail_mode=output_fail_mode)
 
 		self.enable_llm_guardrails = enable_llm_guardrails
 		self.model_name = model_name
@@ -5,7 +5,8 @@ Tích hợp và quản lý tất cả guardrail rules với LLM-powered analysis
 
 from typing import Dict, Any, List, Optional
 from datetime import datetime
-from .core import GuardrailEngine, GuardrailResult
+from app.core.config import GUARDRAIL_INPUT_FAIL_MODE, GUARDRAIL_OUTPUT_FAIL_MODE, GUARDRAIL_TIMEOUT_SECONDS
+from .core import GuardrailEngine, GuardrailFailMode, GuardrailResult
 from .llm_guardrail import LLMGuardrailEngine
 from .input_guardrails import (
 	ProfanityGuardrail,
@@ -48,6 +49,9 @@ class ChatWorkflowGuardrailManager:
 		        - max_input_length: int (default 5000)
 		        - strict_mode: bool (default False)
 		        - model_name: str (default 'gemini-2.0-flash-lite')
+		        - timeout_seconds: float (default GUARDRAIL_TIMEOUT_SECONDS) - Latency budget mỗi guardrail
+		        - input_fail_mode: 'open' | 'closed' (default GUARDRAIL_INPUT_FAIL_MODE)
+		        - output_fail_mode: 'open' | 'closed' (default GUARDRAIL_OUTPUT_FAIL_MODE)
 		"""
 		self.config = config or {}
 
@@ -59,10 +63,19 @@ class ChatWorkflowGuardrailManager:
 		self.max_input_length = self.config.get('max_input_length', 5000)
 		self.strict_mode = self.config.get('strict_mode', False)
 		self.model_name = self.config.get('model_name', 'gemini-2.0-flash-lite')
+		self.timeout_seconds = self.config.get('timeout_seconds', GUARDRAIL_TIMEOUT_SECONDS)
+		self.input_fail_mode = GuardrailFailMode(self.config.get('input_fail_mode', GUARDRAIL_INPUT_FAIL_MODE))
+		self.output_fail_mode = GuardrailFailMode(self.config.get('output_fail_mode', GUARDRAIL_OUTPUT_FAIL_MODE))
+
+		engine_options = {
+			'timeout_seconds': self.timeout_seconds,
+			'input_fail_mode': self.input_fail_mode,
+			'output_fail_mode': self.output_fail_mode,
+		}
 
 		# Initialize appropriate engine
 		if self.enable_llm_guardrails:
-			self.engine = LLMGuardrailEngine(enable_llm_guardrails=True, model_name=self.model_name)
+			self.engine = LLMGuardrailEngine(enable_llm_guardrails=True, model_name=self.model_name, **engine_options)
 			color_logger.info(
 				f'🧠 {Colors.BOLD}LLM GUARDRAIL MANAGER:{Colors.RESET} Initialized with AI-powered protection',
 				Colors.BRIGHT_GREEN,
@@ -71,7 +84,7 @@ class ChatWorkflowGuardrailManager:
 				use_llm_only=self.use_llm_only,
 			)
 		else:
-			self.engine = GuardrailEngine()
+			self.engine = GuardrailEngine(**engine_options)
 			color_logger.info(
 				f'🛡️ {Colors.BOLD}TRADITIONAL GUARDRAIL MANAGER:{Colors.RESET} Initialized with rule-based protection',
 				Colors.BRIGHT_BLUE,
@@ -117,7 +130,34 @@ class ChatWorkflowGuardrailManager:
 		if not self.enable_input_guardrails:
 			return GuardrailResult(passed=True, violations=[])
 
-		# Enhanced context for LLM analysis
+		enhanced_context = self._prepare_input_check(user_input, context)
+		result = self.engine.check_input(user_input, enhanced_context)
+		self._log_input_result(result)
+
+		return result
+
+	async def acheck_user_input(self, user_input: str, context: Dict[str, Any] = None) -> GuardrailResult:
+		"""
+		Async variant của check_user_input: các guardrail chạy đồng thời, LLM gọi native async
+
+		Args:
+		    user_input: Input từ user
+		    context: Context thêm (user_id, conversation_id, etc.)
+
+		Returns:
+		    GuardrailResult với thông tin vi phạm và content đã sửa đổi (nếu có)
+		"""
+		if not self.enable_input_guardrails:
+			return GuardrailResult(passed=True, violations=[])
+
+		enhanced_context = self._prepare_input_check(user_input, context)
+		result = await self.engine.acheck_input(user_input, enhanced_context)
+		self._log_input_result(result)
+
+		return result
+
+	def _prepare_input_check(self, user_input: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
+		"""Enhanced context for LLM analysis of user input"""
 		enhanced_context = context or {}
 		enhanced_context.update({
 			'analysis_type': 'input',
@@ -133,8 +173,9 @@ class ChatWorkflowGuardrailManager:
 			traditional_guards=not self.use_llm_only,
 		)
 
-		result = self.engine.check_input(user_input, enhanced_context)
+		return enhanced_context
 
+	def _log_input_result(self, result: GuardrailResult):
 		color_logger.info(
 			f'🛡️ {Colors.BOLD}INPUT GUARDRAIL RESULT:{Colors.RESET} {"✅ PASSED" if result.passed else "❌ BLOCKED"}',
 			Colors.BRIGHT_GREEN if result.passed else Colors.BRIGHT_RED,
@@ -143,8 +184,6 @@ class ChatWorkflowGuardrailManager:
 			processing_time=result.processing_time,
 		)
 
-		return result
-
 	def check_ai_output(self, ai_output: str, context: Dict[str, Any] = None) -> GuardrailResult:
 		"""
 		Kiểm tra output từ AI với LLM-powered analysis
@@ -159,7 +198,34 @@ class ChatWorkflowGuardrailManager:
 		if not self.enable_output_guardrails:
 			return GuardrailResult(passed=True, violations=[])
 
-		# Enhanced context for LLM analysis
+		enhanced_context = self._prepare_output_check(ai_output, context)
+		result = self.engine.check_output(ai_output, enhanced_context)
+		self._log_output_result(result)
+
+		return result
+
+	async def acheck_ai_output(self, ai_output: str, context: Dict[str, Any] = None) -> GuardrailResult:
+		"""
+		Async variant của check_ai_output: các guardrail chạy đồng thời, LLM gọi native async
+
+		Args:
+		    ai_output: Response từ AI
+		    context: Context thêm (query, rag_context, etc.)
+
+		Returns:
+		    GuardrailResult với thông tin vi phạm và content đã sửa đổi (nếu có)
+		"""
+		if not self.enable_output_guardrails:
+			return GuardrailResult(passed=True, violations=[])
+
+		enhanced_context = self._prepare_output_check(ai_output, context)
+		result = await self.engine.acheck_output(ai_output, enhanced_context)
+		self._log_output_result(result)
+
+		return result
+
+	def _prepare_output_check(self, ai_output: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
+		"""Enhanced context for LLM analysis of AI output"""
 		enhanced_context = context or {}
 		enhanced_context.update({
 			'analysis_type': 'output',
@@ -175,8 +241,9 @@ class ChatWorkflowGuardrailManager:
 			traditional_guards=not self.use_llm_only,
 		)
 
-		result = self.engine.check_output(ai_output, enhanced_context)
+		return enhanced_context
 
+	def _log_output_result(self, result: GuardrailResult):
 		color_logger.info(
 			f'🛡️ {Colors.BOLD}OUTPUT GUARDRAIL RESULT:{Colors.RESET} {"✅ PASSED" if result.passed else "⚠️ FLAGGED"}',
 			Colors.BRIGHT_GREEN if result.passed else Colors.BRIGHT_YELLOW,
@@ -185,8 +252,6 @@ class ChatWorkflowGuardrailManager:
 			processing_time=result.processing_time,
 		)
 
-		return result
-
 	def get_guardrail_stats(self) -> Dict[str, Any]:
 		"""Lấy thống kê guardrail với thông tin LLM."""
 		stats = self.engine.get_stats()
@@ -199,6 +264,9 @@ class ChatWorkflowGuardrailManager:
 				'enable_output_guardrails': self.enable_output_guardrails,
 				'strict_mode': self.strict_mode,
 				'max_input_length': self.max_input_length,
+				'timeout_seconds': self.timeout_seconds,
+				'input_fail_mode': self.input_fail_mode.value,
+				'output_fail_mode': self.output_fail_mode.value,
 			},
 		})
 		return stats
@@ -12,6 +12,7 @@ from .core import (
 	GuardrailSeverity,
 	GuardrailAction,
 )
+from .pattern_matcher import mask_hits, output_matcher
 from datetime import datetime
 
 
@@ -39,19 +40,18 @@ class HallucinationGuardrail(BaseGuardrail):
 			r'\d+% người dùng',  # Tránh statistics không có nguồn
 		]
 
+		output_matcher.register(f'{self.name}.uncertainty', {phrase: phrase for phrase in self.uncertainty_phrases}, literal=True)
+		output_matcher.register(f'{self.name}.suspicious', {pattern: pattern for pattern in self.suspicious_patterns})
+
 	def check(self, content: str, context: Dict[str, Any] = None) -> GuardrailResult:
 		violations = []
-		content_lower = content.lower()
+		hits = output_matcher.scan(content)
 
 		# Kiểm tra uncertainty phrases (điều tốt)
-		uncertainty_count = sum(1 for phrase in self.uncertainty_phrases if phrase in content_lower)
+		uncertainty_count = len({hit.tag for hit in hits.get(f'{self.name}.uncertainty', [])})
 
 		# Kiểm tra suspicious patterns
-		suspicious_findings = []
-		for pattern in self.suspicious_patterns:
-			matches = re.findall(pattern, content_lower)
-			if matches:
-				suspicious_findings.extend(matches)
+		suspicious_findings = [hit.text.lower() for hit in hits.get(f'{self.name}.suspicious', [])]
 
 		if suspicious_findings:
 			violation = GuardrailViolation(
@@ -137,14 +137,12 @@ class ToxicityGuardrail(BaseGuardrail):
 			r'discriminat',
 		]
 
+		output_matcher.register(self.name, {pattern: pattern for pattern in self.toxic_patterns})
+
 	def check(self, content: str, context: Dict[str, Any] = None) -> GuardrailResult:
 		violations = []
-		content_lower = content.lower()
 
-		found_toxic = []
-		for pattern in self.toxic_patterns:
-			if re.search(pattern, content_lower, re.IGNORECASE):
-				found_toxic.append(pattern)
+		found_toxic = list(dict.fromkeys(hit.tag for hit in output_matcher.scan(content).get(self.name, [])))
 
 		if found_toxic:
 			violation = GuardrailViolation(
@@ -186,11 +184,13 @@ class BrandSafetyGuardrail(BaseGuardrail):
 			# "competitor_platform_name"
 		]
 
+		output_matcher.register(self.name, {kw: kw for kw in self.brand_unsafe_keywords}, literal=True)
+
 	def check(self, content: str, context: Dict[str, Any] = None) -> GuardrailResult:
 		violations = []
-		content_lower = content.lower()
+		hits = output_matcher.scan(content).get(self.name, [])
 
-		found_unsafe = [kw for kw in self.brand_unsafe_keywords if kw in content_lower]
+		found_unsafe = list(dict.fromkeys(hit.tag for hit in hits))
 
 		if found_unsafe:
 			violation = GuardrailViolation(
@@ -204,9 +204,7 @@ class BrandSafetyGuardrail(BaseGuardrail):
 			violations.append(violation)
 
 			# Suggest modification
-			modified_content = content
-			for keyword in found_unsafe:
-				modified_content = modified_content.replace(keyword, '***')
+			modified_content = mask_hits(content, hits)
 
 			return GuardrailResult(passed=True, violations=violations, modified_content=modified_content)
 
@@ -220,6 +218,7 @@ class ResponseQualityGuardrail(BaseGuardrail):
 		super().__init__('response_quality_filter', True, GuardrailSeverity.MEDIUM)
 		self.min_length = 10
 		self.max_length = 3000
+		self.special_chars_only_pattern = re.compile(r'[^\w\s]*')
 
 	def check(self, content: str, context: Dict[str, Any] = None) -> GuardrailResult:
 		violations = []
@@ -250,7 +249,7 @@ class ResponseQualityGuardrail(BaseGuardrail):
 			violations.append(violation)
 
 		# Kiểm tra có phải chỉ toàn ký tự đặc biệt
-		if re.match(r'^[^\w\s]*$', content.strip()):
+		if self.special_chars_only_pattern.fullmatch(content.strip()):
 			violation = GuardrailViolation(
 				rule_name=self.name,
 				severity=self.severity,
@@ -295,12 +294,15 @@ class EnterViuConsistencyGuardrail(BaseGuardrail):
 			'opportunity-blocking',
 		]
 
+		output_matcher.register(f'{self.name}.positive', {val: val for val in self.enterviu_values}, literal=True)
+		output_matcher.register(f'{self.name}.negative', {val: val for val in self.negative_values}, literal=True)
+
 	def check(self, content: str, context: Dict[str, Any] = None) -> GuardrailResult:
 		violations = []
-		content_lower = content.lower()
+		hits = output_matcher.scan(content)
 
 		# Kiểm tra negative values
-		found_negative = [val for val in self.negative_values if val in content_lower]
+		found_negative = list(dict.fromkeys(hit.tag for hit in hits.get(f'{self.name}.negative', [])))
 
 		if found_negative:
 			violation = GuardrailViolation(
@@ -314,7 +316,7 @@ class EnterViuConsistencyGuardrail(BaseGuardrail):
 			violations.append(violation)
 
 		# Kiểm tra có promote EnterViu values không
-		found_positive = [val for val in self.enterviu_values if val in content_lower]
+		found_positive = list(dict.fromkeys(hit.tag for hit in hits.get(f'{self.name}.positive', [])))
 
 		return GuardrailResult(
 			passed=True,
@@ -0,0 +1,200 @@
+"""
+Single-pass Pattern Matcher cho rule-based guardrails
+Tất cả pattern của các guardrail được gộp thành một regex, mỗi message chỉ được scan một lần
+"""
+
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Pattern, Tuple
+
+
+@dataclass(frozen=True)
+class PatternHit:
+	"""Một lần match, gắn với rule và pattern đã match"""
+
+	rule: str
+	tag: str
+	start: int
+	end: int
+	text: str
+
+
+@dataclass
+class _CompiledMatcher:
+	combined: Pattern
+	regexes: List[Tuple[str, str, Pattern]]
+	# Ký tự đầu -> (rule, tag, literal) để xác định literal nào match tại một vị trí
+	literals_by_first_char: Dict[str, List[Tuple[str, str, str]]]
+
+
+class PatternMatcher:
+	"""Matcher dùng chung cho nhiều guardrail rules
+
+	Rules đăng ký pattern lúc khởi tạo guardrail. Lần scan đầu tiên compile một regex gộp:
+	mọi literal được gộp thành một trie (alternation theo prefix chung), theo sau là các regex pattern.
+	Content được lowercase một lần rồi scan không cần IGNORECASE; chỉ tại những vị trí regex gộp match
+	mới xác định rule/pattern cụ thể, nên mọi hit (kể cả chồng lấn giữa các rule) đều được trả về.
+	Kết quả scan được cache theo nội dung vì mọi guardrail của một lượt kiểm tra đều scan cùng message.
+	"""
+
+	def __init__(self, cache_size: int = 16):
+		self.cache_size = cache_size
+		self._literals: Dict[str, Dict[str, str]] = {}
+		self._regexes: Dict[str, Dict[str, str]] = {}
+		self._compiled: Optional[_CompiledMatcher] = None
+		self._cache: 'OrderedDict[str, Dict[str, List[PatternHit]]]' = OrderedDict()
+
+	def register(self, rule: str, patterns: Dict[str, str], literal: bool = False):
+		"""Đăng ký (hoặc thay thế) patterns của một rule
+
+		Matching không phân biệt hoa thường: content được lowercase trước khi scan,
+		nên regex pattern phải viết ở dạng chữ thường.
+
+		Args:
+		    rule: Tên rule, dùng làm key của kết quả scan
+		    patterns: Mapping tag -> pattern (regex, hoặc chuỗi thường nếu literal=True)
+		    literal: Pattern là chuỗi thường (so khớp substring)
+		"""
+		self._literals.pop(rule, None)
+		self._regexes.pop(rule, None)
+		if literal:
+			self._literals[rule] = {tag: pattern.lower() for tag, pattern in patterns.items() if pattern}
+		else:
+			self._regexes[rule] = dict(patterns)
+		self._compiled = None
+		self._cache.clear()
+
+	def scan(self, content: str) -> Dict[str, List[PatternHit]]:
+		"""Scan content một lượt, trả về hits theo rule (theo thứ tự xuất hiện trong content)"""
+		cached = self._cache.get(content)
+		if cached is not None:
+			self._cache.move_to_end(content)
+			return cached
+
+		lowered = content.lower()
+		if len(lowered) == len(content):
+			hits = self._scan_lowered(content, lowered)
+		else:
+			# Một số ký tự Unicode đổi độ dài khi lowercase, vị trí không còn khớp với content gốc
+			hits = self._scan_per_pattern(content)
+
+		self._cache[content] = hits
+		if len(self._cache) > self.cache_size:
+			self._cache.popitem(last=False)
+		return hits
+
+	def get_rules(self) -> Dict[str, Dict[str, str]]:
+		"""Regex của từng rule (literal đã được escape)"""
+		rules = {rule: {tag: re.escape(literal) for tag, literal in literals.items()} for rule, literals in self._literals.items()}
+		rules.update({rule: dict(regexes) for rule, regexes in self._regexes.items()})
+		return rules
+
+	def _scan_lowered(self, content: str, lowered: str) -> Dict[str, List[PatternHit]]:
+		compiled = self._compile()
+		hits: Dict[str, List[PatternHit]] = {}
+		if compiled is None:
+			return hits
+
+		# findall-style: các match của cùng một pattern không chồng lấn nhau
+		last_end: Dict[Tuple[str, str], int] = {}
+
+		def add_hit(rule: str, tag: str, start: int, end: int):
+			if start < last_end.get((rule, tag), 0):
+				return
+			last_end[(rule, tag)] = max(end, start + 1)
+			hits.setdefault(rule, []).append(PatternHit(rule, tag, start, end, content[start:end]))
+
+		position = 0
+		while True:
+			candidate = compiled.combined.search(lowered, position)
+			if candidate is None:
+				break
+
+			start = candidate.start()
+			for rule, tag, literal in compiled.literals_by_first_char.get(lowered[start], ()):
+				if lowered.startswith(literal, start):
+					add_hit(rule, tag, start, start + len(literal))
+
+			for rule, tag, pattern in compiled.regexes:
+				match = pattern.match(lowered, start)
+				if match is not None:
+					add_hit(rule, tag, start, match.end())
+
+			position = start + 1
+
+		return hits
+
+	def _scan_per_pattern(self, content: str) -> Dict[str, List[PatternHit]]:
+		hits: Dict[str, List[PatternHit]] = {}
+		for rule, patterns in self.get_rules().items():
+			for tag, pattern in patterns.items():
+				for match in re.finditer(pattern, content, re.IGNORECASE):
+					hits.setdefault(rule, []).append(PatternHit(rule, tag, match.start(), match.end(), match.group(0)))
+		for rule_hits in hits.values():
+			rule_hits.sort(key=lambda hit: hit.start)
+		return hits
+
+	def _compile(self) -> Optional[_CompiledMatcher]:
+		if self._compiled is None:
+			literals = [(rule, tag, literal) for rule, rule_literals in self._literals.items() for tag, literal in rule_literals.items()]
+			regexes = [(rule, tag, re.compile(pattern)) for rule, rule_regexes in self._regexes.items() for tag, pattern in rule_regexes.items()]
+			if not literals and not regexes:
+				return None
+
+			# Không dùng capturing group cho từng alternative: sre chậm đi vài lần khi phải ghi group
+			alternatives = [_trie_pattern([literal for _, _, literal in literals])] if literals else []
+			alternatives += [f'(?:{pattern.pattern})' for _, _, pattern in regexes]
+
+			literals_by_first_char: Dict[str, List[Tuple[str, str, str]]] = {}
+			for rule, tag, literal in literals:
+				literals_by_first_char.setdefault(literal[0], []).append((rule, tag, literal))
+
+			self._compiled = _CompiledMatcher(re.compile('|'.join(alternatives)), regexes, literals_by_first_char)
+		return self._compiled
+
+
+def _trie_pattern(words: List[str]) -> str:
+	"""Regex alternation của các literal, gộp theo prefix chung (Aho-Corasick kiểu nghèo cho sre)"""
+	trie: Dict[str, dict] = {}
+	for word in words:
+		node = trie
+		for char in word:
+			node = node.setdefault(char, {})
+		node[''] = {}
+
+	def build(node: Dict[str, dict]) -> str:
+		branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+		if not branches:
+			return ''
+		body = branches[0] if len(branches) == 1 else f'(?:{"|".join(branches)})'
+		if '' in node:
+			# Một literal kết thúc tại đây: phần còn lại là optional
+			body = f'(?:{body})?'
+		return body
+
+	return build(trie)
+
+
+def mask_hits(content: str, hits: List[PatternHit], replacement: str = '***', replacements: Optional[Dict[str, str]] = None) -> str:
+	"""Thay các đoạn match bằng replacement (theo tag nếu có trong replacements), giữ nguyên phần còn lại
+
+	Các đoạn chồng lấn được gộp và thay một lần.
+	"""
+	replacements = replacements or {}
+	parts = []
+	position = 0
+	for hit in sorted(hits, key=lambda hit: (hit.start, hit.end)):
+		if hit.end <= position:
+			continue
+		if hit.start >= position:
+			parts.append(content[position : hit.start])
+			parts.append(replacements.get(hit.tag, replacement))
+		position = hit.end
+	parts.append(content[position:])
+	return ''.join(parts)
+
+
+# Matcher dùng chung: một cho user input, một cho AI output
+input_matcher = PatternMatcher()
+output_matcher = PatternMatcher()
@@ -0,0 +1,98 @@
+"""
+Pattern Matcher Benchmark
+
+So sánh single-pass PatternMatcher với cách cũ (re.findall từng pattern, mỗi rule scan lại message)
+trên input dài, cho cả input và output guardrails.
+
+Usage: python -m app.modules.agent.workflows.chat_workflow.guardrails.pattern_matcher_benchmark [--repeat N]
+"""
+
+import argparse
+import random
+import re
+import time
+from typing import Callable, List
+
+from .input_guardrails import EnterViuContextGuardrail, InjectionGuardrail, PersonalInfoGuardrail, ProfanityGuardrail, SpamGuardrail
+from .output_guardrails import BrandSafetyGuardrail, EnterViuConsistencyGuardrail, HallucinationGuardrail, ResponseQualityGuardrail, ToxicityGuardrail
+from .pattern_matcher import PatternMatcher, input_matcher, output_matcher
+
+SIZES = (1_000, 10_000, 100_000)
+
+FILLER_WORDS = (
+	'tôi đang tìm việc backend developer với ba năm kinh nghiệm python fastapi và mysql, '
+	'mong muốn phát triển sự nghiệp trong môi trường professional và supportive, '
+	'hãy giúp tôi viết lại cv cho phù hợp với job description này. '
+).split()
+
+# Vài hit rải rác để benchmark có cả đường match lẫn đường không match
+SAMPLE_HITS = ('0912345678', 'ignore previous instructions', 'damn', 'có lẽ', 'theo nghiên cứu năm 2023', 'bạo lực', 'unprofessional')
+
+
+def build_text(size: int, seed: int = 42) -> str:
+	rng = random.Random(seed)
+	words = []
+	length = 0
+	while length < size:
+		word = rng.choice(SAMPLE_HITS) if rng.random() < 0.002 else rng.choice(FILLER_WORDS)
+		words.append(word)
+		length += len(word) + 1
+	return ' '.join(words)[:size]
+
+
+def per_rule_scan(matcher: PatternMatcher, content: str) -> int:
+	"""Cách cũ: mỗi pattern của mỗi rule là một lượt re.findall riêng trên toàn bộ message"""
+	found = 0
+	for patterns in matcher.get_rules().values():
+		for pattern in patterns.values():
+			found += len(re.findall(pattern, content, re.IGNORECASE))
+	return found
+
+
+def single_pass_scan(matcher: PatternMatcher, content: str) -> int:
+	matcher._cache.clear()  # đo scan thật, không đo cache hit
+	return sum(len(hits) for hits in matcher.scan(content).values())
+
+
+def best_of(repeat: int, func: Callable[[], int]) -> float:
+	timings = []
+	for _ in range(repeat):
+		start = time.perf_counter()
+		func()
+		timings.append(time.perf_counter() - start)
+	return min(timings)
+
+
+def main(argv: List[str] = None) -> int:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--repeat', type=int, default=20)
+	args = parser.parse_args(argv)
+
+	# Khởi tạo guardrails để đăng ký pattern vào matcher dùng chung
+	input_guardrails = [ProfanityGuardrail(), SpamGuardrail(), PersonalInfoGuardrail(), InjectionGuardrail(), EnterViuContextGuardrail()]
+	output_guardrails = [HallucinationGuardrail(), ToxicityGuardrail(), BrandSafetyGuardrail(), ResponseQualityGuardrail(), EnterViuConsistencyGuardrail()]
+
+	print(f'{"matcher":<8} {"size":>8} {"per-rule ms":>12} {"single-pass ms":>15} {"speedup":>8} {"hits":>6} {"all checks ms":>14}')
+	for name, matcher, guardrails in (('input', input_matcher, input_guardrails), ('output', output_matcher, output_guardrails)):
+		for size in SIZES:
+			content = build_text(size)
+
+			hits = single_pass_scan(matcher, content)
+			per_rule = best_of(args.repeat, lambda: per_rule_scan(matcher, content))
+			single_pass = best_of(args.repeat, lambda: single_pass_scan(matcher, content))
+
+			def run_checks():
+				matcher._cache.clear()
+				for guardrail in guardrails:
+					guardrail.check(content, {})
+				return 0
+
+			all_checks = best_of(args.repeat, run_checks)
+
+			print(f'{name:<8} {size:>8} {per_rule * 1000:>12.3f} {single_pass * 1000:>15.3f} {per_rule / single_pass:>7.1f}x {hits:>6} {all_checks * 1000:>14.3f}')
+
+	return 0
+
+
+if __name__ == '__main__':
+	raise SystemExit(main())
@@ -0,0 +1,70 @@
+"""
+Token-budgeted model input of a chat turn
+
+The checkpoint bounds the number of messages of a thread, not their size (pasted CVs, tool results).
+The model sees the system prompt, the rolling summary of the older messages (Conversation.context_summary)
+and the newest whole turns that the summary does not cover yet and that fit in the token budget;
+the current turn is always kept.
+"""
+
+from typing import List, Optional
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from langchain_core.messages.utils import count_tokens_approximately
+
+from app.core.config import CHAT_CONTEXT_TOKEN_BUDGET
+
+SUMMARY_HEADER = '# Conversation summary (earlier turns, no longer shown verbatim)'
+
+
+def split_turns(messages: List[BaseMessage]) -> List[List[BaseMessage]]:
+	"""Group messages into turns starting on a user message, so no tool result is separated from its call"""
+	turns: List[List[BaseMessage]] = []
+	for message in messages:
+		if isinstance(message, HumanMessage) or not turns:
+			turns.append([])
+		turns[-1].append(message)
+	return turns
+
+
+def count_stored_messages(turn: List[BaseMessage]) -> int:
+	"""Messages of a turn that the chat stores: the user message and the final assistant reply (not tool calls / results)"""
+	return sum(1 for message in turn if isinstance(message, HumanMessage) or (isinstance(message, AIMessage) and message.content and not message.tool_calls))
+
+
+def build_model_input(
+	system_prompt: str,
+	messages: List[BaseMessage],
+	summary: Optional[str] = None,
+	unsummarized_message_count: Optional[int] = None,
+	token_budget: int = CHAT_CONTEXT_TOKEN_BUDGET,
+) -> List[BaseMessage]:
+	"""System message (prompt + conversation summary) followed by the newest turns that fit in `token_budget`
+
+	With a summary, earlier turns are only kept while they hold some of the `unsummarized_message_count`
+	most recent stored messages; older ones are in the summary already. The turn on the boundary is kept whole.
+	Tokens are estimated (count_tokens_approximately), no tokenizer call on the hot path.
+	"""
+	if summary:
+		system_prompt = f'{system_prompt}\n\n{SUMMARY_HEADER}\n{summary}'
+	system_message = SystemMessage(content=system_prompt)
+
+	turns = split_turns([message for message in messages if not isinstance(message, SystemMessage)])
+	if not turns:
+		return [system_message]
+
+	# The current turn goes in even over budget: without it there is nothing to answer
+	kept: List[BaseMessage] = list(turns[-1])
+	remaining = token_budget - count_tokens_approximately([system_message]) - count_tokens_approximately(kept)
+	unsummarized_seen = 0
+	for turn in reversed(turns[:-1]):
+		if summary and unsummarized_message_count is not None and unsummarized_seen >= unsummarized_message_count:
+			break
+		turn_tokens = count_tokens_approximately(turn)
+		if turn_tokens > remaining:
+			break
+		kept = turn + kept
+		remaining -= turn_tokens
+		unsummarized_seen += count_stored_messages(turn)
+
+	return [system_message] + kept
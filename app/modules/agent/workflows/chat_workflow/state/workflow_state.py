@@ -4,9 +4,38 @@ Streamlined state management with essential fields only
 """
 
 from typing import Dict, List, Optional, Annotated, TypedDict, Any
-from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage
 from langgraph.graph.message import add_messages
 
+from app.core.config import CHECKPOINT_MESSAGE_WINDOW
+
+
+def trim_message_window(messages: List[BaseMessage], window: int) -> List[BaseMessage]:
+	"""Keep the last `window` messages, starting on a user turn so no tool result loses its call"""
+	if window <= 0 or len(messages) <= window:
+		return messages
+
+	start = len(messages) - window
+	while start < len(messages) and not isinstance(messages[start], HumanMessage):
+		start += 1
+	if start == len(messages):
+		# A single turn longer than the window: keep that whole turn
+		start = len(messages) - window
+		while start > 0 and not isinstance(messages[start], HumanMessage):
+			start -= 1
+
+	return messages[start:]
+
+
+def add_messages_window(left: List[BaseMessage], right: List[BaseMessage]) -> List[BaseMessage]:
+	"""add_messages bounded to CHECKPOINT_MESSAGE_WINDOW messages
+
+	System prompts are rebuilt from the run config on every turn, so they are never kept.
+	"""
+	merged = add_messages(left, right)
+	merged = [message for message in merged if not isinstance(message, SystemMessage)]
+	return trim_message_window(merged, CHECKPOINT_MESSAGE_WINDOW)
+
 
 class AgentState(TypedDict):
 	"""
@@ -16,7 +45,7 @@ class AgentState(TypedDict):
 	"""
 
 	# Core conversation state
-	messages: Annotated[List[BaseMessage], add_messages]
+	messages: Annotated[List[BaseMessage], add_messages_window]
 
 	# Basic metadata
 	conversation_id: Optional[str]
@@ -4,14 +4,15 @@ CV Profile update tool for chat workflow
 
 import json
 import logging
-import asyncio
 from datetime import datetime
 from langchain_core.tools import tool
 from sqlalchemy.orm import Session
 from app.modules.chat.dal.conversation_dal import ConversationDAL
+from app.modules.chat.services.conversation_context_service import conversation_context_cache
 from app.modules.cv_extraction.repository.cv_repo import CVRepo
 from app.modules.cv_extraction.schemas.cv import ProcessCVRequest
 from app.exceptions.exception import ValidationException
+from app.utils.n8n_api_client import run_async
 
 logger = logging.getLogger(__name__)
 
@@ -25,12 +26,9 @@ def get_cv_profile_tool(db_session: Session):
 	def update_cv_profile(conversation_id: str, cv_file_url: str) -> str:
 		"""Update user CV profile in conversation metadata by processing CV file."""
 		try:
-			# Process CV file using asyncio
+			# Process CV file on a loop of its own (the tool runs in a worker thread)
 			request = ProcessCVRequest(cv_file_url=cv_file_url)
-			loop = asyncio.new_event_loop()
-			asyncio.set_event_loop(loop)
-			result = loop.run_until_complete(cv_repo.process_cv(request))
-			loop.close()
+			result = run_async(cv_repo.process_cv(request))
 
 			if result.error_code != 0:
 				return f'Failed to process CV: {result.message}'
@@ -65,6 +63,7 @@ def get_cv_profile_tool(db_session: Session):
 			# Update conversation
 			conversation.extra_metadata = json.dumps(existing_metadata)
 			db_session.commit()
+			conversation_context_cache.invalidate(conversation_id)
 
 			return 'CV profile updated successfully in conversation metadata'
 
@@ -7,49 +7,23 @@ import logging
 import json
 from typing import Dict, Any, Optional
 from datetime import datetime
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
 from sqlalchemy.orm import Session
 
 from app.utils.n8n_api_client import n8n_client
 from app.exceptions.exception import ValidationException
 
-logger = logging.getLogger(__name__)
-
-# Global variables to store context for the current request
-_current_authorization_token: Optional[str] = None
-_current_conversation_id: Optional[str] = None
-_current_user_id: Optional[str] = None
-
-
-def set_authorization_token(token: str):
-	"""Set authorization token for N8N API calls in current context"""
-	global _current_authorization_token
-	_current_authorization_token = token
-	print(f'[QuestionComposer] Authorization token set: {token[:20] if token else None}...')
-
+from .tool_context import get_tool_context
 
-def set_conversation_context(conversation_id: str, user_id: str = None):
-	"""Set conversation context for current request"""
-	global _current_conversation_id, _current_user_id
-	_current_conversation_id = conversation_id
-	_current_user_id = user_id
-	logger.info(f'[QuestionComposer] Context set - Conversation: {conversation_id}, User: {user_id}')
-
-
-def get_authorization_token() -> Optional[str]:
-	"""Get current authorization token"""
-	return _current_authorization_token
-
-
-def get_conversation_context() -> tuple[Optional[str], Optional[str]]:
-	"""Get current conversation context (conversation_id, user_id)"""
-	return _current_conversation_id, _current_user_id
+logger = logging.getLogger(__name__)
 
 
 @tool(return_direct=False)
 async def generate_survey_questions(
 	description: str = 'Generate personalized survey questions based on user request',
 	custom_prompt: str = 'Ask user with a super long question',
+	config: RunnableConfig = None,
 ) -> str:
 	"""
 	🔥 CRITICAL TOOL: Generate intelligent survey questions using N8N API and send to frontend via WebSocket.
@@ -88,9 +62,10 @@ async def generate_survey_questions(
 	    Success message confirming survey was generated and sent to user interface
 	"""
 
-	# Get context from global variables
-	conversation_id, user_id = get_conversation_context()
-	authorization_token = get_authorization_token()
+	# Get context of the current run
+	context = get_tool_context(config)
+	conversation_id, user_id = context.conversation_id, context.user_id
+	authorization_token = context.authorization_token
 
 	logger.info(f'[generate_survey_questions] 🔧 Context - Conversation: {conversation_id}, User: {user_id}')
 	logger.info(f'[generate_survey_questions] 🔐 Authorization token available: {bool(authorization_token)}')
@@ -146,13 +121,12 @@ async def _send_survey_to_frontend(conversation_id: str, user_id: str, n8n_respo
 			'timestamp': datetime.now().isoformat(),
 		}
 
-		# Send via WebSocket if user is connected
-		if user_id and user_id in websocket_manager.active_connections:
+		# Send via WebSocket; the registry reaches the user on whichever worker holds the socket
+		if user_id:
 			print(f'[_send_survey_to_frontend] Sending survey data via WebSocket to user: {user_id}')
 			await websocket_manager.send_message(user_id, survey_message)
-			print('[_send_survey_to_frontend] Survey data sent successfully via WebSocket')
 		else:
-			logger.warning(f'[_send_survey_to_frontend] User {user_id} not connected to WebSocket')
+			logger.warning(f'[_send_survey_to_frontend] No user to deliver survey data to')
 
 		return session_id
 
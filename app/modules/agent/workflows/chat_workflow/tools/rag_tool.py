@@ -3,17 +3,30 @@ RAG Tool for Chat Agent - version as a proper LangChain tool
 This tool provides RAG functionality that can be called by the agent when needed
 """
 
+import asyncio
 import logging
-import json
-from typing import Dict, Any, Optional
+from typing import Any, Dict, List, Optional, Tuple
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
 from sqlalchemy.orm import Session
 
+from app.core.config import RAG_SEARCH_MAX_TOP_K, RAG_SEARCH_TIMEOUT_SECONDS
+from app.modules.agentic_rag.core.config import DEFAULT_COLLECTION
+from app.modules.agentic_rag.core.rank_fusion import reciprocal_rank_fusion
+from app.modules.agentic_rag.schemas.kb_schema import QueryRequest, QueryResponseItem
+
+from .tool_context import get_tool_context
+
 logger = logging.getLogger(__name__)
 
+SOURCE_LABELS = {
+	'conversation': 'Conversation files',
+	'global': 'Global knowledge',
+}
+
 
 @tool
-async def rag_search(conversation_id: str, query: str, top_k: int = 5) -> str:
+async def rag_search(query: str, top_k: int = 5, config: RunnableConfig = None) -> str:
 	"""
 	Search for relevant information using RAG (Retrieval Augmented Generation).
 
@@ -24,112 +37,87 @@ async def rag_search(conversation_id: str, query: str, top_k: int = 5) -> str:
 	- Retrieve relevant CV or profile data
 
 	Args:
-	        conversation_id: ID of the current conversation
 	        query: What to search for
 	        top_k: Number of results to return (default: 5)
 
 	Returns:
-	        JSON string containing search results and context
+	        Search results with their sources
 	"""
-	logger.info(f'[rag_search] Searching for: "{query}" in conversation: {conversation_id}')
+	conversation_id = get_tool_context(config).conversation_id
+	top_k = max(1, min(top_k, RAG_SEARCH_MAX_TOP_K))
+	logger.info(f'[rag_search] Searching for: "{query}" in conversation: {conversation_id} (top_k={top_k})')
 
 	try:
-		# Placeholder implementation - will be enhanced with actual RAG
-		results = {
-			'query': query,
-			'conversation_id': conversation_id,
-			'results': [],
-			'context': '',
-			'sources': [],
-		}
+		# Conversation files and the global KB are searched together
+		collections = [('global', DEFAULT_COLLECTION)]
+		if conversation_id:
+			collections.insert(0, ('conversation', f'conversation_{conversation_id}'))
 
-		# Try to get conversation-specific context
-		conv_context = await _search_conversation_context(conversation_id, query, top_k)
-		if conv_context:
-			results['results'].extend(conv_context)
-			results['context'] += f'Conversation Context: {" ".join([r.get("content", "") for r in conv_context])}\n\n'
+		results = await hybrid_search(query, collections, top_k, timeout_seconds=RAG_SEARCH_TIMEOUT_SECONDS)
+		logger.info(f'[rag_search] Found {len(results)} total results')
 
-		# Try to get global knowledge
-		global_context = await _search_global_knowledge(query, top_k)
-		if global_context:
-			results['results'].extend(global_context)
-			results['context'] += f'Global Knowledge: {" ".join([r.get("content", "") for r in global_context])}'
-
-		logger.info(f'[rag_search] Found {len(results["results"])} total results')
-
-		if results['context']:
-			return f'🔍 RAG Search Results:\n\n{results["context"]}\n\nSources: {len(results["results"])} documents found'
-		else:
+		if not results:
 			return '🔍 No relevant information found in the knowledge base for this query.'
+		return _format_results(results)
 
 	except Exception as e:
 		logger.error(f'[rag_search] Error in RAG search: {str(e)}')
 		return f'❌ RAG search failed: {str(e)}'
 
 
-async def _search_conversation_context(conversation_id: str, query: str, top_k: int) -> list:
-	"""Search conversation-specific context (files, CV data, etc.)"""
-	try:
-		# This would be replaced with actual conversation RAG implementation
-		logger.info(f'[_search_conversation_context] Searching conversation {conversation_id} for: {query}')
-
-		# Placeholder - check for CV-related keywords
-		cv_keywords = [
-			'cv',
-			'resume',
-			'experience',
-			'skill',
-			'education',
-			'work',
-			'job',
-			'career',
-		]
-		if any(keyword in query.lower() for keyword in cv_keywords):
-			return [
-				{
-					'content': f'CV and profile information for conversation {conversation_id}',
-					'source': 'cv_data',
-					'relevance': 0.9,
-				}
-			]
-
-		return []
-
-	except Exception as e:
-		logger.error(f'[_search_conversation_context] Error: {str(e)}')
-		return []
-
+async def hybrid_search(query: str, collections: List[Tuple[str, str]], top_k: int, timeout_seconds: Optional[float] = None) -> List[Dict[str, Any]]:
+	"""Hybrid (BM25 sparse + dense) search of several collections at once, merged with reciprocal rank fusion
 
-async def _search_global_knowledge(query: str, top_k: int) -> list:
-	"""Search global knowledge base"""
-	try:
-		# This would be replaced with actual global KB implementation
-		logger.info(f'[_search_global_knowledge] Searching global KB for: {query}')
-
-		# Placeholder - provide generic career advice for career-related queries
-		career_keywords = [
-			'cv',
-			'interview',
-			'job',
-			'career',
-			'skill',
-			'experience',
-			'resume',
-		]
-		if any(keyword in query.lower() for keyword in career_keywords):
-			return [
-				{
-					'content': 'General career and CV best practices: Focus on achievements, use action verbs, tailor to job requirements, include relevant skills and experience.',
-					'source': 'global_knowledge',
-					'relevance': 0.8,
-				}
-			]
-
-		return []
+	Args:
+	        query: Search query
+	        collections: (source, collection_id) pairs
+	        top_k: Max results overall
+	        timeout_seconds: Latency budget; collections that have not answered by then are skipped
 
-	except Exception as e:
-		logger.error(f'[_search_global_knowledge] Error: {str(e)}')
-		return []
+	Returns:
+	        Results (content, metadata, source, collection_id, score), best first
+	"""
+	from app.modules.agentic_rag.repository.kb_repo import KBRepository
+
+	kb_repo = KBRepository()
+	request = QueryRequest(query=query, top_k=top_k)
+	tasks = {asyncio.create_task(kb_repo.hybrid_query(request, collection_id=collection_id)): (source, collection_id) for source, collection_id in collections}
+
+	done, pending = await asyncio.wait(tasks, timeout=timeout_seconds)
+	for task in pending:
+		task.cancel()
+		logger.warning(f'[hybrid_search] Collection {tasks[task][1]} exceeded the {timeout_seconds}s budget, skipped')
+
+	result_lists: List[List[Tuple[str, str, QueryResponseItem]]] = []
+	for task in done:
+		source, collection_id = tasks[task]
+		if task.exception() is not None:
+			logger.error(f'[hybrid_search] Search failed in collection {collection_id}: {task.exception()}')
+			continue
+		result_lists.append([(source, collection_id, item) for item in task.result().results])
+
+	fused = reciprocal_rank_fusion(result_lists, key=lambda result: (result[1], result[2].id or result[2].content))[:top_k]
+	return [
+		{
+			'content': item.content or '',
+			'metadata': item.metadata or {},
+			'source': source,
+			'collection_id': collection_id,
+			'score': fused_score,
+		}
+		for (source, collection_id, item), fused_score in fused
+	]
+
+
+def _format_results(results: List[Dict[str, Any]]) -> str:
+	parts = []
+	for i, result in enumerate(results, start=1):
+		metadata = result['metadata']
+		label = SOURCE_LABELS.get(result['source'], result['source'])
+		name = metadata.get('file_name') or metadata.get('source') or metadata.get('title')
+		header = f'[{i}] {label}' + (f' - {name}' if name else '')
+		parts.append(f'{header}:\n{result["content"]}')
+	return f'🔍 RAG Search Results:\n\n' + '\n\n'.join(parts) + f'\n\nSources: {len(results)} documents found'
 
 
 # Factory function for backward compatibility with the old RAGTool class
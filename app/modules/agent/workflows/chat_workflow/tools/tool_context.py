@@ -0,0 +1,31 @@
+"""
+Per-run context for chat workflow tools
+
+Tools receive the LangGraph run config (declare a `config: RunnableConfig` parameter,
+LangChain injects it and keeps it out of the tool schema) and read the caller's
+conversation, user and N8N token from it, so concurrent turns never share state.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+from langchain_core.runnables import RunnableConfig
+
+
+@dataclass(frozen=True)
+class ToolContext:
+	"""Caller context of one workflow run"""
+
+	conversation_id: Optional[str] = None
+	user_id: Optional[str] = None
+	authorization_token: Optional[str] = None
+
+
+def get_tool_context(config: Optional[RunnableConfig]) -> ToolContext:
+	"""Read the tool context from a run config built by LangGraphService"""
+	configurable = (config or {}).get('configurable', {})
+	return ToolContext(
+		conversation_id=configurable.get('conversation_id') or configurable.get('thread_id'),
+		user_id=configurable.get('user_id'),
+		authorization_token=configurable.get('authorization_token'),
+	)
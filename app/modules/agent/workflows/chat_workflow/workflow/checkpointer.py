@@ -0,0 +1,486 @@
+"""
+Persistent Checkpointer for Chat Workflow
+
+SQL-backed LangGraph checkpoint saver that keeps only the latest checkpoint of each
+thread (plus the pending writes of that checkpoint), so a conversation costs one row
+however long it runs. Rows live in the app's MySQL database by default, shared by
+every API instance (a SQLite file only works for a single instance), survive
+restarts, and expire after a TTL.
+
+The message window itself is bounded by the state reducer (see workflow_state.py);
+this saver records the size of what it stores for per-thread metrics.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+	WRITES_IDX_MAP,
+	BaseCheckpointSaver,
+	ChannelVersions,
+	Checkpoint,
+	CheckpointMetadata,
+	CheckpointTuple,
+	get_checkpoint_id,
+	get_checkpoint_metadata,
+)
+from sqlalchemy import (
+	Column,
+	DateTime,
+	Integer,
+	LargeBinary,
+	MetaData,
+	String,
+	Table,
+	create_engine,
+	delete,
+	func,
+	select,
+)
+from sqlalchemy.dialects import mysql
+from sqlalchemy.engine import Engine
+
+from app.core.config import (
+	CHECKPOINT_DATABASE_URL,
+	CHECKPOINT_TTL_SECONDS,
+	DATABASE_URL,
+)
+
+logger = logging.getLogger(__name__)
+
+# BLOB caps at 64KB on MySQL, long conversations need more
+_Blob = LargeBinary().with_variant(mysql.LONGBLOB(), 'mysql')
+
+# Expired threads are swept at most this often from put()
+EVICTION_INTERVAL_SECONDS = 300
+
+# Created by Alembic (migration 6a2d9f4c8e51) in the app database, by the saver itself in a separate store
+metadata = MetaData()
+
+checkpoints_table = Table(
+	'langgraph_checkpoints',
+	metadata,
+	Column('thread_id', String(255), primary_key=True),
+	Column('checkpoint_ns', String(255), primary_key=True, default=''),
+	Column('checkpoint_id', String(64), nullable=False),
+	Column('parent_checkpoint_id', String(64), nullable=True),
+	Column('checkpoint_type', String(32), nullable=False),
+	Column('checkpoint', _Blob, nullable=False),
+	Column('metadata_type', String(32), nullable=False),
+	Column('checkpoint_metadata', _Blob, nullable=False),
+	Column('message_count', Integer, nullable=False, default=0),
+	Column('size_bytes', Integer, nullable=False, default=0),
+	Column('updated_at', DateTime(timezone=True), nullable=False, index=True),
+)
+
+writes_table = Table(
+	'langgraph_checkpoint_writes',
+	metadata,
+	Column('thread_id', String(255), primary_key=True),
+	Column('checkpoint_ns', String(255), primary_key=True, default=''),
+	Column('checkpoint_id', String(64), primary_key=True),
+	Column('task_id', String(64), primary_key=True),
+	Column('idx', Integer, primary_key=True),
+	Column('channel', String(255), nullable=False),
+	Column('value_type', String(32), nullable=False),
+	Column('value', _Blob, nullable=False),
+	Column('task_path', String(255), nullable=False, default=''),
+)
+
+
+class SQLCheckpointSaver(BaseCheckpointSaver[str]):
+	"""Latest-checkpoint-only saver with TTL eviction
+
+	Only the newest checkpoint of a thread is kept, so `list()` yields at most one
+	entry per namespace and older checkpoint ids are not retrievable (no time travel).
+	"""
+
+	def __init__(self, engine: Engine, ttl_seconds: int = CHECKPOINT_TTL_SECONDS, create_tables: bool = True, **kwargs):
+		super().__init__(**kwargs)
+		self.engine = engine
+		self.ttl_seconds = ttl_seconds
+		self._last_eviction = 0.0
+		self._eviction_lock = threading.Lock()
+		if create_tables:
+			metadata.create_all(engine, checkfirst=True)
+
+	@classmethod
+	def from_url(cls, url: str, ttl_seconds: int = CHECKPOINT_TTL_SECONDS) -> 'SQLCheckpointSaver':
+		"""Create a saver for a database URL, making room for a SQLite file if needed"""
+		connect_args = {}
+		if url.startswith('sqlite'):
+			# Async graph runs hop between threads of the default executor
+			connect_args['check_same_thread'] = False
+			path = url.split(':///', 1)[-1] if ':///' in url else ''
+			if path and path != ':memory:':
+				os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+			logger.warning(f'[SQLCheckpointSaver] Checkpoints are stored in {url}, local to this host: run a single API instance or use the shared database')
+		engine = create_engine(url, pool_pre_ping=True, connect_args=connect_args)
+		# The app database schema is managed by Alembic
+		return cls(engine, ttl_seconds=ttl_seconds, create_tables=url != DATABASE_URL)
+
+	# ---- helpers -------------------------------------------------------------
+
+	def _expiry_cutoff(self) -> Optional[datetime]:
+		if self.ttl_seconds <= 0:
+			return None
+		return datetime.now(timezone.utc) - timedelta(seconds=self.ttl_seconds)
+
+	@staticmethod
+	def _thread_key(config: RunnableConfig) -> Tuple[str, str]:
+		configurable = config['configurable']
+		return configurable['thread_id'], configurable.get('checkpoint_ns', '')
+
+	def _load_writes(self, conn, thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> list:
+		rows = conn.execute(
+			select(writes_table)
+			.where(
+				writes_table.c.thread_id == thread_id,
+				writes_table.c.checkpoint_ns == checkpoint_ns,
+				writes_table.c.checkpoint_id == checkpoint_id,
+			)
+			.order_by(writes_table.c.task_id, writes_table.c.idx)
+		).mappings()
+		return [(row['task_id'], row['channel'], self.serde.loads_typed((row['value_type'], row['value']))) for row in rows]
+
+	def _row_to_tuple(self, conn, row) -> CheckpointTuple:
+		thread_id, checkpoint_ns, checkpoint_id = row['thread_id'], row['checkpoint_ns'], row['checkpoint_id']
+		parent_checkpoint_id = row['parent_checkpoint_id']
+		return CheckpointTuple(
+			config={
+				'configurable': {
+					'thread_id': thread_id,
+					'checkpoint_ns': checkpoint_ns,
+					'checkpoint_id': checkpoint_id,
+				}
+			},
+			checkpoint=self.serde.loads_typed((row['checkpoint_type'], row['checkpoint'])),
+			metadata=self.serde.loads_typed((row['metadata_type'], row['checkpoint_metadata'])),
+			parent_config=(
+				{
+					'configurable': {
+						'thread_id': thread_id,
+						'checkpoint_ns': checkpoint_ns,
+						'checkpoint_id': parent_checkpoint_id,
+					}
+				}
+				if parent_checkpoint_id
+				else None
+			),
+			pending_writes=self._load_writes(conn, thread_id, checkpoint_ns, checkpoint_id),
+		)
+
+	def _maybe_evict(self) -> None:
+		"""Sweep expired threads, throttled so puts stay cheap"""
+		now = time.monotonic()
+		if now - self._last_eviction < EVICTION_INTERVAL_SECONDS or not self._eviction_lock.acquire(blocking=False):
+			return
+		try:
+			self._last_eviction = now
+			self.evict_expired()
+		except Exception as e:
+			logger.error(f'[SQLCheckpointSaver] Eviction failed: {e}')
+		finally:
+			self._eviction_lock.release()
+
+	# ---- BaseCheckpointSaver -------------------------------------------------
+
+	def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+		thread_id, checkpoint_ns = self._thread_key(config)
+		query = select(checkpoints_table).where(
+			checkpoints_table.c.thread_id == thread_id,
+			checkpoints_table.c.checkpoint_ns == checkpoint_ns,
+		)
+		if checkpoint_id := get_checkpoint_id(config):
+			query = query.where(checkpoints_table.c.checkpoint_id == checkpoint_id)
+		cutoff = self._expiry_cutoff()
+		if cutoff is not None:
+			query = query.where(checkpoints_table.c.updated_at >= cutoff)
+
+		with self.engine.connect() as conn:
+			row = conn.execute(query).mappings().first()
+			return self._row_to_tuple(conn, row) if row else None
+
+	def list(
+		self,
+		config: Optional[RunnableConfig],
+		*,
+		filter: Optional[Dict[str, Any]] = None,
+		before: Optional[RunnableConfig] = None,
+		limit: Optional[int] = None,
+	) -> Iterator[CheckpointTuple]:
+		query = select(checkpoints_table).order_by(checkpoints_table.c.checkpoint_id.desc())
+		if config:
+			query = query.where(checkpoints_table.c.thread_id == config['configurable']['thread_id'])
+			if (checkpoint_ns := config['configurable'].get('checkpoint_ns')) is not None:
+				query = query.where(checkpoints_table.c.checkpoint_ns == checkpoint_ns)
+			if checkpoint_id := get_checkpoint_id(config):
+				query = query.where(checkpoints_table.c.checkpoint_id == checkpoint_id)
+		if before and (before_checkpoint_id := get_checkpoint_id(before)):
+			query = query.where(checkpoints_table.c.checkpoint_id < before_checkpoint_id)
+
+		with self.engine.connect() as conn:
+			rows = conn.execute(query).mappings().all()
+			for row in rows:
+				checkpoint_tuple = self._row_to_tuple(conn, row)
+				if filter and not all(checkpoint_tuple.metadata.get(key) == value for key, value in filter.items()):
+					continue
+				if limit is not None:
+					if limit <= 0:
+						break
+					limit -= 1
+				yield checkpoint_tuple
+
+	def put(
+		self,
+		config: RunnableConfig,
+		checkpoint: Checkpoint,
+		metadata: CheckpointMetadata,
+		new_versions: ChannelVersions,
+	) -> RunnableConfig:
+		thread_id, checkpoint_ns = self._thread_key(config)
+		checkpoint_type, checkpoint_blob = self.serde.dumps_typed(checkpoint)
+		metadata_type, metadata_blob = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+		messages = checkpoint.get('channel_values', {}).get('messages') or []
+
+		with self.engine.begin() as conn:
+			conn.execute(
+				delete(checkpoints_table).where(
+					checkpoints_table.c.thread_id == thread_id,
+					checkpoints_table.c.checkpoint_ns == checkpoint_ns,
+				)
+			)
+			# Writes of the replaced checkpoint are folded into this one
+			conn.execute(
+				delete(writes_table).where(
+					writes_table.c.thread_id == thread_id,
+					writes_table.c.checkpoint_ns == checkpoint_ns,
+					writes_table.c.checkpoint_id != checkpoint['id'],
+				)
+			)
+			conn.execute(
+				checkpoints_table.insert().values(
+					thread_id=thread_id,
+					checkpoint_ns=checkpoint_ns,
+					checkpoint_id=checkpoint['id'],
+					parent_checkpoint_id=config['configurable'].get('checkpoint_id'),
+					checkpoint_type=checkpoint_type,
+					checkpoint=checkpoint_blob,
+					metadata_type=metadata_type,
+					checkpoint_metadata=metadata_blob,
+					message_count=len(messages),
+					size_bytes=len(checkpoint_blob) + len(metadata_blob),
+					updated_at=datetime.now(timezone.utc),
+				)
+			)
+
+		self._maybe_evict()
+
+		return {
+			'configurable': {
+				'thread_id': thread_id,
+				'checkpoint_ns': checkpoint_ns,
+				'checkpoint_id': checkpoint['id'],
+			}
+		}
+
+	def put_writes(
+		self,
+		config: RunnableConfig,
+		writes: Sequence[Tuple[str, Any]],
+		task_id: str,
+		task_path: str = '',
+	) -> None:
+		thread_id, checkpoint_ns = self._thread_key(config)
+		checkpoint_id = config['configurable']['checkpoint_id']
+
+		with self.engine.begin() as conn:
+			existing = set(
+				conn.execute(
+					select(writes_table.c.idx).where(
+						writes_table.c.thread_id == thread_id,
+						writes_table.c.checkpoint_ns == checkpoint_ns,
+						writes_table.c.checkpoint_id == checkpoint_id,
+						writes_table.c.task_id == task_id,
+					)
+				).scalars()
+			)
+			for idx, (channel, value) in enumerate(writes):
+				write_idx = WRITES_IDX_MAP.get(channel, idx)
+				if write_idx in existing:
+					# Regular writes are immutable, special ones (errors, interrupts) are replaced
+					if write_idx >= 0:
+						continue
+					conn.execute(
+						delete(writes_table).where(
+							writes_table.c.thread_id == thread_id,
+							writes_table.c.checkpoint_ns == checkpoint_ns,
+							writes_table.c.checkpoint_id == checkpoint_id,
+							writes_table.c.task_id == task_id,
+							writes_table.c.idx == write_idx,
+						)
+					)
+				value_type, value_blob = self.serde.dumps_typed(value)
+				conn.execute(
+					writes_table.insert().values(
+						thread_id=thread_id,
+						checkpoint_ns=checkpoint_ns,
+						checkpoint_id=checkpoint_id,
+						task_id=task_id,
+						idx=write_idx,
+						channel=channel,
+						value_type=value_type,
+						value=value_blob,
+						task_path=task_path,
+					)
+				)
+
+	def delete_thread(self, thread_id: str) -> None:
+		with self.engine.begin() as conn:
+			conn.execute(delete(writes_table).where(writes_table.c.thread_id == thread_id))
+			conn.execute(delete(checkpoints_table).where(checkpoints_table.c.thread_id == thread_id))
+
+	# Database calls run on the default executor so graph runs don't block the event loop
+
+	async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+		return await asyncio.to_thread(self.get_tuple, config)
+
+	async def alist(
+		self,
+		config: Optional[RunnableConfig],
+		*,
+		filter: Optional[Dict[str, Any]] = None,
+		before: Optional[RunnableConfig] = None,
+		limit: Optional[int] = None,
+	) -> AsyncIterator[CheckpointTuple]:
+		items = await asyncio.to_thread(lambda: list(self.list(config, filter=filter, before=before, limit=limit)))
+		for item in items:
+			yield item
+
+	async def aput(
+		self,
+		config: RunnableConfig,
+		checkpoint: Checkpoint,
+		metadata: CheckpointMetadata,
+		new_versions: ChannelVersions,
+	) -> RunnableConfig:
+		return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+	async def aput_writes(
+		self,
+		config: RunnableConfig,
+		writes: Sequence[Tuple[str, Any]],
+		task_id: str,
+		task_path: str = '',
+	) -> None:
+		await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+	async def adelete_thread(self, thread_id: str) -> None:
+		await asyncio.to_thread(self.delete_thread, thread_id)
+
+	def get_next_version(self, current: Optional[str], channel: None) -> str:
+		if current is None:
+			current_v = 0
+		elif isinstance(current, int):
+			current_v = current
+		else:
+			current_v = int(current.split('.')[0])
+		return f'{current_v + 1:032}.{random.random():016}'
+
+	# ---- maintenance & metrics -----------------------------------------------
+
+	def evict_expired(self) -> int:
+		"""Delete threads idle for longer than the TTL, returns the number of threads removed"""
+		cutoff = self._expiry_cutoff()
+		if cutoff is None:
+			return 0
+
+		with self.engine.begin() as conn:
+			expired = conn.execute(select(checkpoints_table.c.thread_id, checkpoints_table.c.checkpoint_ns).where(checkpoints_table.c.updated_at < cutoff)).all()
+			for thread_id, checkpoint_ns in expired:
+				conn.execute(delete(writes_table).where(writes_table.c.thread_id == thread_id, writes_table.c.checkpoint_ns == checkpoint_ns))
+			conn.execute(delete(checkpoints_table).where(checkpoints_table.c.updated_at < cutoff))
+
+		if expired:
+			logger.info(f'[SQLCheckpointSaver] Evicted {len(expired)} expired checkpoint(s)')
+		return len(expired)
+
+	def get_thread_stats(self, thread_id: str) -> Optional[Dict[str, Any]]:
+		"""Stored size of one thread: messages kept, bytes on disk, pending writes, last update"""
+		with self.engine.connect() as conn:
+			row = (
+				conn.execute(
+					select(
+						func.sum(checkpoints_table.c.message_count).label('message_count'),
+						func.sum(checkpoints_table.c.size_bytes).label('checkpoint_bytes'),
+						func.max(checkpoints_table.c.updated_at).label('updated_at'),
+					).where(checkpoints_table.c.thread_id == thread_id)
+				)
+				.mappings()
+				.first()
+			)
+			if not row or row['updated_at'] is None:
+				return None
+			writes = (
+				conn.execute(
+					select(
+						func.count().label('count'),
+						func.coalesce(func.sum(func.length(writes_table.c.value)), 0).label('bytes'),
+					).where(writes_table.c.thread_id == thread_id)
+				)
+				.mappings()
+				.first()
+			)
+
+		return {
+			'thread_id': thread_id,
+			'message_count': int(row['message_count'] or 0),
+			'checkpoint_bytes': int(row['checkpoint_bytes'] or 0),
+			'pending_writes': int(writes['count']),
+			'pending_write_bytes': int(writes['bytes']),
+			'updated_at': row['updated_at'].isoformat(),
+		}
+
+	def get_stats(self) -> Dict[str, Any]:
+		"""Totals across all threads, for dashboards and capacity checks"""
+		with self.engine.connect() as conn:
+			row = (
+				conn.execute(
+					select(
+						func.count(func.distinct(checkpoints_table.c.thread_id)).label('threads'),
+						func.coalesce(func.sum(checkpoints_table.c.size_bytes), 0).label('total_bytes'),
+						func.coalesce(func.max(checkpoints_table.c.size_bytes), 0).label('max_bytes'),
+						func.coalesce(func.sum(checkpoints_table.c.message_count), 0).label('total_messages'),
+					)
+				)
+				.mappings()
+				.first()
+			)
+		return {
+			'threads': int(row['threads']),
+			'total_bytes': int(row['total_bytes']),
+			'max_thread_bytes': int(row['max_bytes']),
+			'total_messages': int(row['total_messages']),
+			'ttl_seconds': self.ttl_seconds,
+		}
+
+
+_checkpointer: Optional[SQLCheckpointSaver] = None
+_checkpointer_lock = threading.Lock()
+
+
+def get_checkpointer() -> SQLCheckpointSaver:
+	"""Process-wide checkpointer configured from settings"""
+	global _checkpointer
+	if _checkpointer is None:
+		with _checkpointer_lock:
+			if _checkpointer is None:
+				_checkpointer = SQLCheckpointSaver.from_url(CHECKPOINT_DATABASE_URL)
+	return _checkpointer
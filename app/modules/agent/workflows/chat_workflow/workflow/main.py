@@ -60,6 +60,12 @@ class Workflow:
 		# Initialize LLM
 		self.llm = ChatGoogleGenerativeAI(model=self.config.model_name, temperature=self.config.temperature)
 
+		# Tools, ToolNode and tool-bound model are shared by all runs (set up by WorkflowBuilder)
+		self._tools = []
+		self._tool_node = None
+		self._model_with_tools = None
+		self._model_with_tools_key = None
+
 		# Initialize Business Process Manager
 		self.business_process_manager = get_business_process_manager()
 
@@ -73,6 +79,14 @@ class Workflow:
 		self.workflow_builder = WorkflowBuilder(self)
 		self.compiled_graph = self.workflow_builder.build_workflow()
 
+	def get_model_with_tools(self):
+		"""LLM bound to the workflow tools, rebuilt only when the model or the tool set changes"""
+		key = (id(self.llm), tuple(tool.name for tool in self._tools))
+		if self._model_with_tools is None or self._model_with_tools_key != key:
+			self._model_with_tools = self.llm.bind_tools(self._tools)
+			self._model_with_tools_key = key
+		return self._model_with_tools
+
 	def _init_global_kb_service(self):
 		"""Initialize Global Knowledge Base Service"""
 		try:
@@ -19,12 +19,12 @@ from datetime import datetime
 from typing import Dict, Any, List, Optional
 
 from langchain_core.messages import AIMessage, SystemMessage, HumanMessage
-from langgraph.prebuilt import ToolNode
 logger = logging.getLogger(__name__)
 
 # Import state management
 try:
 	from ..state.workflow_state import AgentState, StateManager
+	from ..state.context_builder import build_model_input
 except ImportError as e:
 	logger.error(f"Failed to import StateManager: {e}")
 	raise
@@ -188,25 +188,27 @@ class WorkflowNodes:
 			if persona_prompt:
 				system_prompt = persona_prompt
 
+		# Conversation prompt (with CV context) comes from the run config, not the checkpoint
+		conversation_prompt = config.get("configurable", {}).get("system_prompt")
+		if conversation_prompt:
+			system_prompt = f"{system_prompt}\n\n{conversation_prompt}"
+
 		# Get messages
 		messages = state.get("messages", [])
 		if not messages:
 			return {"messages": [SystemMessage(content=system_prompt)]}
 
-		# Get ALL available tools
-		all_tools = get_tool_definitions(self.workflow.config)
-		pass
+		# Model bound to ALL available tools (built once per tool set)
+		model_with_tools = self.workflow.get_model_with_tools()
 
-		# Bind tools to model
-		try:
-			model_with_tools = self.workflow.llm.bind_tools(all_tools)
-			pass
-		except Exception as e:
-			pass
-			raise
-
-		# Prepare messages for LLM
-		enhanced_messages = [SystemMessage(content=system_prompt)] + messages
+		# Prepare messages for LLM: summary of older turns + newest turns not summarized, within the token budget
+		enhanced_messages = build_model_input(
+			system_prompt,
+			messages,
+			summary=config.get("configurable", {}).get("conversation_summary"),
+			unsummarized_message_count=config.get("configurable", {}).get("unsummarized_message_count"),
+			token_budget=self.workflow.config.context_token_budget,
+		)
 
 		pass
 
@@ -271,56 +273,12 @@ class WorkflowNodes:
 				print(f"[tools_node] Tool validation failed: {str(e)}")
 				# Continue with execution on validation error
 
-		# Update tools with authorization token and conversation context if available
+		# Tools read conversation, user and authorization token from the run config
 		auth_token = config.get("configurable", {}).get("authorization_token")
 		print(f"[tools_node] Authorization token available: {bool(auth_token)}")
 
-		if auth_token:
-			print(
-				f"[tools_node] Setting authorization token for tools: {auth_token[:20]}..."
-			)
-
-			# Set authorization token for question composer tool using global function
-			try:
-				from ..tools.question_composer_tool import (
-					set_authorization_token,
-					set_conversation_context,
-				)
-
-				set_authorization_token(auth_token)
-				set_conversation_context(conversation_id, user_id)
-				print(
-					f"[tools_node] Context set for question composer tool - Conversation: {conversation_id}, User: {user_id}"
-				)
-			except ImportError:
-				pass
-
-			# Set authorization token for JD matching tool using global function
-			try:
-				from ..tools.jd_matching_tool import (
-					set_authorization_token as set_jd_authorization_token,
-					set_conversation_context as set_jd_conversation_context,
-				)
-
-				set_jd_authorization_token(auth_token)
-				set_jd_conversation_context(conversation_id, user_id)
-				print(f'[tools_node] Context set for JD matching tool - Conversation: {conversation_id}, User: {user_id}')
-			except ImportError:
-				pass
-
-			# For any other tools that support set_authorization_token method
-			for tool in self.workflow._tools:
-				if hasattr(tool, "set_authorization_token"):
-					print(f"[tools_node] Setting token for tool: {tool.name}")
-					tool.set_authorization_token(auth_token)
-				else:
-					pass
-		else:
-			pass
-
-		# Execute tools
-		tool_node = ToolNode(self.workflow._tools)
-		result = await tool_node.ainvoke(updated_state, config or {})
+		# Execute tools with the shared ToolNode
+		result = await self.workflow._tool_node.ainvoke(updated_state, config or {})
 
 		# Track survey generation in state
 		survey_generated = False
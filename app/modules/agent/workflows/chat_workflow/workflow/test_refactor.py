@@ -52,21 +52,21 @@ def test_imports():
 		from app.modules.agent.workflows.chat_workflow.tools.jd_matching_tool import (
 			trigger_jd_matching_tool,
 			get_jd_matching_tool,
-			set_authorization_token,
-			set_conversation_context,
-			get_authorization_token,
-			get_conversation_context,
 		)
+		from app.modules.agent.workflows.chat_workflow.tools.tool_context import get_tool_context
 		print('✅ JD matching tool import successful')
 
-		# Test JD matching tool functions
-		set_authorization_token('test_token')
-		set_conversation_context('test_conversation', 'test_user')
-		token = get_authorization_token()
-		conv_id, user_id = get_conversation_context()
-		assert token == 'test_token'
-		assert conv_id == 'test_conversation'
-		assert user_id == 'test_user'
+		# Test tool context is read from the run config
+		context = get_tool_context({
+			'configurable': {
+				'authorization_token': 'test_token',
+				'conversation_id': 'test_conversation',
+				'user_id': 'test_user',
+			}
+		})
+		assert context.authorization_token == 'test_token'
+		assert context.conversation_id == 'test_conversation'
+		assert context.user_id == 'test_user'
 		print('✅ JD matching tool functions working correctly')
 
 		print('\n🎉 ALL TESTS PASSED - Refactored workflow is working correctly!')
@@ -16,10 +16,10 @@ from typing import Dict, Any
 
 from langgraph.graph import StateGraph, END
 from langgraph.prebuilt import ToolNode
-from langgraph.checkpoint.memory import MemorySaver
 
 from ..state.workflow_state import AgentState
 from ..tools.basic_tools import get_tools
+from .checkpointer import get_checkpointer
 from .nodes import WorkflowNodes
 from .routing import WorkflowRouter
 
@@ -42,10 +42,10 @@ class WorkflowBuilder:
         # Create workflow graph
         workflow = StateGraph(AgentState)
 
-        # Get tools and store for runtime updates
+        # Get tools and build the ToolNode shared by every run
         tools = get_tools(self.workflow.config)
         self.workflow._tools = tools
-        tool_node = ToolNode(tools)  # noqa: F841
+        self.workflow._tool_node = ToolNode(tools)
 
         # Register all nodes
         self._register_nodes(workflow)
@@ -56,8 +56,8 @@ class WorkflowBuilder:
         # Set entry point
         workflow.set_entry_point("input_validation")
 
-        # Compile with memory
-        checkpointer = MemorySaver()
+        # Compile with the persistent, latest-checkpoint-only saver
+        checkpointer = get_checkpointer()
         compiled_graph = workflow.compile(checkpointer=checkpointer)
 
         logger.info("[WorkflowBuilder] Workflow compilation completed")
@@ -2,6 +2,7 @@
 LangGraph implementation for Agentic RAG workflows.
 """
 
+import asyncio
 import uuid
 import logging
 from typing import Dict, List, Any, TypedDict, Optional
@@ -18,6 +19,8 @@ from app.exceptions.exception import CustomHTTPException
 from app.core.config import GOOGLE_API_KEY
 from app.modules.agentic_rag.repository.kb_repo import KBRepository
 from app.modules.agentic_rag.core.config import DEFAULT_COLLECTION
+from app.modules.agentic_rag.core.rank_fusion import reciprocal_rank_fusion
+from app.modules.agentic_rag.schemas.kb_schema import QueryRequest, QueryResponseItem
 
 logger = logging.getLogger(__name__)
 
@@ -44,19 +47,29 @@ class AgentState(TypedDict):
 	sources: List[Dict[str, Any]]
 	messages: List[Any]
 	error: Optional[str]
-	plans: Optional[List[str]]  # <-- Add plans to state
-	current_plan_index: Optional[int]  # <-- Track which plan is being processed
-	all_contexts: Optional[List[str]]  # <-- Store all contexts for aggregation
-	plan_loop_count: Optional[int]  # <-- Add loop counter
+	plans: Optional[List[str]]  # Sub-queries, retrieved concurrently
+	all_contexts: Optional[List[str]]  # Context of the fused documents
 
 
 class RAGAgentGraph:
 	"""LangGraph-based agent for RAG operations."""
 
-	def __init__(self, kb_repo: Optional[KBRepository] = None, collection_id: str = None) -> None:
+	MAX_PLANS = 5  # Upper bound on sub-queries (original query included)
+
+	def __init__(
+		self,
+		kb_repo: Optional[KBRepository] = None,
+		collection_id: str = None,
+		max_concurrent_retrievals: int = 4,
+		top_k_per_query: int = 5,
+		fused_top_k: int = 8,
+	) -> None:
 		"""Initialize the RAG agent graph."""
 
 		self.collection_id = collection_id or DEFAULT_COLLECTION
+		self.max_concurrent_retrievals = max_concurrent_retrievals
+		self.top_k_per_query = top_k_per_query
+		self.fused_top_k = fused_top_k
 		self.kb_repo = kb_repo or KBRepository(collection_name=self.collection_id)
 
 		try:
@@ -97,73 +110,79 @@ class RAGAgentGraph:
 
 		# Use the new RunnableSequence pattern instead of LLMChain
 		chain = planning_prompt | self.llm.with_structured_output(PlanningOutput)
-		result = chain.invoke({'question': query})
-		plans = result.sub_queries if isinstance(result, PlanningOutput) else []
+		try:
+			result = await chain.ainvoke({'question': query})
+			sub_queries = result.sub_queries if isinstance(result, PlanningOutput) else []
+		except Exception as e:
+			# Planning is an optimization: fall back to retrieving the original query only
+			logger.warning(f'{LogColors.WARNING}[RAGAgentGraph] Planning failed, using the original query: {e}{LogColors.ENDC}')
+			sub_queries = []
+
+		# The original query is always searched too; duplicates are dropped
+		plans = list(dict.fromkeys(plan.strip() for plan in [query, *sub_queries] if plan and plan.strip()))[: self.MAX_PLANS]
 		return {
 			'plans': plans,
-			'current_plan_index': 0,
 			'all_contexts': [],
 			'messages': state.get('messages', []) + [AIMessage(content=f'Planned sub-queries: {plans}')],
 		}
 
 	async def _retrieval_node(self, state: AgentState) -> Dict[str, Any]:
-		"""Retrieve relevant documents based on the current plan sub-query."""
-		plans = state.get('plans', [])
-		current_plan_index = state.get('current_plan_index', 0)
+		"""Retrieve documents for every planned sub-query concurrently and fuse them with reciprocal rank fusion."""
 		collection_id = state.get('collection_id', self.collection_id)
-		# Use the current plan sub-query if available, else fallback to main query
-		if plans and 0 <= current_plan_index < len(plans):
-			query = plans[current_plan_index]
-		else:
-			query = state.get('query', '')
+		plans = state.get('plans') or ([state['query']] if state.get('query') else [])
 
-		if not query:
+		if not plans:
 			return {
 				'error': 'No query provided',
 				'messages': state.get('messages', []) + [AIMessage(content='Error: No query provided')],
 			}
-		# Log the query being processed
 
-		try:
-			# Retrieve documents using the KB repository
-			from app.modules.agentic_rag.schemas.kb_schema import QueryRequest
-
-			# Use collection-specific query
-			query_response = await self.kb_repo.query(QueryRequest(query=query, top_k=5), collection_id=collection_id)
-
-			# Convert to Document objects
-			retrieved_docs = []
-			for i, item in enumerate(query_response.results):
-				doc = Document(
-					page_content=item.content,
-					metadata={**item.metadata, 'collection_id': collection_id},
-				)
-				retrieved_docs.append(doc)
-
-			# Prepare context for this plan
-			context_parts = []
-			for i, doc in enumerate(retrieved_docs):
-				doc_id = getattr(doc, 'id', f'doc_{i}')
-				context_part = f'Document {i + 1} (ID: {doc_id}, Collection: {collection_id}):\n{doc.page_content}'
-				context_parts.append(context_part)
-			context = '\n\n'.join(context_parts)
-
-			# Aggregate all contexts
-			all_contexts = state.get('all_contexts', [])
-			all_contexts = all_contexts + [context] if context else all_contexts
+		semaphore = asyncio.Semaphore(self.max_concurrent_retrievals)
 
+		async def retrieve(query: str) -> List[QueryResponseItem]:
+			async with semaphore:
+				query_response = await self.kb_repo.query(QueryRequest(query=query, top_k=self.top_k_per_query), collection_id=collection_id)
+				return query_response.results
+
+		results = await asyncio.gather(*(retrieve(plan) for plan in plans), return_exceptions=True)
+
+		result_lists = []
+		for plan, result in zip(plans, results):
+			if isinstance(result, BaseException):
+				logger.warning(f'{LogColors.WARNING}[RAGAgentGraph] Retrieval failed for sub-query "{plan}": {result}{LogColors.ENDC}')
+				continue
+			result_lists.append(result)
+
+		if not result_lists:
+			error = next(result for result in results if isinstance(result, BaseException))
 			return {
-				'retrieved_documents': retrieved_docs,
-				'all_contexts': all_contexts,
-				'current_plan_index': current_plan_index + 1,
-				'messages': state.get('messages', []) + [AIMessage(content=f'Retrieved {len(retrieved_docs)} documents for plan: "{query}"')],
-			}
-		except Exception as e:
-			return {
-				'error': str(e),
-				'messages': state.get('messages', []) + [AIMessage(content=f'Error retrieving documents from collection {collection_id}: {e}')],
+				'error': str(error),
+				'messages': state.get('messages', []) + [AIMessage(content=f'Error retrieving documents from collection {collection_id}: {error}')],
 			}
 
+		# Deduplicate by document id (content when there is none) and merge the rankings
+		fused = reciprocal_rank_fusion(result_lists, key=lambda item: item.id or item.content)[: self.fused_top_k]
+
+		retrieved_docs = []
+		sources = []
+		context_parts = []
+		for i, (item, fused_score) in enumerate(fused):
+			doc = Document(
+				page_content=item.content,
+				metadata={**item.metadata, 'collection_id': collection_id},
+			)
+			retrieved_docs.append(doc)
+			sources.append({'id': item.id, 'collection_id': collection_id, 'score': item.score, 'rrf_score': fused_score})
+			context_parts.append(f'Document {i + 1} (ID: {item.id or f"doc_{i}"}, Collection: {collection_id}):\n{item.content}')
+		context = '\n\n'.join(context_parts)
+
+		return {
+			'retrieved_documents': retrieved_docs,
+			'sources': sources,
+			'all_contexts': [context] if context else [],
+			'messages': state.get('messages', []) + [AIMessage(content=f'Retrieved {len(retrieved_docs)} documents for {len(plans)} sub-queries')],
+		}
+
 	async def _generation_node(self, state: AgentState) -> Dict[str, Any]:
 		"""Generate an answer based on all aggregated contexts."""
 
@@ -203,16 +222,13 @@ class RAGAgentGraph:
 			from langchain.chains import LLMChain
 
 			chain = LLMChain(llm=self.llm, prompt=prompt)
-			result = chain.invoke(prompt_inputs)
+			result = await chain.ainvoke(prompt_inputs)
 			answer = result.get('text', '')
 
-			# Prepare sources from all retrieved documents
-			sources = []
-			# Optionally, you can collect all docs from all retrievals if you want to show sources
-			# For now, just leave empty or aggregate if you want
+			# Sources are the fused documents of the retrieval node
 			return {
 				'answer': answer,
-				'sources': sources,
+				'sources': state.get('sources', []),
 				'messages': state.get('messages', []) + [AIMessage(content=answer)],
 			}
 		except Exception as e:
@@ -221,12 +237,6 @@ class RAGAgentGraph:
 				'messages': state.get('messages', []) + [AIMessage(content=f'Error generating answer for collection {collection_id}: {e}')],
 			}
 
-	def _should_continue_plans(self, state: AgentState) -> bool:
-		"""Check if there are more plans to process."""
-		plans = state.get('plans', [])
-		current_plan_index = state.get('current_plan_index', 0)
-		return bool(plans) and current_plan_index + 1 < len(plans)
-
 	def _should_end(self, state: AgentState) -> bool:
 		"""Determine if the workflow should end."""
 		has_answer = bool(state.get('answer'))
@@ -249,37 +259,9 @@ class RAGAgentGraph:
 		graph.add_node('generation', self._generation_node)
 
 		# Define the edges
-		# Planning -> Retrieval
+		# Planning -> Retrieval (all sub-queries at once) -> Generation
 		graph.add_edge('planning', 'retrieval')
-
-		# Retrieval -> Next plan or Generation
-		MAX_PLAN_LOOP = 5  # Set your recursion/iteration limit here
-
-		def plan_conditional(state: AgentState):
-			plans = state.get('plans', [])
-			current_plan_index = state.get('current_plan_index', 0)
-			plan_loop_count = state.get('plan_loop_count', 0) or 0
-
-			# Only increment loop count if we are actually looping
-			if plans and current_plan_index + 1 < len(plans):
-				plan_loop_count += 1
-				state['plan_loop_count'] = plan_loop_count
-				if plan_loop_count >= MAX_PLAN_LOOP:
-					logger.warning(f'[RAGAgentGraph-BuildGraph] Plan loop limit reached ({plan_loop_count}), breaking recursion.')
-					return 'generation'
-				state['current_plan_index'] = current_plan_index + 1
-				return 'retrieval'
-			else:
-				return 'generation'
-
-		graph.add_conditional_edges(
-			'retrieval',
-			plan_conditional,
-			{
-				'retrieval': 'retrieval',
-				'generation': 'generation',
-			},
-		)
+		graph.add_edge('retrieval', 'generation')
 
 		# Generation -> END
 		graph.add_edge('generation', END)
@@ -309,7 +291,6 @@ class RAGAgentGraph:
 					HumanMessage(content=query),
 				],
 				'error': None,
-				'plan_loop_count': 0,  # <-- Initialize loop counter
 			}
 
 			# Create a new session for this execution
@@ -37,14 +37,28 @@ QDRANT_URL = os.getenv(
 )
 QDRANT_API_KEY = os.getenv('QDRANT_API_KEY', '')  # Không cần API key cho local Qdrant
 QDRANT_COLLECTION = os.getenv('QDRANT_COLLECTION', 'agentic_rag_kb')
+# Qdrant local mode (embedded storage, or ':memory:'), only used when QDRANT_HOST is not set
+QDRANT_PATH = os.getenv('QDRANT_PATH', '') if not os.getenv('QDRANT_HOST') else ''
+# Bounded thread offload for blocking Qdrant/embedding calls, and points per upsert request
+QDRANT_MAX_CONCURRENCY = int(os.getenv('QDRANT_MAX_CONCURRENCY', '8'))
+QDRANT_UPSERT_BATCH_SIZE = int(os.getenv('QDRANT_UPSERT_BATCH_SIZE', '64'))
 
 logger.info(f'{LogColors.OKCYAN}[AgenticRAG-CoreConfig] Qdrant configuration - Host: {QDRANT_HOST}, Port: {QDRANT_PORT}, URL: {QDRANT_URL}{LogColors.ENDC}')
 logger.info(f'{LogColors.OKBLUE}[AgenticRAG-CoreConfig] Default collection: {QDRANT_COLLECTION}{LogColors.ENDC}')
+if QDRANT_PATH:
+	logger.info(f'{LogColors.OKBLUE}[AgenticRAG-CoreConfig] Qdrant local mode: {QDRANT_PATH}{LogColors.ENDC}')
 
 # Embedding configuration
 EMBEDDING_MODEL = os.getenv('EMBEDDING_MODEL', 'models/embedding-001')
 logger.info(f'{LogColors.OKCYAN}[AgenticRAG-CoreConfig] Embedding model: {EMBEDDING_MODEL}{LogColors.ENDC}')
 
+# Embedding cache: in-process LRU + persistent tier ('disk' = local SQLite file, 'redis', or 'memory' for LRU only)
+EMBEDDING_CACHE_BACKEND = os.getenv('EMBEDDING_CACHE_BACKEND', 'disk')
+EMBEDDING_CACHE_PATH = os.getenv('EMBEDDING_CACHE_PATH', './data/embedding_cache.db')
+EMBEDDING_CACHE_MEMORY_SIZE = int(os.getenv('EMBEDDING_CACHE_MEMORY_SIZE', '10000'))
+EMBEDDING_CACHE_TTL_SECONDS = int(os.getenv('EMBEDDING_CACHE_TTL_SECONDS', '0'))  # Redis only, 0 = no expiry
+logger.info(f'{LogColors.OKCYAN}[AgenticRAG-CoreConfig] Embedding cache - Backend: {EMBEDDING_CACHE_BACKEND}, Memory size: {EMBEDDING_CACHE_MEMORY_SIZE}{LogColors.ENDC}')
+
 # File extraction configuration
 MAX_FILE_SIZE = int(os.getenv('MAX_FILE_SIZE', '10485760'))  # 10MB default
 SUPPORTED_FILE_TYPES = {
@@ -68,6 +82,7 @@ class QdrantConfig(BaseModel):
 	QdrantUrl: str = QDRANT_URL
 	QdrantApiKey: str = QDRANT_API_KEY
 	QdrantCollection: str = QDRANT_COLLECTION
+	QdrantPath: str = QDRANT_PATH
 
 	class Config:
 		env_prefix = 'QDRANT_'
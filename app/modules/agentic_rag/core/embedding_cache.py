@@ -0,0 +1,223 @@
+"""
+Content-addressed embedding cache for the Agentic RAG module.
+
+Vectors are keyed by (model, kind, sha256 of the text), so re-indexing a file, re-uploading a
+global KB document or attaching the same CV to a new conversation only embeds text that was
+never seen before. Lookups go through an in-process LRU first, then a persistent store
+(a local SQLite file or Redis) shared by every worker.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+
+# Color codes for logging
+class LogColors:
+	HEADER = '\033[95m'
+	OKBLUE = '\033[94m'
+	OKCYAN = '\033[96m'
+	OKGREEN = '\033[92m'
+	WARNING = '\033[93m'
+	FAIL = '\033[91m'
+	ENDC = '\033[0m'
+	BOLD = '\033[1m'
+
+
+def _pack(vector: Sequence[float]) -> bytes:
+	return array('d', vector).tobytes()
+
+
+def _unpack(data: bytes) -> List[float]:
+	vector = array('d')
+	vector.frombytes(data)
+	return vector.tolist()
+
+
+class EmbeddingStore(ABC):
+	"""Interface for the persistent embedding tier"""
+
+	@abstractmethod
+	def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+		"""Stored vectors of the given keys, missing keys are left out"""
+		pass
+
+	@abstractmethod
+	def set_many(self, vectors: Dict[str, List[float]]) -> None:
+		"""Store the vectors by key"""
+		pass
+
+
+class SQLiteEmbeddingStore(EmbeddingStore):
+	"""Local disk tier, one SQLite file per host"""
+
+	def __init__(self, path: str):
+		directory = os.path.dirname(path)
+		if directory:
+			os.makedirs(directory, exist_ok=True)
+		self._conn = sqlite3.connect(path, check_same_thread=False)
+		self._conn.execute('PRAGMA journal_mode=WAL')
+		self._conn.execute('CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)')
+		self._conn.commit()
+		self._lock = threading.Lock()
+
+	def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+		found: Dict[str, List[float]] = {}
+		with self._lock:
+			# SQLite caps the number of bound parameters per statement
+			for offset in range(0, len(keys), 500):
+				batch = keys[offset : offset + 500]
+				rows = self._conn.execute(f'SELECT key, vector FROM embeddings WHERE key IN ({",".join("?" * len(batch))})', batch).fetchall()
+				found.update((key, _unpack(vector)) for key, vector in rows)
+		return found
+
+	def set_many(self, vectors: Dict[str, List[float]]) -> None:
+		with self._lock:
+			self._conn.executemany('INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)', [(key, _pack(vector)) for key, vector in vectors.items()])
+			self._conn.commit()
+
+
+class RedisEmbeddingStore(EmbeddingStore):
+	"""Redis tier shared by all workers and hosts"""
+
+	def __init__(self, redis_url: str, ttl_seconds: int = 0, prefix: str = 'embedding:'):
+		import redis
+
+		self._redis = redis.from_url(redis_url)
+		self.ttl_seconds = ttl_seconds
+		self.prefix = prefix
+
+	def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+		values = self._redis.mget([self.prefix + key for key in keys])
+		return {key: _unpack(value) for key, value in zip(keys, values) if value is not None}
+
+	def set_many(self, vectors: Dict[str, List[float]]) -> None:
+		pipeline = self._redis.pipeline(transaction=False)
+		for key, vector in vectors.items():
+			pipeline.set(self.prefix + key, _pack(vector), ex=self.ttl_seconds or None)
+		pipeline.execute()
+
+
+class CachedEmbeddings(Embeddings):
+	"""Embeddings wrapper that only sends unseen texts to the wrapped model
+
+	Documents and queries are cached separately: Gemini embeds them with different task types.
+	A failing persistent store never fails an embedding call, it only costs a miss.
+	"""
+
+	def __init__(self, embeddings: Embeddings, model_name: str, store: Optional[EmbeddingStore] = None, memory_size: int = 10_000):
+		self.embeddings = embeddings
+		self.model_name = model_name
+		self.store = store
+		self.memory_size = memory_size
+		self._memory: 'OrderedDict[str, Tuple[float, ...]]' = OrderedDict()
+		self._lock = threading.Lock()
+		self.stats = {
+			'memory_hits': 0,
+			'store_hits': 0,
+			'misses': 0,
+			'store_errors': 0,
+		}
+
+	def embed_documents(self, texts: List[str]) -> List[List[float]]:
+		return self._embed(list(texts), 'document')
+
+	def embed_query(self, text: str) -> List[float]:
+		return self._embed([text], 'query')[0]
+
+	def _key(self, text: str, kind: str) -> str:
+		return hashlib.sha256(f'{self.model_name}\0{kind}\0{text}'.encode('utf-8')).hexdigest()
+
+	def _embed(self, texts: List[str], kind: str) -> List[List[float]]:
+		keys = [self._key(text, kind) for text in texts]
+		vectors: Dict[str, Tuple[float, ...]] = {}
+
+		with self._lock:
+			for key in keys:
+				vector = self._memory.get(key)
+				if vector is not None:
+					self._memory.move_to_end(key)
+					vectors[key] = vector
+					self.stats['memory_hits'] += 1
+
+		# Duplicates inside one batch are embedded once
+		missing = list(dict.fromkeys(key for key in keys if key not in vectors))
+		if missing and self.store is not None:
+			try:
+				stored = self.store.get_many(missing)
+			except Exception as e:
+				logger.warning(f'{LogColors.WARNING}[EmbeddingCache] Store read failed: {e}{LogColors.ENDC}')
+				self.stats['store_errors'] += 1
+				stored = {}
+			for key, vector in stored.items():
+				vectors[key] = tuple(vector)
+			self.stats['store_hits'] += len(stored)
+			self._remember({key: tuple(vector) for key, vector in stored.items()})
+			missing = [key for key in missing if key not in stored]
+
+		if missing:
+			text_by_key = dict(zip(keys, texts))
+			missing_texts = [text_by_key[key] for key in missing]
+			embedded = self.embeddings.embed_documents(missing_texts) if kind == 'document' else [self.embeddings.embed_query(text) for text in missing_texts]
+			new_vectors = dict(zip(missing, embedded))
+			self.stats['misses'] += len(missing)
+			logger.info(f'{LogColors.OKCYAN}[EmbeddingCache] Embedded {len(missing)}/{len(texts)} {kind} texts ({len(texts) - len(missing)} cached){LogColors.ENDC}')
+
+			if self.store is not None:
+				try:
+					self.store.set_many(new_vectors)
+				except Exception as e:
+					logger.warning(f'{LogColors.WARNING}[EmbeddingCache] Store write failed: {e}{LogColors.ENDC}')
+					self.stats['store_errors'] += 1
+			new_vectors = {key: tuple(vector) for key, vector in new_vectors.items()}
+			vectors.update(new_vectors)
+			self._remember(new_vectors)
+
+		return [list(vectors[key]) for key in keys]
+
+	def _remember(self, vectors: Dict[str, Tuple[float, ...]]):
+		if not vectors:
+			return
+		with self._lock:
+			for key, vector in vectors.items():
+				self._memory[key] = vector
+				self._memory.move_to_end(key)
+			while len(self._memory) > self.memory_size:
+				self._memory.popitem(last=False)
+
+	def get_stats(self) -> Dict[str, float]:
+		lookups = self.stats['memory_hits'] + self.stats['store_hits'] + self.stats['misses']
+		hits = self.stats['memory_hits'] + self.stats['store_hits']
+		return {
+			'model': self.model_name,
+			**self.stats,
+			'hit_rate': hits / lookups if lookups else 0.0,
+			'memory_entries': len(self._memory),
+			'store': type(self.store).__name__ if self.store is not None else None,
+		}
+
+
+def build_embedding_store(backend: str, path: str, redis_url: str, ttl_seconds: int = 0) -> Optional[EmbeddingStore]:
+	"""Persistent tier from config: 'disk', 'redis' or 'memory' (LRU only)"""
+	backend = (backend or 'memory').lower()
+	try:
+		if backend == 'disk':
+			return SQLiteEmbeddingStore(path)
+		if backend == 'redis':
+			return RedisEmbeddingStore(redis_url, ttl_seconds=ttl_seconds)
+	except Exception as e:
+		logger.warning(f'{LogColors.WARNING}[EmbeddingCache] {backend} store unavailable, using in-process cache only: {e}{LogColors.ENDC}')
+		return None
+	if backend != 'memory':
+		logger.warning(f'{LogColors.WARNING}[EmbeddingCache] Unknown backend {backend!r}, using in-process cache only{LogColors.ENDC}')
+	return None
@@ -0,0 +1,285 @@
+"""
+Process-wide Qdrant client and vector store registry for the Agentic RAG module.
+
+Every KBRepository shares one QdrantClient, one (cached) embedding model per model name and one
+QdrantVectorStore per collection. Collections known to exist are cached, so building a
+repository no longer costs a client, a get_collection round trip and a vector store.
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, TypeVar
+
+from langchain_core.embeddings import Embeddings
+from langchain_google_genai import GoogleGenerativeAIEmbeddings
+from langchain_qdrant import QdrantVectorStore, RetrievalMode
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import Distance, Modifier, SparseVectorParams, VectorParams
+
+from app.core.config import GOOGLE_API_KEY, REDIS_URL
+from app.modules.agentic_rag.core.config import (
+	EMBEDDING_CACHE_BACKEND,
+	EMBEDDING_CACHE_MEMORY_SIZE,
+	EMBEDDING_CACHE_PATH,
+	EMBEDDING_CACHE_TTL_SECONDS,
+	QDRANT_MAX_CONCURRENCY,
+	settings,
+)
+from app.modules.agentic_rag.core.embedding_cache import CachedEmbeddings, EmbeddingStore, build_embedding_store
+from app.modules.agentic_rag.core.sparse_encoder import SPARSE_VECTOR_NAME, BM25SparseEmbeddings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+# Color codes for logging
+class LogColors:
+	HEADER = '\033[95m'
+	OKBLUE = '\033[94m'
+	OKCYAN = '\033[96m'
+	OKGREEN = '\033[92m'
+	WARNING = '\033[93m'
+	FAIL = '\033[91m'
+	ENDC = '\033[0m'
+	BOLD = '\033[1m'
+
+
+_embedding_store: Optional[EmbeddingStore] = None
+_embedding_store_lock = threading.Lock()
+_embedding_store_built = False
+
+
+def _get_embedding_store() -> Optional[EmbeddingStore]:
+	"""Persistent embedding cache tier, shared by every model"""
+	global _embedding_store, _embedding_store_built
+	if not _embedding_store_built:
+		with _embedding_store_lock:
+			if not _embedding_store_built:
+				_embedding_store = build_embedding_store(EMBEDDING_CACHE_BACKEND, EMBEDDING_CACHE_PATH, REDIS_URL, EMBEDDING_CACHE_TTL_SECONDS)
+				_embedding_store_built = True
+	return _embedding_store
+
+
+def _default_embedding_factory(model_name: str) -> Embeddings:
+	embedding = GoogleGenerativeAIEmbeddings(model=model_name, google_api_key=GOOGLE_API_KEY)
+	return CachedEmbeddings(embedding, model_name, store=_get_embedding_store(), memory_size=EMBEDDING_CACHE_MEMORY_SIZE)
+
+
+class QdrantRegistry:
+	"""Shared Qdrant client, embeddings and per-collection vector stores.
+
+	Pass `client` (e.g. `QdrantClient(location=':memory:')`) and `embedding_factory` to run against
+	Qdrant local mode without a server or an embedding API.
+	"""
+
+	def __init__(
+		self,
+		url: Optional[str] = None,
+		api_key: Optional[str] = None,
+		path: Optional[str] = None,
+		client: Optional[QdrantClient] = None,
+		embedding_factory: Optional[Callable[[str], Embeddings]] = None,
+		max_retries: int = 5,
+		retry_delay: float = 3,
+		max_concurrency: int = QDRANT_MAX_CONCURRENCY,
+	):
+		self.url = url
+		self.api_key = api_key
+		self.path = path
+		self.max_retries = max_retries
+		self.retry_delay = retry_delay
+		self.max_concurrency = max_concurrency
+		self._embedding_factory = embedding_factory or _default_embedding_factory
+		self.sparse_embedding = BM25SparseEmbeddings()
+
+		self._client: Optional[QdrantClient] = client
+		self._embeddings: Dict[str, Embeddings] = {}
+		self._vectorstores: Dict[Tuple[str, int, bool], QdrantVectorStore] = {}
+		# Only positive answers are cached: a collection created by another worker is still found
+		self._known_collections: Set[str] = set()
+		# Collections known to have the BM25 sparse vector (hybrid retrieval)
+		self._sparse_collections: Set[str] = set()
+		self._lock = threading.RLock()
+		self._executor: Optional[ThreadPoolExecutor] = None
+
+	@property
+	def client(self) -> QdrantClient:
+		"""The shared client, created on first use (with retries for Docker networking start-up)"""
+		if self._client is None:
+			with self._lock:
+				if self._client is None:
+					self._client = self._connect()
+		return self._client
+
+	def _connect(self) -> QdrantClient:
+		for attempt in range(self.max_retries):
+			try:
+				if self.path == ':memory:':
+					client = QdrantClient(location=':memory:')
+				elif self.path:
+					client = QdrantClient(path=self.path)
+				else:
+					client = QdrantClient(url=self.url, api_key=self.api_key or None)
+				logger.info(f'{LogColors.OKGREEN}[QdrantRegistry] Qdrant client initialized ({self.path or self.url}){LogColors.ENDC}')
+				return client
+			except Exception as e:
+				logger.warning(f'{LogColors.WARNING}[QdrantRegistry] Qdrant client init failed (attempt {attempt + 1}/{self.max_retries}): {e}{LogColors.ENDC}')
+				if attempt == self.max_retries - 1:
+					raise
+				time.sleep(self.retry_delay)
+
+	@property
+	def executor(self) -> ThreadPoolExecutor:
+		"""Bounded pool for blocking Qdrant and embedding calls made from async code"""
+		if self._executor is None:
+			with self._lock:
+				if self._executor is None:
+					self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='qdrant')
+		return self._executor
+
+	async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+		"""Run a blocking call on the bounded pool so the event loop keeps serving other requests"""
+		loop = asyncio.get_running_loop()
+		return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+	def get_embedding(self, model_name: str) -> Embeddings:
+		"""Shared embedding model instance for `model_name`"""
+		embedding = self._embeddings.get(model_name)
+		if embedding is None:
+			with self._lock:
+				embedding = self._embeddings.get(model_name)
+				if embedding is None:
+					embedding = self._embedding_factory(model_name)
+					self._embeddings[model_name] = embedding
+		return embedding
+
+	def collection_exists(self, collection_name: str) -> bool:
+		"""Check a collection, answering from the cache when it is already known to exist"""
+		if collection_name in self._known_collections:
+			return True
+		exists = self.client.collection_exists(collection_name=collection_name)
+		if exists:
+			self._known_collections.add(collection_name)
+		return exists
+
+	def create_collection(self, collection_name: str, vector_size: int) -> bool:
+		"""Create a collection with a cosine dense vector and a BM25 sparse vector, returns False when it could not be created"""
+		try:
+			self.client.create_collection(
+				collection_name=collection_name,
+				vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE),
+				sparse_vectors_config={SPARSE_VECTOR_NAME: SparseVectorParams(modifier=Modifier.IDF)},
+			)
+		except Exception as e:
+			# Another worker may have created it in between
+			self._known_collections.discard(collection_name)
+			if self.collection_exists(collection_name):
+				return True
+			logger.error(f'{LogColors.FAIL}[QdrantRegistry] Error creating collection {collection_name}: {e}{LogColors.ENDC}')
+			return False
+
+		self._known_collections.add(collection_name)
+		self._sparse_collections.add(collection_name)
+		logger.info(f'{LogColors.OKGREEN}[QdrantRegistry] Collection created: {collection_name}{LogColors.ENDC}')
+		return True
+
+	def has_sparse_vector(self, collection_name: str) -> bool:
+		"""Whether the collection has the BM25 sparse vector
+
+		Qdrant cannot add a vector to an existing collection: collections created before hybrid
+		retrieval stay dense-only until they are deleted and re-indexed.
+		"""
+		if collection_name in self._sparse_collections:
+			return True
+		sparse_vectors = self.client.get_collection(collection_name=collection_name).config.params.sparse_vectors or {}
+		if SPARSE_VECTOR_NAME in sparse_vectors:
+			self._sparse_collections.add(collection_name)
+			return True
+		return False
+
+	def ensure_collection(self, collection_name: str, vector_size: int) -> bool:
+		"""Make sure a collection exists, creating it on first use"""
+		if self.collection_exists(collection_name):
+			return True
+		with self._lock:
+			return self.collection_exists(collection_name) or self.create_collection(collection_name, vector_size)
+
+	def delete_collection(self, collection_name: str) -> bool:
+		"""Delete a collection and drop everything cached for it"""
+		self.forget_collection(collection_name)
+		return self.client.delete_collection(collection_name=collection_name)
+
+	def forget_collection(self, collection_name: str):
+		"""Drop the cached existence flag and vector stores of a collection"""
+		with self._lock:
+			self._known_collections.discard(collection_name)
+			self._sparse_collections.discard(collection_name)
+			for key in [key for key in self._vectorstores if key[0] == collection_name]:
+				del self._vectorstores[key]
+
+	def get_vectorstore(self, collection_name: str, embedding: Embeddings, vector_size: int, hybrid: bool = False) -> QdrantVectorStore:
+		"""Shared vector store for a collection (the collection is created if missing)
+
+		A hybrid store writes dense + BM25 sparse vectors and searches both, fused with RRF by Qdrant;
+		a dense store searches the dense vector only and returns cosine similarities.
+		"""
+		key = (collection_name, id(embedding), hybrid)
+		vectorstore = self._vectorstores.get(key)
+		if vectorstore is None:
+			self.ensure_collection(collection_name, vector_size)
+			if hybrid and not self.has_sparse_vector(collection_name):
+				logger.warning(f'{LogColors.WARNING}[QdrantRegistry] Collection {collection_name} has no sparse vector, using dense retrieval{LogColors.ENDC}')
+				vectorstore = self.get_vectorstore(collection_name, embedding, vector_size)
+				self._vectorstores[key] = vectorstore
+				return vectorstore
+			with self._lock:
+				vectorstore = self._vectorstores.get(key)
+				if vectorstore is None:
+					options = {'retrieval_mode': RetrievalMode.HYBRID, 'sparse_embedding': self.sparse_embedding, 'sparse_vector_name': SPARSE_VECTOR_NAME} if hybrid else {}
+					vectorstore = QdrantVectorStore(
+						client=self.client,
+						collection_name=collection_name,
+						embedding=embedding,
+						metadata_payload_key='metadata',
+						**options,
+					)
+					self._vectorstores[key] = vectorstore
+		return vectorstore
+
+	def get_stats(self) -> Dict[str, Any]:
+		return {
+			'known_collections': len(self._known_collections),
+			'vectorstores': len(self._vectorstores),
+			'embedding_models': len(self._embeddings),
+			'embedding_cache': self.get_embedding_cache_stats(),
+		}
+
+	def get_embedding_cache_stats(self) -> List[Dict[str, Any]]:
+		"""Hit/miss counters of every cached embedding model"""
+		return [embedding.get_stats() for embedding in list(self._embeddings.values()) if isinstance(embedding, CachedEmbeddings)]
+
+
+_registry: Optional[QdrantRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_qdrant_registry() -> QdrantRegistry:
+	"""Process-wide registry built from the Agentic RAG Qdrant settings"""
+	global _registry
+	if _registry is None:
+		with _registry_lock:
+			if _registry is None:
+				_registry = QdrantRegistry(url=settings.QdrantUrl, api_key=settings.QdrantApiKey, path=settings.QdrantPath or None)
+	return _registry
+
+
+def set_qdrant_registry(registry: Optional[QdrantRegistry]):
+	"""Swap the process-wide registry (e.g. a local-mode registry in tests), None resets it"""
+	global _registry
+	with _registry_lock:
+		_registry = registry
@@ -0,0 +1,35 @@
+"""
+Reciprocal rank fusion for merging ranked retrieval results.
+"""
+
+from typing import Callable, Dict, Hashable, List, Sequence, Tuple, TypeVar
+
+T = TypeVar('T')
+
+# Constant from Cormack et al. (2009): dampens the weight of the very first ranks
+RRF_K = 60
+
+
+def reciprocal_rank_fusion(result_lists: Sequence[Sequence[T]], key: Callable[[T], Hashable], k: int = RRF_K) -> List[Tuple[T, float]]:
+	"""Merge ranked lists into one, deduplicated by `key`
+
+	Each item scores sum(1 / (k + rank)) over the lists it appears in (rank starts at 1), so items
+	found by several lists rise to the top. The first occurrence of an item is kept.
+
+	Returns:
+	    (item, fused score) pairs, best first
+	"""
+	scores: Dict[Hashable, float] = {}
+	items: Dict[Hashable, T] = {}
+	for results in result_lists:
+		seen = set()
+		for rank, item in enumerate(results, start=1):
+			item_key = key(item)
+			# A duplicate inside one list only counts at its best rank
+			if item_key in seen:
+				continue
+			seen.add(item_key)
+			items.setdefault(item_key, item)
+			scores[item_key] = scores.get(item_key, 0.0) + 1.0 / (k + rank)
+
+	return sorted(((items[item_key], score) for item_key, score in scores.items()), key=lambda pair: pair[1], reverse=True)
@@ -0,0 +1,54 @@
+"""
+BM25-style sparse encoder for hybrid retrieval.
+
+Documents are encoded as hashed term ids weighted by the BM25 term-frequency component;
+the IDF part is applied by Qdrant at search time (sparse vector modifier IDF), so document
+vectors never need re-encoding when the corpus grows. Queries are the bag of their terms.
+"""
+
+import re
+import zlib
+from collections import Counter
+from typing import List
+
+from langchain_qdrant import SparseEmbeddings, SparseVector
+
+# Named sparse vector of every Agentic RAG collection
+SPARSE_VECTOR_NAME = 'bm25'
+
+_TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+
+class BM25SparseEmbeddings(SparseEmbeddings):
+	"""Hashing BM25 encoder (no vocabulary to fit or persist)"""
+
+	def __init__(self, k1: float = 1.2, b: float = 0.75, avg_doc_length: float = 256.0):
+		self.k1 = k1
+		self.b = b
+		self.avg_doc_length = avg_doc_length
+
+	def tokenize(self, text: str) -> List[str]:
+		return _TOKEN_PATTERN.findall(text.lower())
+
+	@staticmethod
+	def term_id(token: str) -> int:
+		# Stable across processes (unlike hash()), fits Qdrant's uint32 indices
+		return zlib.crc32(token.encode('utf-8'))
+
+	def embed_documents(self, texts: List[str]) -> List[SparseVector]:
+		return [self._encode_document(text) for text in texts]
+
+	def embed_query(self, text: str) -> SparseVector:
+		term_ids = sorted({self.term_id(token) for token in self.tokenize(text)})
+		return SparseVector(indices=term_ids, values=[1.0] * len(term_ids))
+
+	def _encode_document(self, text: str) -> SparseVector:
+		tokens = self.tokenize(text)
+		length_norm = self.k1 * (1 - self.b + self.b * len(tokens) / self.avg_doc_length)
+
+		weights: Counter = Counter()
+		for token, tf in Counter(tokens).items():
+			# Hash collisions add up like repeated terms
+			weights[self.term_id(token)] += tf
+		term_ids = sorted(weights)
+		return SparseVector(indices=term_ids, values=[weights[term_id] * (self.k1 + 1) / (weights[term_id] + length_norm) for term_id in term_ids])
@@ -40,33 +40,29 @@ class RAGVectorDAL:
 		"""Create new collection trong Qdrant"""
 		logger.info(f'{LogColors.HEADER}[RAGVectorDAL] Creating new collection: {collection_name}{LogColors.ENDC}')
 
-		try:
-			from qdrant_client.http.models import Distance, VectorParams
-
-			logger.info(f'{LogColors.OKBLUE}[RAGVectorDAL] Configuring collection with vector size: {self.kb_repo.vector_size}, distance: COSINE{LogColors.ENDC}')
-
-			self.kb_repo.client.create_collection(
-				collection_name=collection_name,
-				vectors_config=VectorParams(size=self.kb_repo.vector_size, distance=Distance.COSINE),
-			)
+		logger.info(f'{LogColors.OKBLUE}[RAGVectorDAL] Configuring collection with vector size: {self.kb_repo.vector_size}, distance: COSINE{LogColors.ENDC}')
 
+		created = self.kb_repo.registry.create_collection(collection_name, self.kb_repo.vector_size)
+		if created:
 			logger.info(f'{LogColors.OKGREEN}[RAGVectorDAL] Collection created successfully: {collection_name}{LogColors.ENDC}')
-			return True
-		except Exception as e:
-			logger.info(f'{LogColors.FAIL}[RAGVectorDAL] Error creating collection {collection_name}: {str(e)}{LogColors.ENDC}')
-			return False
+		else:
+			logger.info(f'{LogColors.FAIL}[RAGVectorDAL] Error creating collection {collection_name}{LogColors.ENDC}')
+		return created
 
 	def collection_exists(self, collection_name: str) -> bool:
 		"""Check if collection exists"""
 		logger.info(f'{LogColors.OKBLUE}[RAGVectorDAL] Checking existence of collection: {collection_name}{LogColors.ENDC}')
 
 		try:
-			self.kb_repo.client.get_collection(collection_name=collection_name)
-			logger.info(f'{LogColors.OKGREEN}[RAGVectorDAL] Collection exists: {collection_name}{LogColors.ENDC}')
-			return True
+			exists = self.kb_repo.registry.collection_exists(collection_name)
 		except Exception:
+			exists = False
+
+		if exists:
+			logger.info(f'{LogColors.OKGREEN}[RAGVectorDAL] Collection exists: {collection_name}{LogColors.ENDC}')
+		else:
 			logger.info(f'{LogColors.WARNING}[RAGVectorDAL] Collection does not exist: {collection_name}{LogColors.ENDC}')
-			return False
+		return exists
 
 	async def add_documents_to_collection(self, collection_name: str, documents: List[DocumentModel]) -> List[str]:
 		"""Add documents to specific collection"""
@@ -120,7 +116,7 @@ class RAGVectorDAL:
 
 		try:
 			logger.info(f'{LogColors.OKBLUE}[RAGVectorDAL] Executing collection deletion in Qdrant{LogColors.ENDC}')
-			self.kb_repo.client.delete_collection(collection_name=collection_name)
+			self.kb_repo.registry.delete_collection(collection_name)
 			logger.info(f'{LogColors.OKGREEN}[RAGVectorDAL] Collection deleted successfully: {collection_name}{LogColors.ENDC}')
 			return True
 		except Exception as e:
@@ -164,27 +160,15 @@ class RAGVectorDAL:
 		"""Get KBRepository configured for specific collection"""
 		logger.info(f'{LogColors.HEADER}[RAGVectorDAL] Creating KBRepository for collection: {collection_name}{LogColors.ENDC}')
 
-		# Create new KB repo instance với custom collection name
+		# Create new KB repo instance với custom collection name (client và vectorstore dùng chung qua registry)
 		logger.info(f'{LogColors.OKBLUE}[RAGVectorDAL] Initializing new KBRepository instance{LogColors.ENDC}')
 		kb_repo = KBRepository()
 		kb_repo.collection_name = collection_name
 		logger.info(f'{LogColors.OKCYAN}[RAGVectorDAL] Updated collection name to: {collection_name}{LogColors.ENDC}')
 
-		# Ensure collection exists trước khi tạo vectorstore
-		if not self.collection_exists(collection_name):
-			logger.info(f'{LogColors.WARNING}[RAGVectorDAL] Collection does not exist, creating: {collection_name}{LogColors.ENDC}')
-			self.create_collection(collection_name)
-
-		# Recreate vectorstore với collection name mới
-		logger.info(f'{LogColors.OKBLUE}[RAGVectorDAL] Recreating vectorstore for collection: {collection_name}{LogColors.ENDC}')
-		from langchain_qdrant import QdrantVectorStore
-
-		kb_repo.vectorstore = QdrantVectorStore(
-			client=kb_repo.client,
-			collection_name=collection_name,
-			embedding=kb_repo.embedding,
-			metadata_payload_key='metadata',
-		)
+		# Shared vectorstore của collection, collection được tạo nếu chưa có
+		logger.info(f'{LogColors.OKBLUE}[RAGVectorDAL] Loading shared vectorstore for collection: {collection_name}{LogColors.ENDC}')
+		kb_repo.vectorstore = kb_repo.registry.get_vectorstore(collection_name, kb_repo.embedding, kb_repo.vector_size)
 
 		logger.info(f'{LogColors.OKGREEN}[RAGVectorDAL] KBRepository configured successfully for collection: {collection_name}{LogColors.ENDC}')
 		return kb_repo
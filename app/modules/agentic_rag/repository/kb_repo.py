@@ -1,33 +1,24 @@
 import io
 import logging
-import time
 import uuid
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from fastapi import UploadFile
 from langchain.schema import Document
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
 from langchain_qdrant import QdrantVectorStore
 from qdrant_client import QdrantClient
+from qdrant_client.http import models
 
-# Added imports for collection creation
-from qdrant_client.http.models import (
-	CollectionStatus,
-	Distance,
-	PointStruct,
-	VectorParams,
-)
-
-from app.core.config import GOOGLE_API_KEY
 from app.exceptions.exception import CustomHTTPException
 from app.middleware.translation_manager import _
 from app.modules.agentic_rag.core.config import (
 	COLLECTION_PREFIX,
 	DEFAULT_COLLECTION,
 	MAX_FILE_SIZE,
+	QDRANT_UPSERT_BATCH_SIZE,
 	SUPPORTED_FILE_TYPES,
-	settings,
 )
+from app.modules.agentic_rag.core.qdrant_registry import QdrantRegistry, get_qdrant_registry
 from app.modules.agentic_rag.schemas.kb_schema import (
 	AddDocumentsRequest,
 	QueryRequest,
@@ -56,10 +47,7 @@ class LogColors:
 class KBRepository:
 	"""Repository for interacting with the Qdrant knowledge base."""
 
-	def __init__(self, collection_name: str = None) -> None:
-		# Initialize Qdrant client and vector store
-		qdrant_url: str = settings.QdrantUrl
-		qdrant_api_key: str = settings.QdrantApiKey
+	def __init__(self, collection_name: str = None, registry: QdrantRegistry = None) -> None:
 		self.collection_name: str = collection_name or DEFAULT_COLLECTION
 		# Add collection prefix for better organization
 		if not self.collection_name.startswith(COLLECTION_PREFIX):
@@ -68,78 +56,43 @@ class KBRepository:
 		self.embedding_model_name: str = 'models/embedding-001'
 		self.vector_size: int = 768
 
-		# Add retry logic for Docker networking issues
-		max_retries = 5
-		retry_delay = 3  # seconds
-
-		for attempt in range(max_retries):
-			try:
-				# Initialize Qdrant client
-				self.client: QdrantClient = QdrantClient(url=qdrant_url, api_key=qdrant_api_key if qdrant_api_key else None)
-				break
-			except Exception as e:
-				print(e)
-				if attempt < max_retries - 1:
-					time.sleep(retry_delay)
-				else:
-					raise CustomHTTPException(status_code=500, message=_('error_initializing_qdrant_client'))
+		# Client, embeddings and vector stores are shared process-wide, so building a repository is cheap
+		self.registry: QdrantRegistry = registry or get_qdrant_registry()
+
+		try:
+			self.client: QdrantClient = self.registry.client
+		except Exception as e:
+			logger.error(f'{LogColors.FAIL}[KBRepository] Error initializing Qdrant client: {e}{LogColors.ENDC}')
+			raise CustomHTTPException(status_code=500, message=_('error_initializing_qdrant_client'))
 
 		# Initialize embeddings using Google's GenerativeAI embeddings
 		try:
-			self.embedding = GoogleGenerativeAIEmbeddings(model=self.embedding_model_name, google_api_key=GOOGLE_API_KEY)
+			self.embedding = self.registry.get_embedding(self.embedding_model_name)
 		except Exception as e:
-			print(e)
+			logger.error(f'{LogColors.FAIL}[KBRepository] Error initializing embeddings: {e}{LogColors.ENDC}')
 			raise CustomHTTPException(message=_('error_occurred'))
 
 		# Initialize file extraction service
 		try:
 			self.file_extraction = file_extraction_service
 		except Exception as e:
-			print(e)
+			logger.error(f'{LogColors.FAIL}[KBRepository] Error initializing file extraction: {e}{LogColors.ENDC}')
 			raise CustomHTTPException(message=_('error_initializing_file_extraction'))
 
 		# Ensure collection exists
 		try:
-			collection_exists = False
-			try:
-				collection_info = self.client.get_collection(collection_name=self.collection_name)
-				if collection_info.status == CollectionStatus.GREEN:
-					collection_exists = True
-			except Exception as e:
-				print(e)
-				print(f'\033[93m[KBRepository] Collection {self.collection_name} does not exist, creating...\033[0m')
-
-			if not collection_exists:
-				self.client.create_collection(
-					collection_name=self.collection_name,
-					vectors_config=VectorParams(size=self.vector_size, distance=Distance.COSINE),
-				)
-
+			if not self.registry.ensure_collection(self.collection_name, self.vector_size):
+				raise CustomHTTPException(message=_('error_creating_or_checking_collection'))
+		except CustomHTTPException:
+			raise
 		except Exception as e:
-			print(e)
+			logger.error(f'{LogColors.FAIL}[KBRepository] Error creating or checking collection {self.collection_name}: {e}{LogColors.ENDC}')
 			raise CustomHTTPException(message=_('error_creating_or_checking_collection'))
 
 		try:
-			# Create or load existing Qdrant collection via LangChain wrapper
-
-			# Add retry logic for collection creation/connection
-			for attempt in range(max_retries):
-				try:
-					self.vectorstore = QdrantVectorStore(
-						client=self.client,
-						collection_name=self.collection_name,
-						embedding=self.embedding,
-						metadata_payload_key='metadata',
-					)
-					break
-				except Exception as e:
-					print(e)
-					if attempt < max_retries - 1:
-						time.sleep(retry_delay)
-					else:
-						raise
+			self.vectorstore = self.registry.get_vectorstore(self.collection_name, self.embedding, self.vector_size)
 		except Exception as e:
-			print(e)
+			logger.error(f'{LogColors.FAIL}[KBRepository] Error getting vector store for {self.collection_name}: {e}{LogColors.ENDC}')
 			raise CustomHTTPException(message=_('error_occurred'))
 
 	def _get_full_collection_name(self, collection_id: str) -> str:
@@ -150,49 +103,38 @@ class KBRepository:
 
 	def create_collection(self, collection_id: str) -> bool:
 		"""Create a new collection."""
-		collection_name = self._get_full_collection_name(collection_id)
-
-		try:
-			self.client.create_collection(
-				collection_name=collection_name,
-				vectors_config=VectorParams(size=self.vector_size, distance=Distance.COSINE),
-			)
-			return True
-		except Exception as e:
-			print(e)
-			return False
+		return self.registry.create_collection(self._get_full_collection_name(collection_id), self.vector_size)
 
 	def collection_exists(self, collection_id: str) -> bool:
 		"""Check if collection exists."""
-		collection_name = self._get_full_collection_name(collection_id)
 		try:
-			self.client.get_collection(collection_name=collection_name)
-			return True
+			return self.registry.collection_exists(self._get_full_collection_name(collection_id))
 		except Exception:
 			return False
 
-	def _get_collection_vectorstore(self, collection_id: str) -> QdrantVectorStore:
-		"""Get vectorstore for specific collection."""
-		collection_name = self._get_full_collection_name(collection_id)
+	def _get_collection_vectorstore(self, collection_id: str, hybrid: bool = False) -> QdrantVectorStore:
+		"""Get vectorstore for specific collection (created if missing)."""
+		return self.registry.get_vectorstore(self._get_full_collection_name(collection_id), self.embedding, self.vector_size, hybrid=hybrid)
+
+	@staticmethod
+	def _build_filter(metadata_filter: Optional[Dict[str, Any]]) -> Optional[models.Filter]:
+		"""Build a Qdrant filter from metadata field -> value (a list matches any of its values)."""
+		if not metadata_filter:
+			return None
 
-		return QdrantVectorStore(
-			client=self.client,
-			collection_name=collection_name,
-			embedding=self.embedding,
-			metadata_payload_key='metadata',
-		)
+		conditions = []
+		for field, value in metadata_filter.items():
+			match = models.MatchAny(any=list(value)) if isinstance(value, (list, tuple, set)) else models.MatchValue(value=value)
+			conditions.append(models.FieldCondition(key=f'metadata.{field}', match=match))
+		return models.Filter(must=conditions)
 
-	async def add_documents(self, request: AddDocumentsRequest, collection_id: str = None) -> List[str]:
-		"""Add documents to the knowledge base."""
+	async def add_documents(self, request: AddDocumentsRequest, collection_id: str = None, batch_size: int = QDRANT_UPSERT_BATCH_SIZE) -> List[str]:
+		"""Add documents to the knowledge base, embedding and upserting them in batches off the event loop."""
 		collection_id = collection_id or DEFAULT_COLLECTION
 
 		try:
-			# Ensure collection exists
-			if not self.collection_exists(collection_id):
-				self.create_collection(collection_id)
-
-			# Get collection-specific vectorstore
-			vectorstore = self._get_collection_vectorstore(collection_id)
+			# Hybrid vectorstore writes both the dense and the BM25 sparse vectors (ensures the collection exists)
+			vectorstore = await self.registry.run(self._get_collection_vectorstore, collection_id, True)
 
 			docs: List[Document] = []
 			for i, doc in enumerate(request.documents):
@@ -204,7 +146,10 @@ class KBRepository:
 					)
 				)
 
-			vectorstore.add_documents(documents=docs)
+			# One embedding request + one upsert per batch, other requests are served in between
+			for start in range(0, len(docs), batch_size):
+				batch = docs[start : start + batch_size]
+				await self.registry.run(vectorstore.add_documents, documents=batch, ids=[doc.id for doc in batch], batch_size=batch_size)
 
 			ids: List[str] = [doc.id for doc in request.documents]
 			return ids
@@ -213,28 +158,39 @@ class KBRepository:
 			raise CustomHTTPException(message=_('error_occurred'))
 
 	async def query(self, request: QueryRequest, collection_id: str = None) -> QueryResponse:
-		"""Query the knowledge base for similar documents."""
+		"""Query the knowledge base for similar documents, with their cosine similarity scores."""
+		return await self._search(request, collection_id, hybrid=False)
+
+	async def hybrid_query(self, request: QueryRequest, collection_id: str = None) -> QueryResponse:
+		"""Query with dense + BM25 sparse vectors fused by Qdrant (scores are RRF scores, not similarities)."""
+		return await self._search(request, collection_id, hybrid=True)
+
+	async def _search(self, request: QueryRequest, collection_id: str, hybrid: bool) -> QueryResponse:
 		collection_id = collection_id or DEFAULT_COLLECTION
 
 		try:
 			# Check if collection exists
-			if not self.collection_exists(collection_id):
+			if not await self.registry.run(self.collection_exists, collection_id):
 				return QueryResponse(results=[])
 
 			# Get collection-specific vectorstore
-			vectorstore = self._get_collection_vectorstore(collection_id)
+			vectorstore = await self.registry.run(self._get_collection_vectorstore, collection_id, hybrid)
 
-			results = vectorstore.similarity_search(
+			results = await self.registry.run(
+				vectorstore.similarity_search_with_score,
 				query=request.query,
 				k=request.top_k,
+				filter=self._build_filter(request.filter),
+				score_threshold=request.score_threshold,
 			)
 
 			items: List[QueryResponseItem] = []
-			for i, res in enumerate(results):
+			for res, score in results:
 				item = QueryResponseItem(
-					id=res.id,
+					# langchain_qdrant returns the point id in the metadata, not on the document
+					id=res.id or (res.metadata or {}).get('_id'),
 					content=res.page_content,
-					score=getattr(res, 'score', 0.0),
+					score=score,
 					metadata=res.metadata or {},
 				)
 				items.append(item)
@@ -259,7 +215,7 @@ class KBRepository:
 				raise CustomHTTPException(message=_('unsupported_file_type'))
 
 			# Extract text content using file extraction service
-			extraction_result = self.file_extraction.extract_text_from_file(
+			extraction_result = await self.file_extraction.aextract_text_from_file(
 				file_content=content,
 				file_type=file.content_type,
 				file_name=file.filename,
@@ -272,12 +228,8 @@ class KBRepository:
 			if not text_content.strip():
 				raise CustomHTTPException(message=_('empty_file_content'))
 
-			# Ensure collection exists
-			if not self.collection_exists(collection_id):
-				self.create_collection(collection_id)
-
-			# Get collection-specific vectorstore
-			vectorstore = self._get_collection_vectorstore(collection_id)
+			# Hybrid vectorstore writes both the dense and the BM25 sparse vectors (ensures the collection exists)
+			vectorstore = await self.registry.run(self._get_collection_vectorstore, collection_id, True)
 
 			doc_id = str(uuid.uuid4())
 			metadata = {
@@ -291,7 +243,7 @@ class KBRepository:
 			# Create document
 			langchain_doc = Document(page_content=text_content, metadata=metadata)
 
-			ids = vectorstore.add_documents(documents=[langchain_doc], ids=[doc_id])
+			ids = await self.registry.run(vectorstore.add_documents, documents=[langchain_doc], ids=[doc_id])
 
 			if not ids:
 				raise CustomHTTPException(message=_('error_adding_document_to_vector_store'))
@@ -318,7 +270,8 @@ class KBRepository:
 		collection_name = self._get_full_collection_name(collection_id)
 
 		try:
-			points = self.client.retrieve(
+			points = await self.registry.run(
+				self.client.retrieve,
 				collection_name=collection_name,
 				ids=[document_id],
 				with_payload=True,
@@ -344,7 +297,8 @@ class KBRepository:
 		collection_name = self._get_full_collection_name(collection_id)
 
 		try:
-			self.client.delete(
+			await self.registry.run(
+				self.client.delete,
 				collection_name=collection_name,
 				points_selector=[document_id],
 			)
@@ -363,7 +317,8 @@ class KBRepository:
 			next_page_offset = None
 
 			while True:
-				points, next_page_offset = self.client.scroll(
+				points, next_page_offset = await self.registry.run(
+					self.client.scroll,
 					collection_name=collection_name,
 					limit=100,
 					offset=next_page_offset,
@@ -223,8 +223,8 @@ async def upload_global_kb_file(
 				file_extraction_service,
 			)
 
-			logger.debug('[GlobalKBRoutes] Calling file_extraction_service.extract_text_from_file')
-			extraction_result = file_extraction_service.extract_text_from_file(
+			logger.debug('[GlobalKBRoutes] Calling file_extraction_service.aextract_text_from_file')
+			extraction_result = await file_extraction_service.aextract_text_from_file(
 				file_content=file_content,
 				file_type=file.content_type or 'application/octet-stream',
 				file_name=file.filename or 'unknown_file',
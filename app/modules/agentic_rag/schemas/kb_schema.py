@@ -27,6 +27,8 @@ class QueryRequest(RequestSchema):
 
 	query: str = Field(..., description='Query text to search in the knowledge base')
 	top_k: int = Field(default=5, description='Number of top similar documents to retrieve')
+	filter: Optional[Dict[str, Any]] = Field(default=None, description='Metadata filter: field -> value (or list of accepted values)')
+	score_threshold: Optional[float] = Field(default=None, description='Minimum cosine similarity of returned documents')
 
 
 class QueryResponseItem(BaseModel):
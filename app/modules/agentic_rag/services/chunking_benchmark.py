@@ -0,0 +1,135 @@
+"""
+Semantic Chunking Benchmark
+
+Đo throughput của SemanticChunkingService với một fake embedder deterministic (không gọi API):
+thời gian chia câu + embedding theo batch + similarity vector hoá, so với cách cũ
+(split theo '.' và cosine similarity từng cặp câu trong vòng lặp Python).
+
+Usage: python -m app.modules.agentic_rag.services.chunking_benchmark [--repeat N] [--latency-ms MS] [--batch-size N]
+"""
+
+import argparse
+import hashlib
+import random
+import time
+from typing import Callable, List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from .chunking_service import SemanticChunkingService, split_sentences
+
+PAGES = (1, 5, 20)
+SENTENCES_PER_PAGE = 40
+DIMENSIONS = 768
+
+TOPICS = (
+	'Kinh nghiệm backend với Python, FastAPI và MySQL trong các dự án thương mại điện tử.',
+	'Dr. Nguyen V. A hướng dẫn đề tài tốt nghiệp về xử lý ngôn ngữ tự nhiên, đạt điểm 3.8/4.0.',
+	'Xây dựng pipeline CI/CD, triển khai Docker và Kubernetes cho hệ thống microservices!',
+	'Thành thạo giao tiếp tiếng Anh, làm việc nhóm và quản lý thời gian hiệu quả.',
+	'Liên hệ qua email candidate@example.com hoặc portfolio tại https://example.dev.',
+)
+
+
+class FakeEmbeddings(Embeddings):
+	"""Embedder deterministic: vector chỉ phụ thuộc vào text
+
+	Giả lập API thật: tối đa `max_batch` text mỗi request, mỗi request tốn `latency_seconds`.
+	"""
+
+	def __init__(self, size: int = DIMENSIONS, latency_seconds: float = 0.0, max_batch: int = 100):
+		self.size = size
+		self.latency_seconds = latency_seconds
+		self.max_batch = max_batch
+		self.requests = 0
+
+	def _vector(self, text: str) -> List[float]:
+		seed = int.from_bytes(hashlib.sha256(text.encode('utf-8')).digest()[:8], 'big')
+		return np.random.default_rng(seed).standard_normal(self.size).tolist()
+
+	def embed_documents(self, texts: List[str]) -> List[List[float]]:
+		requests = -(-len(texts) // self.max_batch)
+		self.requests += requests
+		if self.latency_seconds:
+			time.sleep(self.latency_seconds * requests)
+		return [self._vector(text) for text in texts]
+
+	def embed_query(self, text: str) -> List[float]:
+		return self.embed_documents([text])[0]
+
+
+def build_document(pages: int, seed: int = 42) -> str:
+	rng = random.Random(seed)
+	paragraphs = []
+	for _ in range(pages * SENTENCES_PER_PAGE // 5):
+		paragraphs.append(' '.join(f'{rng.choice(TOPICS)[:-1]} ({rng.randint(1, 10_000)}).' for _ in range(5)))
+	return '\n\n'.join(paragraphs)
+
+
+def legacy_chunk(embedding: Embeddings, text: str, max_chunk_size: int = 1000, similarity_threshold: float = 0.7) -> List[str]:
+	"""Cách cũ: split theo '.', cosine similarity từng cặp câu"""
+	sentences = [s.strip() for s in text.split('.') if s.strip()]
+	if len(sentences) <= 1:
+		return [text]
+	embeddings = embedding.embed_documents(sentences)
+
+	chunks = []
+	current_chunk = [sentences[0]]
+	current_size = len(sentences[0])
+	for i in range(1, len(sentences)):
+		a, b = np.array(embeddings[i - 1]), np.array(embeddings[i])
+		similarity = np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
+		if similarity >= similarity_threshold and current_size + len(sentences[i]) <= max_chunk_size:
+			current_chunk.append(sentences[i])
+			current_size += len(sentences[i])
+		else:
+			chunks.append('. '.join(current_chunk) + '.')
+			current_chunk = [sentences[i]]
+			current_size = len(sentences[i])
+	chunks.append('. '.join(current_chunk) + '.')
+	return chunks
+
+
+def best_of(repeat: int, func: Callable[[], object]) -> float:
+	timings = []
+	for _ in range(repeat):
+		start = time.perf_counter()
+		func()
+		timings.append(time.perf_counter() - start)
+	return min(timings)
+
+
+def main(argv: List[str] = None) -> int:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--repeat', type=int, default=5)
+	parser.add_argument('--latency-ms', type=float, default=0.0, help='độ trễ giả lập cho mỗi request embedding')
+	parser.add_argument('--batch-size', type=int, default=100)
+	args = parser.parse_args(argv)
+
+	embedding = FakeEmbeddings(latency_seconds=args.latency_ms / 1000)
+	service = SemanticChunkingService(embedding=embedding, batch_size=args.batch_size)
+
+	print(f'{"pages":>5} {"sentences":>9} {"requests":>8} {"legacy ms":>10} {"batched ms":>11} {"sentences/s":>12} {"similarity ms (loop -> vectorized)":>36}')
+	for pages in PAGES:
+		text = build_document(pages)
+
+		embedding.requests = 0
+		service.semantic_chunk(text)
+		requests = embedding.requests
+
+		legacy = best_of(args.repeat, lambda: legacy_chunk(embedding, text))
+		batched = best_of(args.repeat, lambda: service.semantic_chunk(text))
+
+		sentences = split_sentences(text)
+		vectors = embedding.embed_documents(sentences)
+		loop = best_of(args.repeat, lambda: [np.dot(np.array(a), np.array(b)) / (np.linalg.norm(a) * np.linalg.norm(b)) for a, b in zip(vectors, vectors[1:])])
+		vectorized = best_of(args.repeat, lambda: service._adjacent_similarities(vectors))
+
+		print(f'{pages:>5} {len(sentences):>9} {requests:>8} {legacy * 1000:>10.2f} {batched * 1000:>11.2f} {len(sentences) / batched:>12.0f} {f"{loop * 1000:.2f} -> {vectorized * 1000:.2f}":>36}')
+
+	return 0
+
+
+if __name__ == '__main__':
+	raise SystemExit(main())
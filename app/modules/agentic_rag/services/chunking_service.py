@@ -3,20 +3,86 @@ Semantic Chunking Service - Đơn giản và nhẹ
 """
 
 import logging
-from typing import List
-from langchain_core.documents import Document
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
-from app.core.config import GOOGLE_API_KEY
+import re
+from typing import List, Optional
+
 import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from app.modules.agentic_rag.core.qdrant_registry import get_qdrant_registry
 
 logger = logging.getLogger(__name__)
 
+# Viết tắt thường gặp (EN/VI) không kết thúc câu, so khớp ở dạng chữ thường và bỏ dấu chấm cuối
+ABBREVIATIONS = {
+	'mr',
+	'mrs',
+	'ms',
+	'dr',
+	'prof',
+	'sr',
+	'jr',
+	'st',
+	'vs',
+	'etc',
+	'e.g',
+	'i.e',
+	'inc',
+	'ltd',
+	'co',
+	'corp',
+	'no',
+	'tp',
+	'ths',
+	'ts',
+	'pgs',
+	'gs',
+	'ks',
+	'cn',
+}
+
+# Dấu kết thúc câu (kèm ngoặc/nháy đóng) theo sau bởi khoảng trắng
+_SENTENCE_END_PATTERN = re.compile(r'[.!?…]+["\'”’)\]]*(?=\s)')
+_LINE_BREAK_PATTERN = re.compile(r'\n\s*\n|\n(?=\s*(?:[-*•▪●+]|\d+[.)])\s)')
+
+
+def split_sentences(text: str) -> List[str]:
+	"""Chia văn bản thành câu
+
+	- Đoạn văn và dòng bullet (CV, JD) là ranh giới câu
+	- Dấu . ! ? … chỉ kết thúc câu khi theo sau là khoảng trắng, nên số thập phân, email, URL không bị cắt
+	- Viết tắt (Dr., e.g., TP.), chữ cái viết tắt tên (Nguyen V. A) và số thứ tự đầu dòng không kết thúc câu
+	"""
+	sentences = []
+	for block in _LINE_BREAK_PATTERN.split(text):
+		start = 0
+		for match in _SENTENCE_END_PATTERN.finditer(block):
+			if match.group(0).startswith('.') and _is_abbreviation(block, match.start()):
+				continue
+			sentences.append(block[start : match.end()])
+			start = match.end()
+		sentences.append(block[start:])
+	return [sentence for sentence in (' '.join(sentence.split()) for sentence in sentences) if sentence]
+
+
+def _is_abbreviation(block: str, dot_index: int) -> bool:
+	word_start = dot_index
+	while word_start > 0 and not block[word_start - 1].isspace():
+		word_start -= 1
+	word = block[word_start:dot_index].lower().lstrip('("\'')
+	if word.isdigit() and not block[:word_start].strip():
+		# Số thứ tự đầu dòng ("1. ...")
+		return True
+	return word in ABBREVIATIONS or (len(word) == 1 and word.isalpha())
+
 
 class SemanticChunkingService:
 	"""Service cho semantic chunking đơn giản"""
 
-	def __init__(self):
-		self.embedding = GoogleGenerativeAIEmbeddings(model='models/embedding-001', google_api_key=GOOGLE_API_KEY)
+	def __init__(self, embedding: Optional[Embeddings] = None, batch_size: int = 100):
+		# Shared cached embedding model: sentences already embedded are not sent to the API again
+		self.embedding = embedding or get_qdrant_registry().get_embedding('models/embedding-001')
+		self.batch_size = batch_size
 
 	def semantic_chunk(self, text: str, max_chunk_size: int = 1000, similarity_threshold: float = 0.7) -> List[str]:
 		"""
@@ -25,13 +91,32 @@ class SemanticChunkingService:
 		- Nhóm câu có similarity cao
 		- Giữ chunk size hợp lý
 		"""
-		# Chia theo câu đơn giản
-		sentences = [s.strip() for s in text.split('.') if s.strip()]
+		sentences = split_sentences(text)
 		if len(sentences) <= 1:
 			return [text]
 
-		# Tính embedding cho từng câu
-		embeddings = self.embedding.embed_documents(sentences)
+		# Embedding theo batch giới hạn cho toàn bộ câu của văn bản
+		embeddings = []
+		for i in range(0, len(sentences), self.batch_size):
+			embeddings.extend(self.embedding.embed_documents(sentences[i : i + self.batch_size]))
+
+		return self._group_sentences(sentences, embeddings, max_chunk_size, similarity_threshold)
+
+	async def asemantic_chunk(self, text: str, max_chunk_size: int = 1000, similarity_threshold: float = 0.7) -> List[str]:
+		"""Như semantic_chunk nhưng embedding không block event loop"""
+		sentences = split_sentences(text)
+		if len(sentences) <= 1:
+			return [text]
+
+		embeddings = []
+		for i in range(0, len(sentences), self.batch_size):
+			embeddings.extend(await self.embedding.aembed_documents(sentences[i : i + self.batch_size]))
+
+		return self._group_sentences(sentences, embeddings, max_chunk_size, similarity_threshold)
+
+	def _group_sentences(self, sentences: List[str], embeddings: List[List[float]], max_chunk_size: int, similarity_threshold: float) -> List[str]:
+		"""Nhóm các câu liên tiếp có similarity >= threshold, giữ chunk <= max_chunk_size"""
+		similarities = self._adjacent_similarities(embeddings)
 
 		chunks = []
 		current_chunk = [sentences[0]]
@@ -41,29 +126,26 @@ class SemanticChunkingService:
 			sentence = sentences[i]
 			sentence_size = len(sentence)
 
-			# Kiểm tra similarity với câu cuối của chunk hiện tại
-			similarity = self._cosine_similarity(embeddings[i - 1], embeddings[i])
-
-			# Nếu similarity cao và size cho phép -> thêm vào chunk hiện tại
-			if similarity >= similarity_threshold and current_size + sentence_size <= max_chunk_size:
+			# Nếu similarity với câu trước cao và size cho phép -> thêm vào chunk hiện tại
+			if similarities[i - 1] >= similarity_threshold and current_size + sentence_size <= max_chunk_size:
 				current_chunk.append(sentence)
 				current_size += sentence_size
 			else:
 				# Tạo chunk mới
-				chunks.append('. '.join(current_chunk) + '.')
+				chunks.append(' '.join(current_chunk))
 				current_chunk = [sentence]
 				current_size = sentence_size
 
 		# Thêm chunk cuối
 		if current_chunk:
-			chunks.append('. '.join(current_chunk) + '.')
+			chunks.append(' '.join(current_chunk))
 
 		return chunks
 
-	def _cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
-		"""Tính cosine similarity đơn giản"""
-		try:
-			a, b = np.array(vec1), np.array(vec2)
-			return np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
-		except:
-			return 0.0
+	def _adjacent_similarities(self, embeddings: List[List[float]]) -> List[float]:
+		"""Cosine similarity giữa mỗi cặp câu liền kề, tính một lần trên cả ma trận"""
+		matrix = np.asarray(embeddings, dtype=np.float32)
+		norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+		# Vector 0 (embedding lỗi) có similarity 0 thay vì NaN
+		matrix = np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+		return np.einsum('ij,ij->i', matrix[:-1], matrix[1:]).tolist()
@@ -337,12 +337,15 @@ class ConversationRAGService:
 		logger.info(f'{LogColors.OKBLUE}[ConversationRAGService] Checking if collection exists: {collection_name}{LogColors.ENDC}')
 
 		try:
-			self.kb_repo.client.get_collection(collection_name=collection_name)
-			logger.info(f'{LogColors.OKGREEN}[ConversationRAGService] Collection exists: {collection_name}{LogColors.ENDC}')
-			return True
+			exists = self.kb_repo.registry.collection_exists(collection_name)
 		except Exception:
+			exists = False
+
+		if exists:
+			logger.info(f'{LogColors.OKGREEN}[ConversationRAGService] Collection exists: {collection_name}{LogColors.ENDC}')
+		else:
 			logger.info(f'{LogColors.WARNING}[ConversationRAGService] Collection does not exist: {collection_name}{LogColors.ENDC}')
-			return False
+		return exists
 
 	def get_conversation_collection_stats(self, conversation_id: str) -> Dict[str, Any]:
 		"""Get statistics cho conversation collection"""
@@ -8,12 +8,14 @@ import asyncio
 from typing import Dict, Any, List, Optional
 from sqlalchemy.orm import Session
 
+from app.modules.agentic_rag.core.qdrant_registry import get_qdrant_registry
 from app.modules.agentic_rag.repository.kb_repo import KBRepository
 from app.modules.agentic_rag.schemas.kb_schema import (
 	AddDocumentsRequest,
 	DocumentModel,
 	QueryRequest,
 )
+from app.modules.chat.services.file_extraction_service import file_extraction_service
 from app.middleware.translation_manager import _
 from app.exceptions.exception import ValidationException
 
@@ -454,6 +456,8 @@ workflow.add_edge("process", END)
 				'collection_name': self.GLOBAL_COLLECTION_NAME,
 				'exists': collection_exists,
 				'status': ('active' if collection_exists else 'not_initialized'),
+				'embedding_cache': get_qdrant_registry().get_embedding_cache_stats(),
+				'extraction': file_extraction_service.get_stats(),
 			}
 
 			logger.info(f'[GlobalKBService] Successfully generated Global KB stats')
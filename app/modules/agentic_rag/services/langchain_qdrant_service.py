@@ -39,7 +39,7 @@ class LangChainQdrantService:
 			doc_chunks = []
 			for doc in documents:
 				# Sử dụng semantic chunking
-				semantic_chunks = self.semantic_chunking.semantic_chunk(doc.page_content)
+				semantic_chunks = await self.semantic_chunking.asemantic_chunk(doc.page_content)
 
 				# Tạo Document objects từ semantic chunks
 				for chunk_text in semantic_chunks:
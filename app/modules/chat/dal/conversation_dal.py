@@ -1,9 +1,11 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, asc
-from app.core.base_dal import BaseDAL
+from sqlalchemy import desc, asc, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.base_dal import AsyncBaseDAL, BaseDAL
 from app.core.base_model import Pagination
 from app.modules.chat.models.conversation import Conversation
 from app.utils.filter_utils import apply_dynamic_filters
+from datetime import datetime
 from typing import Optional
 import logging
 
@@ -24,6 +26,9 @@ class ConversationDAL(BaseDAL[Conversation]):
 		search: Optional[str] = None,
 		order_by: str = 'last_activity',
 		order_direction: str = 'desc',
+		cursor: Optional[str] = None,
+		use_cursor: bool = False,
+		include_total: bool = False,
 	):
 		"""Get conversations for a user with pagination and filtering"""
 		pass  # logger.info(f'\033[93m[ConversationDAL.get_user_conversations] Getting conversations for user: {user_id}, page: {page}, page_size: {page_size}, search: {search}, order_by: {order_by}, order_direction: {order_direction}\033[0m')
@@ -35,6 +40,18 @@ class ConversationDAL(BaseDAL[Conversation]):
 			pass  # logger.info(f'\033[94m[ConversationDAL.get_user_conversations] Applying search filter: {search}\033[0m')
 			query = query.filter(self.model.name.ilike(f'%{search}%'))
 
+		# Keyset pagination only supports timestamp orderings
+		if use_cursor or cursor:
+			order_column = self.model.create_date if order_by == 'create_date' else self.model.last_activity
+			return self.paginate_by_cursor(
+				query,
+				order_column,
+				cursor=cursor,
+				page_size=page_size,
+				descending=order_direction.lower() == 'desc',
+				total_count=query.count() if include_total else None,
+			)
+
 		# Apply ordering
 		pass  # logger.info(f'\033[94m[ConversationDAL.get_user_conversations] Applying ordering by: {order_by} {order_direction}\033[0m')
 		order_column = getattr(self.model, order_by, self.model.last_activity)
@@ -102,3 +119,56 @@ class ConversationDAL(BaseDAL[Conversation]):
 		logger.info(f'Total conversations count: {total_count}')
 		
 		return total_count
+
+
+	def record_new_messages(self, conversation_id: str, count: int, last_activity: datetime) -> int:
+		"""Atomically add `count` to message_count and set last_activity; returns the new message_count"""
+		self.db.execute(
+			update(self.model)
+			.where(self.model.id == conversation_id)
+			.values(message_count=self.model.message_count + count, last_activity=last_activity)
+		)
+		return self.db.execute(select(self.model.message_count).where(self.model.id == conversation_id)).scalar() or 0
+
+	def save_context_summary(self, conversation_id: str, summary: str, message_count: int, expected_message_count: int) -> bool:
+		"""Store a rolling summary covering the first `message_count` messages, unless another refresh moved it past `expected_message_count`"""
+		result = self.db.execute(
+			update(self.model)
+			.where(self.model.id == conversation_id, self.model.context_summary_message_count == expected_message_count)
+			.values(context_summary=summary, context_summary_message_count=message_count)
+		)
+		return result.rowcount > 0
+
+
+class AsyncConversationDAL(AsyncBaseDAL[Conversation]):
+	"""Async conversation queries for the chat hot path"""
+
+	def __init__(self, db: AsyncSession):
+		super().__init__(db, Conversation)
+
+	async def get_user_conversation_by_id(self, conversation_id: str, user_id: str) -> Optional[Conversation]:
+		"""Get a specific conversation for a user
+
+		Always re-read from the row: the session never expires objects (expire_on_commit=False) and a
+		websocket keeps it for its whole life, so the identity-map copy would miss writes made elsewhere.
+		"""
+		result = await self.db.execute(
+			select(self.model)
+			.where(
+				self.model.id == conversation_id,
+				self.model.user_id == user_id,
+				self.model.is_deleted == False,
+			)
+			.execution_options(populate_existing=True)
+		)
+		return result.scalars().first()
+
+	async def record_new_messages(self, conversation_id: str, count: int, last_activity: datetime) -> int:
+		"""Atomically add `count` to message_count and set last_activity; returns the new message_count"""
+		await self.db.execute(
+			update(self.model)
+			.where(self.model.id == conversation_id)
+			.values(message_count=self.model.message_count + count, last_activity=last_activity)
+		)
+		result = await self.db.execute(select(self.model.message_count).where(self.model.id == conversation_id))
+		return result.scalar() or 0
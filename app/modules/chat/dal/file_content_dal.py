@@ -0,0 +1,21 @@
+import logging
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.base_dal import BaseDAL
+from app.modules.chat.models.file_content import FileContent
+
+logger = logging.getLogger(__name__)
+
+
+class FileContentDAL(BaseDAL[FileContent]):
+	def __init__(self, db: Session):
+		super().__init__(db, FileContent)
+
+	def get_by_checksum(self, user_id: str, checksum: str) -> Optional[FileContent]:
+		"""Get the content record of a user's file bytes"""
+		return self.db.query(self.model).filter(self.model.user_id == user_id, self.model.checksum == checksum, self.model.is_deleted == False).first()
+
+	def get_by_object_path(self, object_path: str) -> Optional[FileContent]:
+		return self.db.query(self.model).filter(self.model.object_path == object_path, self.model.is_deleted == False).first()
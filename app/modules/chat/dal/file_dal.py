@@ -26,6 +26,9 @@ class FileDAL(BaseDAL[File]):
 		file_type: Optional[str] = None,
 		search: Optional[str] = None,
 		conversation_id: Optional[str] = None,
+		cursor: Optional[str] = None,
+		use_cursor: bool = False,
+		include_total: bool = False,
 	):
 		"""Get files for a user with pagination and filtering"""
 		pass  # logger.info(f'\033[93m[FileDAL.get_user_files] Getting files for user: {user_id}, page: {page}, page_size: {page_size}, file_type: {file_type}, search: {search}, conversation_id: {conversation_id}\033[0m')
@@ -47,6 +50,15 @@ class FileDAL(BaseDAL[File]):
 			pass  # logger.info(f'\033[94m[FileDAL.get_user_files] Applying conversation filter: {conversation_id}\033[0m')
 			query = query.filter(self.model.conversation_id == conversation_id)
 
+		if use_cursor or cursor:
+			return self.paginate_by_cursor(
+				query,
+				self.model.upload_date,
+				cursor=cursor,
+				page_size=page_size,
+				total_count=query.count() if include_total else None,
+			)
+
 		# Order by upload date descending
 		pass  # logger.info(f'\033[94m[FileDAL.get_user_files] Ordering by upload date descending\033[0m')
 		query = query.order_by(desc(self.model.upload_date))
@@ -94,6 +106,25 @@ class FileDAL(BaseDAL[File]):
 		pass  # logger.info(f'\033[92m[FileDAL.get_files_by_checksum] Found {len(files)} files with checksum: {checksum}\033[0m')
 		return files
 
+	def count_files_by_path(self, file_path: str, exclude_file_id: Optional[str] = None) -> int:
+		"""Count live files referencing a storage object (identical uploads share one object)"""
+		query = self.db.query(self.model).filter(self.model.file_path == file_path, self.model.is_deleted == False)
+		if exclude_file_id:
+			query = query.filter(self.model.id != exclude_file_id)
+		return query.count()
+
+	def get_indexed_file_by_checksum(self, checksum: str, conversation_id: str, exclude_file_id: Optional[str] = None) -> Optional[File]:
+		"""Get an already indexed file with the same content in a conversation (indexing idempotency)"""
+		query = self.db.query(self.model).filter(
+			self.model.checksum == checksum,
+			self.model.conversation_id == conversation_id,
+			self.model.is_indexed == True,
+			self.model.is_deleted == False,
+		)
+		if exclude_file_id:
+			query = query.filter(self.model.id != exclude_file_id)
+		return query.first()
+
 	def get_conversation_files(
 		self,
 		user_id: str,
@@ -102,6 +133,9 @@ class FileDAL(BaseDAL[File]):
 		page_size: int = 10,
 		file_type: Optional[str] = None,
 		search: Optional[str] = None,
+		cursor: Optional[str] = None,
+		use_cursor: bool = False,
+		include_total: bool = False,
 	):
 		"""Get files for a specific conversation with pagination and filtering"""
 		pass  # logger.info(f'\033[93m[FileDAL.get_conversation_files] Getting files for conversation: {conversation_id}, user: {user_id}, page: {page}, page_size: {page_size}, file_type: {file_type}, search: {search}\033[0m')
@@ -120,6 +154,15 @@ class FileDAL(BaseDAL[File]):
 		if search:
 			query = query.filter(self.model.name.ilike(f'%{search}%'))
 
+		if use_cursor or cursor:
+			return self.paginate_by_cursor(
+				query,
+				self.model.upload_date,
+				cursor=cursor,
+				page_size=page_size,
+				total_count=query.count() if include_total else None,
+			)
+
 		# Order by upload date descending
 		query = query.order_by(desc(self.model.upload_date))
 
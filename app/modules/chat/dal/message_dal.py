@@ -1,9 +1,10 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from app.core.base_dal import BaseDAL
+from sqlalchemy import desc, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.base_dal import AsyncBaseDAL, BaseDAL
 from app.core.base_model import Pagination
 from app.modules.chat.models.message import Message
-from typing import List, Optional
+from typing import List, Optional, Set
 import logging
 
 logger = logging.getLogger(__name__)
@@ -19,13 +20,32 @@ class MessageDAL(BaseDAL[Message]):
 		page: int = 1,
 		page_size: int = 50,
 		before_message_id: Optional[str] = None,
+		cursor: Optional[str] = None,
+		use_cursor: bool = False,
+		estimated_total: Optional[int] = None,
 	):
-		"""Get messages for a conversation with pagination"""
+		"""Get messages for a conversation with pagination
+
+		In cursor mode pages walk back from the newest message (scroll-back) and each
+		page is returned in chronological order; the total is only the estimate given.
+		"""
 		query = self.db.query(self.model).filter(
 			self.model.conversation_id == conversation_id,
 			self.model.is_deleted == False,
 		)
 
+		if use_cursor or cursor:
+			paginated_result = self.paginate_by_cursor(
+				query,
+				self.model.timestamp,
+				cursor=cursor,
+				page_size=page_size,
+				descending=True,
+				total_count=estimated_total,
+			)
+			paginated_result.items.reverse()
+			return paginated_result
+
 		# If before_message_id is provided, get messages before that message
 		if before_message_id:
 			before_message = self.get_by_id(before_message_id)
@@ -60,6 +80,20 @@ class MessageDAL(BaseDAL[Message]):
 		)
 		return messages
 
+	def get_messages_range(self, conversation_id: str, offset: int, limit: int) -> List[Message]:
+		"""Messages of a conversation in chronological order, skipping the first `offset`"""
+		return (
+			self.db.query(self.model)
+			.filter(
+				self.model.conversation_id == conversation_id,
+				self.model.is_deleted == False,
+			)
+			.order_by(self.model.timestamp)
+			.offset(offset)
+			.limit(limit)
+			.all()
+		)
+
 	def get_latest_message(self, conversation_id: str) -> Optional[Message]:
 		"""Get the latest message in a conversation"""
 		message = (
@@ -73,6 +107,19 @@ class MessageDAL(BaseDAL[Message]):
 		)
 		return message
 
+	def get_existing_ids(self, message_ids: List[str]) -> Set[str]:
+		"""Ids among `message_ids` that are already stored"""
+		if not message_ids:
+			return set()
+		return {row[0] for row in self.db.query(self.model.id).filter(self.model.id.in_(message_ids)).all()}
+
+	def add_messages(self, messages_data: List[dict]) -> List[Message]:
+		"""Insert messages in one flush (no per-row commit or refresh)"""
+		messages = [self.model(**message_data) for message_data in messages_data]
+		self.db.add_all(messages)
+		self.db.flush()
+		return messages
+
 	def soft_delete_by_conversation(self, conversation_id: str):
 		"""Soft delete all messages in a conversation"""
 		updated_count = (
@@ -84,3 +131,37 @@ class MessageDAL(BaseDAL[Message]):
 			.update({'is_deleted': True})
 		)
 		return updated_count
+
+
+class AsyncMessageDAL(AsyncBaseDAL[Message]):
+	"""Async message queries for the chat hot path"""
+
+	def __init__(self, db: AsyncSession):
+		super().__init__(db, Message)
+
+	async def get_conversation_history(self, conversation_id: str, limit: int = 10) -> List[Message]:
+		"""Get recent messages for conversation context"""
+		result = await self.db.execute(
+			select(self.model)
+			.where(
+				self.model.conversation_id == conversation_id,
+				self.model.is_deleted == False,
+			)
+			.order_by(desc(self.model.timestamp))
+			.limit(limit)
+		)
+		return result.scalars().all()
+
+	async def get_existing_ids(self, message_ids: List[str]) -> Set[str]:
+		"""Ids among `message_ids` that are already stored"""
+		if not message_ids:
+			return set()
+		result = await self.db.execute(select(self.model.id).where(self.model.id.in_(message_ids)))
+		return set(result.scalars().all())
+
+	async def add_messages(self, messages_data: List[dict]) -> List[Message]:
+		"""Insert messages in one flush (no per-row commit or refresh)"""
+		messages = [self.model(**message_data) for message_data in messages_data]
+		self.db.add_all(messages)
+		await self.db.flush()
+		return messages
@@ -3,6 +3,7 @@
 from .conversation import Conversation
 from .message import Message
 from .file import File
+from .file_content import FileContent
 from .message_file import MessageFile
 
-__all__ = ['Conversation', 'Message', 'File', 'MessageFile']
+__all__ = ['Conversation', 'Message', 'File', 'FileContent', 'MessageFile']
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Text
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Index, Text
 from sqlalchemy.orm import relationship
 from app.core.base_model import BaseEntity
 
@@ -7,6 +7,10 @@ class Conversation(BaseEntity):
 	"""Conversation model representing user chat conversations"""
 
 	__tablename__ = 'conversations'
+	__table_args__ = (
+		# Conversation list of a user ordered by recent activity
+		Index('ix_conversations_user_id_is_deleted_last_activity', 'user_id', 'is_deleted', 'last_activity'),
+	)
 
 	name = Column(String(255), nullable=False, default='New Conversation')
 	user_id = Column(String(36), ForeignKey('users.id'), nullable=False)
@@ -14,6 +18,8 @@ class Conversation(BaseEntity):
 	last_activity = Column(DateTime, nullable=True)
 	system_prompt = Column(Text, nullable=True, default=None)  # Per-conversation agent customization
 	extra_metadata = Column(Text, nullable=True, default=None)  # Store additional metadata like CV context as JSON
+	context_summary = Column(Text, nullable=True, default=None)  # Rolling summary of the older messages, sent instead of them
+	context_summary_message_count = Column(Integer, nullable=False, default=0)  # Messages (oldest first) covered by context_summary
 	# Relationships
 	user = relationship('User', back_populates='conversations')
 	messages = relationship('Message', back_populates='conversation', cascade='all, delete-orphan')
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, String, Integer, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.core.base_model import BaseEntity
 
@@ -7,6 +7,12 @@ class File(BaseEntity):
 	"""File model for chat file attachments"""
 
 	__tablename__ = 'files'
+	__table_args__ = (
+		# File lists per user / per conversation ordered by upload date, and duplicate lookup
+		Index('ix_files_user_id_is_deleted_upload_date', 'user_id', 'is_deleted', 'upload_date'),
+		Index('ix_files_conversation_id_is_deleted_upload_date', 'conversation_id', 'is_deleted', 'upload_date'),
+		Index('ix_files_checksum', 'checksum'),
+	)
 
 	name = Column(String(255), nullable=False)
 	original_name = Column(String(255), nullable=False)
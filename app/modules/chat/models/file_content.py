@@ -0,0 +1,24 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy.dialects.mysql import LONGTEXT
+from app.core.base_model import BaseEntity
+
+
+class FileContent(BaseEntity):
+	"""Content-addressed record of an uploaded file's bytes, per user
+
+	Identical re-uploads (same MD5 checksum) reuse the stored object and the extracted text; CV analyses are
+	cached by checksum in cv_analyses.
+	"""
+
+	__tablename__ = 'file_contents'
+	__table_args__ = (UniqueConstraint('user_id', 'checksum', name='uq_file_contents_user_id_checksum'),)
+
+	user_id = Column(String(36), ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+	checksum = Column(String(64), nullable=False)  # MD5 of the content
+	sha256 = Column(String(64), nullable=True)
+	size = Column(Integer, nullable=False)
+	content_type = Column(String(100), nullable=True)
+	object_path = Column(String(1000), nullable=True)  # MinIO object, None once removed from storage
+	extracted_text = Column(Text().with_variant(LONGTEXT(), 'mysql'), nullable=True)
+	extracted_at = Column(DateTime, nullable=True)
+	analyzed_at = Column(DateTime, nullable=True)  # Analyzed as a CV: the object is kept, CV contexts link to it
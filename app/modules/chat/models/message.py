@@ -1,6 +1,6 @@
 import enum
 
-from sqlalchemy import Column, DateTime, Enum, ForeignKey, String, Text
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index, String, Text
 from sqlalchemy.orm import relationship
 
 from app.core.base_model import BaseEntity
@@ -15,6 +15,10 @@ class Message(BaseEntity):
 	"""Message model - stored entirely in MySQL"""
 
 	__tablename__ = 'messages'
+	__table_args__ = (
+		# History, paging and latest-message lookups: filter by conversation, walk by time
+		Index('ix_messages_conversation_id_is_deleted_timestamp', 'conversation_id', 'is_deleted', 'timestamp'),
+	)
 
 	conversation_id = Column(String(36), ForeignKey('conversations.id'), nullable=False)
 	user_id = Column(String(36), ForeignKey('users.id'), nullable=False)
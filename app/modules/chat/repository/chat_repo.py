@@ -3,24 +3,32 @@ import json
 import logging
 import os
 import time
-from datetime import datetime
 from typing import Any, Dict, List
 
 from fastapi import Depends
-from pytz import timezone
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.exceptions.exception import NotFoundException, ValidationException
 from app.middleware.translation_manager import _
+from app.modules.chat.services.conversation_context_service import (
+	ConversationContext,
+	build_conversation_context,
+	conversation_context_cache,
+	conversation_fingerprint,
+)
+from app.modules.chat.services.conversation_summary_service import request_summary_refresh
 from app.modules.chat.services.cv_integration_service import CVIntegrationService
+from app.modules.chat.services.turn_persistence_service import new_message_data, persist_turn, persist_turn_async, turn_write_behind
 from app.utils.n8n_api_client import n8n_client
 
-from ....core.config import GOOGLE_API_KEY
+from ....core.config import CHAT_PERSISTENCE_MODE, CONVERSATION_CONTEXT_HISTORY_LIMIT, GOOGLE_API_KEY
 from ...agent.dal.agent_dal import AgentDAL
 from ...agent.repository.conversation_workflow_repo import ConversationWorkflowRepo
-from ..dal.conversation_dal import ConversationDAL
-from ..dal.message_dal import MessageDAL
+from ..dal.conversation_dal import AsyncConversationDAL, ConversationDAL
+from ..dal.message_dal import AsyncMessageDAL, MessageDAL
+from ..models.message import Message
 
 # Remove CV integration import to avoid circular import
 
@@ -28,13 +36,19 @@ logger = logging.getLogger(__name__)
 
 
 class ChatRepo:
-	def __init__(self, db: Session = Depends(get_db)):
+	def __init__(self, db: Session = Depends(get_db), async_db: AsyncSession | None = None):
 		self.db = db
 		self.conversation_dal = ConversationDAL(db)
 		self.message_dal = MessageDAL(db)
 		self.agent_dal = AgentDAL(db)
 		self.conversation_workflow_repo = ConversationWorkflowRepo(db)
 
+		# Optional async session used by the websocket hot path so queries don't block the event loop
+		self.async_db = async_db
+		if async_db is not None:
+			self.async_conversation_dal = AsyncConversationDAL(async_db)
+			self.async_message_dal = AsyncMessageDAL(async_db)
+
 	def get_conversation_by_id(self, conversation_id: str, user_id: str):
 		"""Get conversation by ID and verify user access"""
 		conversation = self.conversation_dal.get_user_conversation_by_id(conversation_id, user_id)
@@ -42,6 +56,16 @@ class ChatRepo:
 			raise NotFoundException(_('conversation_not_found'))
 		return conversation
 
+	def get_conversation_context(self, conversation_id: str, user_id: str) -> ConversationContext:
+		"""Turn context (metadata, CV context, system prompt, recent history), rebuilt only when the conversation changed"""
+		conversation = self.get_conversation_by_id(conversation_id, user_id)
+		context = conversation_context_cache.get(conversation_id, user_id, conversation_fingerprint(conversation))
+		if context is None:
+			messages = self.message_dal.get_conversation_history(conversation_id, limit=CONVERSATION_CONTEXT_HISTORY_LIMIT)
+			context = build_conversation_context(conversation, messages, CVIntegrationService(self.db))
+			conversation_context_cache.put(context)
+		return context
+
 	def get_conversation_history(self, conversation_id: str, user_id: str, limit: int = 50) -> List[Dict[str, Any]]:
 		"""Get conversation message history for context"""
 
@@ -75,37 +99,75 @@ class ChatRepo:
 	):
 		"""Create a new message in the conversation"""
 		# Verify conversation exists and user has access
-		conversation = self.get_conversation_by_id(conversation_id, user_id)
+		self.get_conversation_by_id(conversation_id, user_id)
 
-		message_timestamp = datetime.now(timezone('Asia/Ho_Chi_Minh'))
-
-		# Create message in MySQL only
-		message_data = {
-			'conversation_id': conversation_id,
-			'user_id': user_id,
-			'role': role,
-			'content': content,
-			'timestamp': message_timestamp,
-			'model_used': model_used,
-			'tokens_used': tokens_used,
-			'response_time_ms': response_time_ms,
-		}
+		# Message insert and conversation activity / message count update in one transaction
+		message_data = new_message_data(conversation_id, user_id, content, role, model_used, tokens_used, response_time_ms)
+		return persist_turn(self.db, conversation_id, [message_data])[0]
 
-		with self.message_dal.transaction():
-			message = self.message_dal.create(message_data)
-
-			# Update conversation activity and message count
-			conversation.last_activity = message_timestamp
-			conversation.message_count += 1
-			self.conversation_dal.update(
-				conversation.id,
-				{
-					'last_activity': conversation.last_activity,
-					'message_count': conversation.message_count,
-				},
-			)
+	def save_turn(self, conversation_id: str, messages_data: List[Dict[str, Any]]) -> List[Message]:
+		"""Persist the messages of a turn (built with new_message_data) and the conversation counters in one transaction"""
+		return persist_turn(self.db, conversation_id, messages_data)
 
-			return message
+	async def get_conversation_by_id_async(self, conversation_id: str, user_id: str):
+		"""Get conversation by ID and verify user access without blocking the event loop"""
+		conversation = await self.async_conversation_dal.get_user_conversation_by_id(conversation_id, user_id)
+		if not conversation:
+			raise NotFoundException(_('conversation_not_found'))
+		return conversation
+
+	async def get_conversation_context_async(self, conversation_id: str, user_id: str) -> ConversationContext:
+		"""Async variant of get_conversation_context"""
+		# A read transaction left open on the long-lived websocket session (write-behind mode never commits it)
+		# would pin the REPEATABLE READ snapshot of the previous turn
+		if self.async_db.in_transaction() and not (self.async_db.new or self.async_db.dirty or self.async_db.deleted):
+			await self.async_db.commit()
+		conversation = await self.get_conversation_by_id_async(conversation_id, user_id)
+		context = conversation_context_cache.get(conversation_id, user_id, conversation_fingerprint(conversation))
+		if context is None:
+			messages = await self.async_message_dal.get_conversation_history(conversation_id, limit=CONVERSATION_CONTEXT_HISTORY_LIMIT)
+			context = build_conversation_context(conversation, messages, CVIntegrationService(self.db))
+			conversation_context_cache.put(context)
+		return context
+
+	async def get_conversation_history_async(self, conversation_id: str, user_id: str, limit: int = 50) -> List[Dict[str, Any]]:
+		"""Async variant of get_conversation_history"""
+		await self.get_conversation_by_id_async(conversation_id, user_id)
+
+		messages = await self.async_message_dal.get_conversation_history(conversation_id, limit=limit)
+
+		return [
+			{
+				'role': message.role,
+				'content': message.content,
+				'timestamp': (message.timestamp.isoformat() if message.timestamp else None),
+				'model_used': message.model_used,
+			}
+			for message in reversed(messages)
+		]
+
+	async def create_message_async(
+		self,
+		conversation_id: str,
+		user_id: str,
+		content: str,
+		role: str,
+		model_used: str = None,
+		tokens_used: str = None,
+		response_time_ms: str = None,
+	):
+		"""Async variant of create_message"""
+		await self.get_conversation_by_id_async(conversation_id, user_id)
+
+		message_data = new_message_data(conversation_id, user_id, content, role, model_used, tokens_used, response_time_ms)
+		return (await persist_turn_async(self.async_db, conversation_id, [message_data]))[0]
+
+	async def save_turn_async(self, conversation_id: str, messages_data: List[Dict[str, Any]]):
+		"""Persist a turn in one transaction, or hand it to the write-behind buffer (CHAT_PERSISTENCE_MODE=write_behind)"""
+		if CHAT_PERSISTENCE_MODE == 'write_behind':
+			await turn_write_behind.submit(conversation_id, messages_data)
+			return
+		await persist_turn_async(self.async_db, conversation_id, messages_data)
 
 	async def get_ai_response_from_n8n(
 		self,
@@ -158,24 +220,10 @@ class ChatRepo:
 			api_key = GOOGLE_API_KEY
 
 		try:
-			# Get conversation history for context
-			conversation_history = self.get_conversation_history(conversation_id, user_id)
-
-			# Get conversation for system prompt
-			conversation = self.get_conversation_by_id(conversation_id, user_id)
-			conversation_system_prompt = getattr(conversation, 'system_prompt', None)
-
-			# Get CV context and integrate into system prompt
-			cv_service = CVIntegrationService(self.db)
-			cv_context = cv_service.get_cv_context_for_prompt(conversation_id, user_id)
-			print(f'\033[91m Debug: CV Context {cv_context}\033[0m')
-
-			if cv_context:
-				# Append CV context to system prompt
-				if conversation_system_prompt:
-					conversation_system_prompt = f'{conversation_system_prompt}\n\n{cv_context}'
-				else:
-					conversation_system_prompt = cv_context
+			# Conversation history and system prompt enriched with CV context, loaded once per conversation state
+			context = self.get_conversation_context(conversation_id, user_id)
+			conversation_history = context.history
+			conversation_system_prompt = context.system_prompt
 
 			# Call agent workflow system
 			print(f'\033[91m Debug: Conversation System Prompt {conversation_system_prompt}\033[0m')
@@ -186,8 +234,13 @@ class ChatRepo:
 				conversation_history=conversation_history,
 				authorization_token=authorization_token,
 				user_id=user_id,
+				conversation_summary=context.summary,
+				unsummarized_message_count=context.unsummarized_message_count,
 			)
 
+			# Older turns reach the model only through the summary: extend it in the background when due
+			await request_summary_refresh(context)
+
 			return result
 
 		except Exception as e:
@@ -208,8 +261,9 @@ class ChatRepo:
 		api_key: str = None,
 		websocket_manager=None,
 		user_id: str = None,
+		authorization_token: str = None,
 	) -> dict:
-		"""Get AI response using Agent system with streaming support"""
+		"""Get AI response using Agent system, forwarding content deltas over the websocket as they arrive"""
 
 		# Get user_id from conversation if not provided
 		if not user_id:
@@ -225,18 +279,16 @@ class ChatRepo:
 			# Use environment variable as fallback
 			api_key = GOOGLE_API_KEY
 
+		streamed_content = ''
 		try:
-			# Get conversation history for context
-			conversation_history = self.get_conversation_history(conversation_id, user_id)
-
-			# Get conversation for system prompt
-			conversation = self.get_conversation_by_id(conversation_id, user_id)
-			conversation_system_prompt = getattr(conversation, 'system_prompt', None)
+			# Get conversation history and system prompt enriched with CV context (cached across turns)
+			if self.async_db is not None:
+				context = await self.get_conversation_context_async(conversation_id, user_id)
+			else:
+				context = self.get_conversation_context(conversation_id, user_id)
+			conversation_history = context.history
+			conversation_system_prompt = context.system_prompt
 
-			# Call agent workflow system for streaming
-
-			# Collect streaming response
-			result_content = ''
 			result_data = {}
 
 			async for chunk in self.conversation_workflow_repo.execute_streaming_chat_workflow(
@@ -244,9 +296,13 @@ class ChatRepo:
 				user_message=user_message,
 				conversation_system_prompt=conversation_system_prompt,
 				conversation_history=conversation_history,
+				authorization_token=authorization_token,
+				user_id=user_id,
+				conversation_summary=context.summary,
+				unsummarized_message_count=context.unsummarized_message_count,
 			):
 				if chunk.get('type') == 'content':
-					result_content += chunk.get('content', '')
+					streamed_content += chunk.get('content', '')
 
 					# Send websocket update if available
 					if websocket_manager and user_id:
@@ -254,10 +310,23 @@ class ChatRepo:
 							user_id,
 							{
 								'type': 'assistant_message_chunk',
+								'conversation_id': conversation_id,
 								'chunk': chunk.get('content', ''),
 								'is_final': False,
 							},
 						)
+				elif chunk.get('type') == 'replace':
+					# Output guardrails or tools changed the answer: retract the streamed text
+					if websocket_manager and user_id:
+						await websocket_manager.send_message(
+							user_id,
+							{
+								'type': 'assistant_message_replace',
+								'conversation_id': conversation_id,
+								'content': chunk.get('content', ''),
+								'response_safe': chunk.get('response_safe', True),
+							},
+						)
 				elif chunk.get('type') == 'final':
 					result_data = chunk
 
@@ -267,27 +336,28 @@ class ChatRepo:
 							user_id,
 							{
 								'type': 'assistant_message_chunk',
+								'conversation_id': conversation_id,
 								'chunk': '',
 								'is_final': True,
 							},
 						)
 
-			# Prepare final result
-			final_result = {
-				'content': result_content,
+			await request_summary_refresh(context)
+
+			# Final state content wins: tool results and guardrail notices never pass through the token stream
+			return {
+				'content': result_data.get('content') or streamed_content,
 				'model_used': result_data.get('model_used', 'agent-workflow'),
 				'usage': result_data.get('usage', {}),
 				'response_time_ms': result_data.get('response_time_ms', 0),
 				'agent_name': result_data.get('agent_name', 'conversation-workflow'),
 			}
 
-			return final_result
-
 		except Exception as e:
 			logger.error(f'Error getting Agent streaming response: {e}')
 
 			# Fallback to simulation if agent system fails
-			return await self._simulate_streaming_ai_response_fallback(user_message, api_key, websocket_manager, user_id)
+			return await self._simulate_streaming_ai_response_fallback(user_message, api_key, websocket_manager, user_id, conversation_id)
 
 	async def _simulate_ai_response_fallback(self, message: str, api_key: str) -> dict:
 		"""
@@ -327,6 +397,7 @@ class ChatRepo:
 		api_key: str,
 		websocket_manager=None,
 		user_id: str = None,
+		conversation_id: str = None,
 	) -> dict:
 		"""
 		Fallback streaming AI response simulation when agent system fails
@@ -350,6 +421,7 @@ class ChatRepo:
 						user_id,
 						{
 							'type': 'assistant_message_chunk',
+							'conversation_id': conversation_id,
 							'chunk': chunk.strip(),
 							'is_final': i == len(words) - 1,
 							'fallback_mode': True,
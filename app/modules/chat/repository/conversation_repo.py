@@ -9,6 +9,7 @@ from app.core.base_dal import CustomHTTPException
 from app.core.database import get_db
 from app.middleware.translation_manager import _
 from ..schemas.conversation_request import ConversationListRequest
+from ..services.conversation_context_service import conversation_context_cache
 from ..dal.message_dal import MessageDAL
 from ..dal.conversation_dal import ConversationDAL
 
@@ -30,6 +31,9 @@ class ConversationRepo:
 			search=request.search,
 			order_by=request.order_by,
 			order_direction=request.order_direction,
+			cursor=request.cursor,
+			use_cursor=request.use_cursor,
+			include_total=request.include_total,
 		)
 		return conversations
 
@@ -105,7 +109,8 @@ class ConversationRepo:
 		if update_data:
 			with self.conversation_dal.transaction():
 				updated_conversation = self.conversation_dal.update(conversation_id, update_data)
-				return updated_conversation
+			conversation_context_cache.invalidate(conversation_id)
+			return updated_conversation
 
 		return conversation
 
@@ -123,6 +128,7 @@ class ConversationRepo:
 				'update_date': datetime.now(timezone('Asia/Ho_Chi_Minh')).isoformat(),
 			}
 			self.conversation_dal.update(conversation_id, update_data)
+		conversation_context_cache.invalidate(conversation_id)
 
 	def get_conversation_messages(
 		self,
@@ -130,6 +136,9 @@ class ConversationRepo:
 		page: int = 1,
 		page_size: int = 50,
 		before_message_id: str = None,
+		cursor: str = None,
+		use_cursor: bool = False,
+		estimated_total: int = None,
 	):
 		"""Get messages for a conversation with pagination"""
 		messages = self.message_dal.get_conversation_messages(
@@ -137,5 +146,8 @@ class ConversationRepo:
 			page=page,
 			page_size=page_size,
 			before_message_id=before_message_id,
+			cursor=cursor,
+			use_cursor=use_cursor,
+			estimated_total=estimated_total,
 		)
 		return messages
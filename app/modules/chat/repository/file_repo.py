@@ -11,6 +11,8 @@ from app.core.database import get_db
 from app.exceptions.exception import NotFoundException, ValidationException
 from app.middleware.translation_manager import _
 from ..schemas.file_request import FileListRequest
+from app.core.config import FILE_UPLOAD_MAX_SIZE
+from app.modules.chat.services.file_content_service import FileContentService
 from app.modules.chat.services.file_service import file_service
 from ..dal.file_dal import FileDAL
 
@@ -21,6 +23,7 @@ class FileRepo:
 	def __init__(self, db: Session = Depends(get_db)):
 		self.db = db
 		self.file_dal = FileDAL(db)
+		self.content_service = FileContentService(db)
 
 	async def upload_files(
 		self,
@@ -28,8 +31,12 @@ class FileRepo:
 		user_id: str,
 		conversation_id: Optional[str] = None,
 	):
-		"""Upload multiple files and save metadata to database"""
+		"""Upload multiple files and save metadata to database
+
+		Returns (uploaded files, {file_id: indexing task id}) so the client can poll the indexing progress.
+		"""
 		uploaded_files = []
+		task_ids = {}
 
 		for i, file in enumerate(files):
 			try:
@@ -37,13 +44,18 @@ class FileRepo:
 				if not file_service.validate_file(file):
 					raise ValidationException(_('invalid_file'))
 
-				# Calculate checksum
-				checksum = await file_service.calculate_checksum(file)
-
-				# Skip duplicate check - allow all uploads
-
-				# Upload to MinIO
-				file_path, url = await file_service.upload_to_storage(file, user_id, conversation_id)
+				# Identical bytes already uploaded by the user reuse the stored object (and its extracted text)
+				content, reused = await self.content_service.store_upload(
+					file,
+					user_id=user_id,
+					meeting_id=conversation_id or user_id,
+					file_type='chat_files',
+					max_size=FILE_UPLOAD_MAX_SIZE,
+				)
+				if reused:
+					logger.info(f'[FileRepo.upload_files] {file.filename} matches an earlier upload, stored object reused')
+				file_path = content.object_path
+				url = file_service.get_download_url(file_path, expires=3600)
 
 				# Create file record in database
 				file_data = {
@@ -51,12 +63,12 @@ class FileRepo:
 					'original_name': file.filename,
 					'file_path': file_path,
 					'file_url': url,
-					'size': file.size or 0,
+					'size': content.size,
 					'type': file.content_type or file_service.get_content_type(file.filename),
 					'user_id': user_id,
 					'conversation_id': conversation_id,
 					'upload_date': datetime.now(timezone('Asia/Ho_Chi_Minh')).isoformat(),
-					'checksum': checksum,
+					'checksum': content.checksum,
 					'minio_bucket': 'default',
 				}
 
@@ -67,15 +79,15 @@ class FileRepo:
 			except Exception as e:
 				raise ValidationException(f'Failed to upload file {file.filename}: {str(e)}')
 
-		# Trigger indexing events cho uploaded files nếu có conversation_id
+		# Queue background indexing cho uploaded files nếu có conversation_id (upload không chờ indexing)
 		if conversation_id and uploaded_files:
 			try:
-				await self._trigger_file_indexing_events(uploaded_files, conversation_id, user_id)
+				task_ids = await self._trigger_file_indexing_events(uploaded_files, conversation_id, user_id)
 			except Exception as e:
 				logger.error(f'\033[91m[FileRepo.upload_files] Error triggering indexing events: {str(e)}\033[0m')
 				# Don't fail the upload if indexing fails
 
-		return uploaded_files
+		return uploaded_files, task_ids
 
 	def get_file_by_id(self, file_id: str, user_id: Optional[str] = None):
 		"""Get file by ID with optional user ownership check"""
@@ -97,6 +109,9 @@ class FileRepo:
 			file_type=request.file_type,
 			search=request.search,
 			conversation_id=request.conversation_id,
+			cursor=request.cursor,
+			use_cursor=request.use_cursor,
+			include_total=request.include_total,
 		)
 		return files
 
@@ -104,14 +119,16 @@ class FileRepo:
 		"""Delete file from MinIO and mark as deleted in database"""
 		file = self.get_file_by_id(file_id, user_id)
 
-		try:
-			# Remove from MinIO
-			await file_service.delete_from_storage(file.file_path)
+		file_path = file.file_path
 
+		try:
 			# Soft delete in database
 			with self.file_dal.transaction():
 				self.file_dal.delete(file_id)
 
+			# Remove from MinIO unless an identical upload still uses the object
+			await self.content_service.release_object(file_path, exclude_file_id=file_id)
+
 			return True
 
 		except Exception as e:
@@ -143,6 +160,9 @@ class FileRepo:
 			page_size=request.page_size,
 			file_type=request.file_type,
 			search=request.search,
+			cursor=request.cursor,
+			use_cursor=request.use_cursor,
+			include_total=request.include_total,
 		)
 		return files
 
@@ -205,7 +225,7 @@ class FileRepo:
 				self.file_dal.mark_file_as_indexed(file_id, success)
 
 	async def _trigger_file_indexing_events(self, uploaded_files: List, conversation_id: str, user_id: str):
-		"""Trigger file indexing events for uploaded files"""
+		"""Trigger file indexing events for uploaded files, returns {file_id: task_id} of the queued tasks"""
 		try:
 			from app.modules.agent.events.file_indexing_events import (
 				get_file_indexing_event_handler,
@@ -220,11 +240,11 @@ class FileRepo:
 			# Trigger batch indexing event
 			result = await event_handler.handle_multiple_files_uploaded(file_ids, conversation_id, user_id)
 
-			if result['success']:
-				pass
-			else:
+			if not result['success']:
 				logger.error(f'\033[91m[FileRepo._trigger_file_indexing_events] Indexing failed: {result.get("error", "Unknown error")}\033[0m')
 
+			return result.get('task_ids', {})
+
 		except Exception as e:
 			logger.error(f'\033[91m[FileRepo._trigger_file_indexing_events] Error triggering indexing events: {str(e)}\033[0m')
 			raise
@@ -9,8 +9,9 @@ from fastapi import (
 	File,
 	Query,
 )
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.database import get_async_db, get_db
 from app.enums.base_enums import BaseErrorCode
 from app.modules.chat.repository.chat_repo import ChatRepo
 from app.modules.chat.schemas.chat_request import SendMessageRequest
@@ -22,8 +23,10 @@ from app.middleware.translation_manager import _
 from app.exceptions.exception import ValidationException
 from app.middleware.websocket_middleware import WebSocketErrorHandler
 from app.modules.chat.services.cv_integration_service import CVIntegrationService
+from app.modules.chat.services.turn_persistence_service import new_message_data
 from app.modules.chat.dal.message_dal import MessageDAL
 from app.modules.chat.dal.conversation_dal import ConversationDAL
+from app.utils.websocket_registry import ConnectionRegistry
 import logging
 
 logger = logging.getLogger(__name__)
@@ -31,59 +34,8 @@ logger = logging.getLogger(__name__)
 route = APIRouter(prefix='/chat', tags=['Chat'])
 
 
-class WebSocketManager:
-	"""Manage WebSocket connections for chat"""
-
-	def __init__(self):
-		self.active_connections: dict[str, WebSocket] = {}
-
-	async def connect(self, websocket: WebSocket, user_id: str):
-		await websocket.accept()
-		self.active_connections[user_id] = websocket
-
-	def disconnect(self, user_id: str):
-		if user_id in self.active_connections:
-			del self.active_connections[user_id]
-		else:
-			pass
-
-	async def send_message(self, user_id: str, message: dict):
-		"""Send message to WebSocket client with comprehensive logging"""
-		if user_id in self.active_connections:
-			websocket = self.active_connections[user_id]
-			try:
-				message_str = json.dumps(message)
-				message_type = message.get('type', 'unknown')
-
-				# Log the outgoing message with details
-
-				# Log content preview based on message type
-				if message_type == 'user_message':
-					content = message.get('message', {}).get('content', '')
-				elif message_type == 'assistant_message_complete':
-					content = message.get('message', {}).get('content', '')
-					model = message.get('message', {}).get('model_used', 'unknown')
-					response_time = message.get('message', {}).get('response_time_ms', 'unknown')
-				elif message_type == 'assistant_typing':
-					status = message.get('status', False)
-				elif message_type == 'error':
-					error_msg = message.get('message', 'Unknown error')
-				elif message_type in ['ping', 'pong']:
-					pass
-				else:
-					pass
-
-				await websocket.send_text(message_str)
-
-			except Exception as e:
-				pass
-				self.disconnect(user_id)
-		else:
-			pass
-
-
-# Global WebSocket manager instance
-websocket_manager = WebSocketManager()
+# Global WebSocket manager instance, fanned out across workers via pub/sub
+websocket_manager = ConnectionRegistry(namespace='chat_v1')
 
 
 @route.post('/websocket/token', response_model=APIResponse)
@@ -115,6 +67,7 @@ async def websocket_chat_endpoint(
 	websocket: WebSocket,
 	conversation_id: str,
 	db: Session = Depends(get_db),
+	async_db: AsyncSession = Depends(get_async_db),
 ):
 	"""WebSocket endpoint for real-time chat messaging"""
 
@@ -149,11 +102,11 @@ async def websocket_chat_endpoint(
 			await WebSocketErrorHandler.handle_auth_error(websocket, reason='Authentication failed')
 			return
 
-		chat_repo = ChatRepo(db)
+		chat_repo = ChatRepo(db, async_db)
 
 		# Verify user has access to conversation
 		try:
-			chat_repo.get_conversation_by_id(conversation_id, user_id)
+			await chat_repo.get_conversation_by_id_async(conversation_id, user_id)
 		except Exception as e:
 			logger.error(f'[WebSocket] ❌ ACCESS DENIED: {str(e)}')
 			await WebSocketErrorHandler.handle_forbidden_error(websocket, reason='Access denied to conversation')
@@ -187,78 +140,83 @@ async def websocket_chat_endpoint(
 						)
 						continue
 
-					# Create user message
-					try:
-						user_message = chat_repo.create_message(
-							conversation_id=conversation_id,
-							user_id=user_id,
-							content=content,
-							role='user',
-						)
-					except Exception as e:
-						logger.error(f'[WebSocket] ❌ FAILED to save user message: {str(e)}')
-						await websocket_manager.send_message(
-							user_id,
-							{'type': 'error', 'message': 'Failed to save message'},
-						)
-						continue
+					# User message id and timestamp are assigned now; it is persisted together with the reply
+					user_message = new_message_data(conversation_id, user_id, content, 'user')
 
 					# Send user message confirmation
 					user_message_response = {
 						'type': 'user_message',
+						'conversation_id': conversation_id,
 						'message': {
-							'id': user_message.id,
+							'id': user_message['id'],
 							'content': content,
 							'role': 'user',
-							'timestamp': user_message.timestamp.isoformat(),
+							'timestamp': user_message['timestamp'].isoformat(),
 						},
 					}
 					await websocket_manager.send_message(user_id, user_message_response)
 
 					# Send typing indicator
-					typing_message = {'type': 'assistant_typing', 'status': True}
+					typing_message = {'type': 'assistant_typing', 'conversation_id': conversation_id, 'status': True}
 					await websocket_manager.send_message(user_id, typing_message)
 
 					try:
-						# Get AI response with streaming using Agent system
+						# Stream AI response deltas as assistant_message_chunk frames
 						# Pass authorization token to AI service
-
-						ai_response = await chat_repo.get_ai_response(
+						ai_response = await chat_repo.get_ai_response_streaming(
 							conversation_id=conversation_id,
 							user_message=content,
 							api_key=api_key,
+							websocket_manager=websocket_manager,
 							user_id=user_id,
 							authorization_token=authorization_token,  # Pass authorization token
 						)
 
-						# Create AI message in database
-						ai_message = chat_repo.create_message(
-							conversation_id=conversation_id,
-							user_id=user_id,
-							content=ai_response['content'],
-							role='assistant',
+						ai_message = new_message_data(
+							conversation_id,
+							user_id,
+							ai_response['content'],
+							'assistant',
 							model_used=ai_response.get('model_used'),
 							tokens_used=json.dumps(ai_response.get('usage', {})),
 							response_time_ms=str(ai_response.get('response_time_ms', 0)),
 						)
 
+						# User + AI messages and the conversation counters in one transaction (or the write-behind buffer)
+						try:
+							await chat_repo.save_turn_async(conversation_id, [user_message, ai_message])
+						except Exception as e:
+							logger.error(f'[WebSocket] ❌ FAILED to save turn: {str(e)}')
+							await websocket_manager.send_message(
+								user_id,
+								{'type': 'error', 'message': 'Failed to save message'},
+							)
+							continue
+
 						# Send final message confirmation
 						await websocket_manager.send_message(
 							user_id,
 							{
 								'type': 'assistant_message_complete',
+								'conversation_id': conversation_id,
 								'message': {
-									'id': ai_message.id,
-									'content': ai_message.content,
+									'id': ai_message['id'],
+									'content': ai_message['content'],
 									'role': 'assistant',
-									'timestamp': ai_message.timestamp.isoformat(),
-									'model_used': ai_message.model_used,
-									'response_time_ms': ai_message.response_time_ms,
+									'timestamp': ai_message['timestamp'].isoformat(),
+									'model_used': ai_message['model_used'],
+									'response_time_ms': ai_message['response_time_ms'],
+									'usage': ai_response.get('usage', {}),
 								},
 							},
 						)
 
 					except Exception:
+						# No reply: the user message is still kept
+						try:
+							await chat_repo.save_turn_async(conversation_id, [user_message])
+						except Exception as e:
+							logger.error(f'[WebSocket] ❌ FAILED to save user message: {str(e)}')
 						await websocket_manager.send_message(
 							user_id,
 							{'type': 'error', 'message': _('ai_response_error')},
@@ -266,7 +224,7 @@ async def websocket_chat_endpoint(
 
 					finally:
 						# Stop typing indicator
-						await websocket_manager.send_message(user_id, {'type': 'assistant_typing', 'status': False})
+						await websocket_manager.send_message(user_id, {'type': 'assistant_typing', 'conversation_id': conversation_id, 'status': False})
 
 				elif message_data.get('type') == 'survey_response':
 					try:
@@ -352,7 +310,7 @@ async def websocket_chat_endpoint(
 			pass
 	finally:
 		if user_id:
-			websocket_manager.disconnect(user_id)
+			websocket_manager.disconnect(user_id, websocket)
 		else:
 			pass
 
@@ -373,33 +331,34 @@ async def send_message(
 		conversation = chat_repo.get_conversation_by_id(request.conversation_id, user_id)
 		logger.debug(f'Verified access to conversation: {conversation.id}')
 
-		# Create user message
-		user_message = chat_repo.create_message(
-			conversation_id=request.conversation_id,
-			user_id=user_id,
-			content=request.content,
-			role='user',
-		)
+		user_message_data = new_message_data(request.conversation_id, user_id, request.content, 'user')
 
 		# Get AI response using Agent system (non-streaming)
-		ai_response = await chat_repo.get_ai_response(
-			conversation_id=request.conversation_id,
-			user_message=request.content,
-			api_key=request.api_key,
-			user_id=user_id,
-		)
-
-		# Create AI message
-		ai_message = chat_repo.create_message(
-			conversation_id=request.conversation_id,
-			user_id=user_id,
-			content=ai_response['content'],
-			role='assistant',
+		try:
+			ai_response = await chat_repo.get_ai_response(
+				conversation_id=request.conversation_id,
+				user_message=request.content,
+				api_key=request.api_key,
+				user_id=user_id,
+			)
+		except Exception:
+			# No reply: the user message is still kept
+			chat_repo.save_turn(request.conversation_id, [user_message_data])
+			raise
+
+		ai_message_data = new_message_data(
+			request.conversation_id,
+			user_id,
+			ai_response['content'],
+			'assistant',
 			model_used=ai_response.get('model_used'),
 			tokens_used=json.dumps(ai_response.get('usage', {})),
 			response_time_ms=str(ai_response.get('response_time_ms', 0)),
 		)
 
+		# User + AI messages and the conversation counters in one transaction
+		user_message, ai_message = chat_repo.save_turn(request.conversation_id, [user_message_data, ai_message_data])
+
 		return APIResponse(
 			error_code=BaseErrorCode.ERROR_CODE_SUCCESS,
 			message=_('message_sent_successfully'),
@@ -459,10 +418,13 @@ async def upload_cv_for_chat(
 		if not any(file.filename.lower().endswith(ext) for ext in cv_extensions):
 			raise ValidationException(_('invalid_cv_file_type'))
 
-		# Upload file lên MinIO
+		# Upload file lên MinIO (CV đã upload trước đó với cùng nội dung dùng lại object cũ)
+		from app.modules.chat.services.file_content_service import FileContentService
 		from app.utils.minio.minio_handler import minio_handler
 
-		object_path = await minio_handler.upload_fastapi_file(file=file, meeting_id=conversation_id or user_id, file_type='cv_files')
+		content_service = FileContentService(db)
+		content, _reused = await content_service.store_upload(file, user_id=user_id, meeting_id=conversation_id or user_id, file_type='cv_files')
+		object_path = content.object_path
 
 		# Generate download URL for CV extraction
 		cv_file_url = minio_handler.get_file_url(object_path, expires=3600)
@@ -472,8 +434,9 @@ async def upload_cv_for_chat(
 		from app.modules.cv_extraction.schemas.cv import ProcessCVRequest
 
 		cv_repo = CVRepo(db)
+		# Cùng nội dung CV đã được phân tích (theo checksum + analysis version): không tải lại, không gọi lại N8N
 		cv_request = ProcessCVRequest(cv_file_url=cv_file_url)
-		cv_result = await cv_repo.process_cv(cv_request)
+		cv_result = await cv_repo.process_cv(cv_request, checksum=content.checksum)
 
 		if cv_result.error_code != 0:
 			raise ValidationException(cv_result.message)
@@ -498,6 +461,10 @@ async def upload_cv_for_chat(
 
 			await cv_service.store_cv_context(conversation_id, user_id, cv_analysis_dict)
 
+			# Đánh dấu nội dung CV đã phân tích (object được giữ lại vì CV context tham chiếu tới nó)
+			if cv_analysis_dict:
+				content_service.mark_cv_analyzed(user_id, content.checksum)
+
 		response_file_path = object_path
 		response_cv_file_url = cv_data.get('cv_file_url', cv_file_url)
 		response_cv_analysis_result = cv_data.get('cv_analysis_result')
@@ -588,6 +555,8 @@ async def get_chat_history(
 	conversation_id: str,
 	limit: int = Query(20, ge=1, le=100),
 	page: int = Query(1, ge=1),
+	cursor: str | None = Query(None, description='Cursor from next_cursor to scroll further back'),
+	use_cursor: bool = Query(False, description='Start cursor pagination from the newest messages (the page returns next_cursor)'),
 	db: Session = Depends(get_db),
 	current_user: dict = Depends(get_current_user),
 ):
@@ -608,6 +577,9 @@ async def get_chat_history(
 		conversation_id=conversation_id,
 		page=page,
 		page_size=limit,
+		cursor=cursor,
+		use_cursor=use_cursor,
+		estimated_total=conversation.message_count,
 	)
 	# Chuyển đổi dữ liệu trả về
 	messages = [
@@ -627,5 +599,6 @@ async def get_chat_history(
 			'total': paginated.total_count,
 			'page': paginated.page,
 			'page_size': paginated.page_size,
+			'next_cursor': paginated.next_cursor,
 		},
 	)
@@ -44,6 +44,7 @@ async def get_conversations(
 				total_pages=result.total_pages,
 				page=result.page,
 				page_size=result.page_size,
+				next_cursor=result.next_cursor,
 			),
 		),
 	)
@@ -139,6 +140,8 @@ async def get_conversation_messages(
 	page: int = 1,
 	page_size: int = 50,
 	before_message_id: str = None,
+	pagination_mode: str = 'offset',
+	cursor: str = None,
 	repo: ConversationRepo = Depends(),
 	current_user: dict = Depends(get_current_user),
 ):
@@ -146,14 +149,17 @@ async def get_conversation_messages(
 	user_id = current_user.get('user_id')
 
 	# Verify user has access to conversation
-	repo.get_conversation_by_id(conversation_id, user_id)
+	conversation = repo.get_conversation_by_id(conversation_id, user_id)
 
-	# Get messages
+	# Get messages; in cursor mode the denormalized message_count stands in for COUNT(*)
 	result = repo.get_conversation_messages(
 		conversation_id=conversation_id,
 		page=page,
 		page_size=page_size,
 		before_message_id=before_message_id,
+		cursor=cursor,
+		use_cursor=pagination_mode == 'cursor',
+		estimated_total=conversation.message_count,
 	)
 	return APIResponse(
 		error_code=BaseErrorCode.ERROR_CODE_SUCCESS,
@@ -165,6 +171,7 @@ async def get_conversation_messages(
 				total_pages=result.total_pages,
 				page=result.page,
 				page_size=result.page_size,
+				next_cursor=result.next_cursor,
 			),
 		),
 	)
@@ -1,5 +1,7 @@
-from fastapi import APIRouter, Depends, UploadFile, File, Form
-from fastapi.responses import StreamingResponse
+import asyncio
+
+from fastapi import APIRouter, Depends, UploadFile, File, Form, Header
+from fastapi.responses import RedirectResponse, Response, StreamingResponse
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.enums.base_enums import BaseErrorCode
@@ -8,11 +10,12 @@ from app.modules.chat.repository.file_repo import FileRepo
 from app.modules.chat.schemas.file_request import FileListRequest
 from app.modules.chat.schemas.file_response import FileResponse, UploadFileResponse
 from app.core.base_model import APIResponse, PaginatedResponse, PagingInfo
+from app.core.config import FILE_DOWNLOAD_REDIRECT
 from app.exceptions.handlers import handle_exceptions
 from app.middleware.auth_middleware import verify_token
 from app.middleware.translation_manager import _
+from app.utils.http_download import RangeNotSatisfiableError, content_disposition, etag_matches, format_etag, parse_range_header
 from typing import List, Optional
-import io
 
 route = APIRouter(prefix='/files', tags=['Files'], dependencies=[Depends(verify_token)])
 
@@ -27,7 +30,7 @@ async def upload_files(
 ):
 	"""Upload multiple files"""
 	user_id = current_user.get('user_id')
-	uploaded_files = await repo.upload_files(files=files, user_id=user_id, conversation_id=conversation_id)
+	uploaded_files, task_ids = await repo.upload_files(files=files, user_id=user_id, conversation_id=conversation_id)
 
 	return APIResponse(
 		error_code=BaseErrorCode.ERROR_CODE_SUCCESS,
@@ -35,6 +38,7 @@ async def upload_files(
 		data=UploadFileResponse(
 			uploaded_files=[FileResponse.model_validate(file) for file in uploaded_files],
 			failed_files=[],  # Handle failed files in repo if needed
+			indexing_task_ids=task_ids,
 		),
 	)
 
@@ -60,6 +64,7 @@ async def get_files(
 				total_pages=result.total_pages,
 				page=result.page,
 				page_size=result.page_size,
+				next_cursor=result.next_cursor,
 			),
 		),
 	)
@@ -73,6 +78,9 @@ async def get_files_by_conversation(
 	page_size: int = 10,
 	file_type: Optional[str] = None,
 	search: Optional[str] = None,
+	pagination_mode: str = 'offset',
+	cursor: Optional[str] = None,
+	include_total: bool = False,
 	repo: FileRepo = Depends(),
 	current_user: dict = Depends(get_current_user),
 ):
@@ -86,6 +94,9 @@ async def get_files_by_conversation(
 		file_type=file_type,
 		search=search,
 		conversation_id=conversation_id,
+		pagination_mode=pagination_mode,
+		cursor=cursor,
+		include_total=include_total,
 	)
 
 	result = repo.get_files_by_conversation(user_id, conversation_id, request)
@@ -100,6 +111,7 @@ async def get_files_by_conversation(
 				total_pages=result.total_pages,
 				page=result.page,
 				page_size=result.page_size,
+				next_cursor=result.next_cursor,
 			),
 		),
 	)
@@ -146,24 +158,60 @@ async def get_file_download_url(
 @handle_exceptions
 async def download_file(
 	file_id: str,
+	redirect: Optional[bool] = None,
+	range_header: Optional[str] = Header(None, alias='Range'),
+	if_none_match: Optional[str] = Header(None),
+	if_range: Optional[str] = Header(None),
 	repo: FileRepo = Depends(),
 	current_user: dict = Depends(get_current_user),
 ):
-	"""Download file directly"""
+	"""Download file directly: streamed from storage (Range / If-None-Match aware) or redirected to a presigned URL"""
 	user_id = current_user.get('user_id')
+
+	if FILE_DOWNLOAD_REDIRECT if redirect is None else redirect:
+		return RedirectResponse(repo.get_file_download_url(file_id, user_id, expires=3600), status_code=307)
+
 	file = repo.get_file_by_id(file_id, user_id)
 
-	# Get file content from MinIO
 	from app.utils.minio.minio_handler import minio_handler
 
-	file_content, filename = minio_handler.download_file(file.file_path)
-
-	# Return as streaming response
-	return StreamingResponse(
-		io.BytesIO(file_content),
-		media_type=file.type,
-		headers={'Content-Disposition': f'attachment; filename={file.original_name}'},
-	)
+	# The content checksum is the ETag: a re-download the client already has costs no storage call
+	etag = format_etag(file.checksum) if file.checksum else None
+	if etag and etag_matches(if_none_match, etag):
+		return Response(status_code=304, headers={'ETag': etag, 'Cache-Control': 'private, no-cache'})
+
+	stat = await asyncio.to_thread(minio_handler.stat_file, file.file_path)
+	if not etag:
+		etag = format_etag(stat.etag)
+		if etag_matches(if_none_match, etag):
+			return Response(status_code=304, headers={'ETag': etag, 'Cache-Control': 'private, no-cache'})
+
+	headers = {
+		'ETag': etag,
+		'Accept-Ranges': 'bytes',
+		'Cache-Control': 'private, no-cache',
+		'Content-Disposition': content_disposition(file.original_name),
+	}
+
+	# If-Range: resume only if the client's partial copy is still the current content
+	if if_range and not etag_matches(if_range, etag):
+		range_header = None
+	try:
+		byte_range = parse_range_header(range_header, stat.size)
+	except RangeNotSatisfiableError:
+		return Response(status_code=416, headers={**headers, 'Content-Range': f'bytes */{stat.size}'})
+
+	status_code = 200
+	start, end = 0, stat.size - 1
+	if byte_range:
+		status_code = 206
+		start, end = byte_range
+		headers['Content-Range'] = f'bytes {start}-{end}/{stat.size}'
+	headers['Content-Length'] = str(end - start + 1)
+
+	# Proxied chunk by chunk: worker memory does not depend on the file size
+	stream = await asyncio.to_thread(minio_handler.open_file_stream, file.file_path, start, end - start + 1)
+	return StreamingResponse(stream, status_code=status_code, media_type=file.type, headers=headers)
 
 
 @route.delete('/{file_id}', response_model=APIResponse)
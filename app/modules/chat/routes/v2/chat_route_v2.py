@@ -8,40 +8,15 @@ from app.http.oauth2 import verify_websocket_token
 from app.middleware.websocket_middleware import WebSocketErrorHandler
 from app.utils.n8n_api_client import n8n_client
 from app.middleware.translation_manager import _
+from app.utils.websocket_registry import ConnectionRegistry
 
 logger = logging.getLogger(__name__)
 
 route = APIRouter(prefix='/chat', tags=['Chat V2'])
 
 
-class WebSocketManagerV2:
-	"""WebSocket manager for V2 chat with N8N direct integration"""
-
-	def __init__(self):
-		self.active_connections: dict[str, WebSocket] = {}
-
-	async def connect(self, websocket: WebSocket, user_id: str):
-		await websocket.accept()
-		self.active_connections[user_id] = websocket
-
-	def disconnect(self, user_id: str):
-		if user_id in self.active_connections:
-			del self.active_connections[user_id]
-
-	async def send_message(self, user_id: str, message: dict):
-		"""Send message to WebSocket client"""
-		if user_id in self.active_connections:
-			websocket = self.active_connections[user_id]
-			try:
-				message_str = json.dumps(message)
-				await websocket.send_text(message_str)
-			except Exception as e:
-				logger.error(f'Error sending websocket message: {e}')
-				self.disconnect(user_id)
-
-
-# Global WebSocket manager instance for V2
-websocket_manager_v2 = WebSocketManagerV2()
+# Global WebSocket manager instance for V2, fanned out across workers via pub/sub
+websocket_manager_v2 = ConnectionRegistry(namespace='chat_v2')
 
 
 @route.websocket('/ws/{conversation_id}')
@@ -211,4 +186,4 @@ async def websocket_chat_v2_endpoint(
 			pass
 	finally:
 		if user_id:
-			websocket_manager_v2.disconnect(user_id)
+			websocket_manager_v2.disconnect(user_id, websocket)
@@ -1,7 +1,7 @@
 from pydantic import ConfigDict, Field
 from app.core.base_model import ResponseSchema
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 
 class FileResponse(ResponseSchema):
@@ -30,3 +30,4 @@ class UploadFileResponse(ResponseSchema):
 
 	uploaded_files: List[FileResponse]
 	failed_files: List[str] = Field(default_factory=list, description='List of failed file names')
+	indexing_task_ids: Dict[str, str] = Field(default_factory=dict, description='Indexing task id per file id, to poll the indexing progress')
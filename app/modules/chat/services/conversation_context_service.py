@@ -0,0 +1,172 @@
+"""
+Per-conversation context of a chat turn, cached across turns
+
+A turn needs the conversation's parsed metadata, its CV context, the system prompt built from both,
+the rolling summary of older messages and the recent message history. They are built once and kept in a process-wide LRU; every turn
+still loads the conversation row (access check), and its fingerprint (message count, system prompt,
+raw metadata, summary coverage) tells whether the cached context is current, so writes made by other workers are
+never served stale. Messages created in this process are written through to the cached history,
+conversation updates invalidate the entry.
+"""
+
+import json
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import CONVERSATION_CONTEXT_CACHE_SIZE, CONVERSATION_CONTEXT_HISTORY_LIMIT
+from app.modules.chat.services.cv_integration_service import CVIntegrationService
+
+logger = logging.getLogger(__name__)
+
+Fingerprint = Tuple[int, Optional[str], Optional[str], int]
+
+
+def conversation_fingerprint(conversation) -> Fingerprint:
+	"""Changes whenever a message is added, the prompt / metadata of the conversation is updated or its summary is refreshed"""
+	return (
+		conversation.message_count or 0,
+		conversation.system_prompt,
+		conversation.extra_metadata,
+		getattr(conversation, 'context_summary_message_count', None) or 0,
+	)
+
+
+def format_history_entry(message) -> Dict[str, Any]:
+	return {
+		'role': message.role,
+		'content': message.content,
+		'timestamp': (message.timestamp.isoformat() if message.timestamp else None),
+		'model_used': message.model_used,
+	}
+
+
+@dataclass
+class ConversationContext:
+	"""Everything a chat turn needs from the conversation before calling the LLM"""
+
+	conversation_id: str
+	user_id: str
+	fingerprint: Fingerprint
+	metadata: Dict[str, Any] = field(default_factory=dict)
+	cv_context: Optional[str] = None
+	system_prompt: Optional[str] = None  # Conversation system prompt with the CV context appended
+	history: List[Dict[str, Any]] = field(default_factory=list)  # Chronological, last CONVERSATION_CONTEXT_HISTORY_LIMIT messages
+	summary: Optional[str] = None  # Rolling summary of the first summary_message_count messages
+	summary_message_count: int = 0
+	summary_refresh_requested_at: Optional[int] = None  # message_count when a summary refresh was last enqueued
+
+	@property
+	def message_count(self) -> int:
+		return self.fingerprint[0]
+
+	@property
+	def unsummarized_message_count(self) -> Optional[int]:
+		"""Most recent stored messages not covered by the summary (None without a summary)"""
+		return max(0, self.message_count - self.summary_message_count) if self.summary else None
+
+
+def build_conversation_context(conversation, messages: List[Any], cv_service: CVIntegrationService) -> ConversationContext:
+	"""Build the context of a conversation from its row and its recent messages (newest first, as the DAL returns them)"""
+	try:
+		metadata = json.loads(conversation.extra_metadata) if conversation.extra_metadata else {}
+	except json.JSONDecodeError:
+		logger.warning(f'[ConversationContext] Unreadable extra_metadata of conversation {conversation.id}')
+		metadata = {}
+
+	try:
+		cv_context = cv_service.format_cv_context(metadata)
+	except Exception as e:
+		logger.error(f'[ConversationContext] Error building CV context: {e}')
+		cv_context = None
+
+	system_prompt = getattr(conversation, 'system_prompt', None)
+	if cv_context:
+		# Append CV context to system prompt
+		system_prompt = f'{system_prompt}\n\n{cv_context}' if system_prompt else cv_context
+
+	return ConversationContext(
+		conversation_id=conversation.id,
+		user_id=conversation.user_id,
+		fingerprint=conversation_fingerprint(conversation),
+		metadata=metadata,
+		cv_context=cv_context,
+		system_prompt=system_prompt,
+		history=[format_history_entry(message) for message in reversed(messages)],
+		summary=getattr(conversation, 'context_summary', None),
+		summary_message_count=getattr(conversation, 'context_summary_message_count', None) or 0,
+	)
+
+
+class ConversationContextCache:
+	"""Thread-safe LRU of ConversationContext by conversation id"""
+
+	def __init__(self, max_size: int = CONVERSATION_CONTEXT_CACHE_SIZE, history_limit: int = CONVERSATION_CONTEXT_HISTORY_LIMIT):
+		self.max_size = max_size
+		self.history_limit = history_limit
+		self._contexts: 'OrderedDict[str, ConversationContext]' = OrderedDict()
+		self._lock = threading.Lock()
+		self._hits = 0
+		self._misses = 0
+		self._invalidations = 0
+
+	def get(self, conversation_id: str, user_id: str, fingerprint: Fingerprint) -> Optional[ConversationContext]:
+		"""Cached context, if it was built from the conversation state identified by `fingerprint`"""
+		with self._lock:
+			context = self._contexts.get(conversation_id)
+			if context is None or context.user_id != user_id or context.fingerprint != fingerprint:
+				self._misses += 1
+				return None
+			self._contexts.move_to_end(conversation_id)
+			self._hits += 1
+			return context
+
+	def put(self, context: ConversationContext):
+		if self.max_size <= 0:
+			return
+		with self._lock:
+			self._contexts[context.conversation_id] = context
+			self._contexts.move_to_end(context.conversation_id)
+			while len(self._contexts) > self.max_size:
+				self._contexts.popitem(last=False)
+
+	def record_message(self, conversation_id: str, history_entry: Dict[str, Any], message_count: int):
+		"""Write-through of a message just committed (as formatted by format_history_entry); the conversation's message_count is now `message_count`"""
+		with self._lock:
+			context = self._contexts.get(conversation_id)
+			if context is None:
+				return
+			cached_count, *rest = context.fingerprint
+			if cached_count != message_count - 1:
+				# Another writer got in between: the cached history has a gap
+				self._contexts.pop(conversation_id, None)
+				self._invalidations += 1
+				return
+			history = context.history + [history_entry]
+			context.history = history[-self.history_limit :]
+			context.fingerprint = (message_count, *rest)
+
+	def invalidate(self, conversation_id: str):
+		with self._lock:
+			if self._contexts.pop(conversation_id, None) is not None:
+				self._invalidations += 1
+
+	def clear(self):
+		with self._lock:
+			self._contexts.clear()
+
+	def get_stats(self) -> Dict[str, float]:
+		with self._lock:
+			lookups = self._hits + self._misses
+			return {
+				'size': len(self._contexts),
+				'hits': self._hits,
+				'misses': self._misses,
+				'invalidations': self._invalidations,
+				'hit_rate': round(self._hits / lookups, 4) if lookups else 0.0,
+			}
+
+
+conversation_context_cache = ConversationContextCache()
@@ -0,0 +1,145 @@
+"""
+Rolling summary of the older messages of a conversation
+
+The model input of a turn is bounded by CHAT_CONTEXT_TOKEN_BUDGET (see chat_workflow/state/context_builder):
+recent turns are sent verbatim, older ones only through Conversation.context_summary. The summary covers the
+first context_summary_message_count messages and is extended by the `refresh_conversation_summary` Celery task,
+off the chat hot path: only the messages added since the previous refresh are folded into it, and a refresh
+that raced with another one is discarded by the conditional save.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+	CHAT_CONTEXT_SUMMARY_KEEP_RECENT,
+	CHAT_CONTEXT_SUMMARY_MAX_TOKENS,
+	CHAT_CONTEXT_SUMMARY_REFRESH_EVERY,
+	CHAT_CONTEXT_TOKEN_BUDGET,
+)
+from app.modules.chat.dal.conversation_dal import ConversationDAL
+from app.modules.chat.dal.message_dal import MessageDAL
+from app.modules.chat.services.conversation_context_service import ConversationContext, conversation_context_cache
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_PROMPT = """You maintain the running summary of a conversation between a user and EnterViu, an AI assistant for CV building, job search and interview preparation.
+Update the current summary with the new messages. Keep what the assistant needs to continue the conversation: the user's goals, background, skills and CV details, target roles and companies, decisions taken, advice already given, interview questions practiced with the user's answers and feedback, and open follow-ups. Drop greetings and small talk.
+Write in the language of the conversation, as concise bullet points, at most {max_words} words. Reply with the updated summary only.
+
+Current summary:
+{summary}
+
+New messages:
+{messages}"""
+
+
+def summary_refresh_due(message_count: int, summary_message_count: int) -> bool:
+	"""Whether REFRESH_EVERY messages older than the KEEP_RECENT most recent ones are not summarized yet"""
+	return message_count - CHAT_CONTEXT_SUMMARY_KEEP_RECENT - summary_message_count >= CHAT_CONTEXT_SUMMARY_REFRESH_EVERY
+
+
+async def request_summary_refresh(context: ConversationContext) -> Optional[str]:
+	"""Enqueue a summary refresh of the conversation when one is due
+
+	At most one request per REFRESH_EVERY messages from this process, so a refresh that failed is asked
+	again later instead of on every turn. Returns the task id.
+	"""
+	message_count = context.message_count
+	if not summary_refresh_due(message_count, context.summary_message_count):
+		return None
+	if context.summary_refresh_requested_at is not None and message_count - context.summary_refresh_requested_at < CHAT_CONTEXT_SUMMARY_REFRESH_EVERY:
+		return None
+	context.summary_refresh_requested_at = message_count
+
+	from app.jobs.tasks import refresh_conversation_summary
+
+	try:
+		# Publishing to the broker is network I/O, keep it off the event loop
+		result = await asyncio.to_thread(refresh_conversation_summary.apply_async, args=[context.conversation_id])
+		return result.id
+	except Exception as e:
+		logger.error(f'[ConversationSummary] Error enqueuing summary refresh of conversation {context.conversation_id}: {e}')
+		return None
+
+
+def _as_chat_message(message) -> BaseMessage:
+	# Messages longer than half the budget are cut, so every fold prompt stays within the budget
+	content = message.content or ''
+	max_chars = CHAT_CONTEXT_TOKEN_BUDGET * 2
+	if len(content) > max_chars:
+		content = f'{content[:max_chars]} [...]'
+	return HumanMessage(content=content) if message.role == 'user' else AIMessage(content=content)
+
+
+def _batches(messages: List[BaseMessage], token_budget: int) -> List[List[BaseMessage]]:
+	batches: List[List[BaseMessage]] = [[]]
+	batch_tokens = 0
+	for message in messages:
+		message_tokens = count_tokens_approximately([message])
+		if batches[-1] and batch_tokens + message_tokens > token_budget:
+			batches.append([])
+			batch_tokens = 0
+		batches[-1].append(message)
+		batch_tokens += message_tokens
+	return batches
+
+
+def _format_messages(messages: List[BaseMessage]) -> str:
+	return '\n\n'.join(f'{"User" if isinstance(message, HumanMessage) else "Assistant"}: {message.content}' for message in messages)
+
+
+def get_summary_llm():
+	from langchain_google_genai import ChatGoogleGenerativeAI
+
+	from app.modules.agent.workflows.chat_workflow.config.workflow_config import WorkflowConfig
+
+	config = WorkflowConfig.from_env()
+	return ChatGoogleGenerativeAI(model=config.model_name, temperature=0, max_output_tokens=CHAT_CONTEXT_SUMMARY_MAX_TOKENS)
+
+
+async def fold_into_summary(llm, summary: Optional[str], messages: List[BaseMessage]) -> str:
+	"""Current summary + new messages -> updated summary (one LLM call per budget-sized batch)"""
+	# Roughly 1.3 tokens per word, leaving room for the bullet markup
+	max_words = max(50, CHAT_CONTEXT_SUMMARY_MAX_TOKENS * 2 // 3)
+	for batch in _batches(messages, CHAT_CONTEXT_TOKEN_BUDGET - CHAT_CONTEXT_SUMMARY_MAX_TOKENS):
+		prompt = SUMMARY_PROMPT.format(max_words=max_words, summary=summary or '(empty)', messages=_format_messages(batch))
+		response = await llm.ainvoke([HumanMessage(content=prompt)])
+		summary = (response.content if isinstance(response.content, str) else str(response.content)).strip() or summary
+	return summary
+
+
+async def refresh_summary(db: Session, conversation_id: str, llm=None) -> Dict[str, Any]:
+	"""Fold the messages added since the previous refresh, except the KEEP_RECENT most recent ones, into the summary"""
+	conversation_dal = ConversationDAL(db)
+	conversation = conversation_dal.get_by_id(conversation_id)
+	if not conversation or conversation.is_deleted:
+		return {'conversation_id': conversation_id, 'status': 'skipped', 'reason': 'not_found'}
+
+	summary_message_count = conversation.context_summary_message_count or 0
+	message_count = conversation.message_count or 0
+	if not summary_refresh_due(message_count, summary_message_count):
+		return {'conversation_id': conversation_id, 'status': 'skipped', 'reason': 'up_to_date'}
+
+	messages = MessageDAL(db).get_messages_range(conversation_id, offset=summary_message_count, limit=message_count - CHAT_CONTEXT_SUMMARY_KEEP_RECENT - summary_message_count)
+	if not messages:
+		return {'conversation_id': conversation_id, 'status': 'skipped', 'reason': 'no_messages'}
+
+	summary = await fold_into_summary(llm or get_summary_llm(), conversation.context_summary, [_as_chat_message(message) for message in messages])
+	covered_count = summary_message_count + len(messages)
+
+	with conversation_dal.transaction():
+		saved = conversation_dal.save_context_summary(conversation_id, summary, covered_count, expected_message_count=summary_message_count)
+	if not saved:
+		logger.info(f'[ConversationSummary] Summary of conversation {conversation_id} was refreshed concurrently, result discarded')
+		return {'conversation_id': conversation_id, 'status': 'skipped', 'reason': 'superseded'}
+
+	# Other processes see the new coverage in the conversation fingerprint
+	conversation_context_cache.invalidate(conversation_id)
+	logger.info(f'[ConversationSummary] Conversation {conversation_id}: {len(messages)} message(s) folded, summary covers {covered_count}')
+	return {'conversation_id': conversation_id, 'status': 'refreshed', 'folded': len(messages), 'summary_message_count': covered_count}
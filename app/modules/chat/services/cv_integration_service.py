@@ -123,6 +123,7 @@ class CVIntegrationService:
 
 			# Import here to avoid circular import
 			from app.modules.chat.repository.chat_repo import ChatRepo
+			from app.modules.chat.services.conversation_context_service import conversation_context_cache
 
 			chat_repo = ChatRepo(self.db_session)
 			logger.debug('[CVIntegrationService] Initialized ChatRepo')
@@ -144,6 +145,7 @@ class CVIntegrationService:
 
 			conversation.extra_metadata = json.dumps(existing_metadata)
 			self.db_session.commit()
+			conversation_context_cache.invalidate(conversation_id)
 			logger.info('[CVIntegrationService] CV context stored successfully')
 
 		except Exception as e:
@@ -172,33 +174,38 @@ class CVIntegrationService:
 			# Import here to avoid circular import
 			from app.modules.chat.repository.chat_repo import ChatRepo
 
-			chat_repo = ChatRepo(self.db_session)
-			conversation = chat_repo.get_conversation_by_id(conversation_id, user_id)
-
-			if not conversation or not conversation.extra_metadata:
-				logger.debug('[CVIntegrationService] No conversation or extra_metadata found')
-				return None
+			# Served from the cached turn context: parsed once per conversation state
+			return ChatRepo(self.db_session).get_conversation_context(conversation_id, user_id).cv_context
 
-			metadata = json.loads(conversation.extra_metadata)
-			cv_context = metadata.get('cv_context')
+		except Exception as e:
+			logger.error(f'[CVIntegrationService] Error getting CV context: {str(e)}')
+			return None
 
-			if not cv_context or not cv_context.get('cv_uploaded'):
-				logger.debug('[CVIntegrationService] No CV context or CV not uploaded')
-				return None
+	def format_cv_context(self, metadata: Dict[str, Any]) -> Optional[str]:
+		"""
+		Format CV context cho prompt từ conversation metadata đã parse
 
-			# Format CV info cho prompt
-			context_parts = self._build_context_parts(cv_context)
+		Args:
+		    metadata: Conversation.extra_metadata đã json.loads
 
-			if context_parts:
-				logger.debug(f'[CVIntegrationService] Generated {len(context_parts)} context parts')
-				return f'THÔNG TIN CV CỦA NGƯỜI DÙNG:\n{cv_context}\n---'
+		Returns:
+		    String context về CV information hoặc None nếu không có CV
+		"""
+		cv_context = metadata.get('cv_context')
 
-			logger.debug('[CVIntegrationService] No context parts generated')
+		if not cv_context or not cv_context.get('cv_uploaded'):
+			logger.debug('[CVIntegrationService] No CV context or CV not uploaded')
 			return None
 
-		except Exception as e:
-			logger.error(f'[CVIntegrationService] Error getting CV context: {str(e)}')
-			return None
+		# Format CV info cho prompt
+		context_parts = self._build_context_parts(cv_context)
+
+		if context_parts:
+			logger.debug(f'[CVIntegrationService] Generated {len(context_parts)} context parts')
+			return f'THÔNG TIN CV CỦA NGƯỜI DÙNG:\n{cv_context}\n---'
+
+		logger.debug('[CVIntegrationService] No context parts generated')
+		return None
 
 	def _build_context_parts(self, cv_context: Dict[str, Any]) -> List[str]:
 		"""
@@ -0,0 +1,145 @@
+"""Content-addressed storage of uploads: identical bytes of a user are stored, extracted and analyzed once"""
+
+import logging
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import UploadFile
+from pytz import timezone
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.modules.chat.dal.file_content_dal import FileContentDAL
+from app.modules.chat.dal.file_dal import FileDAL
+from app.modules.chat.models.file_content import FileContent
+from app.modules.chat.services.file_service import file_service
+from app.utils.minio.minio_handler import minio_handler
+
+logger = logging.getLogger(__name__)
+
+
+class FileContentService:
+	"""
+	Per-user content layer keyed by the MD5 checksum of the bytes.
+
+	A re-upload of the same bytes (e.g. the same CV in a new conversation) reuses the stored MinIO object
+	and the extracted text instead of keeping a second copy and extracting again (CV analyses are cached in cv_analyses).
+	Re-chunking reused text produces the same chunks, whose embeddings are then served by the embedding cache.
+	"""
+
+	def __init__(self, db: Session):
+		self.db = db
+		self.content_dal = FileContentDAL(db)
+		self.file_dal = FileDAL(db)
+
+	async def store_upload(
+		self,
+		file: UploadFile,
+		user_id: str,
+		meeting_id: str,
+		file_type: str,
+		max_size: Optional[int] = None,
+	) -> Tuple[FileContent, bool]:
+		"""
+		Store an upload, reusing the user's existing object when the bytes are identical
+
+		The upload is read once: stream_upload computes the MD5 while sending the parts. A duplicate is only
+		known after that pass, so the object just written is removed and the stored one is reused.
+
+		Returns:
+		    (content record, whether the stored object was reused)
+		"""
+		upload_result = await minio_handler.stream_upload(file=file, meeting_id=meeting_id, file_type=file_type, max_size=max_size, compute_sha256=True)
+		checksum = upload_result.md5
+		content = self.get_content(user_id, checksum)
+		if content and content.object_path:
+			logger.info(f'[FileContentService] Reusing stored object {content.object_path} for checksum {checksum}')
+			minio_handler.remove_file(upload_result.object_name)
+			return content, True
+
+		content_data = {
+			'object_path': upload_result.object_name,
+			'sha256': upload_result.sha256,
+			'size': upload_result.size,
+			'content_type': file.content_type or file_service.get_content_type(file.filename),
+		}
+
+		if content:
+			# Known content whose object was removed from storage: point it at the new object
+			with self.content_dal.transaction():
+				content = self.content_dal.update(content.id, content_data)
+			return content, False
+
+		try:
+			with self.content_dal.transaction():
+				content = self.content_dal.create({'user_id': user_id, 'checksum': checksum, **content_data})
+			return content, False
+		except IntegrityError:
+			# The same bytes were stored concurrently by another request: keep its object, drop ours
+			content = self.content_dal.get_by_checksum(user_id, checksum)
+			if not content:
+				raise
+			minio_handler.remove_file(upload_result.object_name)
+			return content, True
+
+	def get_content(self, user_id: str, checksum: Optional[str]) -> Optional[FileContent]:
+		"""Content record of a user's bytes; files uploaded before the content layer existed are adopted on first lookup"""
+		if not user_id or not checksum:
+			return None
+
+		content = self.content_dal.get_by_checksum(user_id, checksum)
+		if content:
+			return content
+
+		legacy_file = next(iter(self.file_dal.get_files_by_checksum(checksum, user_id=user_id)), None)
+		if not legacy_file:
+			return None
+		try:
+			with self.content_dal.transaction():
+				return self.content_dal.create({
+					'user_id': user_id,
+					'checksum': checksum,
+					'size': legacy_file.size or 0,
+					'content_type': legacy_file.type,
+					'object_path': legacy_file.file_path,
+				})
+		except IntegrityError:
+			return self.content_dal.get_by_checksum(user_id, checksum)
+
+	def get_extracted_text(self, user_id: str, checksum: Optional[str]) -> Optional[str]:
+		content = self.get_content(user_id, checksum)
+		return content.extracted_text if content and content.extracted_text else None
+
+	def save_extracted_text(self, user_id: str, checksum: Optional[str], text: str):
+		content = self.get_content(user_id, checksum)
+		if not content:
+			return
+		with self.content_dal.transaction():
+			self.content_dal.update(content.id, {'extracted_text': text, 'extracted_at': datetime.now(timezone('Asia/Ho_Chi_Minh'))})
+
+	def mark_cv_analyzed(self, user_id: str, checksum: Optional[str]):
+		"""Record that the content was analyzed as a CV (the analysis itself is cached in cv_analyses)"""
+		content = self.get_content(user_id, checksum)
+		if not content:
+			return
+		with self.content_dal.transaction():
+			self.content_dal.update(content.id, {'analyzed_at': datetime.now(timezone('Asia/Ho_Chi_Minh'))})
+
+	async def release_object(self, file_path: str, exclude_file_id: Optional[str] = None) -> bool:
+		"""
+		Remove a deleted file's object from storage once no other file references it
+
+		The content record (extracted text, CV analysis) is kept; the next identical upload stores the object again.
+		Objects of analyzed CVs are kept as well, since conversation CV contexts link to them.
+		"""
+		content = self.content_dal.get_by_object_path(file_path)
+		if self.file_dal.count_files_by_path(file_path, exclude_file_id=exclude_file_id) or (content and content.analyzed_at):
+			logger.info(f'[FileContentService] Object {file_path} still referenced, kept in storage')
+			return False
+
+		removed = await file_service.delete_from_storage(file_path)
+		if removed:
+			if content:
+				with self.content_dal.transaction():
+					self.content_dal.update(content.id, {'object_path': None})
+		return removed
@@ -1,16 +1,57 @@
 """
 Service for extracting text content from different file types for indexing
+
+Extraction runs in a bounded process pool (`aextract_text_from_file`): a large or malformed document
+only ties up one worker process, which is capped in memory and time, instead of the event loop.
+Inside a daemonic process (Celery prefork worker), which may not have children, it runs in a thread.
 """
 
+import asyncio
 import io
 import logging
-from typing import Dict, Any
+import multiprocessing
+import resource
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, Optional
+
 import docx
+import fitz  # type: ignore
 
-from app.utils.pdf import PDFToTextConverter
+from app.core.config import EXTRACTION_MAX_PDF_PAGES, EXTRACTION_MAX_WORKERS, EXTRACTION_MEMORY_LIMIT_MB, EXTRACTION_TIMEOUT_SECONDS
 
 logger = logging.getLogger(__name__)
 
+# Grace period after the in-worker timeout before the parent gives up on the worker and recycles the pool
+HARD_TIMEOUT_GRACE_SECONDS = 5.0
+
+
+class ExtractionTimeoutError(Exception):
+	"""Extraction of a file exceeded its time budget"""
+
+
+def _raise_timeout(signum, frame):
+	raise ExtractionTimeoutError('Extraction timed out')
+
+
+def _init_extraction_worker(memory_limit_mb: int):
+	"""Process pool initializer: cap the address space so a pathological document fails with MemoryError"""
+	signal.signal(signal.SIGALRM, _raise_timeout)
+	if memory_limit_mb > 0:
+		limit = memory_limit_mb * 1024 * 1024
+		resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _extract_in_worker(file_content: bytes, file_type: str, file_name: str, timeout_seconds: float) -> Dict[str, Any]:
+	"""Runs in a pool process; the timer interrupts extraction between pages / Python calls"""
+	signal.setitimer(signal.ITIMER_REAL, timeout_seconds)
+	try:
+		return file_extraction_service.extract_text_from_file(file_content, file_type, file_name)
+	finally:
+		signal.setitimer(signal.ITIMER_REAL, 0)
+
 
 class FileExtractionService:
 	"""Service để extract text từ các loại file khác nhau"""
@@ -89,6 +130,8 @@ class FileExtractionService:
 					'extraction_error': 'No content extracted from file',
 				}
 
+		except (ExtractionTimeoutError, MemoryError):
+			raise
 		except Exception as e:
 			logger.error(f'[FileExtractionService] Error extracting text from {file_name}: {str(e)}')
 			return {
@@ -101,16 +144,22 @@ class FileExtractionService:
 			}
 
 	def extract_pdf_text(self, file_content: bytes) -> str:
-		"""Extract text từ PDF file"""
+		"""Extract text từ PDF file, từng trang một (tối đa EXTRACTION_MAX_PDF_PAGES trang)"""
 		try:
-			import io
-
-			pdf_file = io.BytesIO(file_content)
+			text_parts = []
+			with fitz.open(stream=file_content, filetype='pdf') as doc:
+				page_count = min(doc.page_count, EXTRACTION_MAX_PDF_PAGES)
+				if doc.page_count > page_count:
+					logger.warning(f'[FileExtractionService] PDF has {doc.page_count} pages, extracting the first {page_count}')
 
-			# Use the PDFToTextConverter from utils
-			results = PDFToTextConverter.extract_text_from_file(pdf_file)
+				for page_number in range(page_count):
+					# Chỉ một trang được load tại một thời điểm
+					page = doc.load_page(page_number)
+					page_text = page.get_text('text')
+					if page_text.strip():
+						text_parts.append(page_text)
 
-			return results.get('text', '')
+			return '\n'.join(text_parts)
 
 		except Exception as e:
 			logger.error(f'[FileExtractionService] Error extracting PDF: {str(e)}')
@@ -162,6 +211,169 @@ class FileExtractionService:
 		"""Check if file type is supported for text extraction"""
 		return file_type in self.supported_types
 
+	async def aextract_text_from_file(self, file_content: bytes, file_type: str, file_name: str, timeout_seconds: Optional[float] = None) -> Dict[str, Any]:
+		"""
+		Như extract_text_from_file nhưng chạy trong process pool, có timeout và giới hạn bộ nhớ
+
+		Timeout / lỗi bộ nhớ trả về extraction_success=False (file đó sẽ lỗi lại nếu thử lại);
+		worker chết bất thường được thử lại một lần trên pool mới.
+		"""
+		return await extraction_pool.extract(file_content, file_type, file_name, timeout_seconds or EXTRACTION_TIMEOUT_SECONDS)
+
+	def get_stats(self) -> Dict[str, Any]:
+		"""Throughput / latency của extraction theo MIME type"""
+		return extraction_pool.get_stats()
+
+
+class ExtractionPool:
+	"""
+	Bounded process pool for document extraction, with per-file timeouts and per-MIME-type stats
+
+	Workers are started by a forkserver that preloads this module: forking the multi-threaded API process
+	itself could copy locks held by other threads, and spawning would import this module again for every
+	worker. A worker that overruns the hard timeout cannot be interrupted, so the pool is recycled: its
+	processes are killed and a new pool is started for the next file.
+
+	Daemonic processes may not have children, so there (Celery prefork workers, whose tasks have their
+	own time limits) extraction runs in a thread instead.
+	"""
+
+	def __init__(self, max_workers: int = EXTRACTION_MAX_WORKERS, memory_limit_mb: int = EXTRACTION_MEMORY_LIMIT_MB, start_method: str = 'forkserver'):
+		self.max_workers = max_workers
+		self.memory_limit_mb = memory_limit_mb
+		self.start_method = start_method
+		self._executor: Optional[ProcessPoolExecutor] = None
+		self._semaphore: Optional[asyncio.Semaphore] = None
+		self._semaphore_loop = None
+		self._stats: Dict[str, Dict[str, float]] = {}
+
+	def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+		if self.max_workers <= 0:
+			return None
+		if multiprocessing.current_process().daemon:
+			self._use_threads('daemonic processes are not allowed to have children')
+			return None
+		if self._executor is None:
+			try:
+				mp_context = multiprocessing.get_context(self.start_method)
+				if self.start_method == 'forkserver':
+					mp_context.set_forkserver_preload([__name__])
+				self._executor = ProcessPoolExecutor(
+					max_workers=self.max_workers,
+					mp_context=mp_context,
+					initializer=_init_extraction_worker,
+					initargs=(self.memory_limit_mb,),
+				)
+			except (ValueError, OSError) as e:
+				self._use_threads(e)
+				return None
+		return self._executor
+
+	def _use_threads(self, reason):
+		logger.warning(f'[ExtractionPool] Process pool unavailable, extracting in threads: {reason}')
+		self.max_workers = 0
+		if self._executor is not None:
+			self._executor.shutdown(wait=False, cancel_futures=True)
+			self._executor = None
+
+	def _get_semaphore(self) -> asyncio.Semaphore:
+		# Queue in the event loop rather than in the executor, so a waiting file does not start its timeout
+		loop = asyncio.get_running_loop()
+		if self._semaphore is None or self._semaphore_loop is not loop:
+			self._semaphore = asyncio.Semaphore(max(self.max_workers, 1))
+			self._semaphore_loop = loop
+		return self._semaphore
+
+	def _recycle(self, executor: ProcessPoolExecutor):
+		"""Kill the workers of a pool with a stuck extraction and start fresh on the next file"""
+		if self._executor is executor:
+			self._executor = None
+		for process in list((executor._processes or {}).values()):
+			process.kill()
+		executor.shutdown(wait=False, cancel_futures=True)
+
+	async def extract(self, file_content: bytes, file_type: str, file_name: str, timeout_seconds: float) -> Dict[str, Any]:
+		started = time.perf_counter()
+		async with self._get_semaphore():
+			outcome = 'failed'
+			try:
+				result = await self._run(file_content, file_type, file_name, timeout_seconds)
+				outcome = 'succeeded' if result['extraction_success'] else 'failed'
+				return result
+			except ExtractionTimeoutError:
+				outcome = 'timed_out'
+				logger.error(f'[ExtractionPool] Extraction of {file_name} exceeded {timeout_seconds}s')
+				return self._failure(file_type, file_name, f'Extraction timed out after {timeout_seconds}s')
+			except MemoryError:
+				logger.error(f'[ExtractionPool] Extraction of {file_name} exceeded the {self.memory_limit_mb} MB memory limit')
+				return self._failure(file_type, file_name, 'Extraction exceeded the memory limit')
+			except BrokenProcessPool:
+				logger.error(f'[ExtractionPool] Worker crashed while extracting {file_name}')
+				return self._failure(file_type, file_name, 'Extraction worker crashed')
+			finally:
+				self._record(file_type, len(file_content), time.perf_counter() - started, outcome)
+
+	async def _run(self, file_content: bytes, file_type: str, file_name: str, timeout_seconds: float, attempt: int = 1) -> Dict[str, Any]:
+		executor = self._get_executor()
+		if executor is None:
+			return await asyncio.wait_for(asyncio.to_thread(file_extraction_service.extract_text_from_file, file_content, file_type, file_name), timeout_seconds)
+
+		try:
+			# Workers are started on submit: this is where the platform refuses them
+			future = executor.submit(_extract_in_worker, file_content, file_type, file_name, timeout_seconds)
+		except (AssertionError, OSError) as e:
+			self._use_threads(e)
+			return await self._run(file_content, file_type, file_name, timeout_seconds, attempt)
+		try:
+			return await asyncio.wait_for(asyncio.wrap_future(future), timeout_seconds + HARD_TIMEOUT_GRACE_SECONDS)
+		except asyncio.TimeoutError:
+			self._recycle(executor)
+			raise ExtractionTimeoutError(file_name)
+		except BrokenProcessPool:
+			# Another file's worker crashed or the pool was recycled under this file: one retry on a new pool
+			self._recycle(executor)
+			if attempt > 1:
+				raise
+			return await self._run(file_content, file_type, file_name, timeout_seconds, attempt + 1)
+
+	@staticmethod
+	def _failure(file_type: str, file_name: str, error: str) -> Dict[str, Any]:
+		return {
+			'content': '',
+			'file_name': file_name,
+			'file_type': file_type,
+			'char_count': 0,
+			'extraction_success': False,
+			'extraction_error': error,
+		}
+
+	def _record(self, file_type: str, size: int, seconds: float, outcome: str):
+		stats = self._stats.setdefault(
+			file_type or 'unknown',
+			{'files': 0, 'succeeded': 0, 'failed': 0, 'timed_out': 0, 'bytes': 0, 'seconds': 0.0, 'max_seconds': 0.0},
+		)
+		stats['files'] += 1
+		stats[outcome] += 1
+		stats['bytes'] += size
+		stats['seconds'] += seconds
+		stats['max_seconds'] = max(stats['max_seconds'], seconds)
+		logger.info(f'[ExtractionPool] {file_type}: {size} bytes {outcome} in {seconds * 1000:.0f} ms')
+
+	def get_stats(self) -> Dict[str, Any]:
+		return {
+			'max_workers': self.max_workers,
+			'by_type': {
+				file_type: {
+					**stats,
+					'avg_latency_ms': round(stats['seconds'] / stats['files'] * 1000, 1) if stats['files'] else 0.0,
+					'max_latency_ms': round(stats['max_seconds'] * 1000, 1),
+					'throughput_mb_per_s': round(stats['bytes'] / stats['seconds'] / (1024 * 1024), 2) if stats['seconds'] else 0.0,
+				}
+				for file_type, stats in self._stats.items()
+			},
+		}
+
 
 # Create singleton instance
 file_extraction_service = FileExtractionService()
+extraction_pool = ExtractionPool()
@@ -4,6 +4,7 @@ import hashlib
 import mimetypes
 from typing import List, Optional
 from fastapi import UploadFile
+from app.core.config import FILE_UPLOAD_MAX_SIZE
 from app.utils.minio.minio_handler import minio_handler
 from app.modules.chat.models.file import File
 import logging
@@ -20,8 +21,8 @@ class FileService:
 		if not file.filename:
 			return False
 
-		# Check file size (max 50MB)
-		if file.size and file.size > 50 * 1024 * 1024:
+		# Check declared file size (the limit is enforced again while streaming to storage)
+		if file.size and file.size > FILE_UPLOAD_MAX_SIZE:
 			return False
 
 		# Check allowed file types
@@ -42,11 +43,14 @@ class FileService:
 		return True
 
 	@staticmethod
-	async def calculate_checksum(file: UploadFile) -> str:
-		"""Calculate MD5 checksum for file integrity"""
-		content = await file.read()
+	async def calculate_checksum(file: UploadFile, chunk_size: int = 1024 * 1024) -> str:
+		"""Calculate MD5 checksum for file integrity (minio_handler.stream_upload computes it while uploading)"""
+		md5 = hashlib.md5()
+		await file.seek(0)
+		while chunk := await file.read(chunk_size):
+			md5.update(chunk)
 		await file.seek(0)  # Reset file pointer
-		return hashlib.md5(content).hexdigest()
+		return md5.hexdigest()
 
 	@staticmethod
 	def get_content_type(filename: str) -> str:
@@ -54,26 +58,6 @@ class FileService:
 		content_type, _ = mimetypes.guess_type(filename)
 		return content_type or 'application/octet-stream'
 
-	@staticmethod
-	async def upload_to_storage(file: UploadFile, user_id: str, conversation_id: Optional[str] = None) -> str:
-		"""Upload file to MinIO storage"""
-		try:
-			# Upload to MinIO
-			object_path = await minio_handler.upload_fastapi_file(
-				file=file,
-				meeting_id=conversation_id or user_id,
-				file_type='chat_files',
-			)
-
-			url = minio_handler.get_file_url(object_path, expires=3600)
-
-			pass  # logger.info(f'File uploaded to MinIO: {object_path}')
-			return object_path, url
-
-		except Exception as e:
-			logger.error(f'Error uploading file to storage: {e}')
-			raise
-
 	@staticmethod
 	async def delete_from_storage(file_path: str) -> bool:
 		"""Delete file from MinIO storage"""
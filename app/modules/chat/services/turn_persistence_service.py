@@ -0,0 +1,244 @@
+"""
+Persistence of chat turns
+
+A turn (user message + assistant message) is written in a single transaction: both inserts and one
+atomic message_count / last_activity update. Message ids and timestamps are assigned up front, so the
+user message can be echoed to the client before anything is written, and so that writing the same
+turn twice is a no-op (messages already stored are skipped and not counted again).
+
+With CHAT_PERSISTENCE_MODE=write_behind, turns are appended to a local SQLite journal and written by a
+background flusher, so the WebSocket reply never waits on MySQL. A turn leaves the journal only once it
+is committed; turns still in the journal after a crash are replayed on the next startup.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from pytz import timezone
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import CHAT_WRITE_BEHIND_JOURNAL_PATH, CHAT_WRITE_BEHIND_MAX_ATTEMPTS
+from app.modules.chat.dal.conversation_dal import AsyncConversationDAL, ConversationDAL
+from app.modules.chat.dal.message_dal import AsyncMessageDAL, MessageDAL
+from app.modules.chat.models.message import Message
+from app.modules.chat.services.conversation_context_service import conversation_context_cache, format_history_entry
+
+logger = logging.getLogger(__name__)
+
+
+def new_message_data(
+	conversation_id: str,
+	user_id: str,
+	content: str,
+	role: str,
+	model_used: str = None,
+	tokens_used: str = None,
+	response_time_ms: str = None,
+) -> Dict[str, Any]:
+	"""Message row with its id and timestamp assigned, ready to be echoed and persisted"""
+	return {
+		'id': str(uuid.uuid4()),
+		'conversation_id': conversation_id,
+		'user_id': user_id,
+		'role': role,
+		'content': content,
+		'timestamp': datetime.now(timezone('Asia/Ho_Chi_Minh')),
+		'model_used': model_used,
+		'tokens_used': tokens_used,
+		'response_time_ms': response_time_ms,
+	}
+
+
+def _record_in_context_cache(conversation_id: str, history_entries: List[Dict[str, Any]], message_count: int):
+	# Write-through, one message at a time: the last one brought the count to message_count
+	first_count = message_count - len(history_entries) + 1
+	for offset, history_entry in enumerate(history_entries):
+		conversation_context_cache.record_message(conversation_id, history_entry, first_count + offset)
+
+
+def persist_turn(db: Session, conversation_id: str, messages_data: List[Dict[str, Any]]) -> List[Message]:
+	"""Write the messages of a turn and the conversation counters in one transaction (idempotent by message id)
+
+	Returns:
+	    The messages inserted by this call (already stored ones are skipped)
+	"""
+	message_dal = MessageDAL(db)
+	conversation_dal = ConversationDAL(db)
+
+	with message_dal.transaction():
+		existing_ids = message_dal.get_existing_ids([message_data['id'] for message_data in messages_data])
+		new_messages_data = [message_data for message_data in messages_data if message_data['id'] not in existing_ids]
+		if not new_messages_data:
+			return []
+		messages = message_dal.add_messages(new_messages_data)
+		message_count = conversation_dal.record_new_messages(conversation_id, len(messages), max(message_data['timestamp'] for message_data in new_messages_data))
+		# Read before the commit expires them
+		history_entries = [format_history_entry(message) for message in messages]
+
+	_record_in_context_cache(conversation_id, history_entries, message_count)
+	return messages
+
+
+async def persist_turn_async(db: AsyncSession, conversation_id: str, messages_data: List[Dict[str, Any]]) -> List[Message]:
+	"""Async variant of persist_turn"""
+	message_dal = AsyncMessageDAL(db)
+	conversation_dal = AsyncConversationDAL(db)
+
+	async with message_dal.transaction():
+		existing_ids = await message_dal.get_existing_ids([message_data['id'] for message_data in messages_data])
+		new_messages_data = [message_data for message_data in messages_data if message_data['id'] not in existing_ids]
+		if not new_messages_data:
+			return []
+		messages = await message_dal.add_messages(new_messages_data)
+		message_count = await conversation_dal.record_new_messages(conversation_id, len(messages), max(message_data['timestamp'] for message_data in new_messages_data))
+
+	_record_in_context_cache(conversation_id, [format_history_entry(message) for message in messages], message_count)
+	return messages
+
+
+class TurnJournal:
+	"""Local durable queue of turns not yet written to the database (one SQLite file per host)"""
+
+	def __init__(self, path: str):
+		directory = os.path.dirname(path)
+		if directory:
+			os.makedirs(directory, exist_ok=True)
+		self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+		self._conn.execute('PRAGMA journal_mode=WAL')
+		self._conn.execute('PRAGMA synchronous=FULL')
+		self._conn.execute('CREATE TABLE IF NOT EXISTS turns (id INTEGER PRIMARY KEY AUTOINCREMENT, conversation_id TEXT NOT NULL, messages TEXT NOT NULL, created_at REAL NOT NULL)')
+		self._lock = threading.Lock()
+
+	def append(self, conversation_id: str, messages_data: List[Dict[str, Any]]) -> int:
+		payload = json.dumps([{**message_data, 'timestamp': message_data['timestamp'].isoformat()} for message_data in messages_data], ensure_ascii=False)
+		with self._lock:
+			cursor = self._conn.execute('INSERT INTO turns (conversation_id, messages, created_at) VALUES (?, ?, ?)', (conversation_id, payload, time.time()))
+			return cursor.lastrowid
+
+	def pending(self) -> List[Tuple[int, str, List[Dict[str, Any]]]]:
+		"""Journaled turns in submission order"""
+		with self._lock:
+			rows = self._conn.execute('SELECT id, conversation_id, messages FROM turns ORDER BY id').fetchall()
+		turns = []
+		for entry_id, conversation_id, payload in rows:
+			messages_data = [{**message_data, 'timestamp': datetime.fromisoformat(message_data['timestamp'])} for message_data in json.loads(payload)]
+			turns.append((entry_id, conversation_id, messages_data))
+		return turns
+
+	def remove(self, entry_id: int):
+		with self._lock:
+			self._conn.execute('DELETE FROM turns WHERE id = ?', (entry_id,))
+
+	def count(self) -> int:
+		with self._lock:
+			return self._conn.execute('SELECT COUNT(*) FROM turns').fetchone()[0]
+
+
+class TurnWriteBehind:
+	"""
+	Write-behind buffer of chat turns
+
+	submit() journals the turn and returns; one flusher task per event loop writes turns in submission
+	order with persist_turn_async. A turn that keeps failing (CHAT_WRITE_BEHIND_MAX_ATTEMPTS) stays in
+	the journal for the next recover() instead of blocking the turns behind it.
+	"""
+
+	def __init__(self, journal_path: str = CHAT_WRITE_BEHIND_JOURNAL_PATH, session_factory=None, max_attempts: int = CHAT_WRITE_BEHIND_MAX_ATTEMPTS):
+		self.journal_path = journal_path
+		self.max_attempts = max_attempts
+		self._session_factory = session_factory
+		self._journal: Optional[TurnJournal] = None
+		self._queue: Optional[asyncio.Queue] = None
+		self._flusher: Optional[asyncio.Task] = None
+		self._loop: Optional[asyncio.AbstractEventLoop] = None
+		self._flushed = 0
+		self._failed = 0
+
+	@property
+	def journal(self) -> TurnJournal:
+		if self._journal is None:
+			self._journal = TurnJournal(self.journal_path)
+		return self._journal
+
+	def _ensure_flusher(self):
+		loop = asyncio.get_running_loop()
+		if self._loop is not loop or self._flusher is None or self._flusher.done():
+			if self._loop is not loop:
+				self._queue = asyncio.Queue()
+				self._loop = loop
+			self._flusher = loop.create_task(self._flush_loop())
+
+	async def submit(self, conversation_id: str, messages_data: List[Dict[str, Any]]):
+		"""Journal a turn and queue it for writing; returns without touching the database"""
+		self._ensure_flusher()
+		entry_id = self.journal.append(conversation_id, messages_data)
+		self._queue.put_nowait((entry_id, conversation_id, messages_data))
+
+	async def recover(self) -> int:
+		"""Queue the turns left in the journal by a previous process (startup)"""
+		self._ensure_flusher()
+		turns = self.journal.pending()
+		for turn in turns:
+			self._queue.put_nowait(turn)
+		if turns:
+			logger.warning(f'[TurnWriteBehind] Replaying {len(turns)} journaled turn(s)')
+		return len(turns)
+
+	async def drain(self, timeout: float = 10.0):
+		"""Wait for queued turns to be written (shutdown); whatever is left stays journaled"""
+		if self._queue is None or self._loop is not asyncio.get_running_loop():
+			return
+		try:
+			await asyncio.wait_for(self._queue.join(), timeout)
+		except asyncio.TimeoutError:
+			logger.warning(f'[TurnWriteBehind] {self._queue.qsize()} turn(s) not flushed before shutdown, kept in the journal')
+
+	async def _flush_loop(self):
+		while True:
+			entry_id, conversation_id, messages_data = await self._queue.get()
+			try:
+				if await self._write(conversation_id, messages_data):
+					self.journal.remove(entry_id)
+					self._flushed += 1
+				else:
+					self._failed += 1
+			finally:
+				self._queue.task_done()
+
+	async def _write(self, conversation_id: str, messages_data: List[Dict[str, Any]]) -> bool:
+		session_factory = self._session_factory
+		if session_factory is None:
+			from app.core.database import AsyncSessionLocal
+
+			session_factory = AsyncSessionLocal
+
+		for attempt in range(1, self.max_attempts + 1):
+			try:
+				async with session_factory() as db:
+					await persist_turn_async(db, conversation_id, messages_data)
+				return True
+			except Exception as e:
+				logger.error(f'[TurnWriteBehind] Writing turn of conversation {conversation_id} failed (attempt {attempt}/{self.max_attempts}): {e}')
+				if attempt < self.max_attempts:
+					await asyncio.sleep(min(30.0, 0.5 * 2 ** (attempt - 1)))
+		return False
+
+	def get_stats(self) -> Dict[str, int]:
+		return {
+			'queued': self._queue.qsize() if self._queue is not None else 0,
+			'journaled': self.journal.count(),
+			'flushed': self._flushed,
+			'failed': self._failed,
+		}
+
+
+turn_write_behind = TurnWriteBehind()
@@ -0,0 +1,18 @@
+import logging
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.base_dal import BaseDAL
+from app.modules.cv_extraction.models.cv_analysis import CVAnalysis
+
+logger = logging.getLogger(__name__)
+
+
+class CVAnalysisDAL(BaseDAL[CVAnalysis]):
+	def __init__(self, db: Session):
+		super().__init__(db, CVAnalysis)
+
+	def get_by_checksum(self, checksum: str, analysis_version: str) -> Optional[CVAnalysis]:
+		"""Get the stored analysis of a CV's bytes for one analysis version"""
+		return self.db.query(self.model).filter(self.model.checksum == checksum, self.model.analysis_version == analysis_version, self.model.is_deleted == False).first()
@@ -0,0 +1,5 @@
+"""CV extraction models package"""
+
+from .cv_analysis import CVAnalysis
+
+__all__ = ['CVAnalysis']
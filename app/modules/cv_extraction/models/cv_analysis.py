@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, Text, UniqueConstraint
+from sqlalchemy.dialects.mysql import LONGTEXT
+from app.core.base_model import BaseEntity
+
+
+class CVAnalysis(BaseEntity):
+	"""Persisted n8n CV analysis result, keyed by the content checksum and the analysis version
+
+	The result only depends on the bytes, so identical CVs are analyzed once per analysis version.
+	Bumping CV_ANALYSIS_VERSION (e.g. after changing the n8n workflow) makes older results unused.
+	"""
+
+	__tablename__ = 'cv_analyses'
+	__table_args__ = (UniqueConstraint('checksum', 'analysis_version', name='uq_cv_analyses_checksum_version'),)
+
+	checksum = Column(String(64), nullable=False)  # MD5 of the CV bytes
+	analysis_version = Column(String(32), nullable=False)
+	result = Column(Text().with_variant(LONGTEXT(), 'mysql'), nullable=False)  # n8n analyze_cv result as JSON
+	filename = Column(String(255), nullable=True)
+	size = Column(Integer, nullable=True)
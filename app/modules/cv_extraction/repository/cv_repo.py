@@ -1,9 +1,13 @@
+import hashlib
+import json
 import logging
 from typing import Optional, Dict, Any
 from fastapi import Depends
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.core.base_model import APIResponse
+from app.core.config import CV_ANALYSIS_VERSION
 from app.core.database import get_db
 from app.middleware.translation_manager import _
 from app.modules.cv_extraction.schemas.cv import (
@@ -11,11 +15,17 @@ from app.modules.cv_extraction.schemas.cv import (
 	CVAnalysisResult,
 	ProcessCVResponse,
 )
+from app.modules.cv_extraction.dal.cv_analysis_dal import CVAnalysisDAL
 from app.utils.n8n_api_client import n8n_client
+from app.utils.single_flight import SingleFlight
 from app.exceptions.exception import ValidationException
 
 logger = logging.getLogger(__name__)
 
+# Concurrent requests for the same URL download once, for the same CV bytes analyze once
+_download_flights = SingleFlight()
+_analysis_flights = SingleFlight()
+
 
 class CVRepo:
 	"""
@@ -25,18 +35,28 @@ class CVRepo:
 
 	def __init__(self, db: Session = Depends(get_db)):
 		self.db = db
+		self.analysis_dal = CVAnalysisDAL(db)
 		logger.info('[CVRepo] Initialized CV repository')
 
-	async def process_cv(self, request: ProcessCVRequest) -> APIResponse:
-		"""Process CV from URL using N8N API client"""
+	async def process_cv(self, request: ProcessCVRequest, checksum: Optional[str] = None) -> APIResponse:
+		"""Process CV from URL using N8N API client
+
+		Args:
+		    request: CV file URL
+		    checksum: MD5 of the file when the caller already knows it (e.g. our own upload); a stored analysis is then returned without downloading
+		"""
 		logger.info(f'[CVRepo] Processing CV from URL: {request.cv_file_url}')
 
 		if not request.cv_file_url:
 			raise ValidationException(_('cv_file_url_required'))
 
 		try:
+			stored_result = self._get_stored_analysis(checksum) if checksum else None
+			if stored_result is not None:
+				return self.build_response_from_analysis(stored_result, request.cv_file_url)
+
 			# Download CV file using N8N client helper
-			file_content, filename = await n8n_client.download_file_content(request.cv_file_url)
+			file_content, filename = await _download_flights.do(request.cv_file_url, lambda: n8n_client.download_file_content(request.cv_file_url))
 			if not file_content:
 				logger.error('[CVRepo] Failed to download CV file')
 				return APIResponse(
@@ -45,12 +65,10 @@ class CVRepo:
 					data=None,
 				)
 
-			# Analyze CV using N8N client
-			result = await n8n_client.analyze_cv(file_content, filename)
-			print(f'[CVRepo] Result from N8N API: {result}')
+			# Analyze CV using N8N client (stored result reused when these bytes were analyzed before)
+			result = await self._analyze(file_content, filename)
 
 			logger.info('[CVRepo] CV processed successfully via N8N API')
-			print(f'[CVRepo] Processed CV result: {result}')
 			return self._build_success_response(result, request.cv_file_url)
 
 		except ValidationException as e:
@@ -72,9 +90,8 @@ class CVRepo:
 			raise ValidationException(_('invalid_file_content_or_filename'))
 
 		try:
-			# Analyze CV using N8N client
-			result = await n8n_client.analyze_cv(file_content, filename)
-			print(f'[CVRepo] Result from N8N API: {result}')
+			# Analyze CV using N8N client (the bytes are already here: no download, stored result reused)
+			result = await self._analyze(file_content, filename)
 			logger.info('[CVRepo] Binary CV processed successfully via N8N API')
 			return self._build_success_response(result, filename=filename)
 
@@ -89,6 +106,56 @@ class CVRepo:
 				data=None,
 			)
 
+	async def _analyze(self, file_content: bytes, filename: str, checksum: Optional[str] = None) -> Dict[str, Any]:
+		"""Analysis of the CV bytes: stored result of this analysis version, otherwise one coalesced N8N call"""
+		checksum = checksum or hashlib.md5(file_content).hexdigest()
+		stored_result = self._get_stored_analysis(checksum)
+		if stored_result is not None:
+			return stored_result
+
+		async def run_analysis() -> Dict[str, Any]:
+			result = await n8n_client.analyze_cv(file_content, filename)
+			logger.debug(f'[CVRepo] N8N API analyzed CV {checksum}')
+			self._store_analysis(checksum, result, filename, len(file_content))
+			return result
+
+		return await _analysis_flights.do((checksum, CV_ANALYSIS_VERSION), run_analysis)
+
+	def _get_stored_analysis(self, checksum: str) -> Optional[Dict[str, Any]]:
+		analysis = self.analysis_dal.get_by_checksum(checksum, CV_ANALYSIS_VERSION)
+		if not analysis:
+			return None
+		try:
+			logger.info(f'[CVRepo] Reusing stored CV analysis for checksum {checksum} (version {CV_ANALYSIS_VERSION})')
+			return json.loads(analysis.result)
+		except json.JSONDecodeError:
+			logger.warning(f'[CVRepo] Discarding unreadable stored CV analysis {analysis.id}')
+			return None
+
+	def _store_analysis(self, checksum: str, result: Any, filename: Optional[str], size: int):
+		"""Persist an analysis result; a failure only costs a future re-analysis"""
+		if not isinstance(result, dict):
+			return
+		try:
+			with self.analysis_dal.transaction():
+				self.analysis_dal.create({
+					'checksum': checksum,
+					'analysis_version': CV_ANALYSIS_VERSION,
+					'result': json.dumps(result, ensure_ascii=False, default=str),
+					'filename': (filename or '')[:255] or None,
+					'size': size,
+				})
+		except IntegrityError:
+			# Stored concurrently by another worker
+			pass
+		except Exception as e:
+			logger.error(f'[CVRepo] Failed to store CV analysis for checksum {checksum}: {str(e)}')
+
+	def build_response_from_analysis(self, result: Dict[str, Any], cv_file_url: Optional[str] = None) -> APIResponse:
+		"""Build the process_cv response from an analysis result obtained earlier (no N8N call)"""
+		logger.info('[CVRepo] Reusing stored CV analysis result')
+		return self._build_success_response(result, cv_file_url)
+
 	def _build_success_response(
 		self,
 		result: Dict[str, Any],
@@ -98,7 +165,6 @@ class CVRepo:
 		"""Build success response from N8N API result"""
 		try:
 			# Extract data with safe defaults
-			print(f'[CVRepo] Building response from result: {result}')
 			skills_items = result.get('skills_summary', {}).get('items', []) if isinstance(result.get('skills_summary'), dict) else []
 			experience_items = result.get('work_experience_history', {}).get('items', []) if isinstance(result.get('work_experience_history'), dict) else []
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, Text, DateTime, JSON
+from sqlalchemy import Column, String, ForeignKey, Index, Text, DateTime, JSON
 from sqlalchemy.orm import relationship
 from app.core.base_model import BaseEntity
 import uuid
@@ -32,6 +32,10 @@ class QuestionAnswer(BaseEntity):
 	"""Question Answer model storing individual answers within a session"""
 
 	__tablename__ = 'question_answers'
+	__table_args__ = (
+		# Answers of a session, and the per-question upsert lookup
+		Index('ix_question_answers_session_id_question_id', 'session_id', 'question_id'),
+	)
 
 	session_id = Column(String(36), ForeignKey('question_sessions.id'), nullable=False)
 	question_id = Column(String(255), nullable=False)  # References the question ID from questions_data
@@ -6,7 +6,7 @@ from datetime import datetime
 from sqlalchemy.orm import Session
 
 from app.modules.subscription.services.subscription_service import SubscriptionService
-from app.core.database import get_db_session
+from app.core.database import SessionLocal
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -19,10 +19,10 @@ def check_pending_orders():
     """
     logger.info(f"[{datetime.now()}] Starting pending order check job")
     
+    # Get database session
+    db: Session = SessionLocal()
+
     try:
-        # Get database session
-        db: Session = next(get_db_session())
-        
         # Create subscription service
         subscription_service = SubscriptionService(db)
         
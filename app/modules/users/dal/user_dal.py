@@ -73,6 +73,16 @@ class UserDAL(BaseDAL[User]):
 		# Apply dynamic filters using the common utility function
 		query = apply_dynamic_filters(query, User, params)
 
+		# Keyset pagination on (create_date, id), skipping COUNT unless asked for
+		if params.get('pagination_mode') == 'cursor' or params.get('cursor'):
+			return self.paginate_by_cursor(
+				query,
+				User.create_date,
+				cursor=params.get('cursor'),
+				page_size=page_size,
+				total_count=query.count() if params.get('include_total') else None,
+			)
+
 		# Sort by creation date descending
 		query = query.order_by(User.create_date.desc())
 
@@ -27,6 +27,9 @@ async def search_users(
 	page: int = Query(1, ge=1),
 	page_size: int = Query(10, ge=1),
 	filters_json: str | None = Query(None, description='JSON string of filters'),
+	pagination_mode: str = Query('offset', description='offset or cursor (keyset) pagination'),
+	cursor: str | None = Query(None, description='Cursor from paging.next_cursor'),
+	include_total: bool = Query(False, description='Also count the total in cursor mode'),
 	current_user_payload: dict = Depends(get_current_user),
 	repo: UserRepo = Depends(),
 ):
@@ -65,7 +68,14 @@ async def search_users(
 		except Exception:
 			filters = []
 
-	request = SearchUserRequest(page=page, page_size=page_size, filters=filters)
+	request = SearchUserRequest(
+		page=page,
+		page_size=page_size,
+		filters=filters,
+		pagination_mode=pagination_mode,
+		cursor=cursor,
+		include_total=include_total,
+	)
 	result = repo.search_users(request)
 	return APIResponse(
 		error_code=BaseErrorCode.ERROR_CODE_SUCCESS,
@@ -77,6 +87,7 @@ async def search_users(
 				total_pages=result.total_pages,
 				page=result.page,
 				page_size=result.page_size,
+				next_cursor=result.next_cursor,
 			),
 		),
 	)
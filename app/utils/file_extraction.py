@@ -6,8 +6,6 @@ Supports PDF, DOCX, TXT and other text-based file formats.
 import io
 import logging
 from typing import Optional, Tuple
-import tempfile
-import os
 
 import fitz
 
@@ -102,35 +100,23 @@ class FileContentExtractor:
 		try:
 			from docx import Document
 
-			# Create a temporary file to work with python-docx
-			with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as temp_file:
-				temp_file.write(file_content)
-				temp_file.flush()
-
-				try:
-					doc = Document(temp_file.name)
-					text_content = []
+			# python-docx reads from a file-like object, no temporary file needed
+			doc = Document(io.BytesIO(file_content))
+			text_content = []
 
-					for paragraph in doc.paragraphs:
-						if paragraph.text.strip():
-							text_content.append(paragraph.text)
+			for paragraph in doc.paragraphs:
+				if paragraph.text.strip():
+					text_content.append(paragraph.text)
 
-					# Also extract text from tables
-					for table in doc.tables:
-						for row in table.rows:
-							for cell in row.cells:
-								if cell.text.strip():
-									text_content.append(cell.text)
+			# Also extract text from tables
+			for table in doc.tables:
+				for row in table.rows:
+					for cell in row.cells:
+						if cell.text.strip():
+							text_content.append(cell.text)
 
-					full_text = '\n'.join(text_content).strip()
-					return full_text if full_text else None, None
-
-				finally:
-					# Clean up temporary file
-					try:
-						os.unlink(temp_file.name)
-					except:
-						pass
+			full_text = '\n'.join(text_content).strip()
+			return full_text if full_text else None, None
 
 		except ImportError:
 			return None, 'python-docx library not installed. Please install with: pip install python-docx'
@@ -0,0 +1,73 @@
+"""
+HTTP helpers for file downloads: byte ranges, entity tags and Content-Disposition (RFC 9110 / 6266).
+"""
+
+from typing import Optional, Tuple
+from urllib.parse import quote
+
+
+class RangeNotSatisfiableError(ValueError):
+	"""The requested byte range lies outside the resource"""
+
+
+def parse_range_header(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+	"""
+	Parse a single byte range of a resource of `size` bytes.
+
+	Args:
+	    range_header: Value of the Range header ("bytes=0-499", "bytes=500-", "bytes=-500")
+	    size: Size of the resource in bytes
+
+	Returns:
+	    Inclusive (start, end) offsets, or None when the whole resource should be sent
+	    (no header, another unit, multiple ranges or a malformed value are ignored as the RFC allows)
+
+	Raises:
+	    RangeNotSatisfiableError: The range starts beyond the end of the resource
+	"""
+	if not range_header:
+		return None
+	unit, _, ranges = range_header.partition('=')
+	if unit.strip().lower() != 'bytes' or ',' in ranges:
+		return None
+
+	first, _, last = ranges.strip().partition('-')
+	if not (first or last).isdigit() or (first and last and not last.isdigit()):
+		return None
+
+	if not first:
+		# Suffix range: the last N bytes
+		suffix_length = int(last)
+		if suffix_length == 0 or size == 0:
+			raise RangeNotSatisfiableError(range_header)
+		return max(size - suffix_length, 0), size - 1
+
+	start = int(first)
+	end = int(last) if last else size - 1
+	if start > end and last:
+		return None
+	if start >= size:
+		raise RangeNotSatisfiableError(range_header)
+	return start, min(end, size - 1)
+
+
+def format_etag(value: str) -> str:
+	"""Quote an entity tag (MD5 checksum, MinIO etag) for the ETag header"""
+	value = value.strip()
+	return value if value.startswith(('"', 'W/"')) else f'"{value}"'
+
+
+def etag_matches(header_value: Optional[str], etag: str) -> bool:
+	"""Weak comparison of an If-None-Match / If-Range value against `etag` (as in the ETag header)"""
+	if not header_value:
+		return False
+	if header_value.strip() == '*':
+		return True
+	opaque = etag.removeprefix('W/')
+	return any(candidate.strip().removeprefix('W/') == opaque for candidate in header_value.split(','))
+
+
+def content_disposition(filename: str, disposition: str = 'attachment') -> str:
+	"""Content-Disposition with an ASCII fallback and the UTF-8 encoded original name"""
+	fallback = filename.encode('ascii', 'replace').decode('ascii').replace('"', '').replace('?', '_')
+	return f"{disposition}; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename)}"
@@ -3,11 +3,14 @@ MinIO Handler for file storage operations.
 This utility class provides methods for uploading, downloading, and managing files in MinIO object storage.
 """
 
+import asyncio
+import hashlib
 import io
 import logging
 import os
 import uuid
-from typing import Tuple
+from dataclasses import dataclass
+from typing import BinaryIO, Iterator, Optional, Tuple
 
 from fastapi import UploadFile
 
@@ -27,6 +30,45 @@ if isinstance(secure_value, str):
 logger.info(f'MinIO config: endpoint={settings.MINIO_ENDPOINT}, access_key={settings.MINIO_ACCESS_KEY}, bucket_name={settings.MINIO_BUCKET_NAME}, secure={secure_value}')
 
 
+class UploadTooLargeError(ValueError):
+	"""The upload stream exceeded the allowed size"""
+
+
+@dataclass
+class UploadResult:
+	"""Object stored by a streaming upload, with checksums computed while streaming"""
+
+	object_name: str
+	size: int
+	md5: str
+	sha256: Optional[str] = None
+	etag: Optional[str] = None
+
+
+class _HashingReader:
+	"""
+	File-like wrapper handed to put_object: hashes and counts the bytes as MinIO reads them,
+	so the upload, its checksums and the size limit take a single pass over the stream.
+	"""
+
+	def __init__(self, source: BinaryIO, max_size: Optional[int] = None, compute_sha256: bool = False):
+		self.source = source
+		self.max_size = max_size
+		self.size = 0
+		self.md5 = hashlib.md5()
+		self.sha256 = hashlib.sha256() if compute_sha256 else None
+
+	def read(self, size: int = -1) -> bytes:
+		data = self.source.read(size)
+		self.size += len(data)
+		if self.max_size is not None and self.size > self.max_size:
+			raise UploadTooLargeError(f'File exceeds the maximum upload size of {self.max_size} bytes')
+		self.md5.update(data)
+		if self.sha256 is not None:
+			self.sha256.update(data)
+		return data
+
+
 class MinioHandler:
 	"""
 	MinIO Handler for managing file operations with MinIO object storage.
@@ -150,23 +192,76 @@ class MinioHandler:
 		    The object name (path) in MinIO storage
 		"""
 		try:
-			# Read file content
-			file_content = await file.read()
+			result = await self.stream_upload(file=file, meeting_id=meeting_id, file_type=file_type)
+			return result.object_name
+
+		except Exception as err:
+			logger.error(f'Error uploading FastAPI file to MinIO: {err}')
+			raise
+
+	async def stream_upload(
+		self,
+		file: UploadFile,
+		meeting_id: str,
+		file_type: str = 'audio',
+		max_size: Optional[int] = None,
+		compute_sha256: bool = False,
+	) -> UploadResult:
+		"""
+		Stream a FastAPI UploadFile to MinIO in multipart parts, computing its checksums on the way.
+
+		Only one part (MINIO_UPLOAD_PART_SIZE) of the file is held in memory at a time; the blocking
+		upload runs in a worker thread so the event loop keeps serving other requests.
+
+		Args:
+		    file: The FastAPI UploadFile object
+		    meeting_id: Meeting ID for organizing files
+		    file_type: Type of file for folder organization
+		    max_size: Max size in bytes, enforced while streaming (None for no limit)
+		    compute_sha256: Also compute the SHA-256 of the content
 
-			# Reset file cursor
+		Returns:
+		    UploadResult with the object name, size, MD5 (and SHA-256) of the content
+
+		Raises:
+		    UploadTooLargeError: The stream exceeded max_size (a partial multipart upload is aborted)
+		"""
+		try:
 			await file.seek(0)
+			object_name = self._generate_safe_object_name(meeting_id, file.filename, file_type)
+			reader = _HashingReader(file.file, max_size=max_size, compute_sha256=compute_sha256)
+			logger.info(f"Starting streaming upload of '{file.filename}' as '{object_name}'")
 
-			# Use the upload_file method
-			return await self.upload_file(
-				file_content=file_content,
-				file_name=file.filename,
-				meeting_id=meeting_id,
+			write_result = await asyncio.to_thread(
+				self.minio_client.put_object,
+				bucket_name=self.bucket_name,
+				object_name=object_name,
+				data=reader,
+				length=-1,
+				part_size=settings.MINIO_UPLOAD_PART_SIZE,
 				content_type=file.content_type or 'application/octet-stream',
-				file_type=file_type,
 			)
 
-		except Exception as err:
-			logger.error(f'Error uploading FastAPI file to MinIO: {err}')
+			# Reset file cursor for callers that read the file afterwards
+			await file.seek(0)
+
+			logger.info(f"File '{file.filename}' uploaded successfully to MinIO as '{object_name}', size: {reader.size} bytes")
+			return UploadResult(
+				object_name=object_name,
+				size=reader.size,
+				md5=reader.md5.hexdigest(),
+				sha256=reader.sha256.hexdigest() if reader.sha256 is not None else None,
+				etag=write_result.etag,
+			)
+
+		except UploadTooLargeError as err:
+			logger.warning(f"Upload of '{file.filename}' rejected: {err}")
+			raise
+		except S3Error as err:
+			logger.error(f'Error streaming file to MinIO: {err}')
+			raise
+		except Exception as e:
+			logger.error(f'Unexpected error streaming file to MinIO: {str(e)}')
 			raise
 
 	async def upload_bytes(
@@ -258,6 +353,55 @@ class MinioHandler:
 			logger.error(f'File not found in MinIO: {err}')
 			raise
 
+	def stat_file(self, object_name: str):
+		"""
+		Get object metadata (size, etag, content type) without downloading it.
+
+		Args:
+		    object_name: The path of the object in MinIO storage
+
+		Returns:
+		    The MinIO stat result
+		"""
+		object_name = object_name.replace('//', '/')
+		try:
+			return self.minio_client.stat_object(bucket_name=self.bucket_name, object_name=object_name)
+		except S3Error as err:
+			logger.error(f'Error getting file stat from MinIO: {err}')
+			raise
+
+	def open_file_stream(self, object_name: str, offset: int = 0, length: int = 0, chunk_size: Optional[int] = None) -> Iterator[bytes]:
+		"""
+		Open an object (or a byte range of it) and return an iterator over its content in chunks.
+
+		The object is requested right away, so storage errors are raised here and not halfway through
+		a response; the connection is released when the iterator is exhausted or closed.
+
+		Args:
+		    object_name: The path of the object in MinIO storage
+		    offset: Start offset in bytes
+		    length: Number of bytes to read (0 for up to the end)
+		    chunk_size: Size of the yielded chunks (default FILE_DOWNLOAD_CHUNK_SIZE)
+
+		Returns:
+		    Iterator of byte chunks
+		"""
+		object_name = object_name.replace('//', '/')
+		try:
+			response = self.minio_client.get_object(bucket_name=self.bucket_name, object_name=object_name, offset=offset, length=length)
+		except S3Error as err:
+			logger.error(f'Error opening file stream from MinIO: {err}')
+			raise
+
+		def iterate() -> Iterator[bytes]:
+			try:
+				yield from response.stream(chunk_size or settings.FILE_DOWNLOAD_CHUNK_SIZE)
+			finally:
+				response.close()
+				response.release_conn()
+
+		return iterate()
+
 	def get_file_url(self, object_name: str, expires: int | None = None) -> str:
 		"""
 		Get a presigned URL for a file.
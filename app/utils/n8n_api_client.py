@@ -1,24 +1,125 @@
 """
 N8N API Client for Question Composer
 Client để gọi N8N API thay vì local question composer module
+
+All calls of an event loop share one pooled keep-alive httpx client. Each endpoint has its own timeout,
+concurrency limit (bulkhead) and circuit breaker; idempotent calls are retried with jittered backoff.
+Sync callers (Celery tasks, sync tools) run their coroutine with run_async, which closes the pool of
+their short-lived loop before the loop goes away.
 """
 
+import asyncio
 import logging
+import random
+import threading
 import httpx
-import aiohttp
 import uuid
 import time
-from typing import Dict, Any, Optional, Union
+from dataclasses import dataclass
+from typing import Awaitable, Dict, Any, Optional, Tuple, TypeVar, Union
 from fastapi import HTTPException
 
+from app.core.config import (
+    N8N_BASE_URL,
+    N8N_CIRCUIT_FAILURE_THRESHOLD,
+    N8N_CIRCUIT_RESET_SECONDS,
+    N8N_MAX_CONNECTIONS,
+    N8N_VERIFY_SSL,
+)
+
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class EndpointPolicy:
+    """Timeout, concurrency and retry policy of one n8n endpoint"""
+
+    timeout: float  # Seconds to wait for the response (connect is capped separately)
+    max_concurrency: int  # Bulkhead: in-flight calls allowed, others queue up to queue_timeout
+    retries: int = 0  # Extra attempts after the first one
+    idempotent: bool = False  # Only idempotent calls are retried after the request reached n8n
+    queue_timeout: float = 10.0
+    connect_timeout: float = 5.0
+
+
+# Non-idempotent workflows (chat, question generation, survey analysis, JD matching) are only
+# retried when the connection could not be established, i.e. n8n never saw the request
+DEFAULT_POLICIES: Dict[str, EndpointPolicy] = {
+    "chat": EndpointPolicy(timeout=120.0, max_concurrency=32, retries=2),
+    "survey": EndpointPolicy(timeout=120.0, max_concurrency=8, retries=2),
+    "questions": EndpointPolicy(timeout=180.0, max_concurrency=8, retries=2),
+    "cv": EndpointPolicy(timeout=180.0, max_concurrency=4, retries=2, idempotent=True),
+    "download": EndpointPolicy(timeout=60.0, max_concurrency=16, retries=3, idempotent=True),
+    "jd_matching": EndpointPolicy(timeout=180.0, max_concurrency=8, retries=2),
+}
+
+RETRY_BACKOFF_BASE_SECONDS = 0.5
+RETRY_BACKOFF_MAX_SECONDS = 8.0
+
+
+class CircuitOpenError(Exception):
+    """The endpoint failed repeatedly and is not called until its cool-down has passed"""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker
+
+    closed -> open after `failure_threshold` consecutive failures; open -> half-open after
+    `reset_seconds`, letting a single probe through; the probe's outcome closes or re-opens it.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_seconds: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def before_call(self):
+        state = self.state
+        if state == "open" or (state == "half_open" and self.probing):
+            raise CircuitOpenError(self.name)
+        if state == "half_open":
+            self.probing = True
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        self.probing = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                logger.error(f"🔌 [N8NAPIClient] Circuit for '{self.name}' opened after {self.failures} consecutive failures")
+            self.opened_at = time.monotonic()
+
 
 class N8NAPIClient:
     """Unified client for N8N API calls (questions generation and CV analysis)"""
 
-    def __init__(self):
-        self.base_url = "https://n8n.wc504.io.vn"
+    def __init__(
+        self,
+        base_url: str = N8N_BASE_URL,
+        policies: Optional[Dict[str, EndpointPolicy]] = None,
+        max_connections: int = N8N_MAX_CONNECTIONS,
+        verify_ssl: bool = N8N_VERIFY_SSL,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
         self.question_webhook_endpoint = (
             "/webhook/888a07e8-25d6-4671-a36c-939a52740f31/ask"
         )
@@ -26,8 +127,123 @@ class N8NAPIClient:
         self.chat_webhook_endpoint = (
             "/webhook/786eb3d9-73e7-406e-acd9-3e4dfcb67e87/chat"
         )
-        self.jd_matching_webhook_endpoint = "/webhook/888a07e8-25d6-4671-a36c-939a52740f31/jd-matching"  
-        self.timeout = 1800.0
+        self.jd_matching_webhook_endpoint = "/webhook/888a07e8-25d6-4671-a36c-939a52740f31/jd-matching"
+        self.policies = {**DEFAULT_POLICIES, **(policies or {})}
+        self.max_connections = max_connections
+        self.verify_ssl = verify_ssl
+        self._transport = transport  # Custom transport, e.g. httpx.MockTransport in tests
+        self.breakers = {
+            name: CircuitBreaker(name, N8N_CIRCUIT_FAILURE_THRESHOLD, N8N_CIRCUIT_RESET_SECONDS)
+            for name in self.policies
+        }
+        # httpx clients and semaphores belong to one event loop: the API loop, loops of sync tools
+        # running in threads and the loop of each Celery job get their own pool
+        self._pools: Dict[asyncio.AbstractEventLoop, Tuple[httpx.AsyncClient, Dict[str, asyncio.Semaphore]]] = {}
+        self._pools_lock = threading.Lock()
+
+    def _get_pool(self) -> Tuple[httpx.AsyncClient, Dict[str, asyncio.Semaphore]]:
+        loop = asyncio.get_running_loop()
+        with self._pools_lock:
+            pool = self._pools.get(loop)
+            if pool is None:
+                self._discard_closed_loops()
+                client = httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_connections,
+                        keepalive_expiry=30.0,
+                    ),
+                    verify=self.verify_ssl,
+                    transport=self._transport,
+                )
+                bulkheads = {
+                    name: asyncio.Semaphore(policy.max_concurrency)
+                    for name, policy in self.policies.items()
+                }
+                pool = self._pools[loop] = (client, bulkheads)
+            return pool
+
+    def _get_client(self) -> httpx.AsyncClient:
+        return self._get_pool()[0]
+
+    def _discard_closed_loops(self):
+        """Drop pools whose loop ended without aclose(): they can no longer be closed from another loop"""
+        for loop in [loop for loop in self._pools if loop.is_closed()]:
+            self._pools.pop(loop)
+            logger.warning(
+                "[N8NAPIClient] Event loop closed before its n8n client, connections dropped unclosed (use run_async)"
+            )
+
+    async def aclose(self):
+        """Close the pooled connections of the running event loop (application shutdown, end of a job)"""
+        with self._pools_lock:
+            pool = self._pools.pop(asyncio.get_running_loop(), None)
+        if pool is not None:
+            await pool[0].aclose()
+
+    async def _request(self, endpoint: str, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a request through the endpoint's circuit breaker, bulkhead and retry policy
+
+        Raises:
+            CircuitOpenError: The endpoint's circuit is open
+            httpx.TimeoutException / httpx.RequestError: After the retries allowed by the policy
+        """
+        policy = self.policies[endpoint]
+        breaker = self.breakers[endpoint]
+        breaker.before_call()
+
+        client, bulkheads = self._get_pool()
+        bulkhead = bulkheads[endpoint]
+        try:
+            await asyncio.wait_for(bulkhead.acquire(), policy.queue_timeout)
+        except asyncio.TimeoutError:
+            # Not counted as an n8n failure: the limit is ours
+            breaker.probing = False
+            raise httpx.PoolTimeout(f"N8N '{endpoint}' concurrency limit ({policy.max_concurrency}) reached")
+
+        timeout = httpx.Timeout(policy.timeout, connect=policy.connect_timeout)
+        try:
+            attempt = 0
+            while True:
+                attempt += 1
+                try:
+                    response = await client.request(method, url, timeout=timeout, **kwargs)
+                except httpx.TransportError as e:
+                    # Connect failures never reached n8n, so they are safe to retry for every endpoint
+                    not_sent = isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+                    if (not_sent or policy.idempotent) and attempt <= policy.retries:
+                        await self._backoff(endpoint, attempt, e)
+                        continue
+                    breaker.record_failure()
+                    raise
+
+                if (response.status_code >= 500 or response.status_code == 429) and policy.idempotent and attempt <= policy.retries:
+                    await self._backoff(endpoint, attempt, f"HTTP {response.status_code}")
+                    continue
+
+                if response.status_code >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                return response
+        finally:
+            # A probe ended without an outcome (e.g. cancelled) must not keep the circuit half-open forever
+            breaker.probing = False
+            bulkhead.release()
+
+    async def _backoff(self, endpoint: str, attempt: int, reason):
+        # Full jitter: spreads retries of concurrent callers instead of synchronizing them
+        delay = random.uniform(0, min(RETRY_BACKOFF_MAX_SECONDS, RETRY_BACKOFF_BASE_SECONDS * 2 ** (attempt - 1)))
+        logger.warning(f"🔁 [N8NAPIClient] Retrying '{endpoint}' (attempt {attempt + 1}) in {delay:.2f}s after: {reason}")
+        await asyncio.sleep(delay)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Circuit state per endpoint"""
+        return {
+            name: {"state": breaker.state, "consecutive_failures": breaker.failures}
+            for name, breaker in self.breakers.items()
+        }
 
     async def call_chat_workflow(
         self,
@@ -76,8 +292,7 @@ class N8NAPIClient:
             logger.info(f"📤 [N8NAPIClient] Sending chat request to: {url}")
             logger.info(f"📝 [N8NAPIClient] Request body: {request_body}")
 
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(url, json=request_body, headers=headers)
+            response = await self._request("chat", "POST", url, json=request_body, headers=headers)
 
             response_time_ms = int((time.time() - start_time) * 1000)
             logger.info(
@@ -122,9 +337,16 @@ class N8NAPIClient:
                     detail=f"N8N Chat workflow API call failed: {response.text}",
                 )
 
+        except HTTPException:
+            raise
+        except CircuitOpenError:
+            logger.error(f"🔌 [N8NAPIClient] Chat workflow circuit open, request rejected")
+            raise HTTPException(
+                status_code=503, detail="N8N Chat workflow API temporarily unavailable"
+            )
         except httpx.TimeoutException:
             logger.error(
-                f"⏰ [N8NAPIClient] Chat workflow timeout after {self.timeout}s"
+                f"⏰ [N8NAPIClient] Chat workflow timeout after {self.policies['chat'].timeout}s"
             )
             raise HTTPException(
                 status_code=408, detail="N8N Chat workflow API request timeout"
@@ -190,8 +412,7 @@ class N8NAPIClient:
                 f"📝 [N8NAPIClient] Request body keys: {list(request_body.keys())}"
             )
 
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(url, json=request_body, headers=headers)
+            response = await self._request("survey", "POST", url, json=request_body, headers=headers)
 
             logger.info(
                 f"📥 [N8NAPIClient] Survey analysis response status: {response.status_code}"
@@ -214,9 +435,16 @@ class N8NAPIClient:
                     detail=f"N8N Survey Analysis API call failed: {response.text}",
                 )
 
+        except HTTPException:
+            raise
+        except CircuitOpenError:
+            logger.error(f"🔌 [N8NAPIClient] Survey analysis circuit open, request rejected")
+            raise HTTPException(
+                status_code=503, detail="N8N Survey Analysis API temporarily unavailable"
+            )
         except httpx.TimeoutException:
             logger.error(
-                f"⏰ [N8NAPIClient] Survey analysis timeout after {self.timeout}s"
+                f"⏰ [N8NAPIClient] Survey analysis timeout after {self.policies['survey'].timeout}s"
             )
             raise HTTPException(
                 status_code=408, detail="N8N Survey Analysis API request timeout"
@@ -274,8 +502,7 @@ class N8NAPIClient:
             logger.info(f"📤 [N8NAPIClient] Sending request to: {url}")
             logger.info(f"📝 [N8NAPIClient] Request body: {request_body}")
 
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(url, json=request_body, headers=headers)
+            response = await self._request("questions", "POST", url, json=request_body, headers=headers)
 
             logger.info(f"📥 [N8NAPIClient] Response status: {response.status_code}")
 
@@ -296,8 +523,13 @@ class N8NAPIClient:
                     detail=f"N8N API call failed: {response.text}",
                 )
 
+        except HTTPException:
+            raise
+        except CircuitOpenError:
+            logger.error(f"🔌 [N8NAPIClient] Question generation circuit open, request rejected")
+            raise HTTPException(status_code=503, detail="N8N API temporarily unavailable")
         except httpx.TimeoutException:
-            logger.error(f"⏰ [N8NAPIClient] Request timeout after {self.timeout}s")
+            logger.error(f"⏰ [N8NAPIClient] Request timeout after {self.policies['questions'].timeout}s")
             raise HTTPException(status_code=408, detail="N8N API request timeout")
         except httpx.RequestError as e:
             logger.error(f"🌐 [N8NAPIClient] Network error: {str(e)}")
@@ -340,48 +572,48 @@ class N8NAPIClient:
         try:
             logger.info(f"📤 [N8NAPIClient] Sending CV file to: {url}")
 
-            # Create form data with the file
-            data = aiohttp.FormData()
-            data.add_field(
-                "data", file_content, filename=filename, content_type=content_type
+            response = await self._request(
+                "cv",
+                "POST",
+                url,
+                headers=headers,
+                files={"data": (filename, file_content, content_type)},
+            )
+            logger.info(
+                f"📥 [N8NAPIClient] CV API response status: {response.status_code}"
             )
 
-            async with aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=self.timeout)
-            ) as session:
-                async with session.post(
-                    url, headers=headers, data=data, ssl=False
-                ) as response:
-                    logger.info(
-                        f"📥 [N8NAPIClient] CV API response status: {response.status}"
-                    )
+            if response.status_code == 200:
+                result = response.json()
+                logger.info(f"✅ [N8NAPIClient] CV analysis successful")
+                # N8N CV API returns array, get first element
+                return (
+                    result[0]
+                    if isinstance(result, list) and len(result) > 0
+                    else result
+                )
+            else:
+                error_text = response.text
+                logger.error(
+                    f"❌ [N8NAPIClient] CV API failed with status: {response.status_code}"
+                )
+                logger.error(
+                    f"❌ [N8NAPIClient] CV API error response: {error_text}"
+                )
+                raise HTTPException(
+                    status_code=response.status_code,
+                    detail=f"N8N CV API failed: {error_text}",
+                )
 
-                    if response.status == 200:
-                        result = await response.json()
-                        logger.info(f"✅ [N8NAPIClient] CV analysis successful")
-                        # N8N CV API returns array, get first element
-                        return (
-                            result[0]
-                            if isinstance(result, list) and len(result) > 0
-                            else result
-                        )
-                    else:
-                        error_text = await response.text()
-                        logger.error(
-                            f"❌ [N8NAPIClient] CV API failed with status: {response.status}"
-                        )
-                        logger.error(
-                            f"❌ [N8NAPIClient] CV API error response: {error_text}"
-                        )
-                        raise HTTPException(
-                            status_code=response.status,
-                            detail=f"N8N CV API failed: {error_text}",
-                        )
-
-        except aiohttp.ClientTimeout:
-            logger.error(f"⏰ [N8NAPIClient] CV API timeout after {self.timeout}s")
+        except HTTPException:
+            raise
+        except CircuitOpenError:
+            logger.error(f"🔌 [N8NAPIClient] CV API circuit open, request rejected")
+            raise HTTPException(status_code=503, detail="N8N CV API temporarily unavailable")
+        except httpx.TimeoutException:
+            logger.error(f"⏰ [N8NAPIClient] CV API timeout after {self.policies['cv'].timeout}s")
             raise HTTPException(status_code=408, detail="N8N CV API request timeout")
-        except aiohttp.ClientError as e:
+        except httpx.RequestError as e:
             logger.error(f"🌐 [N8NAPIClient] CV API network error: {str(e)}")
             raise HTTPException(
                 status_code=503, detail=f"N8N CV API network error: {str(e)}"
@@ -427,19 +659,18 @@ class N8NAPIClient:
             # Generate filename
             filename = f"cv_{uuid.uuid4()}.{file_extension}"
 
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url)
+            response = await self._request("download", "GET", url)
 
-                if response.status_code == 200:
-                    logger.info(
-                        f"✅ [N8NAPIClient] File downloaded successfully: {filename}"
-                    )
-                    return response.content, filename
-                else:
-                    logger.error(
-                        f"❌ [N8NAPIClient] Failed to download file: {response.status_code}"
-                    )
-                    return None, ""
+            if response.status_code == 200:
+                logger.info(
+                    f"✅ [N8NAPIClient] File downloaded successfully: {filename}"
+                )
+                return response.content, filename
+            else:
+                logger.error(
+                    f"❌ [N8NAPIClient] Failed to download file: {response.status_code}"
+                )
+                return None, ""
 
         except Exception as e:
             logger.error(
@@ -477,11 +708,10 @@ class N8NAPIClient:
         else:
             logger.warning("[N8NAPIClient] No authorization token provided for JD matching")
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(url, json=request_body, headers=headers)
+            response = await self._request("jd_matching", "POST", url, json=request_body, headers=headers)
             logger.info(f"[N8NAPIClient] JD matching response status: {response.status_code}")
             if response.status_code == 200:
-                data = await response.json()
+                data = response.json()
                 if isinstance(data, dict):
                     return data
                 elif isinstance(data, list):
@@ -494,8 +724,13 @@ class N8NAPIClient:
                     status_code=response.status_code,
                     detail=f"N8N JD matching API call failed: {response.text}",
                 )
+        except HTTPException:
+            raise
+        except CircuitOpenError:
+            logger.error("[N8NAPIClient] JD matching circuit open, request rejected")
+            raise HTTPException(status_code=503, detail="N8N JD matching API temporarily unavailable")
         except httpx.TimeoutException:
-            logger.error(f"[N8NAPIClient] JD matching timeout after {self.timeout}s")
+            logger.error(f"[N8NAPIClient] JD matching timeout after {self.policies['jd_matching'].timeout}s")
             raise HTTPException(status_code=408, detail="N8N JD matching API request timeout")
         except httpx.RequestError as e:
             logger.error(f"[N8NAPIClient] JD matching network error: {str(e)}")
@@ -507,3 +742,15 @@ class N8NAPIClient:
 
 # Singleton instance
 n8n_client = N8NAPIClient()
+
+
+def run_async(coro: Awaitable[T]) -> T:
+    """asyncio.run for sync callers, closing the n8n pool of the short-lived loop before it goes away"""
+
+    async def run():
+        try:
+            return await coro
+        finally:
+            await n8n_client.aclose()
+
+    return asyncio.run(run())
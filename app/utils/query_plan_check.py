@@ -0,0 +1,123 @@
+"""
+Query Plan Check
+
+Runs the read queries of the chat, file and survey DAL classes against the configured
+MySQL database, EXPLAINs every SELECT they emit and exits non-zero when one of them
+has to scan a whole table because no index can serve it.
+
+Usage: python -m app.utils.query_plan_check  (or ./check_query_plans.sh)
+"""
+
+import sys
+import uuid
+from typing import Any, Callable, Dict, List, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal, engine
+
+# EXPLAIN access types that read every row of the table or of one of its indexes
+FULL_SCAN_TYPES = ('ALL', 'index')
+
+RED = '\033[0;31m'
+GREEN = '\033[0;32m'
+YELLOW = '\033[0;33m'
+NC = '\033[0m'
+
+
+def _dal_queries() -> List[Tuple[str, Callable[[Session], Any]]]:
+	"""The DAL calls on the hot paths, with throwaway ids (only the plan matters)"""
+	from app.modules.chat.dal.conversation_dal import ConversationDAL
+	from app.modules.chat.dal.file_dal import FileDAL
+	from app.modules.chat.dal.message_dal import MessageDAL
+	from app.modules.question_session.dal.question_answer_dal import QuestionAnswerDAL
+
+	user_id, conversation_id, session_id = (str(uuid.uuid4()) for _ in range(3))
+	checksum = uuid.uuid4().hex
+
+	return [
+		('MessageDAL.get_conversation_messages', lambda db: MessageDAL(db).get_conversation_messages(conversation_id)),
+		('MessageDAL.get_conversation_messages[cursor]', lambda db: MessageDAL(db).get_conversation_messages(conversation_id, use_cursor=True)),
+		('MessageDAL.get_conversation_history', lambda db: MessageDAL(db).get_conversation_history(conversation_id)),
+		('MessageDAL.get_latest_message', lambda db: MessageDAL(db).get_latest_message(conversation_id)),
+		('ConversationDAL.get_user_conversations', lambda db: ConversationDAL(db).get_user_conversations(user_id)),
+		('ConversationDAL.get_user_conversations[cursor]', lambda db: ConversationDAL(db).get_user_conversations(user_id, use_cursor=True)),
+		('ConversationDAL.get_user_conversation_by_id', lambda db: ConversationDAL(db).get_user_conversation_by_id(conversation_id, user_id)),
+		('FileDAL.get_user_files', lambda db: FileDAL(db).get_user_files(user_id)),
+		('FileDAL.get_user_files[cursor]', lambda db: FileDAL(db).get_user_files(user_id, use_cursor=True)),
+		('FileDAL.get_conversation_files', lambda db: FileDAL(db).get_conversation_files(user_id, conversation_id)),
+		('FileDAL.get_files_by_checksum', lambda db: FileDAL(db).get_files_by_checksum(checksum, user_id)),
+		('FileDAL.get_all_files_for_conversation', lambda db: FileDAL(db).get_all_files_for_conversation(conversation_id)),
+		('FileDAL.get_unindexed_files_for_conversation', lambda db: FileDAL(db).get_unindexed_files_for_conversation(conversation_id)),
+		('QuestionAnswerDAL.get_session_answers', lambda db: QuestionAnswerDAL(db).get_session_answers(session_id)),
+		('QuestionAnswerDAL.get_answer_by_question', lambda db: QuestionAnswerDAL(db).get_answer_by_question(session_id, 'q1')),
+		('QuestionAnswerDAL.get_answers_by_question_ids', lambda db: QuestionAnswerDAL(db).get_answers_by_question_ids(session_id, ['q1', 'q2'])),
+	]
+
+
+def capture_statements(db: Session, call: Callable[[Session], Any]) -> List[Tuple[str, Any]]:
+	"""Run a DAL call and collect the SELECT statements it sends to the database"""
+	statements = []
+
+	def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+		if statement.lstrip().upper().startswith('SELECT'):
+			statements.append((statement, parameters))
+
+	event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+	try:
+		call(db)
+	finally:
+		event.remove(engine, 'before_cursor_execute', _before_cursor_execute)
+	return statements
+
+
+def find_full_scans(db: Session, statement: str, parameters: Any) -> List[Dict[str, Any]]:
+	"""EXPLAIN a statement and return the plan rows that scan a base table without a usable index
+
+	Scans the optimizer picks although an index exists (tiny tables) are not reported,
+	only the ones where `possible_keys` is empty.
+	"""
+	result = db.connection().exec_driver_sql(f'EXPLAIN {statement}', parameters)
+	rows = [dict(row._mapping) for row in result]
+	return [
+		row
+		for row in rows
+		if row.get('type') in FULL_SCAN_TYPES
+		and not row.get('possible_keys')
+		# Derived tables (<derived2>, <subquery3>) are the count() wrappers, not stored tables
+		and not str(row.get('table') or '').startswith('<')
+	]
+
+
+def main() -> int:
+	db = SessionLocal()
+	failures = 0
+	try:
+		for label, call in _dal_queries():
+			label_ok = True
+			for statement, parameters in capture_statements(db, call):
+				scans = find_full_scans(db, statement, parameters)
+				if not scans:
+					continue
+				failures += 1
+				label_ok = False
+				tables = ', '.join(sorted({str(row.get('table')) for row in scans}))
+				print(f'{RED}FULL SCAN{NC} {label} on {tables}')
+				print(f'{YELLOW}{" ".join(statement.split())}{NC}')
+			if label_ok:
+				print(f'{GREEN}OK{NC} {label}')
+	finally:
+		db.rollback()
+		db.close()
+
+	if failures:
+		print(f'{RED}{failures} statement(s) fall back to a full table scan{NC}')
+		return 1
+
+	print(f'{GREEN}All DAL queries are served by an index{NC}')
+	return 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())
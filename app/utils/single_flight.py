@@ -0,0 +1,31 @@
+"""
+Single-flight call coalescing: concurrent callers of the same key share one in-flight call
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+	"""
+	Run `fn` once per key at a time; callers arriving while it runs await the same result (or exception).
+
+	Nothing is cached after the call completes. Calls are tracked per event loop, since a future
+	belongs to the loop that created it (Celery tasks and sync tools run in their own loops).
+	"""
+
+	def __init__(self):
+		self._calls: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Future] = {}
+
+	async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+		call_key = (asyncio.get_running_loop(), key)
+		future = self._calls.get(call_key)
+		if future is None:
+			future = asyncio.ensure_future(fn())
+			self._calls[call_key] = future
+			future.add_done_callback(lambda _: self._calls.pop(call_key, None))
+		# A cancelled caller must not cancel the call the other callers are waiting for
+		return await asyncio.shield(future)
+
+	def in_flight(self) -> int:
+		return len(self._calls)
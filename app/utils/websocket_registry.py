@@ -0,0 +1,284 @@
+"""
+WebSocket Connection Registry
+
+Tracks every open socket per user in the current worker and fans messages out
+through a pub/sub backend, so a push for a user connected to another uvicorn worker
+(or to several tabs) is still delivered. Each user has a channel that only the
+workers holding one of the user's sockets subscribe to.
+"""
+
+import asyncio
+import json
+import logging
+import uuid
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from fastapi import WebSocket
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+MessageHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class PubSubBackend(ABC):
+	"""Interface for the cross-worker message backbone"""
+
+	@abstractmethod
+	async def publish(self, channel: str, payload: Dict[str, Any]) -> None:
+		"""Deliver the payload to every handler subscribed to the channel"""
+		pass
+
+	@abstractmethod
+	async def subscribe(self, channel: str, handler: MessageHandler) -> None:
+		"""Call the handler with every payload published on the channel"""
+		pass
+
+	@abstractmethod
+	async def unsubscribe(self, channel: str, handler: MessageHandler) -> None:
+		"""Stop calling the handler for the channel"""
+		pass
+
+	async def close(self) -> None:
+		"""Release backend resources"""
+
+
+class InMemoryPubSubBackend(PubSubBackend):
+	"""Process-local backend, used for a single worker and in tests"""
+
+	def __init__(self):
+		self._handlers: Dict[str, list[MessageHandler]] = defaultdict(list)
+
+	async def publish(self, channel: str, payload: Dict[str, Any]) -> None:
+		for handler in list(self._handlers[channel]):
+			await handler(payload)
+
+	async def subscribe(self, channel: str, handler: MessageHandler) -> None:
+		if handler not in self._handlers[channel]:
+			self._handlers[channel].append(handler)
+
+	async def unsubscribe(self, channel: str, handler: MessageHandler) -> None:
+		if handler in self._handlers.get(channel, ()):
+			self._handlers[channel].remove(handler)
+		if not self._handlers.get(channel):
+			self._handlers.pop(channel, None)
+
+	async def close(self) -> None:
+		self._handlers.clear()
+
+
+class RedisPubSubBackend(PubSubBackend):
+	"""Redis pub/sub backend shared by all workers
+
+	All channels of a worker share one pub/sub connection, so per-user channels cost
+	a SUBSCRIBE each, not a connection each.
+	"""
+
+	def __init__(self, redis_url: str, reconnect_delay: float = 1.0, poll_timeout: float = 1.0):
+		import redis.asyncio as redis
+
+		self._redis = redis.from_url(redis_url, decode_responses=True)
+		self._reconnect_delay = reconnect_delay
+		self._poll_timeout = poll_timeout
+		self._handlers: Dict[str, MessageHandler] = {}
+		self._pubsub = None
+		self._listener: Optional[asyncio.Task] = None
+		self._has_channels = asyncio.Event()
+		# Serializes (UN)SUBSCRIBE commands, so concurrent calls never open a second pub/sub connection
+		self._command_lock = asyncio.Lock()
+
+	async def publish(self, channel: str, payload: Dict[str, Any]) -> None:
+		await self._redis.publish(channel, json.dumps(payload, default=str))
+
+	async def subscribe(self, channel: str, handler: MessageHandler) -> None:
+		self._handlers[channel] = handler
+		if self._listener is None or self._listener.done():
+			# The listener subscribes every registered channel when it (re)connects
+			self._listener = asyncio.create_task(self._listen())
+		elif self._pubsub is not None:
+			async with self._command_lock:
+				await self._pubsub.subscribe(channel)
+		self._has_channels.set()
+
+	async def unsubscribe(self, channel: str, handler: MessageHandler) -> None:
+		if self._handlers.get(channel) != handler:
+			return
+		del self._handlers[channel]
+		if self._pubsub is not None:
+			async with self._command_lock:
+				await self._pubsub.unsubscribe(channel)
+
+	async def _listen(self) -> None:
+		"""Consume the subscribed channels forever, resubscribing after connection errors"""
+		while True:
+			pubsub = self._redis.pubsub()
+			self._pubsub = pubsub
+			try:
+				async with self._command_lock:
+					if self._handlers:
+						await pubsub.subscribe(*self._handlers)
+				while True:
+					if not pubsub.subscribed:
+						# No user on this worker: nothing to read until the next subscribe
+						self._has_channels.clear()
+						await self._has_channels.wait()
+						continue
+					raw = await pubsub.get_message(ignore_subscribe_messages=True, timeout=self._poll_timeout)
+					if not raw or raw.get('type') != 'message':
+						continue
+					handler = self._handlers.get(raw['channel'])
+					if handler is None:
+						continue
+					try:
+						await handler(json.loads(raw['data']))
+					except Exception as e:
+						logger.error(f'[RedisPubSubBackend] Handler error on {raw["channel"]}: {e}')
+			except asyncio.CancelledError:
+				raise
+			except Exception as e:
+				logger.error(f'[RedisPubSubBackend] Subscription lost: {e}')
+				await asyncio.sleep(self._reconnect_delay)
+			finally:
+				self._pubsub = None
+				try:
+					await pubsub.close()
+				except Exception:
+					pass
+
+	async def close(self) -> None:
+		if self._listener is not None:
+			self._listener.cancel()
+			self._listener = None
+		self._handlers.clear()
+		try:
+			await self._redis.close()
+		except Exception:
+			pass
+
+
+class ConnectionRegistry:
+	"""Many-sockets-per-user registry with cross-worker delivery
+
+	Messages are written to this worker's sockets immediately and published on the
+	user's channel, which only workers with a socket of that user subscribe to (the
+	first socket subscribes, the last one unsubscribes); a worker ignores its own
+	publications.
+	"""
+
+	def __init__(self, namespace: str, backend: Optional[PubSubBackend] = None):
+		self.namespace = namespace
+		self.worker_id = uuid.uuid4().hex
+		self.active_connections: Dict[str, Set[WebSocket]] = defaultdict(set)
+		self._backend = backend
+		self._started = False
+		self._start_lock = asyncio.Lock()
+		# The loop only keeps weak references to tasks: hold the unsubscribes until they finish
+		self._unsubscribe_tasks: Set[asyncio.Task] = set()
+
+	def user_channel(self, user_id: str) -> str:
+		return f'{get_settings().WEBSOCKET_PUBSUB_CHANNEL}:{self.namespace}:user:{user_id}'
+
+	async def _ensure_started(self) -> None:
+		"""Create the pub/sub backend on first use"""
+		if self._started:
+			return
+		async with self._start_lock:
+			if self._started:
+				return
+			if self._backend is None:
+				self._backend = create_pubsub_backend()
+			self._started = True
+
+	async def connect(self, websocket: WebSocket, user_id: str):
+		await websocket.accept()
+		first_socket = not self.active_connections.get(user_id)
+		self.active_connections[user_id].add(websocket)
+		if not first_socket:
+			return
+		try:
+			await self._ensure_started()
+			await self._backend.subscribe(self.user_channel(user_id), self._on_published)
+		except Exception as e:
+			# Local delivery keeps working without the backbone
+			logger.error(f'[ConnectionRegistry] Pub/sub unavailable, local delivery only: {e}')
+
+	def disconnect(self, user_id: str, websocket: Optional[WebSocket] = None):
+		"""Drop one socket of a user, or all of them when no socket is given"""
+		sockets = self.active_connections.get(user_id)
+		if sockets is None:
+			return
+		if websocket is None:
+			sockets.clear()
+		else:
+			sockets.discard(websocket)
+		if not sockets:
+			self.active_connections.pop(user_id, None)
+			if self._started:
+				try:
+					task = asyncio.get_running_loop().create_task(self._unsubscribe_user(user_id))
+				except RuntimeError:
+					return
+				self._unsubscribe_tasks.add(task)
+				task.add_done_callback(self._unsubscribe_tasks.discard)
+
+	async def _unsubscribe_user(self, user_id: str) -> None:
+		# The user may have reconnected in the meantime: keep the channel then
+		if self.is_connected(user_id):
+			return
+		try:
+			await self._backend.unsubscribe(self.user_channel(user_id), self._on_published)
+		except Exception as e:
+			logger.error(f'[ConnectionRegistry] Failed to unsubscribe user {user_id}: {e}')
+
+	def is_connected(self, user_id: str) -> bool:
+		"""Whether the user has an open socket on this worker"""
+		return bool(self.active_connections.get(user_id))
+
+	async def send_message(self, user_id: str, message: dict):
+		"""Deliver to this worker's sockets and publish for the other workers holding a socket of the user"""
+		await self._send_local(user_id, message)
+
+		try:
+			await self._ensure_started()
+			await self._backend.publish(
+				self.user_channel(user_id),
+				{'origin': self.worker_id, 'user_id': user_id, 'message': message},
+			)
+		except Exception as e:
+			logger.error(f'[ConnectionRegistry] Failed to publish message for user {user_id}: {e}')
+
+	async def _on_published(self, payload: Dict[str, Any]) -> None:
+		if payload.get('origin') == self.worker_id:
+			return
+		await self._send_local(payload.get('user_id'), payload.get('message', {}))
+
+	async def _send_local(self, user_id: str, message: dict) -> None:
+		sockets = list(self.active_connections.get(user_id, ()))
+		if not sockets:
+			return
+
+		message_str = json.dumps(message, default=str)
+		for websocket in sockets:
+			try:
+				await websocket.send_text(message_str)
+			except Exception as e:
+				logger.error(f'[ConnectionRegistry] Error sending websocket message: {e}')
+				self.disconnect(user_id, websocket)
+
+	async def close(self) -> None:
+		if self._unsubscribe_tasks:
+			await asyncio.gather(*self._unsubscribe_tasks, return_exceptions=True)
+		if self._backend is not None:
+			await self._backend.close()
+		self._started = False
+
+
+def create_pubsub_backend() -> PubSubBackend:
+	"""Build the pub/sub backend selected in settings"""
+	settings = get_settings()
+	if settings.WEBSOCKET_PUBSUB_BACKEND == 'memory':
+		return InMemoryPubSubBackend()
+	return RedisPubSubBackend(settings.REDIS_URL)
@@ -0,0 +1,19 @@
+#!/bin/bash
+
+# Colors for better readability
+RED='\033[0;31m'
+GREEN='\033[0;32m'
+NC='\033[0m' # No Color
+
+# EXPLAIN the DAL hot-path queries against DATABASE_URL and fail on full table scans.
+# Run after `alembic upgrade head` so the plans use the current indexes.
+echo -e "${GREEN}Checking query plans of DAL queries...${NC}"
+
+python -m app.utils.query_plan_check
+status=$?
+
+if [ $status -ne 0 ]; then
+    echo -e "${RED}Query plan check failed.${NC}"
+fi
+
+exit $status
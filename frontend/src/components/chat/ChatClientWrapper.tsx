@@ -18,7 +18,7 @@ import { getErrorMessage } from '@/utils/apiHandler'
 import { ChatWebSocket, ChatWebSocketV2, createChatWebSocket, createChatWebSocketV2 } from '@/utils/websocket'
 import { faRobot, faTimes } from '@fortawesome/free-solid-svg-icons'
 import { FontAwesomeIcon } from '@fortawesome/react-fontawesome'
-import { useCallback, useEffect, useState } from 'react'
+import { useCallback, useEffect, useRef, useState } from 'react'
 import Cookies from 'js-cookie'
 import { AgentManagement } from './AgentManagement'
 import { ChatInterface } from './chat-interface'
@@ -110,9 +110,27 @@ export default function ChatClientWrapper({
     // Don't auto-close survey if we have data for the current conversation
   }, [state.activeConversationId])
 
+  // Frames are published to all of the user's sockets, so other tabs receive them too.
+  // The handler is created once, so it reads the active conversation from a ref.
+  const activeConversationIdRef = useRef<string | null>(null)
+  useEffect(() => {
+    activeConversationIdRef.current = state.activeConversationId
+  }, [state.activeConversationId])
+
   // Handle WebSocket messages
   const handleWebSocketMessage = useCallback((message: WebSocketResponse) => {
     console.log('[ChatClientWrapper] Received WebSocket message:', message.type)
+
+    // Drop chat frames that belong to a conversation another tab has open
+    const conversationScoped = ['user_message', 'assistant_typing', 'assistant_message_chunk', 'assistant_message_replace', 'assistant_message_complete']
+    if (
+      conversationScoped.includes(message.type) &&
+      message.conversation_id &&
+      message.conversation_id !== activeConversationIdRef.current
+    ) {
+      console.log('[ChatClientWrapper] Ignoring frame for conversation:', message.conversation_id)
+      return
+    }
     
     switch (message.type) {
       case 'user_message':
@@ -171,6 +189,26 @@ export default function ChatClientWrapper({
         }
         break
 
+      case 'assistant_message_replace':
+        // The streamed text was changed after streaming (output guardrails, tool result): show the final text instead
+        setState(prev => {
+          const messages = [...prev.messages]
+          const lastMessage = messages[messages.length - 1]
+          if (lastMessage && lastMessage.role === 'assistant' && lastMessage.isStreaming) {
+            messages[messages.length - 1] = { ...lastMessage, content: message.content || '' }
+          } else {
+            messages.push({
+              id: `assistant-streaming-${Date.now()}-${Math.random().toString(36).substr(2, 9)}`,
+              role: 'assistant',
+              content: message.content || '',
+              timestamp: new Date(),
+              isStreaming: true
+            })
+          }
+          return { ...prev, messages, isTyping: false }
+        })
+        break
+
       case 'assistant_message_complete':
         if (message.message) {
           setState(prev => {
@@ -251,7 +251,7 @@ export interface WebSocketOptions {
 }
 
 export interface WebSocketResponse {
-  type: 'user_message' | 'assistant_message_chunk' | 'assistant_message_complete' | 'assistant_typing' | 'error' | 'pong' | 'survey_data' | 'jd_matching_data'
+  type: 'user_message' | 'assistant_message_chunk' | 'assistant_message_replace' | 'assistant_message_complete' | 'assistant_typing' | 'error' | 'pong' | 'survey_data' | 'jd_matching_data'
   message?: {
     id?: string
     content: string
@@ -259,9 +259,16 @@ export interface WebSocketResponse {
     timestamp?: string
     model_used?: string
     response_time_ms?: string
+    usage?: {
+      prompt_tokens?: number
+      completion_tokens?: number
+      total_tokens?: number
+    }
   }
   chunk?: string
   is_final?: boolean
+  content?: string // For assistant_message_replace
+  response_safe?: boolean // For assistant_message_replace
   status?: boolean
   error?: string
   data?: any // For survey_data, jd_matching_data, etc.
@@ -0,0 +1,104 @@
+"""
+Shared fixtures: a file-backed SQLite database with the app schema, reachable from sync and async sessions, and
+a Qdrant local-mode registry with a deterministic embedder
+"""
+
+import glob
+import hashlib
+import importlib
+import math
+import os
+import re
+
+import minio
+import pytest
+
+# Importing the app creates the MinIO handler, which checks its bucket over the network
+minio.Minio.bucket_exists = lambda self, bucket_name: True
+
+from langchain_core.embeddings import Embeddings
+from qdrant_client import QdrantClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.modules.agentic_rag.core.qdrant_registry import QdrantRegistry, set_qdrant_registry
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Relationships resolve by class name: every model must be mapped before create_all
+for model_file in glob.glob(os.path.join(ROOT, 'app', 'modules', '*', 'models', '*.py')):
+	if not model_file.endswith('__init__.py'):
+		importlib.import_module(os.path.relpath(model_file, ROOT)[:-3].replace(os.sep, '.'))
+
+
+@pytest.fixture
+def database_path(tmp_path):
+	path = str(tmp_path / 'app.sqlite')
+	engine = create_engine(f'sqlite:///{path}')
+	Base.metadata.create_all(engine)
+	engine.dispose()
+	return path
+
+
+@pytest.fixture
+def session_factory(database_path):
+	engine = create_engine(f'sqlite:///{database_path}')
+	yield sessionmaker(bind=engine, autocommit=False, autoflush=False)
+	engine.dispose()
+
+
+@pytest.fixture
+def async_session_factory(database_path):
+	pytest.importorskip('aiosqlite')
+	engine = create_async_engine(f'sqlite+aiosqlite:///{database_path}')
+	# Same options as AsyncSessionLocal
+	return async_sessionmaker(bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+
+@pytest.fixture
+def conversation(session_factory):
+	"""(conversation_id, user_id) of an empty conversation"""
+	from app.modules.chat.models.conversation import Conversation
+	from app.modules.users.models.users import User
+
+	db = session_factory()
+	user = User(email='tester@example.com', name='Tester')
+	db.add(user)
+	db.commit()
+	conversation = Conversation(user_id=user.id, name='Interview prep', message_count=0)
+	db.add(conversation)
+	db.commit()
+	ids = (conversation.id, user.id)
+	db.close()
+	return ids
+
+
+class HashingEmbeddings(Embeddings):
+	"""Bag of words hashed into a fixed-size unit vector: same text, same vector, no API"""
+
+	def __init__(self, size=768):
+		self.size = size
+
+	def _embed(self, text):
+		vector = [0.0] * self.size
+		for word in re.findall(r'\w+', text.lower()):
+			vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % self.size] += 1.0
+		norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+		return [value / norm for value in vector]
+
+	def embed_documents(self, texts):
+		return [self._embed(text) for text in texts]
+
+	def embed_query(self, text):
+		return self._embed(text)
+
+
+@pytest.fixture
+def qdrant_registry():
+	"""Process-wide Qdrant registry swapped for Qdrant local mode (in memory) and HashingEmbeddings"""
+	registry = QdrantRegistry(client=QdrantClient(location=':memory:'), embedding_factory=lambda model_name: HashingEmbeddings(), max_concurrency=1)
+	set_qdrant_registry(registry)
+	yield registry
+	set_qdrant_registry(None)
@@ -0,0 +1,56 @@
+"""
+AsyncBaseDAL writes: standalone calls commit under the autobegun session, transaction() blocks commit once
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.base_dal import AsyncBaseDAL
+from app.modules.users.models.users import User
+
+
+def stored_names(session_factory):
+	db = session_factory()
+	names = sorted(user.name for user in db.query(User).all())
+	db.close()
+	return names
+
+
+def test_standalone_writes_are_committed(session_factory, async_session_factory):
+	async def run():
+		async with async_session_factory() as db:
+			dal = AsyncBaseDAL(db, User)
+			# A read first: the session has autobegun a transaction before the write
+			assert await dal.get_all() == []
+			user = await dal.create({'email': 'a@example.com', 'name': 'Ana'})
+			created = stored_names(session_factory)
+			await dal.update(user.id, {'name': 'Anna'})
+			updated = stored_names(session_factory)
+			await dal.delete(user.id)
+			return created, updated, stored_names(session_factory)
+
+	assert asyncio.run(run()) == (['Ana'], ['Anna'], [])
+
+
+def test_transaction_commits_once_at_the_outermost_block(session_factory, async_session_factory):
+	async def run():
+		async with async_session_factory() as db:
+			dal = AsyncBaseDAL(db, User)
+			async with dal.transaction():
+				await dal.create({'email': 'a@example.com', 'name': 'Ana'})
+				async with dal.transaction():
+					await dal.create({'email': 'b@example.com', 'name': 'Bo'})
+				inside = stored_names(session_factory)
+			committed = stored_names(session_factory)
+
+			with pytest.raises(RuntimeError):
+				async with dal.transaction():
+					await dal.create({'email': 'c@example.com', 'name': 'Cy'})
+					raise RuntimeError('boom')
+			return inside, committed, stored_names(session_factory)
+
+	inside, committed, after_failure = asyncio.run(run())
+	assert inside == []
+	assert committed == ['Ana', 'Bo']
+	assert after_failure == ['Ana', 'Bo']
@@ -0,0 +1,71 @@
+"""
+SQL checkpoint saver: schema from the Alembic migration, latest-checkpoint storage and TTL eviction
+"""
+
+import importlib.util
+import os
+from datetime import datetime, timedelta, timezone
+
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from langgraph.checkpoint.base import empty_checkpoint
+from sqlalchemy import create_engine, inspect, update
+
+from app.modules.agent.workflows.chat_workflow.workflow import checkpointer
+from app.modules.agent.workflows.chat_workflow.workflow.checkpointer import SQLCheckpointSaver, checkpoints_table
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MIGRATION = os.path.join(ROOT, 'alembic', 'versions', '6a2d9f4c8e51_add_langgraph_checkpoints.py')
+
+
+def run_migration(engine, step='upgrade'):
+	spec = importlib.util.spec_from_file_location('checkpoint_migration', MIGRATION)
+	migration = importlib.util.module_from_spec(spec)
+	spec.loader.exec_module(migration)
+	with engine.begin() as conn:
+		migration.op = Operations(MigrationContext.configure(conn))
+		getattr(migration, step)()
+
+
+def thread_config(thread_id):
+	return {'configurable': {'thread_id': thread_id, 'checkpoint_ns': ''}}
+
+
+def save(saver, thread_id):
+	checkpoint = empty_checkpoint()
+	return saver.put(thread_config(thread_id), checkpoint, {'source': 'input', 'step': 0}, {}), checkpoint
+
+
+def test_migration_creates_the_saver_schema(tmp_path):
+	engine = create_engine(f'sqlite:///{tmp_path / "app.sqlite"}')
+	run_migration(engine)
+
+	with engine.connect() as conn:
+		assert compare_metadata(MigrationContext.configure(conn), checkpointer.metadata) == []
+
+	# Tables created at runtime by earlier versions are adopted, not created twice
+	run_migration(engine, 'downgrade')
+	checkpointer.metadata.create_all(engine)
+	run_migration(engine)
+	assert {'langgraph_checkpoints', 'langgraph_checkpoint_writes'} <= set(inspect(engine).get_table_names())
+
+
+def test_saver_keeps_the_latest_checkpoint_and_evicts_expired_threads(tmp_path):
+	saver = SQLCheckpointSaver.from_url(f'sqlite:///{tmp_path / "checkpoints.sqlite"}', ttl_seconds=3600)
+
+	save(saver, 'old')
+	save(saver, 'current')
+	config, checkpoint = save(saver, 'current')
+
+	assert saver.get_tuple(thread_config('current')).checkpoint['id'] == checkpoint['id']
+	assert saver.get_stats()['threads'] == 2
+
+	with saver.engine.begin() as conn:
+		conn.execute(update(checkpoints_table).where(checkpoints_table.c.thread_id == 'old').values(updated_at=datetime.now(timezone.utc) - timedelta(hours=2)))
+
+	# Expired threads are no longer served, then swept
+	assert saver.get_tuple(thread_config('old')) is None
+	assert saver.evict_expired() == 1
+	assert saver.get_stats()['threads'] == 1
+	assert saver.get_thread_stats('current')['updated_at'].startswith(str(datetime.now(timezone.utc).year))
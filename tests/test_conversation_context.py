@@ -0,0 +1,86 @@
+"""
+Per-turn conversation context: CV context in the system prompt, cache hits, write-through and invalidation
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from app.modules.chat.models.conversation import Conversation
+from app.modules.chat.repository import chat_repo
+from app.modules.chat.repository.chat_repo import ChatRepo
+from app.modules.chat.services.conversation_context_service import conversation_context_cache
+from app.modules.chat.services.cv_integration_service import CVIntegrationService
+
+CV_ANALYSIS = {
+	'cv_summary': 'Backend developer',
+	'personal_information': {'full_name': 'Nguyen Van A'},
+	'skills': ['Python', 'FastAPI'],
+	'experience': [{'company': 'Acme'}],
+	'education': [],
+}
+
+
+@pytest.fixture
+def context_cache():
+	conversation_context_cache.clear()
+	yield conversation_context_cache
+	conversation_context_cache.clear()
+
+
+@pytest.fixture
+def db(session_factory, monkeypatch):
+	# The agent workflow (LLM clients) plays no part in building the context
+	monkeypatch.setattr(chat_repo, 'ConversationWorkflowRepo', lambda db: None)
+	db = session_factory()
+	yield db
+	db.close()
+
+
+def test_stored_cv_context_reaches_the_system_prompt(db, conversation, context_cache):
+	conversation_id, user_id = conversation
+	db.get(Conversation, conversation_id).system_prompt = 'Be concise.'
+	db.commit()
+	repo = ChatRepo(db)
+
+	assert repo.get_conversation_context(conversation_id, user_id).system_prompt == 'Be concise.'
+
+	asyncio.run(CVIntegrationService(db).store_cv_context(conversation_id, user_id, CV_ANALYSIS))
+	context = repo.get_conversation_context(conversation_id, user_id)
+
+	assert context.system_prompt.startswith('Be concise.\n\nTHÔNG TIN CV CỦA NGƯỜI DÙNG:')
+	assert 'FastAPI' in context.cv_context
+	assert context.metadata['cv_context']['experience_count'] == 1
+	assert CVIntegrationService(db).get_cv_context_for_prompt(conversation_id, user_id) == context.cv_context
+
+
+def test_context_is_cached_and_messages_are_written_through(db, conversation, context_cache):
+	conversation_id, user_id = conversation
+	repo = ChatRepo(db)
+	misses = context_cache.get_stats()['misses']
+
+	first = repo.get_conversation_context(conversation_id, user_id)
+	repo.create_message(conversation_id, user_id, 'hello', 'user')
+	second = repo.get_conversation_context(conversation_id, user_id)
+
+	assert second is first
+	assert [entry['content'] for entry in second.history] == ['hello']
+	assert context_cache.get_stats()['misses'] == misses + 1
+
+
+def test_write_from_another_session_rebuilds_the_context(db, session_factory, conversation, context_cache):
+	conversation_id, user_id = conversation
+	repo = ChatRepo(db)
+	first = repo.get_conversation_context(conversation_id, user_id)
+
+	other = session_factory()
+	other.get(Conversation, conversation_id).extra_metadata = json.dumps({'cv_context': {'cv_uploaded': True, 'skills': ['Go']}})
+	other.commit()
+	other.close()
+	db.expire_all()
+
+	second = repo.get_conversation_context(conversation_id, user_id)
+
+	assert second is not first
+	assert 'Go' in second.cv_context
@@ -0,0 +1,80 @@
+"""
+Document extraction pool: worker processes, timeouts, and the thread path inside daemonic (Celery prefork) processes
+"""
+
+import asyncio
+import multiprocessing
+import time
+
+import billiard
+
+from app.modules.chat.services import file_extraction_service as extraction_module
+from app.modules.chat.services.file_extraction_service import ExtractionPool
+
+TEXT = 'Senior Python developer'
+
+
+def extract_with_new_pool(_):
+	"""Runs in a billiard pool process, as a Celery prefork task does"""
+	pool = ExtractionPool(max_workers=2)
+	result = asyncio.run(pool.extract(TEXT.encode(), 'text/plain', 'resume.txt', timeout_seconds=5))
+	return multiprocessing.current_process().daemon, pool.max_workers, result
+
+
+def test_extraction_inside_a_daemonic_process_runs_in_a_thread():
+	pool = billiard.Pool(1)
+	try:
+		daemon, max_workers, result = pool.map(extract_with_new_pool, [0])[0]
+	finally:
+		pool.close()
+		pool.join()
+
+	assert daemon
+	assert max_workers == 0
+	assert result['extraction_success'] and result['content'] == TEXT
+
+
+def test_extraction_runs_in_a_worker_process():
+	# The test process cannot start the forkserver (it imports the app, which needs MinIO); the pool code is the same
+	pool = ExtractionPool(max_workers=1, start_method='fork')
+
+	result = asyncio.run(pool.extract(TEXT.encode(), 'text/plain', 'resume.txt', timeout_seconds=5))
+
+	assert result['extraction_success'] and result['content'] == TEXT
+	assert pool.max_workers == 1 and pool._executor is not None
+	assert pool.get_stats()['by_type']['text/plain']['succeeded'] == 1
+	pool._executor.shutdown()
+
+
+def test_worker_that_cannot_start_falls_back_to_a_thread(monkeypatch):
+	pool = ExtractionPool(max_workers=1, start_method='fork')
+
+	def refuse(*args, **kwargs):
+		raise AssertionError('daemonic processes are not allowed to have children')
+
+	monkeypatch.setattr(extraction_module.ProcessPoolExecutor, 'submit', refuse)
+
+	result = asyncio.run(pool.extract(TEXT.encode(), 'text/plain', 'resume.txt', timeout_seconds=5))
+
+	assert result['extraction_success']
+	assert pool.max_workers == 0 and pool._executor is None
+
+
+def slow_extraction(self, file_content, file_type, file_name):
+	time.sleep(30)
+
+
+def test_stuck_worker_is_killed_and_the_pool_recycled(monkeypatch):
+	# Forked workers inherit the patched method; the in-worker timer is set past the parent's hard timeout
+	monkeypatch.setattr(extraction_module.FileExtractionService, 'extract_text_from_file', slow_extraction)
+	monkeypatch.setattr(extraction_module, 'HARD_TIMEOUT_GRACE_SECONDS', 0.5)
+	monkeypatch.setattr(extraction_module, '_raise_timeout', lambda signum, frame: None)
+	pool = ExtractionPool(max_workers=1, start_method='fork')
+
+	started = time.perf_counter()
+	result = asyncio.run(pool.extract(TEXT.encode(), 'text/plain', 'resume.txt', timeout_seconds=0.5))
+
+	assert time.perf_counter() - started < 5
+	assert not result['extraction_success'] and 'timed out' in result['extraction_error']
+	assert pool._executor is None
+	assert pool.get_stats()['by_type']['text/plain']['timed_out'] == 1
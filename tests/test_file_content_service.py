@@ -0,0 +1,75 @@
+"""
+Content-addressed uploads: one read of the upload, duplicates of a user keep the stored object
+"""
+
+import asyncio
+import hashlib
+import io
+
+import pytest
+from fastapi import UploadFile
+from minio.helpers import ObjectWriteResult
+
+from app.modules.chat.services.file_content_service import FileContentService
+from app.utils.minio.minio_handler import minio_handler
+
+CV = b'%PDF-1.4 Senior Python developer ' * 1000
+
+
+class CountingReader(io.BytesIO):
+	"""Counts the bytes read from the upload"""
+
+	bytes_read = 0
+
+	def read(self, size=-1):
+		data = super().read(size)
+		self.bytes_read += len(data)
+		return data
+
+
+@pytest.fixture
+def storage(monkeypatch):
+	"""minio_handler with its S3 calls stubbed: stored and removed object names"""
+	objects = {'stored': [], 'removed': []}
+
+	def put_object(bucket_name, object_name, data, headers, query_params=None):
+		objects['stored'].append(object_name)
+		return ObjectWriteResult(bucket_name, object_name, None, 'etag', {})
+
+	def remove_object(bucket_name, object_name):
+		objects['removed'].append(object_name)
+
+	monkeypatch.setattr(minio_handler.minio_client, '_put_object', put_object)
+	monkeypatch.setattr(minio_handler.minio_client, 'remove_object', remove_object)
+	return objects
+
+
+def upload(service, user_id, content=CV):
+	source = CountingReader(content)
+	file = UploadFile(file=source, filename='cv.pdf', size=len(content))
+	stored, reused = asyncio.run(service.store_upload(file, user_id=user_id, meeting_id=user_id, file_type='cv_files'))
+	return stored, reused, source.bytes_read
+
+
+def test_duplicate_upload_keeps_the_stored_object(session_factory, conversation, storage):
+	_, user_id = conversation
+	db = session_factory()
+	service = FileContentService(db)
+
+	first, reused, bytes_read = upload(service, user_id)
+
+	assert not reused
+	assert bytes_read == len(CV)  # Hashed while uploading, no separate checksum pass
+	assert first.checksum == hashlib.md5(CV).hexdigest() and first.sha256 == hashlib.sha256(CV).hexdigest()
+	assert storage['stored'] == [first.object_path] and storage['removed'] == []
+
+	second, reused, bytes_read = upload(service, user_id)
+
+	assert reused and second.id == first.id
+	assert bytes_read == len(CV)
+	# The copy written by the second upload is removed, the first object stays
+	assert len(storage['stored']) == 2 and storage['removed'] == [storage['stored'][1]]
+
+	other, reused, _ = upload(service, user_id, content=CV + b'v2')
+	assert not reused and other.object_path == storage['stored'][2]
+	db.close()
@@ -0,0 +1,140 @@
+"""
+index_uploaded_file run in Celery eager mode against SQLite and Qdrant local mode
+"""
+
+import asyncio
+import uuid
+from datetime import datetime
+
+import pytest
+
+from app.jobs import tasks
+from app.jobs.celery_worker import celery_app
+from app.modules.agent.jobs import file_indexing
+from app.modules.agent.jobs.file_indexing import get_conversation_collection_id, index_file
+from app.modules.agentic_rag.repository.kb_repo import KBRepository
+from app.modules.chat.models.file import File
+
+TEXT = 'Senior Python developer. Built data pipelines with Celery and Redis. ' * 40
+
+
+@pytest.fixture
+def eager_celery(monkeypatch):
+	monkeypatch.setattr(celery_app.conf, 'task_always_eager', True)
+	monkeypatch.setattr(celery_app.conf, 'task_eager_propagates', True)
+
+
+@pytest.fixture
+def pipeline(monkeypatch, session_factory, qdrant_registry):
+	"""Counts storage reads, extractions and embedding upserts; the task uses the test database"""
+	calls = {'downloads': 0, 'extractions': 0, 'upserts': 0}
+
+	async def get_file_content(file_path):
+		calls['downloads'] += 1
+		return TEXT.encode()
+
+	async def aextract_text_from_file(file_content, file_type, file_name):
+		calls['extractions'] += 1
+		return {'extraction_success': True, 'content': file_content.decode()}
+
+	add_documents = KBRepository.add_documents
+
+	async def counting_add_documents(self, *args, **kwargs):
+		calls['upserts'] += 1
+		return await add_documents(self, *args, **kwargs)
+
+	monkeypatch.setattr(tasks, 'SessionLocal', session_factory)
+	monkeypatch.setattr(file_indexing.file_service, 'get_file_content', get_file_content)
+	monkeypatch.setattr(file_indexing.file_extraction_service, 'aextract_text_from_file', aextract_text_from_file)
+	monkeypatch.setattr(KBRepository, 'add_documents', counting_add_documents)
+	return calls
+
+
+def add_file(session_factory, conversation, checksum='5d41402abc4b2a76b9719d911017c592'):
+	conversation_id, user_id = conversation
+	file_id = str(uuid.uuid4())
+	db = session_factory()
+	file = File(
+		id=file_id,
+		name='resume.txt',
+		original_name='resume.txt',
+		file_path=f'documents/{conversation_id}/resume.txt',
+		size=len(TEXT),
+		type='text/plain',
+		user_id=user_id,
+		conversation_id=conversation_id,
+		upload_date=datetime.now(),
+		checksum=checksum,
+	)
+	db.add(file)
+	db.commit()
+	db.close()
+	return file_id
+
+
+def file_state(session_factory, file_id):
+	db = session_factory()
+	try:
+		file = db.get(File, file_id)
+		return file.is_indexed, file.indexed_at is not None, file.indexing_error
+	finally:
+		db.close()
+
+
+def test_indexes_file_and_skips_reupload_of_same_checksum(eager_celery, pipeline, session_factory, conversation, qdrant_registry):
+	conversation_id, _ = conversation
+	first_id = add_file(session_factory, conversation)
+
+	result = tasks.index_uploaded_file.apply_async(args=[first_id, conversation_id]).get()
+
+	assert result['status'] == 'indexed' and result['chunks'] > 1
+	assert file_state(session_factory, first_id) == (True, True, None)
+	collection = f'rag_{get_conversation_collection_id(conversation_id)}'
+	points = qdrant_registry.client.count(collection).count
+	assert points == result['chunks']
+	assert pipeline == {'downloads': 1, 'extractions': 1, 'upserts': 1}
+
+	# Same bytes uploaded again in the conversation: marked indexed without extracting or embedding again
+	second_id = add_file(session_factory, conversation)
+	result = tasks.index_uploaded_file.apply_async(args=[second_id, conversation_id]).get()
+
+	assert result == {'file_id': second_id, 'status': 'skipped', 'reason': 'duplicate', 'duplicate_of': first_id}
+	assert file_state(session_factory, second_id) == (True, True, None)
+
+	# Re-running the task of an indexed file is a no-op
+	result = tasks.index_uploaded_file.apply_async(args=[first_id, conversation_id]).get()
+
+	assert result['status'] == 'skipped' and result['reason'] == 'already_indexed'
+	assert pipeline == {'downloads': 1, 'extractions': 1, 'upserts': 1}
+	assert qdrant_registry.client.count(collection).count == points
+
+
+def test_reports_progress_stages(pipeline, session_factory, conversation):
+	conversation_id, _ = conversation
+	file_id = add_file(session_factory, conversation)
+	stages = []
+
+	db = session_factory()
+	try:
+		asyncio.run(index_file(db, file_id, conversation_id, on_progress=lambda stage, meta: stages.append((stage, meta['file_id']))))
+	finally:
+		db.close()
+
+	assert [stage for stage, _ in stages] == ['extracting', 'chunked', 'embedding', 'indexed']
+	assert {meta_file_id for _, meta_file_id in stages} == {file_id}
+
+
+def test_permanent_failure_is_recorded_without_retry(eager_celery, pipeline, session_factory, conversation, monkeypatch):
+	conversation_id, _ = conversation
+	file_id = add_file(session_factory, conversation)
+
+	async def nothing_extracted(file_content, file_type, file_name):
+		return {'extraction_success': False, 'content': '', 'extraction_error': 'Unsupported file'}
+
+	monkeypatch.setattr(file_indexing.file_extraction_service, 'aextract_text_from_file', nothing_extracted)
+
+	result = tasks.index_uploaded_file.apply_async(args=[file_id, conversation_id]).get()
+
+	assert result['status'] == 'failed'
+	assert file_state(session_factory, file_id) == (False, False, 'Unsupported file')
+	assert pipeline['downloads'] == 1 and pipeline['upserts'] == 0
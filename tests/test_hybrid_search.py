@@ -0,0 +1,90 @@
+"""
+Hybrid (BM25 + dense) retrieval behind rag_search, against Qdrant local mode and a deterministic embedder
+"""
+
+import asyncio
+import uuid
+
+import pytest
+
+from app.modules.agent.workflows.chat_workflow.tools import rag_tool
+from app.modules.agent.workflows.chat_workflow.tools.rag_tool import hybrid_search, rag_search
+from app.modules.agentic_rag.core.rank_fusion import reciprocal_rank_fusion
+from app.modules.agentic_rag.core.sparse_encoder import SPARSE_VECTOR_NAME
+from app.modules.agentic_rag.repository.kb_repo import KBRepository
+from app.modules.agentic_rag.schemas.kb_schema import AddDocumentsRequest, DocumentModel, QueryRequest
+
+
+def add_documents(collection_id, contents):
+	documents = [DocumentModel(id=str(uuid.uuid4()), content=content) for content in contents]
+	asyncio.run(KBRepository().add_documents(AddDocumentsRequest(documents=documents), collection_id=collection_id))
+	return [document.id for document in documents]
+
+
+def test_hybrid_query_writes_and_searches_dense_and_sparse_vectors(qdrant_registry):
+	ids = add_documents(
+		'conversation_1',
+		[
+			'Deployed services on Kubernetes clusters with Helm charts',
+			'Led a team of five frontend engineers',
+			'Wrote unit tests for the payment service',
+		],
+	)
+
+	results = asyncio.run(KBRepository().hybrid_query(QueryRequest(query='kubernetes helm', top_k=3), collection_id='conversation_1')).results
+
+	assert results[0].id == ids[0]
+	assert qdrant_registry.has_sparse_vector('rag_conversation_1')
+	point = qdrant_registry.client.retrieve('rag_conversation_1', ids=[ids[0]], with_vectors=True)[0]
+	assert SPARSE_VECTOR_NAME in point.vector and '' in point.vector
+
+
+def test_rrf_ranks_items_found_by_several_lists_first():
+	fused = reciprocal_rank_fusion([['a', 'b', 'c'], ['c', 'd'], ['b']], key=lambda item: item)
+
+	assert [item for item, _ in fused] == ['b', 'c', 'a', 'd']
+	assert fused[0][1] == pytest.approx(1 / 62 + 1 / 61)
+	# Duplicates inside one list count once, at their best rank
+	assert reciprocal_rank_fusion([['a', 'a']], key=lambda item: item) == [('a', pytest.approx(1 / 61))]
+
+
+def test_hybrid_search_merges_collections_by_rank(qdrant_registry):
+	conversation_ids = add_documents('conversation_1', ['Python developer resume', 'Python and Django projects'])
+	global_ids = add_documents('global', ['Python interview questions'])
+
+	results = asyncio.run(hybrid_search('python', [('conversation', 'conversation_1'), ('global', 'global')], top_k=5))
+
+	# Each collection's best hit shares the top fused score, the second conversation hit comes after both
+	assert len(results) == 3
+	assert {result['source'] for result in results[:2]} == {'conversation', 'global'}
+	assert results[0]['score'] == pytest.approx(results[1]['score'])
+	assert results[2]['source'] == 'conversation' and results[2]['score'] < results[1]['score']
+	assert {result['metadata']['collection_id'] for result in results} == {'conversation_1', 'global'}
+	assert len(conversation_ids) + len(global_ids) == len(results)
+
+
+def test_hybrid_search_skips_a_collection_over_the_budget(qdrant_registry, monkeypatch):
+	add_documents('conversation_1', ['Python developer resume'])
+	add_documents('global', ['Python interview questions'])
+	hybrid_query = KBRepository.hybrid_query
+
+	async def slow_global(self, request, collection_id=None):
+		if collection_id == 'global':
+			await asyncio.sleep(2)
+		return await hybrid_query(self, request, collection_id=collection_id)
+
+	monkeypatch.setattr(KBRepository, 'hybrid_query', slow_global)
+
+	results = asyncio.run(hybrid_search('python', [('conversation', 'conversation_1'), ('global', 'global')], top_k=5, timeout_seconds=0.5))
+
+	assert [result['source'] for result in results] == ['conversation']
+
+
+def test_rag_search_caps_top_k(qdrant_registry, monkeypatch):
+	add_documents('conversation_1', [f'Python project number {number}' for number in range(10)])
+	monkeypatch.setattr(rag_tool, 'RAG_SEARCH_MAX_TOP_K', 3)
+
+	output = asyncio.run(rag_search.ainvoke({'query': 'python project', 'top_k': 50}, config={'configurable': {'conversation_id': '1'}}))
+
+	assert 'Sources: 3 documents found' in output
+	assert output.count('Conversation files') == 3
@@ -0,0 +1,140 @@
+"""
+Streaming uploads to MinIO: multipart parts, checksums computed on the way, size limit, bounded memory
+
+The real Minio.put_object runs; only its S3 calls are stubbed.
+"""
+
+import asyncio
+import hashlib
+import importlib
+import os
+import tempfile
+import tracemalloc
+from types import SimpleNamespace
+
+import pytest
+from fastapi import UploadFile
+from minio.helpers import ObjectWriteResult
+
+from app.utils.minio.minio_handler import MinioHandler, UploadTooLargeError
+
+# The package re-exports a handler instance under the module's name
+minio_handler = importlib.import_module('app.utils.minio.minio_handler')
+
+PART_SIZE = 5 * 1024 * 1024  # Smallest part size S3 accepts
+
+
+class FakeS3:
+	"""Stands in for the S3 API calls of put_object and records what each received"""
+
+	def __init__(self):
+		self.parts = []
+		self.single_puts = []
+		self.completed = []
+		self.aborted = []
+
+	def create_multipart_upload(self, bucket_name, object_name, headers):
+		return 'upload-1'
+
+	def upload_part(self, bucket_name, object_name, data, headers, upload_id, part_number):
+		# Only the part size is kept: holding the bytes would defeat the memory check
+		self.parts.append((part_number, len(data)))
+		return f'etag-{part_number}'
+
+	def complete_multipart_upload(self, bucket_name, object_name, upload_id, parts):
+		self.completed.append((upload_id, [part.part_number for part in parts]))
+		return SimpleNamespace(bucket_name=bucket_name, object_name=object_name, version_id=None, etag='multipart-etag', http_headers={}, location=None)
+
+	def abort_multipart_upload(self, bucket_name, object_name, upload_id):
+		self.aborted.append(upload_id)
+
+	def put_object(self, bucket_name, object_name, data, headers, query_params=None):
+		self.single_puts.append(len(data))
+		return ObjectWriteResult(bucket_name, object_name, None, 'single-etag', {})
+
+
+@pytest.fixture
+def s3(monkeypatch):
+	monkeypatch.setattr(minio_handler.settings, 'MINIO_UPLOAD_PART_SIZE', PART_SIZE)
+	return FakeS3()
+
+
+@pytest.fixture
+def handler(s3):
+	handler = MinioHandler()
+	client = handler.minio_client
+	client._create_multipart_upload = s3.create_multipart_upload
+	client._upload_part = s3.upload_part
+	client._complete_multipart_upload = s3.complete_multipart_upload
+	client._abort_multipart_upload = s3.abort_multipart_upload
+	client._put_object = s3.put_object
+	return handler
+
+
+def upload_file(size, filename='resume.pdf'):
+	"""UploadFile backed by a temporary file of `size` random bytes, with the expected MD5 and SHA-256"""
+	md5, sha256 = hashlib.md5(), hashlib.sha256()
+	spooled = tempfile.TemporaryFile()
+	remaining = size
+	while remaining:
+		chunk = os.urandom(min(remaining, 1024 * 1024))
+		spooled.write(chunk)
+		md5.update(chunk)
+		sha256.update(chunk)
+		remaining -= len(chunk)
+	spooled.seek(0)
+	return UploadFile(file=spooled, filename=filename, size=size), md5.hexdigest(), sha256.hexdigest()
+
+
+def test_large_upload_streams_in_parts_with_matching_checksums(handler, s3):
+	size = 4 * PART_SIZE + 12345
+	file, md5, sha256 = upload_file(size)
+
+	result = asyncio.run(handler.stream_upload(file, 'user-1', file_type='documents', compute_sha256=True))
+
+	assert [length for _, length in s3.parts] == [PART_SIZE] * 4 + [12345]
+	assert s3.completed == [('upload-1', [1, 2, 3, 4, 5])]
+	assert s3.aborted == []
+	assert (result.size, result.md5, result.sha256, result.etag) == (size, md5, sha256, 'multipart-etag')
+	assert result.object_name.startswith('documents/user-1/') and result.object_name.endswith('.pdf')
+	# The cursor is rewound for callers that read the file afterwards
+	assert file.file.tell() == 0
+
+
+def test_small_upload_is_a_single_put(handler, s3):
+	file, md5, _ = upload_file(1000)
+
+	result = asyncio.run(handler.stream_upload(file, 'user-1'))
+
+	assert s3.single_puts == [1000] and s3.parts == []
+	assert (result.size, result.md5, result.sha256) == (1000, md5, None)
+
+
+def test_upload_over_max_size_is_aborted(handler, s3):
+	file, _, _ = upload_file(3 * PART_SIZE)
+
+	with pytest.raises(UploadTooLargeError):
+		asyncio.run(handler.stream_upload(file, 'user-1', max_size=PART_SIZE + 100))
+
+	assert s3.aborted == ['upload-1']
+	assert s3.completed == []
+	# Nothing past the limit was sent
+	assert [length for _, length in s3.parts] == [PART_SIZE]
+
+
+def test_upload_memory_does_not_grow_with_file_size(handler):
+	def peak_memory(size):
+		file, _, _ = upload_file(size)
+		tracemalloc.start()
+		try:
+			asyncio.run(handler.stream_upload(file, 'user-1', compute_sha256=True))
+			return tracemalloc.get_traced_memory()[1]
+		finally:
+			tracemalloc.stop()
+
+	small_peak = peak_memory(4 * PART_SIZE)
+	large_peak = peak_memory(12 * PART_SIZE)
+
+	# A few part-sized buffers (minio reads part_size + 1 bytes and slices them), however large the file
+	assert large_peak < 6 * PART_SIZE
+	assert large_peak < small_peak + PART_SIZE / 2
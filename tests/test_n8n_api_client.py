@@ -0,0 +1,230 @@
+"""
+N8N client resilience: retries, circuit breaker and bulkheads against an httpx.MockTransport stub
+"""
+
+import asyncio
+import ssl
+import time
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from app.utils import n8n_api_client
+from app.utils.n8n_api_client import CircuitBreaker, CircuitOpenError, EndpointPolicy, N8NAPIClient
+
+DOWNLOAD_URL = 'https://files.example.com/cv.pdf'
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+	monkeypatch.setattr(n8n_api_client, 'RETRY_BACKOFF_BASE_SECONDS', 0.0)
+
+
+class Stub:
+	"""Replays the given outcomes (status code or exception) and records every request"""
+
+	def __init__(self, *outcomes):
+		self.outcomes = list(outcomes)
+		self.requests = []
+
+	def __call__(self, request):
+		self.requests.append(request)
+		outcome = self.outcomes.pop(0) if self.outcomes else 200
+		if isinstance(outcome, Exception):
+			raise outcome
+		return httpx.Response(outcome, json=[{'output': 'hello'}])
+
+
+def new_client(handler, policies=None):
+	return N8NAPIClient(base_url='https://n8n.test', policies=policies, transport=httpx.MockTransport(handler))
+
+
+def test_idempotent_call_is_retried_on_5xx():
+	stub = Stub(503, 502, 200)
+	client = new_client(stub)
+
+	content, filename = asyncio.run(client.download_file_content(DOWNLOAD_URL))
+
+	assert content is not None and filename.endswith('.pdf')
+	assert len(stub.requests) == 3
+	assert client.get_stats()['download'] == {'state': 'closed', 'consecutive_failures': 0}
+
+
+def test_non_idempotent_call_is_not_retried_on_5xx():
+	stub = Stub(503)
+	client = new_client(stub)
+
+	with pytest.raises(HTTPException) as error:
+		asyncio.run(client.call_chat_workflow('conversation-1', 'hi', 'user-1'))
+
+	assert error.value.status_code == 503
+	assert len(stub.requests) == 1
+	assert client.get_stats()['chat']['consecutive_failures'] == 1
+
+
+def test_idempotent_call_is_retried_on_timeout():
+	stub = Stub(httpx.ReadTimeout('slow'), 200)
+	client = new_client(stub)
+
+	result = asyncio.run(client.analyze_cv(b'%PDF', 'cv.pdf'))
+
+	assert result == {'output': 'hello'}
+	assert len(stub.requests) == 2
+
+
+def test_non_idempotent_call_retries_connect_errors_only():
+	# The connection failed, so n8n never saw the request: safe to send again
+	stub = Stub(httpx.ConnectError('refused'), 200)
+	client = new_client(stub)
+	assert asyncio.run(client.call_chat_workflow('conversation-1', 'hi', 'user-1'))['content'] == 'hello'
+	assert len(stub.requests) == 2
+
+	# A read timeout may have reached n8n: not retried
+	stub = Stub(httpx.ReadTimeout('slow'), 200)
+	client = new_client(stub)
+	with pytest.raises(HTTPException) as error:
+		asyncio.run(client.call_chat_workflow('conversation-1', 'hi', 'user-1'))
+	assert error.value.status_code == 408
+	assert len(stub.requests) == 1
+
+
+def test_retries_are_bounded_by_the_policy():
+	stub = Stub(500, 500, 500, 500, 500)
+	client = new_client(stub, policies={'download': EndpointPolicy(timeout=5.0, max_concurrency=4, retries=2, idempotent=True)})
+
+	assert asyncio.run(client.download_file_content(DOWNLOAD_URL)) == (None, '')
+	assert len(stub.requests) == 3
+
+
+def test_circuit_opens_then_half_opens_with_a_single_probe():
+	stub = Stub(500, 500)
+	client = new_client(stub, policies={'download': EndpointPolicy(timeout=5.0, max_concurrency=4, idempotent=True)})
+	client.breakers['download'] = CircuitBreaker('download', failure_threshold=2, reset_seconds=0.2)
+
+	async def run():
+		for _ in range(2):
+			await client.download_file_content(DOWNLOAD_URL)
+		assert client.get_stats()['download']['state'] == 'open'
+
+		# Open: rejected without calling n8n
+		with pytest.raises(CircuitOpenError):
+			await client._request('download', 'GET', DOWNLOAD_URL)
+		assert len(stub.requests) == 2
+
+		await asyncio.sleep(0.25)
+		assert client.get_stats()['download']['state'] == 'half_open'
+
+		# Half-open: one probe goes through, concurrent calls are rejected while it runs
+		release = asyncio.Event()
+
+		async def slow_success(request):
+			stub.requests.append(request)
+			await release.wait()
+			return httpx.Response(200, content=b'%PDF')
+
+		client._transport.handler = slow_success
+		probe = asyncio.create_task(client._request('download', 'GET', DOWNLOAD_URL))
+		await asyncio.sleep(0.01)
+		with pytest.raises(CircuitOpenError):
+			await client._request('download', 'GET', DOWNLOAD_URL)
+		release.set()
+		assert (await probe).status_code == 200
+
+	asyncio.run(run())
+	assert len(stub.requests) == 3
+	assert client.get_stats()['download'] == {'state': 'closed', 'consecutive_failures': 0}
+
+
+def test_failed_probe_reopens_the_circuit():
+	stub = Stub(500, 500)
+	client = new_client(stub, policies={'download': EndpointPolicy(timeout=5.0, max_concurrency=4, idempotent=True)})
+	breaker = CircuitBreaker('download', failure_threshold=1, reset_seconds=0.2)
+	client.breakers['download'] = breaker
+
+	async def run():
+		await client.download_file_content(DOWNLOAD_URL)
+		await asyncio.sleep(0.25)
+		assert breaker.state == 'half_open'
+		await client.download_file_content(DOWNLOAD_URL)
+
+	asyncio.run(run())
+	assert len(stub.requests) == 2
+	assert breaker.state == 'open'
+	assert time.monotonic() - breaker.opened_at < 0.2
+
+
+def test_bulkhead_rejects_calls_over_the_concurrency_limit():
+	release = asyncio.Event()
+	requests = []
+
+	async def slow(request):
+		requests.append(request)
+		await release.wait()
+		return httpx.Response(200, content=b'%PDF')
+
+	client = new_client(slow, policies={'download': EndpointPolicy(timeout=5.0, max_concurrency=1, queue_timeout=0.05)})
+
+	async def run():
+		first = asyncio.create_task(client._request('download', 'GET', DOWNLOAD_URL))
+		await asyncio.sleep(0.01)
+		with pytest.raises(httpx.PoolTimeout):
+			await client._request('download', 'GET', DOWNLOAD_URL)
+		release.set()
+		assert (await first).status_code == 200
+		# The slot is free again
+		assert (await client._request('download', 'GET', DOWNLOAD_URL)).status_code == 200
+
+	asyncio.run(run())
+	assert len(requests) == 2
+	# Our own limit is not an n8n failure
+	assert client.get_stats()['download'] == {'state': 'closed', 'consecutive_failures': 0}
+
+
+def test_tls_verification_is_configurable():
+	"""Self-signed n8n deployments can turn verification off (N8N_VERIFY_SSL=false)"""
+
+	async def verify_mode(client):
+		mode = client._get_client()._transport._pool._ssl_context.verify_mode
+		await client.aclose()
+		return mode
+
+	assert asyncio.run(verify_mode(N8NAPIClient(base_url='https://n8n.test'))) == ssl.CERT_REQUIRED
+	assert asyncio.run(verify_mode(N8NAPIClient(base_url='https://n8n.test', verify_ssl=False))) == ssl.CERT_NONE
+
+
+def test_run_async_closes_the_pool_of_its_loop(monkeypatch):
+	client = new_client(Stub(200))
+	monkeypatch.setattr(n8n_api_client, 'n8n_client', client)
+
+	async def download():
+		pool = client._get_client()
+		await client.download_file_content(DOWNLOAD_URL)
+		return pool
+
+	pool = n8n_api_client.run_async(download())
+
+	assert pool.is_closed
+	assert client._pools == {}
+
+
+def test_each_event_loop_gets_its_own_pool_and_closed_loops_are_dropped():
+	client = new_client(Stub())
+
+	async def get_pool():
+		return client._get_client()
+
+	# A caller that let its loop end without aclose() leaves a pool behind
+	first = asyncio.run(get_pool())
+	assert len(client._pools) == 1
+
+	loop = asyncio.new_event_loop()
+	try:
+		second = loop.run_until_complete(get_pool())
+		assert second is not first
+		assert list(client._pools) == [loop]  # The pool of the closed loop was discarded
+		assert loop.run_until_complete(get_pool()) is second
+		loop.run_until_complete(client.aclose())
+	finally:
+		loop.close()
+	assert second.is_closed and client._pools == {}
@@ -0,0 +1,170 @@
+"""
+Crash recovery of chat turn persistence (transaction and write-behind modes)
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from app.modules.chat.models.conversation import Conversation
+from app.modules.chat.models.message import Message
+from app.modules.chat.services import turn_persistence_service
+from app.modules.chat.services.turn_persistence_service import TurnJournal, TurnWriteBehind, new_message_data, persist_turn, persist_turn_async
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MESSAGE_COLUMNS = ('id', 'conversation_id', 'user_id', 'role', 'content', 'timestamp', 'model_used', 'tokens_used', 'response_time_ms')
+
+
+def new_turn(conversation_id, user_id, number):
+	return [
+		new_message_data(conversation_id, user_id, f'question {number}', 'user'),
+		new_message_data(conversation_id, user_id, f'answer {number}', 'assistant'),
+	]
+
+
+def stored_state(session_factory, conversation_id):
+	"""(conversation.message_count, stored message contents in order)"""
+	db = session_factory()
+	try:
+		conversation = db.get(Conversation, conversation_id)
+		contents = [message.content for message in db.query(Message).filter(Message.conversation_id == conversation_id).order_by(Message.timestamp)]
+		return conversation.message_count, contents
+	finally:
+		db.close()
+
+
+def replay(journal_path, async_session_factory):
+	"""Start a fresh write-behind buffer on the journal (process restart) and wait for the replay"""
+
+	async def run():
+		write_behind = TurnWriteBehind(journal_path=journal_path, session_factory=async_session_factory)
+		recovered = await write_behind.recover()
+		await write_behind.drain()
+		return recovered, write_behind.get_stats()
+
+	return asyncio.run(run())
+
+
+def test_transaction_crash_writes_nothing(session_factory, conversation, monkeypatch):
+	conversation_id, user_id = conversation
+	turn = new_turn(conversation_id, user_id, 1)
+
+	def crash(*args, **kwargs):
+		raise RuntimeError('crash between the inserts and the counter update')
+
+	monkeypatch.setattr(turn_persistence_service.ConversationDAL, 'record_new_messages', crash)
+	with pytest.raises(RuntimeError):
+		persist_turn(session_factory(), conversation_id, turn)
+	assert stored_state(session_factory, conversation_id) == (0, [])
+
+	monkeypatch.undo()
+	persist_turn(session_factory(), conversation_id, turn)
+	assert stored_state(session_factory, conversation_id) == (2, ['question 1', 'answer 1'])
+
+
+def test_transaction_replay_of_committed_turn_is_not_counted_again(session_factory, conversation):
+	conversation_id, user_id = conversation
+	turn = new_turn(conversation_id, user_id, 1)
+
+	assert len(persist_turn(session_factory(), conversation_id, turn)) == 2
+	assert persist_turn(session_factory(), conversation_id, turn) == []
+	assert stored_state(session_factory, conversation_id) == (2, ['question 1', 'answer 1'])
+
+
+def test_write_behind_crash_between_append_and_flush(tmp_path, database_path, session_factory, async_session_factory, conversation):
+	"""A process killed right after journaling (before its flusher ran) loses nothing: the next start replays the turns"""
+	conversation_id, user_id = conversation
+	journal_path = str(tmp_path / 'journal.db')
+
+	child = textwrap.dedent(
+		f"""
+		import asyncio, os, sys
+		sys.path.insert(0, {ROOT!r})
+		import minio
+		minio.Minio.bucket_exists = lambda self, bucket_name: True
+		from app.modules.chat.services.turn_persistence_service import TurnWriteBehind, new_message_data
+
+		async def main():
+			write_behind = TurnWriteBehind(journal_path={journal_path!r})
+			for number in (1, 2):
+				await write_behind.submit({conversation_id!r}, [
+					new_message_data({conversation_id!r}, {user_id!r}, f'question {{number}}', 'user'),
+					new_message_data({conversation_id!r}, {user_id!r}, f'answer {{number}}', 'assistant'),
+				])
+			# Killed before the flusher task gets to run
+			os._exit(1)
+
+		asyncio.run(main())
+		"""
+	)
+	result = subprocess.run([sys.executable, '-c', child], cwd=ROOT, capture_output=True, timeout=300)
+	assert result.returncode == 1, result.stderr.decode()[-2000:]
+
+	assert TurnJournal(journal_path).count() == 2
+	assert stored_state(session_factory, conversation_id) == (0, [])
+
+	recovered, stats = replay(journal_path, async_session_factory)
+
+	assert recovered == 2
+	assert stats['journaled'] == 0 and stats['flushed'] == 2
+	assert stored_state(session_factory, conversation_id) == (4, ['question 1', 'answer 1', 'question 2', 'answer 2'])
+
+
+def test_write_behind_replay_of_committed_turn_is_not_counted_again(tmp_path, session_factory, async_session_factory, conversation):
+	"""Crash after the commit but before the journal entry was removed: the replay is a no-op"""
+	conversation_id, user_id = conversation
+	journal_path = str(tmp_path / 'journal.db')
+	committed_turn = new_turn(conversation_id, user_id, 1)
+	pending_turn = new_turn(conversation_id, user_id, 2)
+
+	async def commit_turn():
+		async with async_session_factory() as db:
+			await persist_turn_async(db, conversation_id, committed_turn)
+
+	asyncio.run(commit_turn())
+	journal = TurnJournal(journal_path)
+	journal.append(conversation_id, committed_turn)
+	journal.append(conversation_id, pending_turn)
+
+	recovered, stats = replay(journal_path, async_session_factory)
+
+	assert recovered == 2
+	assert stats['journaled'] == 0
+	assert stored_state(session_factory, conversation_id) == (4, ['question 1', 'answer 1', 'question 2', 'answer 2'])
+
+	# A second restart finds nothing left to replay
+	assert replay(journal_path, async_session_factory)[0] == 0
+	assert stored_state(session_factory, conversation_id)[0] == 4
+
+
+def test_write_behind_keeps_failing_turn_journaled(tmp_path, session_factory, async_session_factory, conversation, monkeypatch):
+	conversation_id, user_id = conversation
+	journal_path = str(tmp_path / 'journal.db')
+
+	async def failing_persist(*args, **kwargs):
+		raise RuntimeError('database unavailable')
+
+	async def no_backoff(*args, **kwargs):
+		pass
+
+	async def run():
+		write_behind = TurnWriteBehind(journal_path=journal_path, session_factory=async_session_factory, max_attempts=2)
+		await write_behind.submit(conversation_id, new_turn(conversation_id, user_id, 1))
+		await write_behind.drain()
+		return write_behind.get_stats()
+
+	monkeypatch.setattr(turn_persistence_service, 'persist_turn_async', failing_persist)
+	monkeypatch.setattr(turn_persistence_service.asyncio, 'sleep', no_backoff)
+	stats = asyncio.run(run())
+	assert stats['failed'] == 1 and stats['journaled'] == 1
+	assert stored_state(session_factory, conversation_id) == (0, [])
+
+	monkeypatch.undo()
+	recovered, stats = replay(journal_path, async_session_factory)
+	assert recovered == 1 and stats['journaled'] == 0
+	assert stored_state(session_factory, conversation_id) == (2, ['question 1', 'answer 1'])
@@ -0,0 +1,132 @@
+"""
+WebSocket connection registry over the in-memory pub/sub backend
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from app.utils.websocket_registry import ConnectionRegistry, InMemoryPubSubBackend, PubSubBackend
+
+
+class FakeWebSocket:
+	def __init__(self):
+		self.accepted = False
+		self.sent = []
+
+	async def accept(self):
+		self.accepted = True
+
+	async def send_text(self, text):
+		self.sent.append(json.loads(text))
+
+
+async def settle():
+	"""Let the unsubscribe tasks scheduled by disconnect() run"""
+	for _ in range(3):
+		await asyncio.sleep(0)
+
+
+def test_pubsub_backend_is_abstract():
+	with pytest.raises(TypeError):
+		PubSubBackend()
+
+
+def test_delivers_to_every_socket_of_the_user():
+	async def run():
+		registry = ConnectionRegistry('chat', backend=InMemoryPubSubBackend())
+		first, second, other = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+		await registry.connect(first, 'user-1')
+		await registry.connect(second, 'user-1')
+		await registry.connect(other, 'user-2')
+
+		await registry.send_message('user-1', {'type': 'ping'})
+		return first, second, other
+
+	first, second, other = asyncio.run(run())
+	assert first.accepted and second.accepted
+	# The registry ignores its own publication, so each socket gets the frame once
+	assert first.sent == [{'type': 'ping'}]
+	assert second.sent == [{'type': 'ping'}]
+	assert other.sent == []
+
+
+def test_fans_out_across_registries():
+	"""Two workers sharing one backbone: a push on one reaches the user's socket on the other"""
+
+	async def run():
+		backend = InMemoryPubSubBackend()
+		worker_a = ConnectionRegistry('chat', backend=backend)
+		worker_b = ConnectionRegistry('chat', backend=backend)
+		socket_a, socket_b = FakeWebSocket(), FakeWebSocket()
+		await worker_a.connect(socket_a, 'user-1')
+		await worker_b.connect(socket_b, 'user-1')
+
+		await worker_a.send_message('user-1', {'type': 'from_a'})
+		await worker_b.send_message('user-1', {'type': 'from_b'})
+		# No socket of user-2 anywhere: nothing is delivered
+		await worker_a.send_message('user-2', {'type': 'nobody'})
+		return socket_a, socket_b
+
+	socket_a, socket_b = asyncio.run(run())
+	assert socket_a.sent == [{'type': 'from_a'}, {'type': 'from_b'}]
+	assert socket_b.sent == [{'type': 'from_a'}, {'type': 'from_b'}]
+
+
+def test_unsubscribes_when_last_socket_disconnects():
+	async def run():
+		backend = InMemoryPubSubBackend()
+		worker_a = ConnectionRegistry('chat', backend=backend)
+		worker_b = ConnectionRegistry('chat', backend=backend)
+		channel = worker_b.user_channel('user-1')
+		first, second = FakeWebSocket(), FakeWebSocket()
+		await worker_b.connect(first, 'user-1')
+		await worker_b.connect(second, 'user-1')
+
+		worker_b.disconnect('user-1', first)
+		await settle()
+		subscribed_after_first = channel in backend._handlers
+
+		worker_b.disconnect('user-1', second)
+		await settle()
+		subscribed_after_last = channel in backend._handlers
+
+		await worker_a.send_message('user-1', {'type': 'late'})
+		return subscribed_after_first, subscribed_after_last, worker_b.is_connected('user-1'), first, second
+
+	subscribed_after_first, subscribed_after_last, connected, first, second = asyncio.run(run())
+	assert subscribed_after_first
+	assert not subscribed_after_last
+	assert not connected
+	assert first.sent == [] and second.sent == []
+
+
+def test_pending_unsubscribe_is_held_until_done_and_awaited_on_close():
+	class SlowBackend(InMemoryPubSubBackend):
+		async def unsubscribe(self, channel, handler):
+			await asyncio.sleep(0.05)
+			await super().unsubscribe(channel, handler)
+
+		async def close(self):
+			self.channels_at_close = set(self._handlers)
+			await super().close()
+
+	async def run():
+		backend = SlowBackend()
+		registry = ConnectionRegistry('chat', backend=backend)
+		socket = FakeWebSocket()
+		await registry.connect(socket, 'user-1')
+
+		registry.disconnect('user-1', socket)
+		pending = len(registry._unsubscribe_tasks)
+		await asyncio.sleep(0)
+
+		# close() waits for the unsubscribe instead of closing the backend under it
+		await registry.close()
+		return pending, registry._unsubscribe_tasks, backend.channels_at_close
+
+	pending, tasks_after_close, channels_at_close = asyncio.run(run())
+	assert pending == 1
+	assert tasks_after_close == set()
+	assert channels_at_close == set()